@@ -0,0 +1,378 @@
+# -*- coding: utf-8 -*-
+"""
+Alertas de listas de observação (nomes, CNPJs, palavras-chave) sobre os JSON
+gerados pelo PDFExtractor
+Todos os termos assinados pelos clientes são compilados num único autômato de
+Aho–Corasick, que percorre cada documento novo uma só vez
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
+
+from indice_busca import listar_json, montar_trechos, tokenizar
+from indice_entidades import chave_entidade
+
+logger = logging.getLogger(__name__)
+
+
+class AutomatoAhoCorasick:
+    """
+    Autômato de Aho–Corasick sobre sequências de termos
+
+    O alfabeto são os termos normalizados do tokenizador da busca (sem acentos,
+    em minúsculas), e não caracteres: os padrões casam só com palavras
+    inteiras ("ana" não casa dentro de "banana") e o texto é percorrido um
+    termo por vez, com as palavras já separadas pela expressão regular.
+
+    Uso:
+        automato = AutomatoAhoCorasick()
+        automato.adicionar(('joao', 'da', 'silva'), 'cliente A')
+        automato.construir()
+        for inicio, fim, valor in automato.encontrar(termos):
+            ...
+    """
+
+    def __init__(self):
+        self._transicoes: List[Dict[str, int]] = [{}]
+        self._falhas: List[int] = [0]
+        # Saídas de cada estado: (comprimento do padrão em termos, valor)
+        self._saidas: List[List[Tuple[int, Hashable]]] = [[]]
+        self._padroes = 0
+        self._construido = True
+
+    def __len__(self) -> int:
+        return self._padroes
+
+    def adicionar(self, padrao: Sequence[str], valor: Hashable):
+        """Adiciona um padrão (sequência de termos normalizados) associado a um valor"""
+        if not padrao:
+            return
+        estado = 0
+        for termo in padrao:
+            proximo = self._transicoes[estado].get(termo)
+            if proximo is None:
+                proximo = len(self._transicoes)
+                self._transicoes[estado][termo] = proximo
+                self._transicoes.append({})
+                self._falhas.append(0)
+                self._saidas.append([])
+            estado = proximo
+        self._saidas[estado].append((len(padrao), valor))
+        self._padroes += 1
+        self._construido = False
+
+    def construir(self):
+        """Calcula os links de falha (busca em largura) e propaga as saídas por eles"""
+        fila = deque(self._transicoes[0].values())
+        while fila:
+            estado = fila.popleft()
+            for termo, filho in self._transicoes[estado].items():
+                fila.append(filho)
+                falha = self._falhas[estado]
+                while falha and termo not in self._transicoes[falha]:
+                    falha = self._falhas[falha]
+                destino = self._transicoes[falha].get(termo, 0)
+                self._falhas[filho] = destino if destino != filho else 0
+                if self._saidas[self._falhas[filho]]:
+                    self._saidas[filho] = self._saidas[filho] + self._saidas[self._falhas[filho]]
+        self._construido = True
+
+    def encontrar(self, termos: Sequence[str]) -> Iterator[Tuple[int, int, Hashable]]:
+        """
+        Encontra todas as ocorrências dos padrões numa sequência de termos
+
+        Yields:
+            Tuple: (índice do primeiro termo, índice seguinte ao último, valor)
+        """
+        if not self._construido:
+            self.construir()
+
+        transicoes, falhas, saidas = self._transicoes, self._falhas, self._saidas
+        estado = 0
+        for indice, termo in enumerate(termos):
+            while estado and termo not in transicoes[estado]:
+                estado = falhas[estado]
+            estado = transicoes[estado].get(termo, 0)
+            if saidas[estado]:
+                for comprimento, valor in saidas[estado]:
+                    yield indice - comprimento + 1, indice + 1, valor
+
+
+def variantes_termo(termo: str) -> List[Tuple[str, ...]]:
+    """
+    Padrões (sequências de termos) que representam um termo assinado
+
+    Números de processo, CNPJ e CPF casam com e sem a formatação usual,
+    qualquer que seja a forma em que foram assinados.
+    """
+    variantes = {tuple(t for t, _ in tokenizar(termo))}
+
+    if not any(c.isdigit() for c in termo):
+        return [variante for variante in variantes if variante]
+
+    chave = chave_entidade(termo) or ''
+    tipo, _, valor = chave.partition(':')
+    digitos = re.sub(r'\D', '', valor)
+    if tipo == 'processo':
+        variantes.add(tuple(re.split(r'\D', valor)))
+        variantes.add((digitos,))
+    elif tipo == 'cnpj':
+        variantes.add((digitos[:2], digitos[2:5], digitos[5:8], digitos[8:12], digitos[12:]))
+        variantes.add((digitos,))
+    elif tipo == 'cpf':
+        variantes.add((digitos[:3], digitos[3:6], digitos[6:9], digitos[9:]))
+        variantes.add((digitos,))
+
+    return [variante for variante in variantes if variante]
+
+
+def carregar_assinaturas(caminho: Path) -> Dict[str, List[str]]:
+    """
+    Lê o arquivo de assinaturas: {"cliente": ["termo", ...], ...}
+
+    Raises:
+        ValueError: Se o arquivo não tiver esse formato
+    """
+    with open(caminho, 'r', encoding='utf-8') as f:
+        assinaturas = json.load(f)
+    if not isinstance(assinaturas, dict) or \
+            not all(isinstance(termos, list) and all(isinstance(t, str) for t in termos)
+                    for termos in assinaturas.values()):
+        raise ValueError(f"{caminho}: esperado um objeto {{cliente: [termos]}}")
+    return assinaturas
+
+
+class MonitorAlertas:
+    """
+    Confere os documentos extraídos contra as listas de observação dos clientes
+
+    Os termos de todos os clientes formam um único autômato; termos repetidos
+    entre clientes viram um só padrão. Cada documento é conferido uma vez
+    (controle por mtime e tamanho do JSON em <diretorio_dados>/_alertas/verificados.json)
+    e os alertas são acrescentados a <diretorio_dados>/_alertas/alertas.jsonl.
+    Quando o arquivo de assinaturas muda, o autômato é reconstruído.
+    """
+
+    NOME_DIRETORIO = '_alertas'
+
+    def __init__(self, diretorio_dados: str = "json_data", arquivo_assinaturas: str = "assinaturas_alertas.json",
+                 tamanho_contexto: int = 80):
+        """
+        Inicializa o monitor
+
+        Args:
+            diretorio_dados: Diretório com as subpastas de JSON do PDFExtractor
+            arquivo_assinaturas: JSON com os termos de cada cliente (ver carregar_assinaturas)
+            tamanho_contexto: Caracteres de contexto em volta de cada ocorrência
+        """
+        self.diretorio_dados = Path(diretorio_dados)
+        self.arquivo_assinaturas = Path(arquivo_assinaturas)
+        self.tamanho_contexto = tamanho_contexto
+        self.diretorio = self.diretorio_dados / self.NOME_DIRETORIO
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        self.arquivo_alertas = self.diretorio / 'alertas.jsonl'
+        self.arquivo_verificados = self.diretorio / 'verificados.json'
+
+        self.automato = AutomatoAhoCorasick()
+        self._assinantes: List[List[Tuple[str, str]]] = []
+        # Variantes já calculadas: numa reconstrução, só os termos novos são tokenizados
+        self._variantes: Dict[str, List[Tuple[str, ...]]] = {}
+        # (mtime_ns, tamanho) do arquivo de assinaturas compilado; None = arquivo ausente
+        self._versao_assinaturas: Optional[Tuple] = ()
+
+        self.verificados: Dict[str, Dict] = {}
+        if self.arquivo_verificados.exists():
+            try:
+                with open(self.arquivo_verificados, 'r', encoding='utf-8') as f:
+                    self.verificados = json.load(f)
+            except Exception as e:
+                logger.warning(f"Controle de alertas ilegível, conferindo tudo de novo: {e}")
+
+        self.recarregar_assinaturas()
+
+    def compilar(self, assinaturas: Dict[str, List[str]]):
+        """Reconstrói o autômato a partir de {cliente: [termos]}"""
+        inicio = time.perf_counter()
+        automato = AutomatoAhoCorasick()
+        assinantes: List[List[Tuple[str, str]]] = []
+        ids_padroes: Dict[Tuple[str, ...], int] = {}
+        variantes = {}
+
+        for cliente, termos in assinaturas.items():
+            for termo in termos:
+                if termo not in variantes:
+                    variantes[termo] = self._variantes.get(termo) or variantes_termo(termo)
+                for padrao in variantes[termo]:
+                    id_padrao = ids_padroes.get(padrao)
+                    if id_padrao is None:
+                        id_padrao = ids_padroes[padrao] = len(assinantes)
+                        assinantes.append([])
+                        automato.adicionar(padrao, id_padrao)
+                    if (cliente, termo) not in assinantes[id_padrao]:
+                        assinantes[id_padrao].append((cliente, termo))
+
+        automato.construir()
+        self.automato, self._assinantes, self._variantes = automato, assinantes, variantes
+        logger.info(f"Autômato de alertas: {len(automato)} padrão(ões) de {len(assinaturas)} cliente(s) "
+                    f"em {(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+    def recarregar_assinaturas(self) -> bool:
+        """
+        Reconstrói o autômato se o arquivo de assinaturas mudou
+
+        Returns:
+            bool: True se o autômato foi reconstruído
+        """
+        try:
+            stat = self.arquivo_assinaturas.stat()
+            versao = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            versao = None
+        if versao == self._versao_assinaturas:
+            return False
+
+        self._versao_assinaturas = versao
+        if versao is None:
+            logger.warning(f"Arquivo de assinaturas não encontrado: {self.arquivo_assinaturas}")
+            self.compilar({})
+        else:
+            self.compilar(carregar_assinaturas(self.arquivo_assinaturas))
+        return True
+
+    def conferir_texto(self, texto: str) -> Iterator[Tuple[int, int, str, str]]:
+        """
+        Confere um texto contra todas as assinaturas numa única passada
+
+        Yields:
+            Tuple: (início, fim, cliente, termo) de cada ocorrência, com os
+                offsets no texto original
+        """
+        termos, offsets = [], []
+        for termo, offset in tokenizar(texto):
+            termos.append(termo)
+            offsets.append(offset)
+
+        for primeiro, seguinte, id_padrao in self.automato.encontrar(termos):
+            fim = offsets[seguinte - 1] + len(termos[seguinte - 1])
+            for cliente, termo in self._assinantes[id_padrao]:
+                yield offsets[primeiro], fim, cliente, termo
+
+    def conferir_documento(self, caminho_json: Path, dados: Optional[Dict] = None) -> List[Dict]:
+        """
+        Confere um JSON do PDFExtractor e registra os alertas
+
+        Args:
+            caminho_json: Caminho do JSON
+            dados: Conteúdo já carregado do JSON (opcional)
+
+        Returns:
+            List[Dict]: Alertas (cliente, termo, documento, página, offset e trecho)
+        """
+        caminho_json = Path(caminho_json)
+        caminho_relativo = caminho_json.relative_to(self.diretorio_dados).as_posix()
+        try:
+            if dados is None:
+                with open(caminho_json, 'r', encoding='utf-8') as f:
+                    dados = json.load(f)
+            stat = caminho_json.stat()
+        except Exception as e:
+            logger.error(f"Erro ao ler {caminho_json}: {e}")
+            return []
+
+        alertas = []
+        for pagina in dados.get('paginas', []):
+            texto = pagina.get('texto', '')
+            for inicio, fim, cliente, termo in self.conferir_texto(texto):
+                alertas.append({
+                    'cliente': cliente,
+                    'termo': termo,
+                    'documento': caminho_relativo,
+                    'arquivo': dados.get('arquivo', {}).get('nome', caminho_json.name),
+                    'pasta_origem': dados.get('arquivo', {}).get('pasta_origem', caminho_json.parent.name),
+                    'pagina': pagina['numero_pagina'],
+                    'offset': inicio,
+                    'trecho': ' '.join(montar_trechos(texto, [(inicio, fim)], maximo=1,
+                                                      tamanho_contexto=self.tamanho_contexto)[0].split()),
+                })
+
+        if alertas:
+            with open(self.arquivo_alertas, 'a', encoding='utf-8') as f:
+                for alerta in alertas:
+                    f.write(json.dumps(alerta, ensure_ascii=False) + '\n')
+            logger.info(f"{len(alertas)} alerta(s) em {caminho_relativo}")
+
+        self.verificados[caminho_relativo] = {'tamanho_bytes': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        return alertas
+
+    def conferir_novos(self, todos: bool = False) -> List[Dict]:
+        """
+        Confere os JSON novos ou alterados desde a última verificação
+
+        Args:
+            todos: Se True, confere também os já verificados (ex.: depois de
+                incluir termos, para buscar nas edições anteriores)
+
+        Returns:
+            List[Dict]: Alertas encontrados
+        """
+        self.recarregar_assinaturas()
+        inicio = time.time()
+        alertas = []
+        conferidos = 0
+        for caminho_json in listar_json(self.diretorio_dados):
+            caminho_relativo = caminho_json.relative_to(self.diretorio_dados).as_posix()
+            registro = self.verificados.get(caminho_relativo)
+            stat = caminho_json.stat()
+            if not todos and registro and registro['tamanho_bytes'] == stat.st_size \
+                    and registro['mtime_ns'] == stat.st_mtime_ns:
+                continue
+            alertas.extend(self.conferir_documento(caminho_json))
+            conferidos += 1
+
+        self.salvar()
+        logger.info(f"{conferidos} documento(s) conferido(s) em {time.time() - inicio:.2f}s: "
+                    f"{len(alertas)} alerta(s)")
+        return alertas
+
+    def salvar(self):
+        arquivo_temp = self.arquivo_verificados.with_suffix('.tmp')
+        with open(arquivo_temp, 'w', encoding='utf-8') as f:
+            json.dump(self.verificados, f, ensure_ascii=False)
+        os.replace(arquivo_temp, self.arquivo_verificados)
+
+
+def main():
+    """Função principal"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Alertas de listas de observação sobre os diários extraídos')
+    parser.add_argument('--dados', default='json_data', help='Diretório de saída do PDFExtractor')
+    parser.add_argument('--assinaturas', default='assinaturas_alertas.json',
+                        help='JSON {cliente: [termos]} (padrão: assinaturas_alertas.json)')
+    parser.add_argument('--todos', action='store_true', help='Confere também os documentos já verificados')
+    parser.add_argument('--contexto', type=int, default=80, help='Caracteres de contexto de cada alerta')
+    parser.add_argument('--limite', type=int, default=20, help='Alertas exibidos por cliente')
+    args = parser.parse_args()
+
+    monitor = MonitorAlertas(args.dados, args.assinaturas, args.contexto)
+    alertas = monitor.conferir_novos(todos=args.todos)
+
+    por_cliente: Dict[str, List[Dict]] = {}
+    for alerta in alertas:
+        por_cliente.setdefault(alerta['cliente'], []).append(alerta)
+    for cliente, lista in sorted(por_cliente.items()):
+        print(f"\n{cliente}: {len(lista)} alerta(s)")
+        for alerta in lista[:args.limite]:
+            print(f"- [{alerta['termo']}] {alerta['documento']} - página {alerta['pagina']}")
+            print(f"  {alerta['trecho']}")
+
+
+if __name__ == "__main__":
+    main()
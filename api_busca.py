@@ -0,0 +1,606 @@
+# -*- coding: utf-8 -*-
+"""
+API HTTP local de busca sobre os JSON gerados pelo PDFExtractor, para o frontend
+Servidor asyncio (só biblioteca padrão) que abre o índice uma única vez e
+responde em JSON com paginação, compressão gzip, CORS e um cache LRU com TTL
+das respostas
+
+Rotas:
+    GET /api/busca?q=portaria&pagina=1&por_pagina=20[&ranquear=1&unidade=atos&trechos=3]
+    GET /api/busca?q=portaria&fts=1[&pasta=iomat&de=2025-10-01&ate=2025-10-31]   (banco SQLite)
+    GET /api/documentos[?pasta=iomat&pagina=1&por_pagina=50]
+    GET /api/documentos/<pasta>/<nome>[?pagina=1&por_pagina=10]
+    GET /api/documentos/<pasta>/<nome>/paginas/<numero>[?original=1]
+    GET /api/saude
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from http import HTTPStatus
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from armazenamento_binario import ConversorBinario, LeitorBinario
+from armazenamento_sqlite import NOME_BANCO, ArmazenamentoSQLite
+from boilerplate import texto_original
+from indice_busca import UNIDADES_BUSCA, IndiceInvertido
+
+logger = logging.getLogger(__name__)
+
+MAX_POR_PAGINA = 100
+TAMANHO_MINIMO_GZIP = 1024
+TAMANHO_MAXIMO_CABECALHOS = 64 * 1024
+# A API só responde a GET: corpos maiores que isso são recusados sem serem lidos
+TAMANHO_MAXIMO_CORPO = 64 * 1024
+TEMPO_OCIOSO_CONEXAO = 30
+
+
+class ErroHTTP(Exception):
+    """Erro com status HTTP, devolvido ao cliente como JSON"""
+
+    def __init__(self, status: HTTPStatus, mensagem: str):
+        super().__init__(mensagem)
+        self.status = status
+        self.mensagem = mensagem
+
+
+class CacheRespostas:
+    """
+    Cache LRU com tempo de vida das respostas já serializadas
+
+    Guarda o corpo JSON e, quando algum cliente pediu gzip, o corpo comprimido,
+    para que acertos não paguem nem a busca nem a compressão.
+    """
+
+    def __init__(self, capacidade: int = 512, ttl: float = 300):
+        """
+        Args:
+            capacidade: Número máximo de respostas guardadas
+            ttl: Segundos de validade de cada resposta
+        """
+        self.capacidade = capacidade
+        self.ttl = ttl
+        self._itens: 'OrderedDict[str, Tuple[float, List]]' = OrderedDict()
+        self.estatisticas = {'acertos': 0, 'faltas': 0, 'expiradas': 0}
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+    def obter(self, chave: str) -> Optional[List]:
+        """Resposta guardada ([status, corpo, corpo_gzip]) ou None se ausente ou expirada"""
+        item = self._itens.get(chave)
+        if item is None:
+            self.estatisticas['faltas'] += 1
+            return None
+
+        expira, resposta = item
+        if expira < time.monotonic():
+            del self._itens[chave]
+            self.estatisticas['expiradas'] += 1
+            self.estatisticas['faltas'] += 1
+            return None
+
+        self._itens.move_to_end(chave)
+        self.estatisticas['acertos'] += 1
+        return resposta
+
+    def guardar(self, chave: str, resposta: List):
+        """Guarda uma resposta, descartando as menos usadas recentemente"""
+        if self.capacidade <= 0:
+            return
+        self._itens[chave] = (time.monotonic() + self.ttl, resposta)
+        self._itens.move_to_end(chave)
+        while len(self._itens) > self.capacidade:
+            self._itens.popitem(last=False)
+
+    def limpar(self):
+        self._itens.clear()
+
+
+def _inteiro(parametros: Dict[str, List[str]], nome: str, padrao: int,
+             minimo: int = 1, maximo: Optional[int] = None) -> int:
+    """Lê um parâmetro inteiro da query string"""
+    valores = parametros.get(nome)
+    if not valores:
+        return padrao
+    try:
+        valor = int(valores[0])
+    except ValueError:
+        raise ErroHTTP(HTTPStatus.BAD_REQUEST, f"'{nome}' deve ser um número inteiro")
+    if valor < minimo or (maximo is not None and valor > maximo):
+        faixa = f"entre {minimo} e {maximo}" if maximo is not None else f"no mínimo {minimo}"
+        raise ErroHTTP(HTTPStatus.BAD_REQUEST, f"'{nome}' deve ser {faixa}")
+    return valor
+
+
+def _booleano(parametros: Dict[str, List[str]], nome: str) -> bool:
+    return parametros.get(nome, ['0'])[0].lower() in ('1', 'true', 'sim', 's')
+
+
+class ServidorBusca:
+    """
+    Servidor HTTP da API de busca
+
+    As consultas rodam numa única thread auxiliar (o IndiceInvertido não é
+    thread-safe), de modo que o laço de eventos continua aceitando conexões e
+    respondendo acertos do cache enquanto uma busca está em andamento.
+    """
+
+    def __init__(self, diretorio_dados: str = "json_data", host: str = '127.0.0.1', porta: int = 8000,
+                 tamanho_cache: int = 512, ttl_cache: float = 300, origem_cors: str = '*',
+                 intervalo_recarga: float = 30, leitores_abertos: int = 16):
+        """
+        Inicializa o servidor
+
+        Args:
+            diretorio_dados: Diretório de saída do PDFExtractor
+            host: Endereço de escuta
+            porta: Porta de escuta
+            tamanho_cache: Respostas mantidas no cache LRU
+            ttl_cache: Segundos de validade das respostas em cache
+            origem_cors: Valor de Access-Control-Allow-Origin
+            intervalo_recarga: Segundos entre verificações de alterações no
+                índice (0 = não recarrega)
+            leitores_abertos: Arquivos .dpz mantidos abertos para a rota de páginas
+        """
+        self.diretorio_dados = Path(diretorio_dados)
+        self.host = host
+        self.porta = porta
+        self.origem_cors = origem_cors
+        self.intervalo_recarga = intervalo_recarga
+        self.leitores_abertos = leitores_abertos
+
+        self.cache = CacheRespostas(tamanho_cache, ttl_cache)
+        self.conversor = ConversorBinario(str(self.diretorio_dados))
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='busca')
+        self._leitores: 'OrderedDict[Path, LeitorBinario]' = OrderedDict()
+        self.banco: Optional[ArmazenamentoSQLite] = None
+        self._em_andamento: Dict[str, asyncio.Future] = {}
+        self.requisicoes = 0
+        self.inicio = time.time()
+        self._carregar()
+
+    # ------------------------------------------------------------------
+    # Corpus
+    # ------------------------------------------------------------------
+
+    def _assinatura_indice(self) -> tuple:
+        arquivo = self.diretorio_dados / IndiceInvertido.NOME_DIRETORIO / 'documentos.json'
+        return (arquivo.stat().st_mtime_ns, arquivo.stat().st_size) if arquivo.exists() else None
+
+    def _carregar(self):
+        """Abre o índice e sincroniza as estatísticas do BM25"""
+        inicio = time.perf_counter()
+        self._assinatura = self._assinatura_indice()
+        self.indice = IndiceInvertido(str(self.diretorio_dados))
+        if not self.indice.documentos:
+            logger.warning(f"Índice vazio em {self.indice.diretorio_indice} "
+                           f"(rode: python indice_busca.py --dados {self.diretorio_dados} atualizar)")
+        self.indice.estatisticas_busca()
+        self._fechar_leitores()
+        # Com WAL, o banco sempre mostra as últimas gravações: basta abri-lo uma vez
+        caminho_banco = self.diretorio_dados / NOME_BANCO
+        if self.banco is None and caminho_banco.exists():
+            self.banco = ArmazenamentoSQLite(str(caminho_banco), somente_leitura=True)
+            logger.info(f"Banco SQLite: {caminho_banco}")
+        logger.info(f"Índice carregado em {time.perf_counter() - inicio:.2f}s: "
+                    f"{len(self.indice.documentos)} documento(s)")
+
+    def _recarregar_se_alterado(self) -> bool:
+        if self._assinatura_indice() == self._assinatura:
+            return False
+        logger.info("Índice alterado, recarregando")
+        self._carregar()
+        return True
+
+    def _fechar_leitores(self):
+        for leitor in self._leitores.values():
+            leitor.fechar()
+        self._leitores.clear()
+
+    def _leitor_binario(self, caminho_json: Path) -> Optional[LeitorBinario]:
+        """Leitor do .dpz do documento, se existir e estiver atualizado"""
+        caminho = self.conversor.caminho_binario(caminho_json)
+        leitor = self._leitores.get(caminho)
+        if leitor is not None:
+            self._leitores.move_to_end(caminho)
+            return leitor
+
+        try:
+            if caminho.stat().st_mtime < caminho_json.stat().st_mtime:
+                return None
+            leitor = LeitorBinario(caminho)
+        except (OSError, ValueError):
+            return None
+
+        self._leitores[caminho] = leitor
+        if len(self._leitores) > self.leitores_abertos:
+            self._leitores.popitem(last=False)[1].fechar()
+        return leitor
+
+    def _no_banco(self, caminho_relativo: str) -> bool:
+        """Indica se o banco tem a versão atual do JSON do documento"""
+        if self.banco is None:
+            return False
+        registro = self.banco.registro(caminho_relativo)
+        try:
+            stat = (self.diretorio_dados / caminho_relativo).stat()
+        except OSError:
+            return False
+        return registro is not None and (registro['tamanho_json'], registro['mtime_ns']) == \
+            (stat.st_size, stat.st_mtime_ns)
+
+    def _id_documento(self, pasta: str, nome: str) -> str:
+        id_doc = self.indice._ids_por_caminho.get(f"{pasta}/{nome}.json")
+        if id_doc is None:
+            raise ErroHTTP(HTTPStatus.NOT_FOUND, f"Documento não encontrado: {pasta}/{nome}")
+        return id_doc
+
+    def _blocos_documento(self, id_doc: str) -> Tuple[Dict, int]:
+        """Blocos do documento sem as páginas e o número de páginas (do banco ou do .dpz, quando houver)"""
+        caminho = self.indice.documentos[id_doc]['caminho']
+        if self._no_banco(caminho):
+            return self.banco.blocos(caminho), self.banco.registro(caminho)['numero_paginas']
+        caminho_json = self.diretorio_dados / caminho
+        leitor = self._leitor_binario(caminho_json)
+        if leitor is not None:
+            return leitor.documento['blocos'], leitor.num_paginas
+        dados = self.indice._carregar_documento(id_doc)
+        return {chave: valor for chave, valor in dados.items() if chave != 'paginas'}, len(dados.get('paginas', []))
+
+    def _paginas_documento(self, id_doc: str, inicio: int, fim: int) -> List[Dict]:
+        """Páginas [inicio, fim] (base 1) do documento"""
+        caminho = self.indice.documentos[id_doc]['caminho']
+        if self._no_banco(caminho):
+            return self.banco.paginas(caminho, inicio, fim)
+        caminho_json = self.diretorio_dados / caminho
+        leitor = self._leitor_binario(caminho_json)
+        if leitor is not None:
+            return [leitor.pagina(numero) for numero in range(inicio, min(fim, leitor.num_paginas) + 1)]
+        return self.indice._carregar_documento(id_doc).get('paginas', [])[inicio - 1:fim]
+
+    # ------------------------------------------------------------------
+    # Rotas (executadas na thread de busca)
+    # ------------------------------------------------------------------
+
+    def _rota_busca(self, parametros: Dict[str, List[str]]) -> Dict:
+        consulta = parametros.get('q', [''])[0].strip()
+        if not consulta:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, "Informe a consulta em 'q'")
+        pagina = _inteiro(parametros, 'pagina', 1)
+        por_pagina = _inteiro(parametros, 'por_pagina', 20, maximo=MAX_POR_PAGINA)
+        if _booleano(parametros, 'fts'):
+            return self._busca_fts(consulta, pagina, por_pagina, parametros)
+        ranquear = _booleano(parametros, 'ranquear')
+        unidade = parametros.get('unidade', ['paginas'])[0]
+        if unidade not in UNIDADES_BUSCA:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, f"'unidade' deve ser {' ou '.join(UNIDADES_BUSCA)}")
+
+        inicio = time.perf_counter()
+        busca = self.indice.pesquisar(consulta, pagina=pagina, por_pagina=por_pagina, ranquear=ranquear,
+                                      unidade=unidade,
+                                      trechos_por_resultado=_inteiro(parametros, 'trechos', 3, maximo=10))
+        return {
+            'consulta': consulta,
+            'ranqueada': ranquear,
+            'unidade': unidade if ranquear else 'paginas',
+            'pagina': pagina,
+            'por_pagina': por_pagina,
+            'total': busca['total'],
+            'total_paginas': -(-busca['total'] // por_pagina),
+            'duracao_ms': round((time.perf_counter() - inicio) * 1000, 1),
+            'resultados': busca['resultados'],
+        }
+
+    def _busca_fts(self, consulta: str, pagina: int, por_pagina: int, parametros: Dict[str, List[str]]) -> Dict:
+        """Busca no FTS5 do banco SQLite, com filtros por pasta e data da edição"""
+        if self.banco is None:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST,
+                           "Banco SQLite indisponível (rode: python armazenamento_sqlite.py importar)")
+        datas = {}
+        for nome in ('de', 'ate'):
+            valor = parametros.get(nome, [None])[0]
+            try:
+                datas[nome] = date.fromisoformat(valor) if valor else None
+            except ValueError:
+                raise ErroHTTP(HTTPStatus.BAD_REQUEST, f"'{nome}' deve ser uma data AAAA-MM-DD")
+
+        inicio = time.perf_counter()
+        busca = self.banco.buscar(consulta, limite=por_pagina, deslocamento=(pagina - 1) * por_pagina,
+                                  pastas=parametros.get('pasta'), data_inicio=datas['de'], data_fim=datas['ate'])
+        return {
+            'consulta': consulta,
+            'ranqueada': True,
+            'unidade': 'paginas',
+            'motor': 'fts5',
+            'pagina': pagina,
+            'por_pagina': por_pagina,
+            'total': busca['total'],
+            'total_paginas': -(-busca['total'] // por_pagina),
+            'duracao_ms': round((time.perf_counter() - inicio) * 1000, 1),
+            'resultados': busca['resultados'],
+        }
+
+    def _rota_documentos(self, parametros: Dict[str, List[str]]) -> Dict:
+        pasta = parametros.get('pasta', [None])[0]
+        pagina = _inteiro(parametros, 'pagina', 1)
+        por_pagina = _inteiro(parametros, 'por_pagina', 50, maximo=MAX_POR_PAGINA)
+
+        documentos = sorted(
+            (documento for documento in self.indice.documentos.values()
+             if pasta is None or documento['pasta_origem'] == pasta),
+            key=lambda documento: documento['caminho']
+        )
+        inicio = (pagina - 1) * por_pagina
+        return {
+            'pagina': pagina,
+            'por_pagina': por_pagina,
+            'total': len(documentos),
+            'documentos': [
+                {'id': documento['caminho'][:-len('.json')], 'arquivo': documento['nome'],
+                 'pasta_origem': documento['pasta_origem'], 'numero_paginas': documento['numero_paginas']}
+                for documento in documentos[inicio:inicio + por_pagina]
+            ]
+        }
+
+    def _rota_documento(self, pasta: str, nome: str, parametros: Dict[str, List[str]]) -> Dict:
+        id_doc = self._id_documento(pasta, nome)
+        pagina = _inteiro(parametros, 'pagina', 1)
+        por_pagina = _inteiro(parametros, 'por_pagina', 10, maximo=MAX_POR_PAGINA)
+        blocos, numero_paginas = self._blocos_documento(id_doc)
+        inicio = (pagina - 1) * por_pagina + 1
+
+        return {
+            'id': f"{pasta}/{nome}",
+            **blocos,
+            'numero_paginas': numero_paginas,
+            'pagina': pagina,
+            'por_pagina': por_pagina,
+            'paginas': self._paginas_documento(id_doc, inicio, inicio + por_pagina - 1),
+        }
+
+    def _rota_pagina(self, pasta: str, nome: str, numero: str, parametros: Dict[str, List[str]]) -> Dict:
+        id_doc = self._id_documento(pasta, nome)
+        if not numero.isdigit():
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, "O número da página deve ser inteiro")
+        paginas = self._paginas_documento(id_doc, int(numero), int(numero)) if int(numero) >= 1 else []
+        if not paginas:
+            raise ErroHTTP(HTTPStatus.NOT_FOUND, f"Página {numero} não encontrada em {pasta}/{nome}")
+        pagina = paginas[0]
+        # Texto como foi extraído, com os cabeçalhos e rodapés removidos pelo boilerplate.py
+        if _booleano(parametros, 'original') and 'boilerplate' in pagina:
+            pagina = {chave: valor for chave, valor in pagina.items() if chave != 'boilerplate'}
+            pagina['texto'] = texto_original(paginas[0])
+            pagina['numero_caracteres'] = len(pagina['texto'])
+            pagina['numero_palavras'] = len(pagina['texto'].split())
+        return {'id': f"{pasta}/{nome}", **pagina}
+
+    def _rota_saude(self) -> Dict:
+        return {
+            'status': 'ok',
+            'documentos': len(self.indice.documentos),
+            'banco_sqlite': self.banco is not None,
+            'requisicoes': self.requisicoes,
+            'no_ar_s': round(time.time() - self.inicio),
+            'cache': {**self.cache.estatisticas, 'itens': len(self.cache), 'capacidade': self.cache.capacidade,
+                      'ttl_s': self.cache.ttl},
+        }
+
+    def _despachar(self, caminho: str, parametros: Dict[str, List[str]]) -> Dict:
+        """Escolhe a rota pelo caminho da URL"""
+        partes = [unquote(parte) for parte in caminho.strip('/').split('/')]
+        if partes[:1] != ['api'] or len(partes) < 2:
+            raise ErroHTTP(HTTPStatus.NOT_FOUND, f"Rota inexistente: {caminho}")
+
+        rota = partes[1:]
+        if rota == ['saude']:
+            return self._rota_saude()
+        if rota == ['busca']:
+            return self._rota_busca(parametros)
+        if rota == ['documentos']:
+            return self._rota_documentos(parametros)
+        if len(rota) == 3 and rota[0] == 'documentos':
+            return self._rota_documento(rota[1], rota[2], parametros)
+        if len(rota) == 5 and rota[0] == 'documentos' and rota[3] == 'paginas':
+            return self._rota_pagina(rota[1], rota[2], rota[4], parametros)
+        raise ErroHTTP(HTTPStatus.NOT_FOUND, f"Rota inexistente: {caminho}")
+
+    def _executar_rota(self, caminho: str, parametros: Dict[str, List[str]]) -> List:
+        """Executa a rota e serializa a resposta ([status, corpo, corpo_gzip])"""
+        try:
+            status, conteudo = HTTPStatus.OK, self._despachar(caminho, parametros)
+        except ErroHTTP as e:
+            status, conteudo = e.status, {'erro': e.mensagem}
+        except Exception as e:
+            logger.exception(f"Erro em {caminho}: {e}")
+            status, conteudo = HTTPStatus.INTERNAL_SERVER_ERROR, {'erro': 'Erro interno'}
+        corpo = json.dumps(conteudo, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        return [status, corpo, None]
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    def _cabecalhos_cors(self) -> List[Tuple[str, str]]:
+        return [
+            ('Access-Control-Allow-Origin', self.origem_cors),
+            ('Access-Control-Allow-Methods', 'GET, OPTIONS'),
+            ('Access-Control-Allow-Headers', 'Content-Type'),
+            ('Access-Control-Max-Age', '86400'),
+        ]
+
+    async def _responder(self, escritor: asyncio.StreamWriter, status: HTTPStatus, corpo: bytes,
+                         cabecalhos: List[Tuple[str, str]], manter_conexao: bool):
+        linhas = [f"HTTP/1.1 {status.value} {status.phrase}"]
+        linhas += [f"{nome}: {valor}" for nome, valor in cabecalhos + self._cabecalhos_cors()]
+        linhas += [f"Content-Length: {len(corpo)}", f"Connection: {'keep-alive' if manter_conexao else 'close'}"]
+        escritor.write(('\r\n'.join(linhas) + '\r\n\r\n').encode('latin-1') + corpo)
+        await escritor.drain()
+
+    async def _resposta_rota(self, caminho: str, query: str) -> Tuple[List, bool]:
+        """
+        Resposta da rota, do cache ou executada na thread de busca
+
+        Requisições iguais que chegam enquanto a primeira ainda está sendo
+        executada aguardam o mesmo resultado em vez de repetir a busca.
+        """
+        parametros = parse_qs(query)
+        chave = f"{caminho}?{'&'.join(f'{nome}={valor}' for nome, valor in sorted(parametros.items()))}"
+        usar_cache = caminho.rstrip('/') != '/api/saude'
+        if usar_cache:
+            resposta = self.cache.obter(chave)
+            if resposta is not None:
+                return resposta, True
+
+            if chave in self._em_andamento:
+                return await asyncio.shield(self._em_andamento[chave]), True
+
+        laco = asyncio.get_running_loop()
+        execucao = laco.run_in_executor(self._executor, self._executar_rota, caminho, parametros)
+        if not usar_cache:
+            return await execucao, False
+
+        self._em_andamento[chave] = execucao
+        try:
+            resposta = await asyncio.shield(execucao)
+        finally:
+            del self._em_andamento[chave]
+        if resposta[0] == HTTPStatus.OK:
+            self.cache.guardar(chave, resposta)
+        return resposta, False
+
+    async def _tratar_conexao(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        """Atende as requisições de uma conexão (HTTP/1.1 com keep-alive)"""
+        try:
+            while True:
+                try:
+                    cabecalho = await asyncio.wait_for(leitor.readuntil(b'\r\n\r\n'), TEMPO_OCIOSO_CONEXAO)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self._responder(escritor, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, b'', [], False)
+                    return
+
+                linhas = cabecalho.decode('latin-1').split('\r\n')
+                try:
+                    metodo, alvo, versao = linhas[0].split(' ')
+                except ValueError:
+                    await self._responder(escritor, HTTPStatus.BAD_REQUEST, b'', [], False)
+                    return
+                cabecalhos = {}
+                for linha in linhas[1:]:
+                    nome, _, valor = linha.partition(':')
+                    if nome:
+                        cabecalhos[nome.strip().lower()] = valor.strip()
+
+                tamanho_corpo = cabecalhos.get('content-length', '0') or '0'
+                if not tamanho_corpo.isdigit():
+                    await self._responder(escritor, HTTPStatus.BAD_REQUEST, b'', [], False)
+                    return
+                if int(tamanho_corpo) > TAMANHO_MAXIMO_CORPO:
+                    await self._responder(escritor, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, b'', [], False)
+                    return
+                if int(tamanho_corpo):
+                    try:
+                        await asyncio.wait_for(leitor.readexactly(int(tamanho_corpo)), TEMPO_OCIOSO_CONEXAO)
+                    except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                        return
+
+                conexao = cabecalhos.get('connection', '').lower()
+                manter_conexao = conexao == 'keep-alive' if versao == 'HTTP/1.0' else conexao != 'close'
+                self.requisicoes += 1
+
+                if metodo == 'OPTIONS':
+                    await self._responder(escritor, HTTPStatus.NO_CONTENT, b'', [], manter_conexao)
+                elif metodo != 'GET':
+                    await self._responder(escritor, HTTPStatus.METHOD_NOT_ALLOWED, b'',
+                                          [('Allow', 'GET, OPTIONS')], manter_conexao)
+                else:
+                    url = urlsplit(alvo)
+                    inicio = time.perf_counter()
+                    resposta, acerto = await self._resposta_rota(url.path, url.query)
+                    status, corpo, _ = resposta
+                    extras = [('Content-Type', 'application/json; charset=utf-8'), ('Vary', 'Accept-Encoding'),
+                              ('X-Cache', 'HIT' if acerto else 'MISS')]
+
+                    if len(corpo) >= TAMANHO_MINIMO_GZIP and 'gzip' in cabecalhos.get('accept-encoding', ''):
+                        if resposta[2] is None:
+                            resposta[2] = gzip.compress(corpo, compresslevel=5)
+                        corpo = resposta[2]
+                        extras.append(('Content-Encoding', 'gzip'))
+
+                    await self._responder(escritor, status, corpo, extras, manter_conexao)
+                    logger.debug(f"{metodo} {alvo} {status.value} {len(corpo)}B "
+                                 f"{(time.perf_counter() - inicio) * 1000:.1f} ms{' (cache)' if acerto else ''}")
+
+                if not manter_conexao:
+                    return
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+    async def _monitorar_indice(self):
+        laco = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.intervalo_recarga)
+            if await laco.run_in_executor(self._executor, self._recarregar_se_alterado):
+                # O cache só é tocado no laço de eventos
+                self.cache.limpar()
+
+    async def servir(self):
+        """Atende conexões até ser cancelado"""
+        servidor = await asyncio.start_server(self._tratar_conexao, self.host, self.porta,
+                                              limit=TAMANHO_MAXIMO_CABECALHOS, backlog=1024)
+        monitor = asyncio.create_task(self._monitorar_indice()) if self.intervalo_recarga > 0 else None
+        logger.info(f"API de busca em http://{self.host}:{self.porta}/api/ (dados: {self.diretorio_dados})")
+        try:
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            if monitor:
+                monitor.cancel()
+            self._executor.shutdown(wait=False)
+            self._fechar_leitores()
+
+    def executar(self):
+        """Executa o servidor até Ctrl+C"""
+        try:
+            asyncio.run(self.servir())
+        except KeyboardInterrupt:
+            logger.info("Servidor encerrado")
+
+
+def main():
+    """Função principal"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='API HTTP de busca sobre os JSON extraídos')
+    parser.add_argument('--dados', default='json_data', help='Diretório de saída do PDFExtractor')
+    parser.add_argument('--host', default='127.0.0.1', help='Endereço de escuta (padrão: 127.0.0.1)')
+    parser.add_argument('--porta', type=int, default=8000, help='Porta (padrão: 8000)')
+    parser.add_argument('--cache', type=int, default=512, help='Respostas no cache LRU (padrão: 512)')
+    parser.add_argument('--ttl', type=float, default=300, help='Validade das respostas em cache, em segundos')
+    parser.add_argument('--cors', default='*', help='Origem permitida (Access-Control-Allow-Origin)')
+    parser.add_argument('--recarga', type=float, default=30,
+                        help='Segundos entre verificações de alterações no índice (0 = nunca)')
+    parser.add_argument('--verbose', action='store_true', help='Registra cada requisição')
+    args = parser.parse_args()
+
+    if args.verbose:
+        logger.setLevel(logging.DEBUG)
+
+    ServidorBusca(args.dados, host=args.host, porta=args.porta, tamanho_cache=args.cache, ttl_cache=args.ttl,
+                  origem_cors=args.cors, intervalo_recarga=args.recarga).executar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,444 @@
+# -*- coding: utf-8 -*-
+"""
+Formato binário compacto (.dpz) para os documentos extraídos
+Cada página é um bloco comprimido independente e uma tabela de offsets
+permite ler e descomprimir uma única página sem tocar no resto do arquivo
+
+Layout (inteiros little-endian):
+
+    cabeçalho (32 bytes)  b'DPZ1', versão u16, reservado u16, número de
+                          páginas u32, tamanho do dicionário u32, offset do
+                          bloco do documento u64, offset da tabela u64
+    dicionário            dicionário zlib do documento (comprimido)
+    páginas               texto UTF-8 de cada página, comprimido com zlib
+                          usando o dicionário (zdict)
+    documento             JSON comprimido com arquivo, metadados, informações,
+                          atos e os campos de página que não são derivados do texto
+    tabela                (número de páginas + 1) offsets u64: início de cada
+                          página e, por último, o início do bloco do documento
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import struct
+import sys
+import time
+import zlib
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+from indice_busca import listar_json
+
+logger = logging.getLogger(__name__)
+
+ASSINATURA = b'DPZ1'
+VERSAO_FORMATO = 1
+CABECALHO = struct.Struct('<4sHHIIQQ')
+EXTENSAO = '.dpz'
+
+# Tamanho máximo do dicionário zlib (a janela do deflate é de 32 KB)
+TAMANHO_DICIONARIO = 32 * 1024
+NIVEL_COMPRESSAO = 9
+
+
+def criar_dicionario(textos: Iterable[str], tamanho: int = TAMANHO_DICIONARIO) -> bytes:
+    """
+    Monta o dicionário zlib de um documento a partir das linhas e palavras repetidas
+
+    Cabeçalhos e rodapés de página, fórmulas ("O PROCURADOR-GERAL DE JUSTIÇA,
+    no uso de suas atribuições...") e o vocabulário frequente passam a ser
+    referências ao dicionário em vez de se repetirem em cada bloco. Os
+    trechos mais úteis ficam no fim, mais perto dos dados.
+
+    Args:
+        textos: Texto de cada página
+        tamanho: Tamanho máximo do dicionário em bytes
+
+    Returns:
+        bytes: Dicionário (vazio se não houver repetições)
+    """
+    contagem = Counter()
+    for texto in textos:
+        contagem.update({linha.strip() for linha in texto.split('\n') if len(linha.strip()) > 3})
+        contagem.update(palavra + ' ' for palavra in re.findall(r'\w{4,}', texto))
+
+    # Ganho aproximado: bytes economizados nas repetições além da primeira
+    trechos = sorted(((quantidade - 1) * len(trecho.encode('utf-8')), trecho)
+                     for trecho, quantidade in contagem.items() if quantidade > 1)
+
+    selecionados, total = [], 0
+    for _, trecho in reversed(trechos):
+        dados = trecho.encode('utf-8')
+        if total + len(dados) + 1 <= tamanho:
+            selecionados.append(dados)
+            total += len(dados) + 1
+
+    selecionados.reverse()
+    return b'\n'.join(selecionados)
+
+
+def _campos_derivados(numero_pagina: int, texto: str) -> Dict:
+    """Campos de página reconstruídos a partir do texto (como em PDFExtractor._iterar_paginas)"""
+    return {
+        'numero_pagina': numero_pagina,
+        'texto': texto,
+        'numero_caracteres': len(texto),
+        'numero_palavras': len(texto.split()) if texto else 0
+    }
+
+
+class EscritorBinario:
+    """
+    Grava um documento .dpz página a página
+
+    O arquivo é escrito num temporário e publicado apenas em fechar().
+    """
+
+    def __init__(self, caminho: Path, dicionario: bytes = b''):
+        """
+        Args:
+            caminho: Caminho final do arquivo .dpz
+            dicionario: Dicionário zlib usado em todas as páginas (ver criar_dicionario)
+        """
+        self.caminho = Path(caminho)
+        self.arquivo_temp = self.caminho.with_suffix(EXTENSAO + '.tmp')
+        self.dicionario = dicionario
+        self.offsets = array('Q')
+        self.paginas_extras: Dict[str, Dict] = {}
+
+        self._arquivo = open(self.arquivo_temp, 'wb')
+        self._dicionario_comprimido = zlib.compress(dicionario, NIVEL_COMPRESSAO)
+        self._arquivo.write(b'\0' * CABECALHO.size)
+        self._arquivo.write(self._dicionario_comprimido)
+
+    def _comprimir(self, dados: bytes) -> bytes:
+        if self.dicionario:
+            compressor = zlib.compressobj(NIVEL_COMPRESSAO, zdict=self.dicionario)
+        else:
+            compressor = zlib.compressobj(NIVEL_COMPRESSAO)
+        return compressor.compress(dados) + compressor.flush()
+
+    def escrever_pagina(self, pagina: Dict):
+        """Grava uma página (no formato dos JSONs de json_data)"""
+        texto = pagina.get('texto', '')
+        numero = len(self.offsets) + 1
+
+        # Campos que não podem ser reconstruídos do texto (como 'erro') vão
+        # para o bloco do documento, com a ordem original das chaves
+        if list(pagina.items()) != list(_campos_derivados(numero, texto).items()):
+            self.paginas_extras[str(numero)] = {chave: (None if chave == 'texto' else valor)
+                                                for chave, valor in pagina.items()}
+
+        self.offsets.append(self._arquivo.tell())
+        self._arquivo.write(self._comprimir(texto.encode('utf-8')))
+
+    def fechar(self, documento: Dict):
+        """
+        Grava o bloco do documento e a tabela de offsets e publica o arquivo
+
+        Args:
+            documento: Demais blocos do JSON (arquivo, metadados, atos,
+                informacoes...), na ordem em que aparecem; 'paginas' é ignorado
+        """
+        offset_documento = self._arquivo.tell()
+        bloco = {
+            'ordem_chaves': list(documento),
+            'paginas_extras': self.paginas_extras,
+            'blocos': {chave: valor for chave, valor in documento.items() if chave != 'paginas'}
+        }
+        self._arquivo.write(zlib.compress(
+            json.dumps(bloco, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), NIVEL_COMPRESSAO))
+
+        offset_tabela = self._arquivo.tell()
+        tabela = array('Q', self.offsets)
+        tabela.append(offset_documento)
+        if sys.byteorder == 'big':
+            tabela.byteswap()
+        self._arquivo.write(tabela.tobytes())
+
+        self._arquivo.seek(0)
+        self._arquivo.write(CABECALHO.pack(ASSINATURA, VERSAO_FORMATO, 0, len(self.offsets),
+                                           len(self._dicionario_comprimido), offset_documento, offset_tabela))
+        self._arquivo.close()
+        os.replace(self.arquivo_temp, self.caminho)
+
+    def descartar(self):
+        """Interrompe a escrita e remove o arquivo temporário"""
+        self._arquivo.close()
+        if self.arquivo_temp.exists():
+            self.arquivo_temp.unlink()
+
+
+def salvar_binario(dados: Dict, caminho: Path, dicionario: Optional[bytes] = None) -> Path:
+    """
+    Grava um documento completo (estrutura dos JSONs de json_data) em .dpz
+
+    Args:
+        dados: Documento com 'paginas' e os demais blocos
+        caminho: Arquivo de destino
+        dicionario: Dicionário zlib (padrão: criar_dicionario sobre as páginas)
+
+    Returns:
+        Path: Arquivo gravado
+    """
+    paginas = dados.get('paginas', [])
+    if dicionario is None:
+        dicionario = criar_dicionario(pagina.get('texto', '') for pagina in paginas)
+
+    escritor = EscritorBinario(caminho, dicionario)
+    try:
+        for pagina in paginas:
+            escritor.escrever_pagina(pagina)
+        escritor.fechar(dados)
+    except Exception:
+        escritor.descartar()
+        raise
+    return escritor.caminho
+
+
+class LeitorBinario:
+    """
+    Leitor de documentos .dpz com acesso direto às páginas
+
+    Abrir o arquivo lê só o cabeçalho, o dicionário e a tabela de offsets;
+    pagina(n) faz um seek e descomprime um único bloco.
+
+    Uso:
+        with LeitorBinario('json_data/_binario/iomat/diario.dpz') as leitor:
+            texto = leitor.pagina(143)['texto']
+    """
+
+    def __init__(self, caminho: Path):
+        self.caminho = Path(caminho)
+        self._arquivo = open(self.caminho, 'rb')
+        try:
+            cabecalho = self._arquivo.read(CABECALHO.size)
+            if len(cabecalho) != CABECALHO.size:
+                raise ValueError(f"{self.caminho.name}: arquivo truncado")
+            (assinatura, versao, _, self.num_paginas, tamanho_dicionario,
+             self._offset_documento, self._offset_tabela) = CABECALHO.unpack(cabecalho)
+            if assinatura != ASSINATURA:
+                raise ValueError(f"{self.caminho.name}: não é um arquivo {EXTENSAO}")
+            if versao > VERSAO_FORMATO:
+                raise ValueError(f"{self.caminho.name}: versão {versao} do formato não suportada")
+
+            self.dicionario = zlib.decompress(self._arquivo.read(tamanho_dicionario))
+
+            self._arquivo.seek(self._offset_tabela)
+            self._offsets = array('Q')
+            self._offsets.frombytes(self._arquivo.read(8 * (self.num_paginas + 1)))
+            if sys.byteorder == 'big':
+                self._offsets.byteswap()
+            if len(self._offsets) != self.num_paginas + 1:
+                raise ValueError(f"{self.caminho.name}: tabela de offsets incompleta")
+        except Exception:
+            self._arquivo.close()
+            raise
+        self._documento: Optional[Dict] = None
+
+    def __enter__(self) -> 'LeitorBinario':
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def __len__(self) -> int:
+        return self.num_paginas
+
+    def fechar(self):
+        self._arquivo.close()
+
+    def _ler(self, inicio: int, fim: int) -> bytes:
+        self._arquivo.seek(inicio)
+        return self._arquivo.read(fim - inicio)
+
+    @property
+    def documento(self) -> Dict:
+        """Bloco do documento (lido na primeira consulta)"""
+        if self._documento is None:
+            dados = self._ler(self._offset_documento, self._offset_tabela)
+            self._documento = json.loads(zlib.decompress(dados).decode('utf-8'))
+        return self._documento
+
+    def texto(self, numero: int) -> str:
+        """Texto de uma página (base 1), lendo apenas o seu bloco"""
+        if not 1 <= numero <= self.num_paginas:
+            raise IndexError(f"{self.caminho.name} tem {self.num_paginas} páginas (pedida: {numero})")
+        dados = self._ler(self._offsets[numero - 1], self._offsets[numero])
+        descompressor = zlib.decompressobj(zdict=self.dicionario) if self.dicionario else zlib.decompressobj()
+        return (descompressor.decompress(dados) + descompressor.flush()).decode('utf-8')
+
+    def pagina(self, numero: int) -> Dict:
+        """
+        Página no formato dos JSONs de json_data
+
+        Args:
+            numero: Número da página (base 1)
+
+        Returns:
+            Dict: Página com 'numero_pagina', 'texto', 'numero_caracteres' e
+                'numero_palavras' (e 'erro', se houver)
+        """
+        texto = self.texto(numero)
+        extras = self.documento['paginas_extras'].get(str(numero))
+        if extras is None:
+            return _campos_derivados(numero, texto)
+        return {chave: (texto if chave == 'texto' else valor) for chave, valor in extras.items()}
+
+    def paginas(self) -> Iterator[Dict]:
+        """Percorre as páginas em ordem"""
+        for numero in range(1, self.num_paginas + 1):
+            yield self.pagina(numero)
+
+    def carregar(self) -> Dict:
+        """Reconstrói o documento completo, igual ao JSON de origem (inclusive a ordem das chaves)"""
+        blocos = self.documento['blocos']
+        return {chave: (list(self.paginas()) if chave == 'paginas' else blocos[chave])
+                for chave in self.documento['ordem_chaves']}
+
+
+def carregar_binario(caminho: Path) -> Dict:
+    """Lê um documento .dpz completo"""
+    with LeitorBinario(caminho) as leitor:
+        return leitor.carregar()
+
+
+class ConversorBinario:
+    """Converte os JSONs de json_data para .dpz em <dados>/_binario/<pasta>/"""
+
+    NOME_DIRETORIO = '_binario'
+
+    def __init__(self, diretorio_dados: str = "json_data", diretorio_saida: Optional[str] = None):
+        self.diretorio_dados = Path(diretorio_dados)
+        self.diretorio_saida = Path(diretorio_saida) if diretorio_saida else self.diretorio_dados / self.NOME_DIRETORIO
+
+    def caminho_binario(self, caminho_json: Path) -> Path:
+        return self.diretorio_saida / caminho_json.parent.name / f"{caminho_json.stem}{EXTENSAO}"
+
+    def converter(self, forcar: bool = False) -> Dict[str, int]:
+        """
+        Converte os JSONs, reaproveitando arquivos .dpz mais novos que o JSON
+
+        Args:
+            forcar: Se True, regrava todos os arquivos
+
+        Returns:
+            Dict com contagens de convertidos, inalterados e removidos e os
+            tamanhos totais (bytes) dos JSONs e dos .dpz
+        """
+        existentes = set(self.diretorio_saida.glob(f'*/*{EXTENSAO}'))
+        contagem = {'convertidos': 0, 'inalterados': 0, 'removidos': 0, 'bytes_json': 0, 'bytes_binario': 0}
+
+        for caminho_json in listar_json(self.diretorio_dados):
+            destino = self.caminho_binario(caminho_json)
+            existentes.discard(destino)
+
+            if not forcar and destino.exists() and destino.stat().st_mtime >= caminho_json.stat().st_mtime:
+                contagem['inalterados'] += 1
+            else:
+                with open(caminho_json, 'r', encoding='utf-8') as f:
+                    dados = json.load(f)
+                destino.parent.mkdir(parents=True, exist_ok=True)
+                salvar_binario(dados, destino)
+                contagem['convertidos'] += 1
+                logger.info(f"Convertido: {destino.relative_to(self.diretorio_saida)} "
+                            f"({caminho_json.stat().st_size / destino.stat().st_size:.1f}x menor)")
+
+            contagem['bytes_json'] += caminho_json.stat().st_size
+            contagem['bytes_binario'] += destino.stat().st_size
+
+        # Documentos cujo JSON não existe mais
+        for caminho in existentes:
+            caminho.unlink()
+            contagem['removidos'] += 1
+
+        logger.info(
+            f"Conversão binária: {contagem['convertidos']} convertido(s), "
+            f"{contagem['inalterados']} inalterado(s), {contagem['removidos']} removido(s); "
+            f"{contagem['bytes_json'] / 1024 / 1024:.1f} MB -> {contagem['bytes_binario'] / 1024 / 1024:.1f} MB"
+        )
+        return contagem
+
+    def verificar(self) -> bool:
+        """
+        Confere a ida e volta de cada JSON: o .dpz deve reconstruir exatamente o
+        mesmo documento, e cada página lida diretamente deve ser igual à do JSON
+
+        Returns:
+            bool: True se todos os documentos conferem
+        """
+        ok = True
+        for caminho_json in listar_json(self.diretorio_dados):
+            destino = self.caminho_binario(caminho_json)
+            if not destino.exists():
+                logger.warning(f"Não convertido: {caminho_json}")
+                ok = False
+                continue
+
+            with open(caminho_json, 'r', encoding='utf-8') as f:
+                original = json.load(f)
+
+            with LeitorBinario(destino) as leitor:
+                reconstruido = leitor.carregar()
+                paginas = original.get('paginas', [])
+                inicio = time.perf_counter()
+                avulsas = [leitor.pagina(numero) for numero in range(leitor.num_paginas, 0, -1)]
+                tempo_pagina = (time.perf_counter() - inicio) / max(1, leitor.num_paginas)
+
+            iguais = (json.dumps(reconstruido, ensure_ascii=False) == json.dumps(original, ensure_ascii=False)
+                      and avulsas[::-1] == paginas)
+            ok = ok and iguais
+            logger.info(f"{'✓' if iguais else '❌'} {caminho_json.parent.name}/{caminho_json.name}: "
+                        f"{len(paginas)} páginas, {caminho_json.stat().st_size / destino.stat().st_size:.1f}x menor, "
+                        f"{tempo_pagina * 1000:.2f} ms por página avulsa")
+        return ok
+
+
+def main():
+    """Função principal"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Formato binário compacto (.dpz) dos documentos extraídos')
+    parser.add_argument('--dados', default='json_data', help='Diretório com os JSONs extraídos')
+    parser.add_argument('--saida', default=None, help='Diretório dos .dpz (padrão: <dados>/_binario)')
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+
+    converter = subcomandos.add_parser('converter', help='Converte os JSONs para .dpz')
+    converter.add_argument('--forcar', action='store_true', help='Regrava todos os arquivos')
+
+    subcomandos.add_parser('verificar', help='Confere a ida e volta JSON -> .dpz -> JSON')
+
+    ler = subcomandos.add_parser('ler', help='Imprime páginas de um arquivo .dpz')
+    ler.add_argument('arquivo', help='Arquivo .dpz')
+    ler.add_argument('--paginas', nargs='+', type=int, default=[1], help='Números das páginas')
+    ler.add_argument('--json', action='store_true', help='Imprime o documento completo em JSON')
+
+    args = parser.parse_args()
+
+    if args.comando == 'ler':
+        with LeitorBinario(args.arquivo) as leitor:
+            if args.json:
+                print(json.dumps(leitor.carregar(), ensure_ascii=False, indent=2))
+                return
+            for numero in args.paginas:
+                inicio = time.perf_counter()
+                texto = leitor.texto(numero)
+                duracao = time.perf_counter() - inicio
+                print(f"--- página {numero}/{leitor.num_paginas} ({duracao * 1000:.2f} ms) ---")
+                print(texto)
+        return
+
+    conversor = ConversorBinario(args.dados, args.saida)
+    if args.comando == 'converter':
+        conversor.converter(forcar=args.forcar)
+    elif not conversor.verificar():
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,489 @@
+# -*- coding: utf-8 -*-
+"""
+Armazenamento dos documentos extraídos num banco SQLite com busca FTS5
+Documentos, páginas e metadados ficam num único arquivo (json_data/diarios.db),
+com índices por pasta e data e uma tabela FTS5 sobre o texto das páginas;
+os leitores consultam o banco em vez de abrir e decodificar os JSON inteiros
+
+Tabelas:
+
+    documentos    um registro por JSON do PDFExtractor (caminho relativo,
+                  pasta, nome, data da edição, totais) e os blocos do
+                  documento sem as páginas (JSON, na ordem original das chaves)
+    paginas       texto e demais campos de cada página
+    paginas_fts   índice FTS5 (external content) sobre paginas.texto, mantido
+                  por triggers; sem acentos e sem diferença de maiúsculas
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from exportacao_colunar import inferir_data
+from indice_busca import OPERADORES_E, OPERADORES_OU, listar_json, tokenizar
+
+logger = logging.getLogger(__name__)
+
+NOME_BANCO = 'diarios.db'
+VERSAO_ESQUEMA = 1
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS documentos (
+    id             INTEGER PRIMARY KEY,
+    caminho        TEXT NOT NULL UNIQUE,
+    pasta_origem   TEXT NOT NULL,
+    nome           TEXT NOT NULL,
+    data_edicao    TEXT,
+    numero_paginas INTEGER NOT NULL,
+    total_palavras INTEGER,
+    tamanho_json   INTEGER,
+    mtime_ns       INTEGER,
+    blocos         TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_documentos_pasta_data ON documentos (pasta_origem, data_edicao);
+CREATE INDEX IF NOT EXISTS idx_documentos_data ON documentos (data_edicao);
+
+CREATE TABLE IF NOT EXISTS paginas (
+    id           INTEGER PRIMARY KEY,
+    documento_id INTEGER NOT NULL REFERENCES documentos (id) ON DELETE CASCADE,
+    numero       INTEGER NOT NULL,
+    texto        TEXT NOT NULL,
+    campos       TEXT NOT NULL,
+    UNIQUE (documento_id, numero)
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS paginas_fts USING fts5(
+    texto, content='paginas', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS paginas_ai AFTER INSERT ON paginas BEGIN
+    INSERT INTO paginas_fts (rowid, texto) VALUES (new.id, new.texto);
+END;
+CREATE TRIGGER IF NOT EXISTS paginas_ad AFTER DELETE ON paginas BEGIN
+    INSERT INTO paginas_fts (paginas_fts, rowid, texto) VALUES ('delete', old.id, old.texto);
+END;
+CREATE TRIGGER IF NOT EXISTS paginas_au AFTER UPDATE OF texto ON paginas BEGIN
+    INSERT INTO paginas_fts (paginas_fts, rowid, texto) VALUES ('delete', old.id, old.texto);
+    INSERT INTO paginas_fts (rowid, texto) VALUES (new.id, new.texto);
+END;
+"""
+
+
+def consulta_fts(consulta: str) -> str:
+    """
+    Converte uma consulta na sintaxe da busca (termos, "frases", AND/E, OR/OU)
+    para a sintaxe do FTS5
+
+    Cada termo vira uma string entre aspas, de modo que pontuação e palavras
+    reservadas do FTS5 (NEAR, NOT...) na consulta não são interpretadas.
+
+    Returns:
+        str: Expressão MATCH, ou '' se a consulta não tiver termos
+    """
+    conjuncoes = [[]]
+    for match in re.finditer(r'"([^"]*)"|(\S+)', consulta):
+        frase, palavra = match.groups()
+        if palavra in OPERADORES_OU:
+            conjuncoes.append([])
+            continue
+        if palavra in OPERADORES_E:
+            continue
+        termos = [termo for termo, _ in tokenizar(frase if frase is not None else palavra)]
+        if termos:
+            conjuncoes[-1].append(f'"{" ".join(termos)}"')
+
+    return ' OR '.join(f"({' '.join(conjuncao)})" for conjuncao in conjuncoes if conjuncao)
+
+
+class ArmazenamentoSQLite:
+    """
+    Banco SQLite com os documentos extraídos
+
+    O banco usa WAL: um escritor e qualquer número de leitores (outros
+    processos, como a API) trabalham ao mesmo tempo, sem que os leitores
+    vejam um documento pela metade. As gravações em lote devem ser feitas
+    dentro de transacao(), que confirma tudo de uma vez.
+
+    Uso:
+        with ArmazenamentoSQLite('json_data/diarios.db') as banco:
+            with banco.transacao():
+                banco.salvar_documento('iomat/iomat_0.json', dados)
+            for resultado in banco.buscar('"processo seletivo"'):
+                ...
+    """
+
+    def __init__(self, caminho_banco: str = f"json_data/{NOME_BANCO}", somente_leitura: bool = False):
+        """
+        Abre (e cria, se preciso) o banco
+
+        Args:
+            caminho_banco: Arquivo do banco
+            somente_leitura: Se True, abre o banco existente só para consultas
+
+        Raises:
+            sqlite3.OperationalError: Se o SQLite não tiver suporte a FTS5 ou
+                se o banco não existir no modo somente leitura
+        """
+        self.caminho_banco = Path(caminho_banco)
+        if somente_leitura:
+            self.conexao = sqlite3.connect(f"{self.caminho_banco.resolve().as_uri()}?mode=ro", uri=True,
+                                           isolation_level=None, check_same_thread=False)
+        else:
+            self.caminho_banco.parent.mkdir(parents=True, exist_ok=True)
+            # isolation_level=None: as transações são abertas explicitamente em transacao()
+            self.conexao = sqlite3.connect(self.caminho_banco, timeout=30, isolation_level=None,
+                                           check_same_thread=False)
+            self.conexao.execute('PRAGMA journal_mode=WAL')
+            # Com WAL, NORMAL só perde as últimas transações numa queda de energia, sem corromper o banco
+            self.conexao.execute('PRAGMA synchronous=NORMAL')
+            self.conexao.executescript(ESQUEMA)
+            self.conexao.execute(f'PRAGMA user_version={VERSAO_ESQUEMA}')
+        self.conexao.execute('PRAGMA foreign_keys=ON')
+        self.conexao.row_factory = sqlite3.Row
+        self._em_transacao = False
+
+    def __enter__(self) -> 'ArmazenamentoSQLite':
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def fechar(self):
+        self.conexao.close()
+
+    @contextmanager
+    def transacao(self):
+        """Agrupa as gravações numa única transação (aninhamentos usam a externa)"""
+        if self._em_transacao:
+            yield
+            return
+        self.conexao.execute('BEGIN IMMEDIATE')
+        self._em_transacao = True
+        try:
+            yield
+            self.conexao.execute('COMMIT')
+        except BaseException:
+            self.conexao.execute('ROLLBACK')
+            raise
+        finally:
+            self._em_transacao = False
+
+    # ------------------------------------------------------------------
+    # Gravação
+    # ------------------------------------------------------------------
+
+    def salvar_documento(self, caminho: str, dados: Dict, tamanho_json: Optional[int] = None,
+                         mtime_ns: Optional[int] = None) -> int:
+        """
+        Grava (ou substitui) um documento com todas as páginas
+
+        Args:
+            caminho: Caminho relativo do JSON ("pasta/nome.json"), a chave do documento
+            dados: Documento no formato do PDFExtractor
+            tamanho_json: Tamanho do JSON de origem (para atualizações incrementais)
+            mtime_ns: mtime do JSON de origem (idem)
+
+        Returns:
+            int: id do documento no banco
+        """
+        arquivo = dados.get('arquivo', {})
+        informacoes = dados.get('informacoes', {})
+        paginas = dados.get('paginas', [])
+        data = inferir_data(arquivo.get('nome', caminho), dados.get('metadados'))
+        blocos = {chave: valor for chave, valor in dados.items() if chave != 'paginas'}
+        blocos['_ordem_chaves'] = list(dados)
+
+        with self.transacao():
+            self.conexao.execute('DELETE FROM documentos WHERE caminho = ?', (caminho,))
+            cursor = self.conexao.execute(
+                'INSERT INTO documentos (caminho, pasta_origem, nome, data_edicao, numero_paginas, '
+                'total_palavras, tamanho_json, mtime_ns, blocos) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (caminho, arquivo.get('pasta_origem', Path(caminho).parent.name), arquivo.get('nome', caminho),
+                 data.isoformat() if data else None, len(paginas), informacoes.get('total_palavras'),
+                 tamanho_json, mtime_ns, json.dumps(blocos, ensure_ascii=False))
+            )
+            id_documento = cursor.lastrowid
+            self.conexao.executemany(
+                'INSERT INTO paginas (documento_id, numero, texto, campos) VALUES (?, ?, ?, ?)',
+                ((id_documento, pagina['numero_pagina'], pagina.get('texto', ''),
+                  json.dumps({chave: valor for chave, valor in pagina.items() if chave != 'texto'},
+                             ensure_ascii=False))
+                 for pagina in paginas)
+            )
+        return id_documento
+
+    def remover_documento(self, caminho: str) -> bool:
+        with self.transacao():
+            return self.conexao.execute('DELETE FROM documentos WHERE caminho = ?', (caminho,)).rowcount > 0
+
+    def importar(self, diretorio_dados: str, forcar: bool = False, documentos_por_lote: int = 20) -> Dict[str, int]:
+        """
+        Migra a árvore json_data para o banco
+
+        Cada lote de documentos é gravado numa única transação. JSON com o
+        mesmo tamanho e mtime já importados são pulados, e documentos cujo
+        JSON não existe mais são removidos.
+
+        Args:
+            diretorio_dados: Diretório com as subpastas de JSON do PDFExtractor
+            forcar: Se True, reimporta todos os documentos
+            documentos_por_lote: Documentos por transação
+
+        Returns:
+            Dict: Contagem de importados, inalterados e removidos
+        """
+        diretorio_dados = Path(diretorio_dados)
+        inicio = time.time()
+        contagem = {'importados': 0, 'inalterados': 0, 'removidos': 0}
+        existentes = {linha['caminho']: (linha['tamanho_json'], linha['mtime_ns'])
+                      for linha in self.conexao.execute('SELECT caminho, tamanho_json, mtime_ns FROM documentos')}
+
+        pendentes = []
+        for caminho_json in listar_json(diretorio_dados):
+            caminho = caminho_json.relative_to(diretorio_dados).as_posix()
+            stat = caminho_json.stat()
+            if not forcar and existentes.pop(caminho, None) == (stat.st_size, stat.st_mtime_ns):
+                contagem['inalterados'] += 1
+            else:
+                existentes.pop(caminho, None)
+                pendentes.append((caminho_json, caminho, stat))
+
+        for posicao in range(0, len(pendentes), documentos_por_lote):
+            with self.transacao():
+                for caminho_json, caminho, stat in pendentes[posicao:posicao + documentos_por_lote]:
+                    try:
+                        with open(caminho_json, 'r', encoding='utf-8') as f:
+                            dados = json.load(f)
+                    except Exception as e:
+                        logger.error(f"Erro ao ler {caminho_json}: {e}")
+                        continue
+                    self.salvar_documento(caminho, dados, stat.st_size, stat.st_mtime_ns)
+                    contagem['importados'] += 1
+                    logger.info(f"Importado: {caminho}")
+
+        if existentes:
+            with self.transacao():
+                for caminho in existentes:
+                    self.remover_documento(caminho)
+                    contagem['removidos'] += 1
+
+        logger.info(f"Banco atualizado em {time.time() - inicio:.2f}s: {contagem}")
+        return contagem
+
+    def otimizar(self):
+        """Funde os segmentos do índice FTS5 e atualiza as estatísticas do planejador"""
+        with self.transacao():
+            self.conexao.execute("INSERT INTO paginas_fts (paginas_fts) VALUES ('optimize')")
+        self.conexao.execute('ANALYZE')
+        self.conexao.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+
+    def _id_documento(self, caminho: str) -> Optional[int]:
+        linha = self.conexao.execute('SELECT id FROM documentos WHERE caminho = ?', (caminho,)).fetchone()
+        return linha['id'] if linha else None
+
+    def registro(self, caminho: str) -> Optional[Dict]:
+        """Colunas do documento (sem os blocos e as páginas), ou None se não estiver no banco"""
+        linha = self.conexao.execute(
+            'SELECT caminho, pasta_origem, nome, data_edicao, numero_paginas, total_palavras, tamanho_json, mtime_ns '
+            'FROM documentos WHERE caminho = ?', (caminho,)
+        ).fetchone()
+        return dict(linha) if linha else None
+
+    def blocos(self, caminho: str) -> Optional[Dict]:
+        """Documento sem as páginas (arquivo, metadados, informações, atos...)"""
+        linha = self.conexao.execute('SELECT blocos FROM documentos WHERE caminho = ?', (caminho,)).fetchone()
+        if linha is None:
+            return None
+        blocos = json.loads(linha['blocos'])
+        blocos.pop('_ordem_chaves', None)
+        return blocos
+
+    @staticmethod
+    def _pagina(linha: sqlite3.Row) -> Dict:
+        campos = json.loads(linha['campos'])
+        pagina = {'numero_pagina': campos.pop('numero_pagina'), 'texto': linha['texto']}
+        pagina.update(campos)
+        return pagina
+
+    def paginas(self, caminho: str, inicio: int = 1, fim: Optional[int] = None) -> List[Dict]:
+        """Páginas [inicio, fim] (base 1) de um documento, pela chave primária"""
+        return [self._pagina(linha) for linha in self.conexao.execute(
+            'SELECT p.texto, p.campos FROM paginas p JOIN documentos d ON d.id = p.documento_id '
+            'WHERE d.caminho = ? AND p.numero BETWEEN ? AND ? ORDER BY p.numero',
+            (caminho, inicio, fim if fim is not None else 2 ** 31)
+        )]
+
+    def documento(self, caminho: str) -> Optional[Dict]:
+        """Documento completo, igual ao JSON de origem"""
+        linha = self.conexao.execute('SELECT blocos FROM documentos WHERE caminho = ?', (caminho,)).fetchone()
+        if linha is None:
+            return None
+        blocos = json.loads(linha['blocos'])
+        ordem = blocos.pop('_ordem_chaves')
+        blocos['paginas'] = self.paginas(caminho)
+        return {chave: blocos[chave] for chave in ordem}
+
+    def listar_documentos(self, pastas: Optional[List[str]] = None, data_inicio: Optional[date] = None,
+                          data_fim: Optional[date] = None) -> List[Dict]:
+        """Documentos filtrados por pasta e data da edição (usa os índices de pasta e data)"""
+        filtros, parametros = self._filtros(pastas, data_inicio, data_fim)
+        return [dict(linha) for linha in self.conexao.execute(
+            'SELECT caminho, pasta_origem, nome, data_edicao, numero_paginas, total_palavras FROM documentos d '
+            f'{filtros} ORDER BY caminho', parametros
+        )]
+
+    @staticmethod
+    def _filtros(pastas: Optional[List[str]], data_inicio: Optional[date], data_fim: Optional[date]):
+        condicoes, parametros = [], []
+        if pastas:
+            condicoes.append(f"d.pasta_origem IN ({', '.join('?' * len(pastas))})")
+            parametros.extend(pastas)
+        if data_inicio:
+            condicoes.append('d.data_edicao >= ?')
+            parametros.append(data_inicio.isoformat())
+        if data_fim:
+            condicoes.append('d.data_edicao <= ?')
+            parametros.append(data_fim.isoformat())
+        return (f"WHERE {' AND '.join(condicoes)}" if condicoes else ''), parametros
+
+    def buscar(self, consulta: str, limite: int = 20, deslocamento: int = 0, pastas: Optional[List[str]] = None,
+               data_inicio: Optional[date] = None, data_fim: Optional[date] = None,
+               marcador: str = '**', tamanho_trecho: int = 24) -> Dict:
+        """
+        Busca de texto completo nas páginas, ordenada pelo BM25 do FTS5
+
+        Args:
+            consulta: Termos, "frases" e operadores AND/E e OR/OU (ver consulta_fts)
+            limite: Resultados devolvidos
+            deslocamento: Resultados pulados (paginação)
+            pastas: Pastas de origem desejadas (None = todas)
+            data_inicio: Data mínima da edição (inclusive)
+            data_fim: Data máxima da edição (inclusive)
+            marcador: Texto colocado antes e depois de cada ocorrência no trecho
+            tamanho_trecho: Palavras do trecho (snippet) de cada resultado
+
+        Returns:
+            Dict: {'total': páginas encontradas, 'resultados': [...]}
+        """
+        expressao = consulta_fts(consulta)
+        if not expressao:
+            return {'total': 0, 'resultados': []}
+
+        filtros, parametros = self._filtros(pastas, data_inicio, data_fim)
+        filtros = filtros.replace('WHERE', 'AND', 1)
+        total = self.conexao.execute(
+            'SELECT COUNT(*) FROM paginas_fts JOIN paginas p ON p.id = paginas_fts.rowid '
+            f'JOIN documentos d ON d.id = p.documento_id WHERE paginas_fts MATCH ? {filtros}',
+            [expressao, *parametros]
+        ).fetchone()[0]
+
+        linhas = self.conexao.execute(
+            'SELECT d.caminho, d.nome, d.pasta_origem, d.data_edicao, p.numero, bm25(paginas_fts) AS pontuacao, '
+            "snippet(paginas_fts, 0, ?, ?, '...', ?) AS trecho "
+            'FROM paginas_fts JOIN paginas p ON p.id = paginas_fts.rowid '
+            f'JOIN documentos d ON d.id = p.documento_id WHERE paginas_fts MATCH ? {filtros} '
+            'ORDER BY pontuacao LIMIT ? OFFSET ?',
+            [marcador, marcador, tamanho_trecho, expressao, *parametros, limite, deslocamento]
+        )
+        return {
+            'total': total,
+            'resultados': [
+                {
+                    'documento': linha['caminho'],
+                    'arquivo': linha['nome'],
+                    'pasta_origem': linha['pasta_origem'],
+                    'data_edicao': linha['data_edicao'],
+                    'pagina': linha['numero'],
+                    # O bm25() do FTS5 é negativo: quanto menor, mais relevante
+                    'pontuacao': round(-linha['pontuacao'], 4),
+                    'trecho': ' '.join(linha['trecho'].split()),
+                }
+                for linha in linhas
+            ]
+        }
+
+    def verificar(self, diretorio_dados: str) -> bool:
+        """
+        Confere a ida e volta de cada JSON: o documento lido do banco deve ser
+        igual ao JSON de origem
+
+        Returns:
+            bool: True se todos os documentos conferem
+        """
+        diretorio_dados = Path(diretorio_dados)
+        ok = True
+        for caminho_json in listar_json(diretorio_dados):
+            caminho = caminho_json.relative_to(diretorio_dados).as_posix()
+            with open(caminho_json, 'r', encoding='utf-8') as f:
+                original = json.load(f)
+            inicio = time.perf_counter()
+            reconstruido = self.documento(caminho)
+            duracao = time.perf_counter() - inicio
+            iguais = reconstruido is not None and \
+                json.dumps(reconstruido, ensure_ascii=False) == json.dumps(original, ensure_ascii=False)
+            ok = ok and iguais
+            logger.info(f"{'✓' if iguais else '❌'} {caminho}: {len(original.get('paginas', []))} páginas, "
+                        f"lido em {duracao * 1000:.1f} ms")
+        return ok
+
+
+def main():
+    """Função principal"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Banco SQLite (FTS5) com os documentos extraídos')
+    parser.add_argument('--dados', default='json_data', help='Diretório com os JSONs extraídos')
+    parser.add_argument('--banco', default=None, help=f'Arquivo do banco (padrão: <dados>/{NOME_BANCO})')
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+
+    importar = subcomandos.add_parser('importar', help='Migra os JSONs novos ou alterados para o banco')
+    importar.add_argument('--forcar', action='store_true', help='Reimporta todos os documentos')
+    importar.add_argument('--lote', type=int, default=20, help='Documentos por transação (padrão: 20)')
+
+    subcomandos.add_parser('verificar', help='Confere a ida e volta JSON -> banco -> JSON')
+    subcomandos.add_parser('otimizar', help='Compacta o índice FTS5 e atualiza as estatísticas')
+
+    buscar = subcomandos.add_parser('buscar', help='Busca de texto completo (FTS5)')
+    buscar.add_argument('consulta', help='Ex.: "processo seletivo" OR nomeação')
+    buscar.add_argument('--limite', type=int, default=10)
+    buscar.add_argument('--pastas', nargs='+', default=None)
+    buscar.add_argument('--de', type=date.fromisoformat, default=None, help='Data mínima (AAAA-MM-DD)')
+    buscar.add_argument('--ate', type=date.fromisoformat, default=None, help='Data máxima (AAAA-MM-DD)')
+
+    args = parser.parse_args()
+    caminho_banco = args.banco or os.path.join(args.dados, NOME_BANCO)
+
+    with ArmazenamentoSQLite(caminho_banco, somente_leitura=args.comando in ('buscar', 'verificar')) as banco:
+        if args.comando == 'importar':
+            banco.importar(args.dados, forcar=args.forcar, documentos_por_lote=args.lote)
+        elif args.comando == 'otimizar':
+            banco.otimizar()
+        elif args.comando == 'verificar':
+            if not banco.verificar(args.dados):
+                raise SystemExit(1)
+        else:
+            inicio = time.perf_counter()
+            busca = banco.buscar(args.consulta, limite=args.limite, pastas=args.pastas,
+                                 data_inicio=args.de, data_fim=args.ate)
+            duracao = (time.perf_counter() - inicio) * 1000
+            print(f"\n{busca['total']} página(s) em {duracao:.1f} ms:\n")
+            for resultado in busca['resultados']:
+                print(f"- {resultado['documento']} - página {resultado['pagina']} "
+                      f"({resultado['data_edicao'] or 'sem data'}, pontuação {resultado['pontuacao']})")
+                print(f"  {resultado['trecho']}")
+
+
+if __name__ == "__main__":
+    main()
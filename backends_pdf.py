@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""
+Backends de extração de texto de PDF
+Permite trocar o PyPDF2 (Python puro, sempre disponível) por extratores
+em C, como PyMuPDF e pypdfium2, quando estiverem instalados
+"""
+
+import logging
+from typing import Callable, Dict, List, Optional
+
+import PyPDF2
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:  # dependência opcional
+    fitz = None
+
+try:
+    import pypdfium2
+except ImportError:  # dependência opcional
+    pypdfium2 = None
+
+try:
+    import pypdf
+except ImportError:  # dependência opcional
+    pypdf = None
+
+logger = logging.getLogger(__name__)
+
+# Ordem de preferência do backend 'auto' (o mais rápido primeiro)
+PREFERENCIA_BACKENDS = ['pymupdf', 'pypdfium2', 'pypdf', 'pypdf2']
+
+# Chaves do dicionário de informações do PDF usadas em extrair_metadados_pdf
+CHAVES_METADADOS = ['/Title', '/Author', '/Subject', '/Creator', '/Producer', '/CreationDate', '/ModDate']
+
+
+class PaginaBackend:
+    """Página de um backend sem objeto de página próprio compatível com o PyPDF2"""
+
+    def __init__(self, extrair: Callable[[], str]):
+        self._extrair = extrair
+
+    def extract_text(self) -> str:
+        return self._extrair()
+
+
+class DocumentoBackend:
+    """
+    Documento aberto por um backend
+
+    Interface usada pelo PDFExtractor: num_paginas, pagina(indice), que
+    devolve um objeto com extract_text(), metadados (dicionário com as chaves
+    do PDF: '/Title', '/CreationDate'...) e fechar().
+    """
+
+    num_paginas = 0
+
+    def __enter__(self) -> 'DocumentoBackend':
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def pagina(self, indice: int):
+        raise NotImplementedError
+
+    @property
+    def metadados(self) -> Optional[Dict]:
+        return None
+
+    def liberar_pagina(self, indice: int):
+        """Descarta estruturas internas da página já extraída (acesso sob demanda)"""
+
+    def fechar(self):
+        pass
+
+
+class BackendPDF:
+    """Backend de extração: abre documentos a partir de um arquivo binário"""
+
+    nome = ''
+
+    @staticmethod
+    def disponivel() -> bool:
+        return True
+
+    def abrir(self, arquivo, caminho: Optional[str] = None) -> DocumentoBackend:
+        """
+        Abre um documento
+
+        Args:
+            arquivo: Arquivo aberto em modo binário (ou mmap), posicionado no início
+            caminho: Caminho do arquivo, para os backends que leem o PDF por
+                conta própria (padrão: arquivo.name, quando houver)
+
+        Returns:
+            DocumentoBackend: Documento aberto
+        """
+        raise NotImplementedError
+
+
+# ----------------------------------------------------------------------
+# PyPDF2 (padrão) e pypdf
+# ----------------------------------------------------------------------
+
+class DocumentoPyPDF2(DocumentoBackend):
+
+    def __init__(self, reader):
+        self.reader = reader
+        self.num_paginas = len(reader.pages)
+
+    def pagina(self, indice: int):
+        return self.reader.pages[indice]
+
+    @property
+    def metadados(self) -> Optional[Dict]:
+        return self.reader.metadata
+
+    def liberar_pagina(self, indice: int):
+        # O PyPDF2 guarda os fluxos de conteúdo decodificados em resolved_objects
+        conteudos = dict.get(self.reader.pages[indice], '/Contents')
+        if not isinstance(conteudos, list):
+            conteudos = [conteudos]
+        for referencia in conteudos:
+            if hasattr(referencia, 'idnum'):
+                self.reader.resolved_objects.pop((referencia.generation, referencia.idnum), None)
+
+
+class BackendPyPDF2(BackendPDF):
+    """PyPDF2: Python puro, referência do texto dos JSONs"""
+
+    nome = 'pypdf2'
+
+    def abrir(self, arquivo, caminho: Optional[str] = None) -> DocumentoBackend:
+        return DocumentoPyPDF2(PyPDF2.PdfReader(arquivo))
+
+
+class BackendPypdf(BackendPDF):
+    """pypdf: sucessor do PyPDF2, com extração de texto mais rápida"""
+
+    nome = 'pypdf'
+
+    @staticmethod
+    def disponivel() -> bool:
+        return pypdf is not None
+
+    def abrir(self, arquivo, caminho: Optional[str] = None) -> DocumentoBackend:
+        return DocumentoPyPDF2(pypdf.PdfReader(arquivo))
+
+
+# ----------------------------------------------------------------------
+# PyMuPDF (MuPDF)
+# ----------------------------------------------------------------------
+
+class DocumentoPyMuPDF(DocumentoBackend):
+
+    # Chaves de fitz.Document.metadata correspondentes às do PDF
+    CHAVES = {'/Title': 'title', '/Author': 'author', '/Subject': 'subject', '/Creator': 'creator',
+              '/Producer': 'producer', '/CreationDate': 'creationDate', '/ModDate': 'modDate'}
+
+    def __init__(self, documento):
+        self.documento = documento
+        self.num_paginas = documento.page_count
+
+    def pagina(self, indice: int):
+        pagina = self.documento.load_page(indice)
+        return PaginaBackend(lambda: pagina.get_text('text', sort=False))
+
+    @property
+    def metadados(self) -> Optional[Dict]:
+        metadata = self.documento.metadata or {}
+        return {chave: metadata.get(campo) or '' for chave, campo in self.CHAVES.items()}
+
+    def fechar(self):
+        self.documento.close()
+
+
+class BackendPyMuPDF(BackendPDF):
+    """PyMuPDF: MuPDF em C, em geral uma ordem de grandeza mais rápido"""
+
+    nome = 'pymupdf'
+
+    @staticmethod
+    def disponivel() -> bool:
+        return fitz is not None
+
+    def abrir(self, arquivo, caminho: Optional[str] = None) -> DocumentoBackend:
+        # Aberto pelo caminho, o MuPDF lê do arquivo só o que precisa; por
+        # stream, exigiria uma cópia do PDF inteiro em memória
+        caminho = caminho or getattr(arquivo, 'name', None)
+        if isinstance(caminho, str):
+            return DocumentoPyMuPDF(fitz.open(caminho, filetype='pdf'))
+        return DocumentoPyMuPDF(fitz.open(stream=arquivo.read(), filetype='pdf'))
+
+
+# ----------------------------------------------------------------------
+# pypdfium2 (PDFium)
+# ----------------------------------------------------------------------
+
+class DocumentoPdfium(DocumentoBackend):
+
+    def __init__(self, documento):
+        self.documento = documento
+        self.num_paginas = len(documento)
+
+    def _extrair(self, indice: int) -> str:
+        pagina = self.documento[indice]
+        pagina_texto = pagina.get_textpage()
+        try:
+            return pagina_texto.get_text_range()
+        finally:
+            pagina_texto.close()
+            pagina.close()
+
+    def pagina(self, indice: int):
+        if not 0 <= indice < self.num_paginas:
+            raise IndexError(f"página {indice + 1} fora do documento")
+        return PaginaBackend(lambda: self._extrair(indice))
+
+    @property
+    def metadados(self) -> Optional[Dict]:
+        metadata = self.documento.get_metadata_dict()
+        return {chave: metadata.get(chave[1:], '') for chave in CHAVES_METADADOS}
+
+    def fechar(self):
+        self.documento.close()
+
+
+class BackendPdfium(BackendPDF):
+    """pypdfium2: PDFium (motor do Chrome) em C++"""
+
+    nome = 'pypdfium2'
+
+    @staticmethod
+    def disponivel() -> bool:
+        return pypdfium2 is not None
+
+    def abrir(self, arquivo, caminho: Optional[str] = None) -> DocumentoBackend:
+        return DocumentoPdfium(pypdfium2.PdfDocument(arquivo, autoclose=False))
+
+
+BACKENDS = {backend.nome: backend for backend in (BackendPyPDF2, BackendPypdf, BackendPyMuPDF, BackendPdfium)}
+
+
+def backends_disponiveis() -> List[str]:
+    """Nomes dos backends instalados, na ordem de preferência"""
+    return [nome for nome in PREFERENCIA_BACKENDS if BACKENDS[nome].disponivel()]
+
+
+def criar_backend(nome: str = 'pypdf2') -> BackendPDF:
+    """
+    Cria um backend de extração
+
+    Args:
+        nome: 'pypdf2', 'pypdf', 'pymupdf', 'pypdfium2' ou 'auto' (o mais
+            rápido entre os instalados)
+
+    Returns:
+        BackendPDF: Backend pronto para uso
+
+    Raises:
+        ValueError: Se o nome não for conhecido
+        ImportError: Se o pacote do backend não estiver instalado
+    """
+    if nome == 'auto':
+        nome = backends_disponiveis()[0]
+        logger.info(f"Backend de extração: {nome}")
+
+    if nome not in BACKENDS:
+        raise ValueError(f"Backend desconhecido: {nome} (opções: auto, {', '.join(BACKENDS)})")
+
+    backend = BACKENDS[nome]
+    if not backend.disponivel():
+        raise ImportError(f"O backend {nome} não está instalado")
+    return backend()
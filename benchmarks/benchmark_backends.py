@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark e paridade dos backends de extração de texto de PDF
+
+Extrai os PDFs das pastas de origem com cada backend instalado e informa
+páginas por segundo e a diferença do texto em relação à referência: os JSONs
+já gerados em json_data (quando existem para o PDF) ou, na falta deles, o
+texto extraído pelo PyPDF2.
+
+Uso:
+    python benchmarks/benchmark_backends.py                     # dje doe iomat
+    python benchmarks/benchmark_backends.py doe --max-paginas 20
+    python benchmarks/benchmark_backends.py --backends pypdf2 pymupdf --minimo 0.95
+"""
+
+import argparse
+import difflib
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backends_pdf import BACKENDS, backends_disponiveis, criar_backend  # noqa: E402
+
+
+def extrair_textos(backend, caminho_pdf: Path, max_paginas: Optional[int]) -> List[str]:
+    """Extrai o texto das páginas como PDFExtractor.extrair_texto_pagina (strip; '' em caso de erro)"""
+    textos = []
+    with open(caminho_pdf, 'rb') as arquivo, backend.abrir(arquivo) as documento:
+        total = documento.num_paginas if max_paginas is None else min(max_paginas, documento.num_paginas)
+        for indice in range(total):
+            try:
+                texto = documento.pagina(indice).extract_text()
+                textos.append(texto.strip() if texto else '')
+            except Exception:
+                textos.append('')
+    return textos
+
+
+def textos_referencia(caminho_pdf: Path, diretorio_json: Path, max_paginas: Optional[int]) -> List[str]:
+    """Texto de referência: o JSON já extraído ou, se não existir, o PyPDF2"""
+    arquivo_json = diretorio_json / caminho_pdf.parent.name / f"{caminho_pdf.stem}.json"
+    if arquivo_json.exists():
+        with open(arquivo_json, 'r', encoding='utf-8') as f:
+            paginas = json.load(f).get('paginas', [])
+        return [pagina.get('texto', '') for pagina in paginas[:max_paginas]]
+    return extrair_textos(criar_backend('pypdf2'), caminho_pdf, max_paginas)
+
+
+def similaridade(referencia: str, texto: str) -> float:
+    """Similaridade (0 a 1) entre as sequências de palavras dos dois textos"""
+    if referencia == texto:
+        return 1.0
+    return difflib.SequenceMatcher(None, referencia.split(), texto.split(), autojunk=False).ratio()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark e paridade dos backends de extração de PDF')
+    parser.add_argument('pastas', nargs='*', default=['dje', 'doe', 'iomat'], help='Pastas de PDFs')
+    parser.add_argument('--backends', nargs='+', choices=list(BACKENDS), help='Backends (padrão: os instalados)')
+    parser.add_argument('--referencia', default='json_data', help='Diretório dos JSONs de referência')
+    parser.add_argument('--max-paginas', type=int, help='Páginas por PDF (padrão: todas)')
+    parser.add_argument('--minimo', type=float, default=0.0,
+                        help='Similaridade média mínima; abaixo dela o script sai com erro')
+    args = parser.parse_args()
+
+    pdfs = [caminho for pasta in args.pastas for caminho in sorted(Path(pasta).glob('*.pdf'))]
+    if not pdfs:
+        print(f"Nenhum PDF encontrado em {', '.join(args.pastas)}")
+        sys.exit(1)
+
+    instalados = backends_disponiveis()
+    for nome in set(args.backends or []) - set(instalados):
+        print(f"Backend {nome} não instalado, ignorado")
+    nomes = [nome for nome in (args.backends or instalados) if nome in instalados]
+    if not nomes:
+        sys.exit(1)
+    print(f"Backends: {', '.join(nomes)} (instalados: {', '.join(instalados)})")
+    print(f"{len(pdfs)} PDF(s) em {', '.join(args.pastas)}\n")
+
+    referencias = {caminho: textos_referencia(caminho, Path(args.referencia), args.max_paginas)
+                   for caminho in pdfs}
+
+    resultados: Dict[str, Dict] = {}
+    for nome in nomes:
+        backend = criar_backend(nome)
+        paginas = identicas = 0
+        soma_similaridade = 0.0
+        tempo = 0.0
+
+        for caminho in pdfs:
+            inicio = time.perf_counter()
+            textos = extrair_textos(backend, caminho, args.max_paginas)
+            tempo += time.perf_counter() - inicio
+
+            referencia = referencias[caminho]
+            if len(textos) != len(referencia):
+                print(f"  ! {nome}: {caminho.name} com {len(textos)} páginas (referência: {len(referencia)})")
+            for texto_ref, texto in zip(referencia, textos):
+                valor = similaridade(texto_ref, texto)
+                soma_similaridade += valor
+                identicas += valor == 1.0
+            paginas += len(textos)
+
+        resultados[nome] = {
+            'paginas': paginas,
+            'tempo': tempo,
+            'identicas': identicas,
+            'similaridade': soma_similaridade / paginas if paginas else 0.0,
+        }
+
+    base = resultados.get('pypdf2', next(iter(resultados.values())))
+    print(f"{'backend':12s} {'páginas':>8s} {'tempo':>9s} {'pág/s':>8s} {'ganho':>7s} {'idênticas':>10s} {'similaridade':>13s}")
+    for nome, r in resultados.items():
+        print(f"{nome:12s} {r['paginas']:8d} {r['tempo']:8.2f}s {r['paginas'] / r['tempo']:8.1f} "
+              f"{base['tempo'] / r['tempo']:6.1f}x {r['identicas'] / r['paginas']:9.1%} {r['similaridade']:13.4f}")
+
+    abaixo = [nome for nome, r in resultados.items() if r['similaridade'] < args.minimo]
+    if abaixo:
+        print(f"\n❌ Similaridade abaixo de {args.minimo}: {', '.join(abaixo)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark do parsing das páginas de edição
+
+Compara, em páginas de edição salvas (ou numa página sintética), o caminho
+antigo (html.parser + get_text em cada p/div/article/section) com
+crawler.parsear_conteudo_edicao usando cada parser disponível, e confere que
+o texto_completo é o mesmo quando o parser é o mesmo e que cada trecho de
+texto dos blocos aparece em exatamente uma seção, na ordem da página.
+
+Uso:
+    python benchmarks/benchmark_html.py                        # página sintética
+    python benchmarks/benchmark_html.py cache/edicao1.html ...  # páginas salvas
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+from bs4.element import Tag
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from crawler import PARSER_HTML, TAGS_BLOCO_TEXTO, TIPOS_TEXTO, parsear_conteudo_edicao  # noqa: E402
+
+
+def gerar_pagina_edicao(numero_atos: int = 400, profundidade: int = 6, semente: int = 7) -> str:
+    """Gera uma página de edição com blocos aninhados, como a de um tema WordPress"""
+    aleatorio = random.Random(semente)
+    palavras = ('procurador promotoria portaria designar exercício comarca substituto '
+                'licença processo administrativo resolução conselho superior').split()
+
+    partes = ['<html><head><title>Diário Oficial</title><script>var x = 1;</script>'
+              '<style>p { margin: 0 }</style></head><body><header><nav>Menu</nav></header>',
+              '<h1>Diário Oficial Eletrônico Nº 1234 - 15/03/2024</h1>']
+    partes.extend('<div class="camada">' for _ in range(profundidade))
+    partes.append('<article><div class="entry-content">')
+    for i in range(numero_atos):
+        frase = ' '.join(aleatorio.choice(palavras) for _ in range(aleatorio.randint(8, 40)))
+        partes.append(f'<section><div class="ato"><p><strong>PORTARIA Nº {i}/2024</strong></p>'
+                      f'<p>{frase}.</p><!-- ato {i} --><div><span>Cuiabá, 15 de março de 2024.</span></div>'
+                      f'</div></section>')
+    partes.append('</div></article>')
+    partes.extend('</div>' for _ in range(profundidade))
+    partes.append('<footer>Rodapé</footer></body></html>')
+    return ''.join(partes)
+
+
+def parsear_conteudo_antigo(html: str, url: str) -> dict:
+    """Caminho anterior de parsear_conteudo_edicao, mantido para comparação"""
+    soup = BeautifulSoup(html, 'html.parser')
+    conteudo = {'url': url, 'titulo': '', 'data_publicacao': '', 'numero_edicao': '',
+                'texto_completo': '', 'secoes': []}
+
+    for tag in ['h1', 'h2', '.titulo', '.title']:
+        titulo = soup.select_one(tag)
+        if titulo:
+            conteudo['titulo'] = titulo.get_text(strip=True)
+            break
+
+    for pattern in [soup.find(string=re.compile(r'\d{2}/\d{2}/\d{4}')),
+                    soup.find(class_=re.compile(r'data|date', re.I))]:
+        if pattern:
+            texto = pattern if isinstance(pattern, str) else pattern.get_text()
+            match = re.search(r'\d{2}/\d{2}/\d{4}', texto)
+            if match:
+                conteudo['data_publicacao'] = match.group()
+                break
+
+    numero_match = re.search(r'(?:N[°º]|Edição)\s*(\d+)', html, re.I)
+    if numero_match:
+        conteudo['numero_edicao'] = numero_match.group(1)
+
+    for elemento in soup(['script', 'style', 'nav', 'header', 'footer']):
+        elemento.decompose()
+
+    textos = []
+    for elem in soup.find_all(['p', 'div', 'article', 'section']):
+        texto = elem.get_text(strip=True)
+        if len(texto) > 30:
+            textos.append(texto)
+            conteudo['secoes'].append({'tipo': elem.name, 'texto': texto})
+
+    conteudo['texto_completo'] = '\n\n'.join(textos)
+    return conteudo
+
+
+def textos_proprios_blocos(html: str, parser: str = 'html.parser') -> list:
+    """
+    Texto próprio de cada bloco p/div/article/section, na ordem da página,
+    calculado de forma independente de extrair_blocos_texto (recursão sobre a
+    árvore); o texto de um bloco é dividido onde começa um bloco aninhado
+    """
+    soup = BeautifulSoup(html, parser)
+    for elemento in soup(['script', 'style', 'nav', 'header', 'footer']):
+        elemento.decompose()
+
+    pedacos = []
+
+    def visitar(no, proprios):
+        for filho in no.children:
+            if isinstance(filho, Tag):
+                if filho.name in TAGS_BLOCO_TEXTO:
+                    if proprios:
+                        pedacos.append(''.join(proprios))
+                        proprios.clear()
+                    do_filho = []
+                    visitar(filho, do_filho)
+                    if do_filho:
+                        pedacos.append(''.join(do_filho))
+                else:
+                    visitar(filho, proprios)
+            elif type(filho) in TIPOS_TEXTO and filho.strip() and proprios is not None:
+                proprios.append(filho.strip())
+
+    visitar(soup, None)
+    return pedacos
+
+
+def conferir_secoes(html: str, secoes: list, parser: str = 'html.parser') -> bool:
+    """Confere que as seções cobrem o texto de todos os blocos, cada trecho uma única vez e em ordem"""
+    return '\n'.join(secao['texto'] for secao in secoes) == '\n'.join(textos_proprios_blocos(html, parser))
+
+
+def parsers_disponiveis():
+    parsers = ['html.parser']
+    for nome in ['lxml', 'html5lib']:
+        try:
+            BeautifulSoup('<p></p>', nome)
+            parsers.append(nome)
+        except Exception:
+            pass
+    return parsers
+
+
+def medir(funcao, repeticoes: int) -> float:
+    """Retorna o menor tempo (segundos) entre as repetições"""
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark do parsing das páginas de edição')
+    parser.add_argument('arquivos', nargs='*', help='Páginas de edição salvas (padrão: página sintética)')
+    parser.add_argument('--repeticoes', type=int, default=3, help='Repetições de cada medição')
+    args = parser.parse_args()
+
+    if args.arquivos:
+        paginas = [(arquivo, Path(arquivo).read_text(encoding='utf-8', errors='replace'))
+                   for arquivo in args.arquivos]
+    else:
+        paginas = [('página sintética', gerar_pagina_edicao())]
+
+    parsers = parsers_disponiveis()
+    print(f"Parsers disponíveis: {', '.join(parsers)} (padrão: {PARSER_HTML})")
+
+    for nome, html in paginas:
+        print(f"\n{nome} - {len(html) / 1024:.0f} KB")
+
+        antigo = parsear_conteudo_antigo(html, nome)
+        novo = parsear_conteudo_edicao(html, nome, 'html.parser')
+        campos = ['titulo', 'data_publicacao', 'numero_edicao', 'texto_completo']
+        if any(antigo[campo] != novo[campo] for campo in campos):
+            print("  ❌ Resultado diferente do caminho antigo")
+            sys.exit(1)
+        if not conferir_secoes(html, novo['secoes']):
+            print("  ❌ Seções não cobrem o texto dos blocos exatamente uma vez")
+            sys.exit(1)
+        print(f"  ✓ texto_completo idêntico ({len(antigo['texto_completo'])} caracteres); "
+              f"seções: {len(antigo['secoes'])} -> {len(novo['secoes'])} "
+              f"({sum(len(s['texto']) for s in antigo['secoes'])} -> "
+              f"{sum(len(s['texto']) for s in novo['secoes'])} caracteres)")
+
+        tempo_antigo = medir(lambda: parsear_conteudo_antigo(html, nome), args.repeticoes)
+        print(f"  {'antigo (html.parser)':24s} {tempo_antigo * 1000:8.1f} ms")
+        for nome_parser in parsers:
+            tempo = medir(lambda: parsear_conteudo_edicao(html, nome, nome_parser), args.repeticoes)
+            print(f"  {nome_parser:24s} {tempo * 1000:8.1f} ms ({tempo_antigo / tempo:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
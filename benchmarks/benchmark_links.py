@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark da classificação de links da listagem de edições
+
+Compara o caminho antigo (um soup.select por seletor + busca por texto,
+com regexes recompiladas a cada link) com o classificador de passada única
+crawler.classificar_links, conferindo que ambos produzem as mesmas edições.
+
+Uso:
+    python benchmarks/benchmark_links.py                       # listagem sintética
+    python benchmarks/benchmark_links.py debug_pagina.html     # página salva
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from crawler import SELETORES_LISTAGEM, classificar_links  # noqa: E402
+
+BASE_URL = "https://www.mpmt.mp.br"
+
+
+def gerar_listagem(numero_edicoes: int, semente: int = 42) -> str:
+    """Gera uma página de listagem grande, com links relevantes, repetidos e irrelevantes"""
+    aleatorio = random.Random(semente)
+    partes = ['<html><body><header><nav>']
+    for rede in ['facebook.com/mpmt', 'twitter.com/mpmt', 'instagram.com/mpmt']:
+        partes.append(f'<a href="https://{rede}">{rede}</a>')
+    partes.append('<a href="#topo">Topo</a><a href="mailto:contato@mpmt.mp.br">Contato</a>')
+    partes.append('</nav></header><main><div class="lista-diarios">')
+
+    for i in range(numero_edicoes):
+        numero = 5000 + i
+        data = f"{aleatorio.randint(1, 28):02d}/{aleatorio.randint(1, 12):02d}/{aleatorio.choice([2023, 2024, 2025])}"
+        tipo = aleatorio.choice(['Diário Oficial', 'DOE', 'Edição Especial', 'Suplemento', 'Extra'])
+        estilo = i % 5
+        if estilo == 0:
+            partes.append(f'<div class="diario-item"><a href="/diario-oficial/edicao-{numero}/">'
+                          f'{tipo} Nº {numero} - {data}</a>'
+                          f' <a href="/wp-content/uploads/{numero}.pdf">Baixar PDF</a></div>')
+        elif estilo == 1:
+            partes.append(f'<article><h2><a href="/publicacao/{numero}">{tipo} Edição {numero}</a></h2>'
+                          f'<p>Publicado em <a href="/noticias/{numero}">{data}</a></p></article>')
+        elif estilo == 2:
+            partes.append(f'<p><a class="edicao" href="/arquivo/{numero}">Ed. {numero} de {data}</a></p>')
+        elif estilo == 3:
+            partes.append(f'<span><a href="/doe/{numero}"><strong>DOE {numero}</strong> {data}</a></span>')
+        else:
+            partes.append(f'<li><a href="/busca?ed={numero}">Diário {numero}/{data[-4:]}</a></li>')
+
+        # Links repetidos com outro texto e links sem relação com edições
+        if i % 7 == 0:
+            partes.append(f'<a href="/diario-oficial/edicao-{numero}/">Ver edição {numero}</a>')
+        if i % 3 == 0:
+            partes.append(f'<a href="/institucional/pagina-{i}">Página institucional</a>')
+
+    partes.append('</div></main><footer><a href="javascript:void(0)">Voltar</a></footer></body></html>')
+    return '\n'.join(partes)
+
+
+def classificar_links_antigo(soup: BeautifulSoup, base_url: str):
+    """Caminho anterior de CrawlerDiarioMPMT.extrair_links_edicoes, mantido para comparação"""
+    edicoes = []
+    links_encontrados = set()
+
+    def processar(elemento):
+        href = elemento.get('href')
+        if not href:
+            return
+        texto = elemento.get_text(strip=True)
+        if not texto or len(texto) < 3:
+            return
+        if href.startswith('http'):
+            url_completa = href
+        elif href.startswith('/'):
+            url_completa = f"{base_url}{href}"
+        else:
+            url_completa = f"{base_url}/{href}"
+        if url_completa in links_encontrados:
+            return
+        urls_excluir = ['javascript:', 'mailto:', '#', 'facebook.com', 'twitter.com', 'instagram.com']
+        if any(excl in url_completa.lower() for excl in urls_excluir):
+            return
+        links_encontrados.add(url_completa)
+
+        metadados = {'numero_edicao': None, 'data_publicacao': None, 'ano': None, 'tipo_documento': None}
+        match_numero = re.search(r'(?:N[°º]|Edição|Ed\.?)\s*(\d+)', texto, re.I)
+        if match_numero:
+            metadados['numero_edicao'] = match_numero.group(1)
+        match_data = re.search(r'(\d{2})[/\-.](\d{2})[/\-.](\d{4})', texto)
+        if match_data:
+            metadados['data_publicacao'] = f"{match_data.group(1)}/{match_data.group(2)}/{match_data.group(3)}"
+            metadados['ano'] = match_data.group(3)
+        if not metadados['ano']:
+            match_ano = re.search(r'\b(20\d{2})\b', texto)
+            if match_ano:
+                metadados['ano'] = match_ano.group(1)
+        for tipo in ['Diário Oficial', 'DOE', 'Edição Especial', 'Suplemento', 'Extra']:
+            if tipo.lower() in texto.lower():
+                metadados['tipo_documento'] = tipo
+                break
+        if not metadados['tipo_documento']:
+            metadados['tipo_documento'] = 'Diário Oficial'
+
+        edicoes.append((texto, url_completa, metadados['numero_edicao'], metadados['data_publicacao'],
+                        metadados['ano'], metadados['tipo_documento']))
+
+    for seletor in SELETORES_LISTAGEM:
+        for elemento in soup.select(seletor):
+            processar(elemento)
+    for link in soup.find_all('a', string=re.compile(r'(diário|edição|doe|\d{4})', re.I)):
+        processar(link)
+
+    return edicoes
+
+
+def medir(funcao, soup, repeticoes: int) -> float:
+    """Retorna o menor tempo (segundos) entre as repetições"""
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(soup, BASE_URL)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark da classificação de links da listagem')
+    parser.add_argument('html', nargs='?', help='Página de listagem salva (padrão: listagem sintética)')
+    parser.add_argument('--edicoes', type=int, default=2000, help='Edições na listagem sintética')
+    parser.add_argument('--repeticoes', type=int, default=5, help='Repetições de cada medição')
+    args = parser.parse_args()
+
+    if args.html:
+        html = Path(args.html).read_text(encoding='utf-8')
+        origem = args.html
+    else:
+        html = gerar_listagem(args.edicoes)
+        origem = f"listagem sintética ({args.edicoes} edições)"
+
+    soup = BeautifulSoup(html, 'html.parser')
+    print(f"Página: {origem} - {len(html) / 1024:.0f} KB, {len(soup.find_all('a'))} links")
+
+    antigo = classificar_links_antigo(soup, BASE_URL)
+    novo = [(e.titulo, e.url, e.numero_edicao, e.data_publicacao, e.ano, e.tipo_documento)
+            for e in classificar_links(soup, BASE_URL)]
+    if antigo != novo:
+        print(f"❌ Resultados diferentes: {len(antigo)} edições (antigo) x {len(novo)} (novo)")
+        sys.exit(1)
+    print(f"✓ Mesmas {len(novo)} edições, na mesma ordem")
+
+    tempo_antigo = medir(classificar_links_antigo, soup, args.repeticoes)
+    tempo_novo = medir(classificar_links, soup, args.repeticoes)
+    print(f"Seletores + busca por texto: {tempo_antigo * 1000:8.1f} ms")
+    print(f"Passada única:               {tempo_novo * 1000:8.1f} ms ({tempo_antigo / tempo_novo:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
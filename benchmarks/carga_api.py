@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+Teste de carga da API de busca (api_busca.py)
+
+Abre N conexões simultâneas (HTTP/1.1 com keep-alive), dispara consultas de
+busca sorteadas e informa a vazão e as latências p50/p90/p99, além da taxa de
+acertos do cache do servidor (cabeçalho X-Cache).
+
+Uso:
+    python api_busca.py --dados json_data &
+    python benchmarks/carga_api.py --concorrencia 300 --requisicoes 6000
+
+    # sobe o servidor num subprocesso e o encerra ao final
+    python benchmarks/carga_api.py --iniciar --dados json_data --ranquear
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlencode, urlsplit
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+CONSULTAS_PADRAO = [
+    'portaria', 'edital', 'nomeação', 'exoneração', 'licitação', 'servidor', 'contrato',
+    'aviso', 'resolução', 'despacho', '"processo seletivo"', '"ministério público"',
+    'cuiabá', 'férias', 'aposentadoria', 'pregão eletrônico', 'diárias', 'professor',
+    'exoneração OR nomeação', 'edital AND licitação',
+]
+
+
+def percentil(valores: List[float], p: float) -> float:
+    """Percentil p (0 a 100) pelo método do vizinho mais próximo"""
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, max(0, round(p / 100 * len(ordenados)) - 1))]
+
+
+async def requisitar(leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter,
+                     host: str, alvo: str) -> Dict:
+    """Envia um GET na conexão aberta e lê a resposta inteira"""
+    escritor.write(f"GET {alvo} HTTP/1.1\r\nHost: {host}\r\nAccept-Encoding: gzip\r\n\r\n".encode('latin-1'))
+    await escritor.drain()
+
+    cabecalho = (await leitor.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+    cabecalhos = {}
+    for linha in cabecalho[1:]:
+        nome, _, valor = linha.partition(':')
+        if nome:
+            cabecalhos[nome.strip().lower()] = valor.strip()
+    corpo = await leitor.readexactly(int(cabecalhos.get('content-length', 0)))
+    return {'status': int(cabecalho[0].split(' ')[1]), 'cabecalhos': cabecalhos, 'bytes': len(corpo)}
+
+
+async def cliente(host: str, porta: int, alvos: List[str], fila: asyncio.Queue, resultados: List[Dict]):
+    """Consome a fila de requisições com uma única conexão, reabrindo-a se cair"""
+    conexao = None
+    while True:
+        indice = await fila.get()
+        if indice is None:
+            break
+        try:
+            if conexao is None:
+                conexao = await asyncio.open_connection(host, porta)
+            inicio = time.perf_counter()
+            resposta = await requisitar(*conexao, f"{host}:{porta}", alvos[indice])
+            resposta['latencia_ms'] = (time.perf_counter() - inicio) * 1000
+            resultados.append(resposta)
+        except (OSError, asyncio.IncompleteReadError) as e:
+            resultados.append({'status': 0, 'erro': str(e)})
+            conexao = None
+    if conexao is not None:
+        conexao[1].close()
+
+
+async def executar_carga(host: str, porta: int, alvos: List[str], concorrencia: int) -> Dict:
+    fila: asyncio.Queue = asyncio.Queue()
+    for indice in range(len(alvos)):
+        fila.put_nowait(indice)
+    for _ in range(concorrencia):
+        fila.put_nowait(None)
+
+    resultados: List[Dict] = []
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente(host, porta, alvos, fila, resultados) for _ in range(concorrencia)))
+    return {'resultados': resultados, 'duracao': time.perf_counter() - inicio}
+
+
+def montar_alvos(consultas: List[str], quantidade: int, ranquear: bool, paginas: int, semente: int) -> List[str]:
+    """Sorteia as URLs das buscas (consulta e página de resultados)"""
+    sorteio = random.Random(semente)
+    alvos = []
+    for _ in range(quantidade):
+        parametros = {'q': sorteio.choice(consultas), 'pagina': sorteio.randint(1, paginas)}
+        if ranquear:
+            parametros['ranquear'] = 1
+        alvos.append(f"/api/busca?{urlencode(parametros)}")
+    return alvos
+
+
+async def aguardar_servidor(host: str, porta: int, tempo_maximo: float) -> bool:
+    limite = time.monotonic() + tempo_maximo
+    while time.monotonic() < limite:
+        try:
+            leitor, escritor = await asyncio.open_connection(host, porta)
+            resposta = await requisitar(leitor, escritor, f"{host}:{porta}", '/api/saude')
+            escritor.close()
+            if resposta['status'] == 200:
+                return True
+        except OSError:
+            pass
+        await asyncio.sleep(0.2)
+    return False
+
+
+def relatorio(titulo: str, carga: Dict):
+    respostas = carga['resultados']
+    ok = [r for r in respostas if r['status'] == 200]
+    latencias = [r['latencia_ms'] for r in ok]
+    acertos = sum(1 for r in ok if r['cabecalhos'].get('x-cache') == 'HIT')
+
+    print(f"\n{titulo}")
+    print(f"  requisições: {len(respostas)} ({len(respostas) - len(ok)} erro(s)) em {carga['duracao']:.2f}s "
+          f"= {len(respostas) / carga['duracao']:.0f} req/s")
+    if latencias:
+        print(f"  latência (ms): p50 {percentil(latencias, 50):.1f}  p90 {percentil(latencias, 90):.1f}  "
+              f"p99 {percentil(latencias, 99):.1f}  máx {max(latencias):.1f}  média {statistics.mean(latencias):.1f}")
+        print(f"  cache: {acertos / len(ok):.0%} de acertos, "
+              f"{sum(r['bytes'] for r in ok) / len(ok) / 1024:.1f} KB por resposta")
+    erros = {r['erro'] for r in respostas if 'erro' in r}
+    for erro in list(erros)[:5]:
+        print(f"  ! {erro}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Teste de carga da API de busca')
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help='Endereço da API')
+    parser.add_argument('--concorrencia', type=int, default=300, help='Conexões simultâneas (padrão: 300)')
+    parser.add_argument('--requisicoes', type=int, default=3000, help='Total de buscas (padrão: 3000)')
+    parser.add_argument('--consultas', nargs='+', default=CONSULTAS_PADRAO, help='Consultas sorteadas')
+    parser.add_argument('--paginas', type=int, default=3, help='Páginas de resultados sorteadas (padrão: 3)')
+    parser.add_argument('--ranquear', action='store_true', help='Usa a busca ranqueada (BM25)')
+    parser.add_argument('--semente', type=int, default=42)
+    parser.add_argument('--iniciar', action='store_true', help='Sobe o servidor (api_busca.py) num subprocesso')
+    parser.add_argument('--dados', default='json_data', help='Diretório de dados do servidor, com --iniciar')
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    host, porta = url.hostname, url.port or 80
+
+    processo: Optional[subprocess.Popen] = None
+    if args.iniciar:
+        processo = subprocess.Popen([sys.executable, str(RAIZ / 'api_busca.py'), '--dados', args.dados,
+                                     '--host', host, '--porta', str(porta)])
+    try:
+        if not asyncio.run(aguardar_servidor(host, porta, 60 if args.iniciar else 2)):
+            print(f"API indisponível em {args.url}")
+            sys.exit(1)
+
+        alvos = montar_alvos(args.consultas, args.requisicoes, args.ranquear, args.paginas, args.semente)
+        print(f"{args.requisicoes} busca(s), {args.concorrencia} conexões, "
+              f"{len(args.consultas) * args.paginas} combinações de consulta e página")
+
+        # A primeira rodada encontra o cache frio; a segunda mede o cache quente
+        relatorio('Cache frio', asyncio.run(executar_carga(host, porta, alvos, args.concorrencia)))
+        relatorio('Cache quente', asyncio.run(executar_carga(host, porta, alvos, args.concorrencia)))
+    finally:
+        if processo is not None:
+            processo.terminate()
+            processo.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+Gerador de diários sintéticos para os benchmarks
+
+Gera, de forma determinística (mesma semente = mesmos bytes), PDFs de diário
+oficial com o tamanho pedido, páginas de listagem e de edição em HTML e os
+conteúdos de edição usados por buscar_termo, sem acessar a rede nem depender
+de bibliotecas de geração de PDF.
+
+Uso:
+    python benchmarks/gerador_sintetico.py pdf sinteticos/ --paginas 10 200 2000
+    python benchmarks/gerador_sintetico.py listagem sinteticos/listagem.html --edicoes 3000
+    python benchmarks/gerador_sintetico.py edicao sinteticos/edicao.html --atos 400
+"""
+
+import argparse
+import random
+import sys
+import zlib
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from benchmark_html import gerar_pagina_edicao  # noqa: E402
+from benchmark_links import gerar_listagem  # noqa: E402
+
+VOCABULARIO = (
+    'portaria resolução edital extrato contrato aviso licitação pregão eletrônico nomeação exoneração '
+    'servidor público cargo comissão secretaria estado município procurador promotoria justiça comarca '
+    'designar exercício substituto férias licença aposentadoria processo administrativo conselho '
+    'superior ministério cuiabá várzea grande rondonópolis sinop objeto valor vigência dotação '
+    'orçamentária fiscal gestor termo aditivo prazo dias artigo inciso parágrafo lei decreto federal'
+).split()
+TIPOS_ATOS = ['PORTARIA', 'RESOLUÇÃO', 'EDITAL', 'EXTRATO DE CONTRATO', 'AVISO DE LICITAÇÃO', 'DECRETO']
+NOMES = ['MARIA', 'JOSÉ', 'ANA', 'JOÃO', 'ANTÔNIO', 'FRANCISCA', 'CARLOS', 'PAULO', 'LUCIANA', 'MÁRCIA']
+SOBRENOMES = ['SILVA', 'SANTOS', 'OLIVEIRA', 'SOUZA', 'LIMA', 'PEREIRA', 'CARVALHO', 'ALMEIDA', 'RIBEIRO']
+
+LINHAS_POR_PAGINA = 52
+CARACTERES_POR_LINHA = 95
+
+
+def _digitos_verificadores(base: str, pesos: List[int]) -> str:
+    for _ in range(2):
+        resto = sum(int(d) * p for d, p in zip(base, pesos[-len(base):])) % 11
+        base += str(0 if resto < 2 else 11 - resto)
+    return base
+
+
+def gerar_cnpj(aleatorio: random.Random) -> str:
+    """CNPJ formatado com dígitos verificadores válidos"""
+    d = _digitos_verificadores(f"{aleatorio.randrange(10 ** 8):08d}0001", [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2])
+    return f"{d[:2]}.{d[2:5]}.{d[5:8]}/{d[8:12]}-{d[12:]}"
+
+
+def gerar_processo(aleatorio: random.Random, ano: int) -> str:
+    """Número de processo CNJ com dígito verificador válido"""
+    numero, origem = aleatorio.randrange(10 ** 7), aleatorio.randrange(10 ** 4)
+    digito = 98 - int(f"{numero:07d}{ano}811{origem:04d}00") % 97
+    return f"{numero:07d}-{digito:02d}.{ano}.8.11.{origem:04d}"
+
+
+def gerar_nome(aleatorio: random.Random) -> str:
+    return f"{aleatorio.choice(NOMES)} {aleatorio.choice(SOBRENOMES)} {aleatorio.choice(SOBRENOMES)}"
+
+
+def gerar_paragrafo(aleatorio: random.Random, palavras: int) -> str:
+    frase = ' '.join(aleatorio.choice(VOCABULARIO) for _ in range(palavras))
+    return f"{frase[0].upper()}{frase[1:]}."
+
+
+def gerar_linhas_pagina(aleatorio: random.Random, numero: int, data: date, edicao: int,
+                        contador_atos: List[int]) -> List[str]:
+    """Linhas de uma página: cabeçalho e atos com números, nomes, CNPJs e processos"""
+    linhas = [f"DIÁRIO OFICIAL ELETRÔNICO - Página {numero}",
+              f"Cuiabá, {data.day:02d}/{data.month:02d}/{data.year} - Edição nº {edicao}", '']
+    while len(linhas) < LINHAS_POR_PAGINA:
+        contador_atos[0] += 1
+        tipo = aleatorio.choice(TIPOS_ATOS)
+        texto = (f"{gerar_paragrafo(aleatorio, aleatorio.randint(20, 90))} Nome: {gerar_nome(aleatorio)}, "
+                 f"CNPJ {gerar_cnpj(aleatorio)}, processo {gerar_processo(aleatorio, data.year)}. "
+                 f"{gerar_paragrafo(aleatorio, aleatorio.randint(10, 60))}")
+        linhas.append(f"{tipo} Nº {contador_atos[0]}/{data.year}")
+        while texto:
+            corte = texto.rfind(' ', 0, CARACTERES_POR_LINHA) if len(texto) > CARACTERES_POR_LINHA else len(texto)
+            corte = corte if corte > 0 else len(texto)
+            linhas.append(texto[:corte])
+            texto = texto[corte + 1:]
+        linhas.append('')
+    return linhas[:LINHAS_POR_PAGINA]
+
+
+def _texto_pdf(texto: str) -> bytes:
+    """String literal de PDF em WinAnsiEncoding"""
+    bruto = texto.encode('cp1252', errors='replace')
+    return b'(' + bruto.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+
+def gerar_pdf(caminho: Path, paginas: int, semente: int = 42, data: date = date(2025, 10, 10)) -> Path:
+    """
+    Gera um PDF de diário com o número de páginas pedido
+
+    Cada página tem cerca de 4.500 caracteres (como as do IOMAT) num fluxo de
+    conteúdo comprimido com FlateDecode, em Helvetica (fonte padrão, sem
+    fontes embutidas).
+
+    Args:
+        caminho: Arquivo de saída
+        paginas: Número de páginas
+        semente: Semente do sorteio do texto
+        data: Data da edição (também usada nos metadados)
+
+    Returns:
+        Path: Caminho do PDF
+    """
+    aleatorio = random.Random(semente)
+    edicao = 10000 + semente
+    contador_atos = [0]
+    objetos: Dict[int, bytes] = {
+        3: b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>',
+        4: (b'<< /Title ' + _texto_pdf(f"Diário Oficial Eletrônico - Edição {edicao}")
+            + b' /Producer (gerador_sintetico) /CreationDate '
+            + _texto_pdf(f"D:{data:%Y%m%d}120000-04'00'") + b' >>'),
+    }
+
+    kids = []
+    for numero in range(1, paginas + 1):
+        linhas = gerar_linhas_pagina(aleatorio, numero, data, edicao, contador_atos)
+        conteudo = [b'BT /F1 9 Tf 11 TL 40 800 Td']
+        conteudo.extend(_texto_pdf(linha) + b' Tj T*' for linha in linhas)
+        conteudo.append(b'ET')
+        fluxo = zlib.compress(b'\n'.join(conteudo), 6)
+
+        id_pagina, id_conteudo = 3 + 2 * numero, 4 + 2 * numero
+        objetos[id_conteudo] = (b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(fluxo)
+                                + fluxo + b'\nendstream')
+        objetos[id_pagina] = (b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+                              b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % id_conteudo)
+        kids.append(b'%d 0 R' % id_pagina)
+
+    objetos[1] = b'<< /Type /Catalog /Pages 2 0 R >>'
+    objetos[2] = b'<< /Type /Pages /Kids [' + b' '.join(kids) + b'] /Count %d >>' % paginas
+
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    saida = bytearray(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+    offsets = {}
+    for id_objeto in sorted(objetos):
+        offsets[id_objeto] = len(saida)
+        saida += b'%d 0 obj\n' % id_objeto + objetos[id_objeto] + b'\nendobj\n'
+
+    inicio_xref = len(saida)
+    total = max(objetos) + 1
+    saida += b'xref\n0 %d\n0000000000 65535 f \n' % total
+    for id_objeto in range(1, total):
+        saida += b'%010d 00000 n \n' % offsets[id_objeto]
+    saida += b'trailer\n<< /Size %d /Root 1 0 R /Info 4 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (total, inicio_xref)
+
+    caminho.write_bytes(bytes(saida))
+    return caminho
+
+
+def nome_pdf(paginas: int, semente: int = 42, data: date = date(2025, 10, 10)) -> str:
+    """Nome do PDF sintético (com a data no formato que inferir_data reconhece)"""
+    return f"diario_sintetico_{data.isoformat()}_{paginas}p_s{semente}.pdf"
+
+
+def gerar_conteudos(edicoes: int, paginas_por_edicao: int = 4, semente: int = 42) -> List[Dict]:
+    """
+    Conteúdos de edição no formato de CrawlerDiarioMPMT.processar_edicao
+    (entrada de buscar_termo)
+    """
+    aleatorio = random.Random(semente)
+    inicio = date(2025, 1, 2)
+    conteudos = []
+    for i in range(edicoes):
+        data = inicio + timedelta(days=i)
+        contador_atos = [0]
+        linhas = []
+        for numero in range(1, paginas_por_edicao + 1):
+            linhas.extend(gerar_linhas_pagina(aleatorio, numero, data, 5000 + i, contador_atos))
+        conteudos.append({
+            'url': f"https://www.mpmt.mp.br/diario-oficial/edicao-{5000 + i}/",
+            'titulo': f"Diário Oficial Eletrônico Nº {5000 + i} - {data:%d/%m/%Y}",
+            'data_publicacao': f"{data:%d/%m/%Y}",
+            'numero_edicao': str(5000 + i),
+            'texto_completo': '\n'.join(linhas),
+            'secoes': [],
+        })
+    return conteudos
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gera diários sintéticos (PDF e HTML) para os benchmarks')
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+
+    pdf = subcomandos.add_parser('pdf', help='PDFs de diário')
+    pdf.add_argument('diretorio', help='Diretório de saída')
+    pdf.add_argument('--paginas', nargs='+', type=int, default=[10, 200], help='Páginas de cada PDF')
+    pdf.add_argument('--semente', type=int, default=42)
+
+    listagem = subcomandos.add_parser('listagem', help='Página de listagem de edições')
+    listagem.add_argument('arquivo', help='Arquivo HTML de saída')
+    listagem.add_argument('--edicoes', type=int, default=3000, help='Edições (cerca de 1,5 link por edição)')
+    listagem.add_argument('--semente', type=int, default=42)
+
+    edicao = subcomandos.add_parser('edicao', help='Página de uma edição')
+    edicao.add_argument('arquivo', help='Arquivo HTML de saída')
+    edicao.add_argument('--atos', type=int, default=400)
+    edicao.add_argument('--semente', type=int, default=7)
+
+    args = parser.parse_args()
+
+    if args.comando == 'pdf':
+        for paginas in args.paginas:
+            caminho = gerar_pdf(Path(args.diretorio) / nome_pdf(paginas, args.semente), paginas, args.semente)
+            print(f"{caminho} ({caminho.stat().st_size / 1024:.0f} KB)")
+        return
+
+    html = gerar_listagem(args.edicoes, args.semente) if args.comando == 'listagem' \
+        else gerar_pagina_edicao(args.atos, semente=args.semente)
+    Path(args.arquivo).parent.mkdir(parents=True, exist_ok=True)
+    Path(args.arquivo).write_text(html, encoding='utf-8')
+    print(f"{args.arquivo} ({len(html) / 1024:.0f} KB)")
+
+
+if __name__ == '__main__':
+    main()
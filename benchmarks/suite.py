@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+Suíte de benchmarks reprodutível, totalmente offline
+
+Gera diários sintéticos (gerador_sintetico.py) nos tamanhos pedidos e mede:
+
+    extracao/<N>p     PDFExtractor.processar_pdf num PDF de N páginas
+    links/<N>         CrawlerDiarioMPMT.extrair_links_edicoes numa listagem com ~N links
+    edicao/<N>atos    parsear_conteudo_edicao numa página de edição com N atos
+    busca/<N>ed       CrawlerDiarioMPMT.buscar_termo (substring) sobre N edições
+    bm25/<N>ed        CrawlerDiarioMPMT.buscar_termo_ranqueado sobre N edições
+
+Cada caso é repetido e o resultado (mediana, mínimo, máximo e vazão) é
+gravado em JSON, com o ambiente e o commit, para comparar execuções. Com
+--comparar, a suíte termina com código 1 se algum caso ficar mais lento que a
+base além do limite.
+
+Uso:
+    python benchmarks/suite.py
+    python benchmarks/suite.py --paginas 10 200 2000 --links 500 5000 --saida base.json
+    python benchmarks/suite.py --comparar base.json --limite 0.10
+"""
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from cache_http import CacheHTTP  # noqa: E402
+from crawler import CrawlerDiarioMPMT, parsear_conteudo_edicao  # noqa: E402
+from extract_data import PDFExtractor  # noqa: E402
+from gerador_sintetico import gerar_conteudos, gerar_listagem, gerar_pagina_edicao, gerar_pdf, nome_pdf  # noqa: E402
+
+VERSAO_RESULTADOS = 1
+TERMOS_BUSCA = ['licitação', 'pregão eletrônico', 'exoneração', 'aposentadoria servidor', 'cuiabá']
+# Links por edição na listagem sintética (links de edição, repetidos e institucionais)
+LINKS_POR_EDICAO = 1.68
+
+
+def medir(funcao: Callable[[], object], repeticoes: int, orcamento: float) -> Dict:
+    """
+    Mede uma função repetidas vezes
+
+    A primeira execução serve de aquecimento (caches de importação, de
+    regexes e do sistema de arquivos) quando leva menos de 1 s; casos mais
+    longos não são repetidos além do orçamento de tempo.
+
+    Args:
+        funcao: Função sem argumentos
+        repeticoes: Número máximo de medições
+        orcamento: Segundos a partir dos quais não se inicia outra medição
+
+    Returns:
+        Dict: mediana, mínimo e máximo (segundos) e o número de medições
+    """
+    tempos = []
+    inicio = time.perf_counter()
+    funcao()
+    primeira = time.perf_counter() - inicio
+    if primeira >= 1.0:
+        tempos.append(primeira)
+
+    while len(tempos) < repeticoes and (not tempos or sum(tempos) < orcamento):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+
+    return {
+        'mediana_s': round(statistics.median(tempos), 6),
+        'minimo_s': round(min(tempos), 6),
+        'maximo_s': round(max(tempos), 6),
+        'repeticoes': len(tempos),
+    }
+
+
+def ambiente() -> Dict:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ, capture_output=True,
+                                text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'processador': platform.processor() or platform.machine(),
+        'commit': commit,
+    }
+
+
+def executar_suite(args, diretorio: Path) -> Dict:
+    """Gera os dados sintéticos que faltam e mede cada caso"""
+    casos: Dict[str, Dict] = {}
+
+    def registrar(nome: str, funcao: Callable[[], object], unidades: int, unidade: str):
+        resultado = medir(funcao, args.repeticoes, args.orcamento)
+        resultado.update({'unidades': unidades, 'unidade': unidade,
+                          'por_segundo': round(unidades / resultado['mediana_s'], 2)})
+        casos[nome] = resultado
+        print(f"  {nome:<22} {resultado['mediana_s'] * 1000:10.1f} ms  "
+              f"{resultado['por_segundo']:12,.0f} {unidade}/s  ({resultado['repeticoes']}x)")
+
+    extrator = PDFExtractor(output_dir=str(diretorio / 'json_data'), backend=args.backend)
+    for paginas in args.paginas:
+        caminho = diretorio / nome_pdf(paginas, args.semente)
+        if not caminho.exists():
+            gerar_pdf(caminho, paginas, args.semente)
+        registrar(f"extracao/{paginas}p", lambda caminho=caminho: extrator.processar_pdf(caminho),
+                  paginas, 'páginas')
+
+    crawler = CrawlerDiarioMPMT(cache=CacheHTTP(str(diretorio / 'cache_http'), offline=True))
+    try:
+        for links in args.links:
+            html = gerar_listagem(max(1, round(links / LINKS_POR_EDICAO)), args.semente)
+
+            def extrair_links(html=html):
+                crawler._html_atual = html
+                return crawler.extrair_links_edicoes()
+
+            registrar(f"links/{links}", extrair_links, html.count('<a '), 'links')
+
+        for atos in args.atos:
+            html = gerar_pagina_edicao(atos, semente=args.semente)
+            registrar(f"edicao/{atos}atos",
+                      lambda html=html: parsear_conteudo_edicao(html, 'https://www.mpmt.mp.br/diario-oficial/'),
+                      atos, 'atos')
+
+        for edicoes in args.edicoes:
+            conteudos = gerar_conteudos(edicoes, semente=args.semente)
+            registrar(f"busca/{edicoes}ed",
+                      lambda conteudos=conteudos: [crawler.buscar_termo(conteudos, termo) for termo in TERMOS_BUSCA],
+                      edicoes * len(TERMOS_BUSCA), 'edições')
+            registrar(f"bm25/{edicoes}ed",
+                      lambda conteudos=conteudos: [crawler.buscar_termo_ranqueado(conteudos, termo)
+                                                   for termo in TERMOS_BUSCA],
+                      edicoes * len(TERMOS_BUSCA), 'edições')
+    finally:
+        crawler.fechar()
+
+    return casos
+
+
+def comparar(atual: Dict, base: Dict, limite: float) -> List[str]:
+    """
+    Compara as medianas de cada caso presente nas duas execuções
+
+    Returns:
+        List[str]: Casos que ficaram mais lentos que a base além do limite
+    """
+    regressoes = []
+    print(f"\nComparação com {base.get('inicio', '?')} (commit {base.get('ambiente', {}).get('commit') or '?'}), "
+          f"limite de {limite:.0%}:")
+    for nome, caso in atual['casos'].items():
+        referencia = base.get('casos', {}).get(nome)
+        if referencia is None:
+            print(f"  {nome:<22} (novo)")
+            continue
+        variacao = caso['mediana_s'] / referencia['mediana_s'] - 1
+        regressao = variacao > limite
+        if regressao:
+            regressoes.append(nome)
+        print(f"  {nome:<22} {referencia['mediana_s'] * 1000:10.1f} -> {caso['mediana_s'] * 1000:10.1f} ms "
+              f"({variacao:+.1%}){'  ❌ REGRESSÃO' if regressao else ''}")
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Suíte de benchmarks offline com diários sintéticos')
+    parser.add_argument('--paginas', nargs='+', type=int, default=[10, 200],
+                        help='Tamanhos dos PDFs sintéticos (padrão: 10 200; até 2000)')
+    parser.add_argument('--links', nargs='+', type=int, default=[500, 5000],
+                        help='Links nas listagens sintéticas (padrão: 500 5000)')
+    parser.add_argument('--atos', nargs='+', type=int, default=[100, 400],
+                        help='Atos nas páginas de edição sintéticas (padrão: 100 400)')
+    parser.add_argument('--edicoes', nargs='+', type=int, default=[50, 200],
+                        help='Edições (de 4 páginas) pesquisadas com buscar_termo e com BM25 (padrão: 50 200)')
+    parser.add_argument('--repeticoes', type=int, default=5, help='Medições por caso (padrão: 5)')
+    parser.add_argument('--orcamento', type=float, default=20,
+                        help='Segundos por caso a partir dos quais não há nova medição (padrão: 20)')
+    parser.add_argument('--backend', default='pypdf2', help='Backend de extração de texto (ver backends_pdf.py)')
+    parser.add_argument('--semente', type=int, default=42, help='Semente dos dados sintéticos')
+    parser.add_argument('--dados', default=None,
+                        help='Diretório dos dados sintéticos, reaproveitados entre execuções (padrão: temporário)')
+    parser.add_argument('--saida', default=None,
+                        help='JSON de resultados (padrão: benchmarks/resultados/<data>_<commit>.json)')
+    parser.add_argument('--comparar', default=None, help='JSON de uma execução anterior usado como base')
+    parser.add_argument('--limite', type=float, default=0.10,
+                        help='Aumento máximo da mediana em relação à base (padrão: 0.10 = 10%%)')
+    args = parser.parse_args()
+
+    # Os logs por PDF e por edição atrapalham a leitura e também custam tempo
+    logging.getLogger().setLevel(logging.WARNING)
+
+    base: Optional[Dict] = None
+    if args.comparar:
+        with open(args.comparar, 'r', encoding='utf-8') as f:
+            base = json.load(f)
+
+    resultados = {
+        'versao': VERSAO_RESULTADOS,
+        'inicio': datetime.now().isoformat(timespec='seconds'),
+        'ambiente': ambiente(),
+        'parametros': {chave: valor for chave, valor in vars(args).items()
+                       if chave not in ('saida', 'comparar', 'dados')},
+    }
+    print(f"Python {resultados['ambiente']['python']} - commit {resultados['ambiente']['commit'] or '?'}\n")
+
+    if args.dados:
+        Path(args.dados).mkdir(parents=True, exist_ok=True)
+        resultados['casos'] = executar_suite(args, Path(args.dados))
+    else:
+        with tempfile.TemporaryDirectory(prefix='suite_') as diretorio:
+            resultados['casos'] = executar_suite(args, Path(diretorio))
+
+    saida = Path(args.saida) if args.saida else \
+        RAIZ / 'benchmarks' / 'resultados' / \
+        f"{datetime.now():%Y%m%d_%H%M%S}_{resultados['ambiente']['commit'] or 'sem_commit'}.json"
+    saida.parent.mkdir(parents=True, exist_ok=True)
+    with open(saida, 'w', encoding='utf-8') as f:
+        json.dump(resultados, f, ensure_ascii=False, indent=2)
+    print(f"\nResultados em {saida}")
+
+    if base is not None and comparar(resultados, base, args.limite):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,534 @@
+# -*- coding: utf-8 -*-
+"""
+Detecção e remoção de cabeçalhos, rodapés e outros trechos repetidos
+(boilerplate) das páginas extraídas pelo PDFExtractor
+
+Os modelos são aprendidos de duas formas:
+
+    - no próprio documento: linhas que se repetem no topo ou na base de boa
+      parte das páginas ("Disponibilizado 10/10/2025 Diário da Justiça
+      Eletrônico - MT - Ed. nº 12047", "Ano 2025 - N.: 1524 (03/10/2025)",
+      "3 de 11") e prefixos/sufixos repetidos da primeira e da última linha
+      (o cabeçalho do DJE vem colado ao texto: "... nº 12047 3Videoconferência");
+    - entre edições da mesma pasta de origem: linhas que aparecem na maioria
+      dos documentos recentes (a lista de secretários da primeira página do
+      IOMAT), guardadas em <diretorio_dados>/_boilerplate/<pasta>.json
+
+Números de até 4 dígitos (páginas, datas, edições do DOE) são normalizados
+para '#'; números maiores (protocolos, edições do DJE) continuam literais,
+então linhas com identificadores próprios de cada ato não viram modelo.
+
+Só são removidas as sequências de linhas-modelo do início e do fim de cada
+página (tolerando uma linha intercalada), nunca linhas no meio do texto. O
+texto removido fica no campo 'boilerplate' da página, com a posição no texto
+original, e texto_original() reconstrói a página como foi extraída.
+
+Uso:
+    python boilerplate.py aprender --pastas dje doe iomat
+    python boilerplate.py mostrar iomat
+    python boilerplate.py testar json_data/dje/dje_0.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+NOME_DIRETORIO = '_boilerplate'
+VERSAO_MODELOS = 1
+
+# Linhas não vazias do topo e da base de cada página observadas no aprendizado
+LINHAS_ZONA = 5
+# Fração (e número mínimo) de páginas do documento em que a linha deve aparecer
+FRACAO_PAGINAS = 0.4
+MIN_PAGINAS = 3
+# Fração do peso dos documentos recentes da pasta (e número mínimo de documentos)
+FRACAO_DOCUMENTOS = 0.5
+MIN_DOCUMENTOS = 3
+# A cada documento os pesos anteriores são multiplicados pelo decaimento, para
+# que o modelo acompanhe mudanças no layout (um secretário novo, por exemplo)
+DECAIMENTO = 0.8
+PESO_MINIMO = 0.05
+# Linhas que não são modelo toleradas entre duas linhas-modelo (ou antes da primeira)
+LINHAS_INTERCALADAS = 1
+# Prefixos e sufixos: primeiras/últimas linhas observadas e tamanho em tokens
+LINHAS_AFIXOS = 3
+MIN_TOKENS_AFIXO = 3
+MAX_TOKENS_AFIXO = 40
+MIN_PALAVRAS_AFIXO = 2
+MAX_DIGITOS_NORMALIZADOS = 4
+
+TIPOS_MODELO = ('linhas', 'prefixos', 'sufixos')
+
+# Sequências de dígitos, palavras ou um caractere de pontuação
+_PADRAO_TOKEN = re.compile(r'\d+|[^\W\d_]+|\S')
+_PADRAO_PALAVRA = re.compile(r'[^\W\d_]{2,}')
+
+
+def _tokens(linha: str) -> List[Tuple[str, int, int]]:
+    """Tokens normalizados da linha, com início e fim no texto"""
+    return [
+        ('#' if token.isdigit() and len(token) <= MAX_DIGITOS_NORMALIZADOS else token, m.start(), m.end())
+        for m in _PADRAO_TOKEN.finditer(linha)
+        for token in (m.group(),)
+    ]
+
+
+def _chave(tokens: List[Tuple[str, int, int]]) -> str:
+    return ' '.join(token for token, _, _ in tokens)
+
+
+def chave_linha(linha: str) -> str:
+    """
+    Chave normalizada de uma linha (a mesma para "Página 2 de 11" e "Página 3 de 11")
+
+    Args:
+        linha: Linha do texto de uma página
+
+    Returns:
+        str: Tokens normalizados separados por espaço
+    """
+    return _chave(_tokens(linha))
+
+
+def _linha_relevante(chave: str) -> bool:
+    """Linhas só com números ou pontuação ('1', 'º', ':') não viram modelo"""
+    return len(chave.replace(' ', '')) >= 4 and bool(_PADRAO_PALAVRA.search(chave))
+
+
+def _afixos(tokens: List[Tuple[str, int, int]], sufixos: bool = False) -> Iterable[str]:
+    """Chaves dos prefixos (ou sufixos) da linha com tamanho aceito"""
+    chaves = [token for token, _, _ in tokens]
+    if sufixos:
+        chaves.reverse()
+    palavras = 0
+    for tamanho, token in enumerate(chaves[:MAX_TOKENS_AFIXO], 1):
+        palavras += bool(_PADRAO_PALAVRA.fullmatch(token))
+        if tamanho >= MIN_TOKENS_AFIXO and palavras >= MIN_PALAVRAS_AFIXO:
+            yield ' '.join(reversed(chaves[:tamanho]) if sufixos else chaves[:tamanho])
+
+
+def _maximos(chaves: Set[str], sufixos: bool = False) -> Set[str]:
+    """Descarta as chaves que são prefixo (ou sufixo) de outra chave do conjunto"""
+    dominadas = set()
+    for chave in chaves:
+        tokens = chave.split(' ')
+        for tamanho in range(1, len(tokens)):
+            dominadas.add(' '.join(tokens[-tamanho:] if sufixos else tokens[:tamanho]))
+    return chaves - dominadas
+
+
+def modelo_vazio() -> Dict[str, Set[str]]:
+    return {tipo: set() for tipo in TIPOS_MODELO}
+
+
+def combinar_modelos(*modelos: Dict[str, Set[str]]) -> Dict[str, Set[str]]:
+    """União de modelos (o do documento e o da pasta, por exemplo)"""
+    return {tipo: set().union(*(modelo[tipo] for modelo in modelos)) for tipo in TIPOS_MODELO}
+
+
+class AnaliseDocumento:
+    """
+    Conta, página a página, as linhas do topo e da base e os prefixos e
+    sufixos das linhas das pontas, para montar o modelo do documento
+
+    Chaves que se repetem dentro de uma mesma página (linhas de tabela ou
+    listas que só diferem nos números) ou que aparecem no meio de alguma
+    página além da primeira ("PORTARIA Nº #/#") são conteúdo, não cabeçalho,
+    e nunca entram no modelo; o mesmo vale para prefixos e sufixos que
+    começam (ou terminam) como alguma linha do meio das páginas.
+    """
+
+    def __init__(self):
+        self.paginas = 0
+        self.linhas = Counter()
+        self.prefixos = Counter()
+        self.sufixos = Counter()
+        self.linhas_primeira_pagina: Set[str] = set()
+        self.descartadas: Set[str] = set()
+        # Primeiros e últimos MIN_TOKENS_AFIXO tokens das linhas do meio das páginas
+        self.pontas_meio: Set[Tuple[bool, str]] = set()
+
+    def adicionar_pagina(self, texto: str):
+        """Registra uma página (com o texto original, antes da remoção)"""
+        linhas = [linha for linha in texto.split('\n') if linha.strip()]
+        self.paginas += 1
+
+        chaves = [chave_linha(linha) for linha in linhas]
+        self.descartadas.update(chave for chave, quantidade in Counter(chaves).items() if quantidade > 1)
+        zona = chaves if len(chaves) <= 2 * LINHAS_ZONA else chaves[:LINHAS_ZONA] + chaves[-LINHAS_ZONA:]
+        if self.paginas > 1:
+            for chave in chaves[LINHAS_ZONA:-LINHAS_ZONA]:
+                self.descartadas.add(chave)
+                tokens = chave.split(' ')
+                self.pontas_meio.add((False, ' '.join(tokens[:MIN_TOKENS_AFIXO])))
+                self.pontas_meio.add((True, ' '.join(tokens[-MIN_TOKENS_AFIXO:])))
+        self.linhas.update({chave for chave in zona if _linha_relevante(chave)})
+        if self.paginas == 1:
+            self.linhas_primeira_pagina = {chave for chave in chaves if _linha_relevante(chave)}
+
+        for contagem, pontas, sufixos in ((self.prefixos, linhas[:LINHAS_AFIXOS], False),
+                                          (self.sufixos, linhas[-LINHAS_AFIXOS:], True)):
+            afixos = Counter(afixo for linha in pontas for afixo in set(_afixos(_tokens(linha), sufixos)))
+            self.descartadas.update(afixo for afixo, quantidade in afixos.items() if quantidade > 1)
+            contagem.update(afixos.keys())
+
+    def modelo(self, modelo_pasta: Optional[Dict[str, Set[str]]] = None) -> Dict[str, Set[str]]:
+        """
+        Modelo do documento: linhas, prefixos e sufixos repetidos em pelo
+        menos FRACAO_PAGINAS das páginas (e em MIN_PAGINAS páginas)
+
+        Args:
+            modelo_pasta: Se informado, o modelo da pasta de origem é somado
+                ao do documento (menos as chaves que são conteúdo neste documento)
+
+        Returns:
+            Dict: Conjuntos de chaves 'linhas', 'prefixos' e 'sufixos'
+        """
+        modelo = modelo_vazio()
+        if self.paginas >= MIN_PAGINAS:
+            minimo = max(MIN_PAGINAS, FRACAO_PAGINAS * self.paginas)
+
+            def frequentes(contagem: Counter, sufixos: Optional[bool] = None) -> Set[str]:
+                return {chave for chave, quantidade in contagem.items()
+                        if quantidade >= minimo and chave not in self.descartadas
+                        and (sufixos is None or (sufixos, self._ponta(chave, sufixos)) not in self.pontas_meio)}
+
+            modelo = {
+                'linhas': frequentes(self.linhas),
+                'prefixos': _maximos(frequentes(self.prefixos, False)),
+                'sufixos': _maximos(frequentes(self.sufixos, True), sufixos=True),
+            }
+
+        if modelo_pasta:
+            modelo = combinar_modelos(modelo, {
+                'linhas': modelo_pasta['linhas'] - self.descartadas,
+                'prefixos': {chave for chave in modelo_pasta['prefixos']
+                             if (False, self._ponta(chave, False)) not in self.pontas_meio},
+                'sufixos': {chave for chave in modelo_pasta['sufixos']
+                            if (True, self._ponta(chave, True)) not in self.pontas_meio},
+            })
+        return modelo
+
+    @staticmethod
+    def _ponta(chave: str, sufixo: bool) -> str:
+        tokens = chave.split(' ')
+        return ' '.join(tokens[-MIN_TOKENS_AFIXO:] if sufixo else tokens[:MIN_TOKENS_AFIXO])
+
+
+def _tamanho_afixo(tokens: List[Tuple[str, int, int]], chaves: Set[str], sufixo: bool = False) -> int:
+    """Tokens do maior prefixo (ou sufixo) da linha presente no modelo (0 se nenhum)"""
+    for tamanho in range(min(len(tokens), MAX_TOKENS_AFIXO), MIN_TOKENS_AFIXO - 1, -1):
+        if _chave(tokens[-tamanho:] if sufixo else tokens[:tamanho]) in chaves:
+            return tamanho
+    return 0
+
+
+def _fim_do_cabecalho(texto: str, modelo: Dict[str, Set[str]]) -> int:
+    """Posição em que termina o cabeçalho (0 se a página não começa com boilerplate)"""
+    fim, intercaladas, posicao = 0, 0, 0
+    for linha in texto.split('\n'):
+        inicio_linha, posicao = posicao, posicao + len(linha) + 1
+        if not linha.strip():
+            continue
+        tokens = _tokens(linha)
+        if _chave(tokens) in modelo['linhas']:
+            fim, intercaladas = min(posicao, len(texto)), 0
+            continue
+
+        tamanho = _tamanho_afixo(tokens, modelo['prefixos'])
+        if tamanho:
+            return inicio_linha + tokens[tamanho - 1][2]
+
+        # Uma linha com o sufixo do rodapé já é o fim da página
+        intercaladas += 1
+        if intercaladas > LINHAS_INTERCALADAS or _tamanho_afixo(tokens, modelo['sufixos'], sufixo=True):
+            break
+    return fim
+
+
+def _inicio_do_rodape(texto: str, modelo: Dict[str, Set[str]]) -> int:
+    """Posição em que começa o rodapé (len(texto) se a página não termina com boilerplate)"""
+    inicio, intercaladas, posicao = len(texto), 0, len(texto)
+    for linha in reversed(texto.split('\n')):
+        posicao -= len(linha)
+        inicio_linha = posicao
+        posicao -= 1
+        if not linha.strip():
+            continue
+        tokens = _tokens(linha)
+        if _chave(tokens) in modelo['linhas']:
+            inicio, intercaladas = inicio_linha, 0
+            continue
+
+        tamanho = _tamanho_afixo(tokens, modelo['sufixos'], sufixo=True)
+        if tamanho:
+            return inicio_linha + tokens[-tamanho][1]
+
+        intercaladas += 1
+        if intercaladas > LINHAS_INTERCALADAS or _tamanho_afixo(tokens, modelo['prefixos']):
+            break
+    return inicio
+
+
+def remover_boilerplate(texto: str, modelo: Dict[str, Set[str]]) -> Tuple[str, List[Dict]]:
+    """
+    Remove o cabeçalho e o rodapé de uma página segundo o modelo
+
+    Args:
+        texto: Texto original da página
+        modelo: Modelo do documento e/ou da pasta (ver AnaliseDocumento e ModelosBoilerplate)
+
+    Returns:
+        Tuple: (texto sem boilerplate, trechos removidos como
+            {'posicao': offset no texto original, 'texto': trecho})
+    """
+    if not texto or not any(modelo.values()):
+        return texto, []
+
+    fim = _fim_do_cabecalho(texto, modelo)
+    inicio = max(fim, _inicio_do_rodape(texto, modelo))
+
+    # Os espaços e quebras de linha em volta do texto mantido vão com os trechos removidos
+    if fim:
+        while fim < inicio and texto[fim].isspace():
+            fim += 1
+    if inicio < len(texto):
+        while inicio > fim and texto[inicio - 1].isspace():
+            inicio -= 1
+
+    trechos = []
+    if fim:
+        trechos.append({'posicao': 0, 'texto': texto[:fim]})
+    if inicio < len(texto):
+        trechos.append({'posicao': inicio, 'texto': texto[inicio:]})
+    return texto[fim:inicio], trechos
+
+
+def limpar_pagina(pagina: Dict, modelo: Dict[str, Set[str]]) -> int:
+    """
+    Remove o boilerplate de uma página (no formato dos JSONs de json_data) no lugar
+
+    O texto mantido substitui 'texto' (e as contagens), e os trechos
+    removidos vão para 'boilerplate'.
+
+    Returns:
+        int: Caracteres removidos
+    """
+    texto, trechos = remover_boilerplate(pagina.get('texto', ''), modelo)
+    if not trechos:
+        return 0
+
+    pagina['texto'] = texto
+    pagina['numero_caracteres'] = len(texto)
+    pagina['numero_palavras'] = len(texto.split()) if texto else 0
+    pagina['boilerplate'] = trechos
+    return sum(len(trecho['texto']) for trecho in trechos)
+
+
+def texto_original(pagina: Dict) -> str:
+    """
+    Texto da página como foi extraído do PDF, com o boilerplate removido
+
+    Args:
+        pagina: Página de um JSON de json_data
+
+    Returns:
+        str: Texto original (o próprio 'texto' se nada foi removido)
+    """
+    texto = pagina.get('texto', '')
+    partes, consumido, removidos = [], 0, 0
+    for trecho in pagina.get('boilerplate', ()):
+        fim_mantido = trecho['posicao'] - removidos
+        partes.append(texto[consumido:fim_mantido])
+        partes.append(trecho['texto'])
+        consumido = fim_mantido
+        removidos += len(trecho['texto'])
+    partes.append(texto[consumido:])
+    return ''.join(partes)
+
+
+class ModelosBoilerplate:
+    """
+    Modelos de boilerplate de cada pasta de origem, aprendidos entre edições
+
+    Cada pasta guarda, em <diretorio_dados>/_boilerplate/<pasta>.json, o
+    peso (com decaimento a cada documento) das linhas da primeira página e
+    dos modelos já detectados em cada documento.
+    """
+
+    def __init__(self, diretorio_dados: str = "json_data"):
+        """
+        Args:
+            diretorio_dados: Diretório dos JSON (o mesmo do extract_data.py)
+        """
+        self.diretorio = Path(diretorio_dados) / NOME_DIRETORIO
+        self._pastas: Dict[str, Dict] = {}
+        self._modelos: Dict[str, Dict[str, Set[str]]] = {}
+        self._alteradas: Set[str] = set()
+
+    def _arquivo(self, pasta: str) -> Path:
+        return self.diretorio / f"{pasta}.json"
+
+    def _dados_pasta(self, pasta: str) -> Dict:
+        """Pesos da pasta (lidos do disco na primeira vez)"""
+        if pasta not in self._pastas:
+            dados = None
+            arquivo = self._arquivo(pasta)
+            if arquivo.exists():
+                try:
+                    with open(arquivo, 'r', encoding='utf-8') as f:
+                        dados = json.load(f)
+                    if dados.get('versao') != VERSAO_MODELOS:
+                        dados = None
+                except Exception as e:
+                    logger.warning(f"Modelo de boilerplate inválido, será recriado: {arquivo} ({e})")
+                    dados = None
+            self._pastas[pasta] = dados or {'versao': VERSAO_MODELOS, 'documentos': 0, 'peso_total': 0.0,
+                                            **{tipo: {} for tipo in TIPOS_MODELO}}
+        return self._pastas[pasta]
+
+    def modelo(self, pasta: str) -> Dict[str, Set[str]]:
+        """
+        Modelo aprendido para a pasta de origem
+
+        Args:
+            pasta: Nome da pasta de origem ('dje', 'doe', 'iomat'...)
+
+        Returns:
+            Dict: Conjuntos de chaves 'linhas', 'prefixos' e 'sufixos' (vazios
+                enquanto a pasta tiver menos de MIN_DOCUMENTOS documentos)
+        """
+        if pasta not in self._modelos:
+            dados = self._dados_pasta(pasta)
+            if dados['documentos'] < MIN_DOCUMENTOS:
+                self._modelos[pasta] = modelo_vazio()
+            else:
+                minimo = FRACAO_DOCUMENTOS * dados['peso_total']
+                self._modelos[pasta] = {
+                    tipo: {chave for chave, peso in dados[tipo].items() if peso >= minimo}
+                    for tipo in TIPOS_MODELO
+                }
+        return self._modelos[pasta]
+
+    def registrar(self, pasta: str, analise: AnaliseDocumento):
+        """
+        Acrescenta um documento aos pesos da pasta
+
+        Args:
+            pasta: Nome da pasta de origem
+            analise: Análise do documento (com todas as páginas)
+        """
+        if not analise.paginas:
+            return
+        dados = self._dados_pasta(pasta)
+        modelo_documento = analise.modelo()
+        novos = {
+            'linhas': modelo_documento['linhas'] | (analise.linhas_primeira_pagina - analise.descartadas),
+            'prefixos': modelo_documento['prefixos'],
+            'sufixos': modelo_documento['sufixos'],
+        }
+
+        for tipo in TIPOS_MODELO:
+            pesos = dados[tipo]
+            for chave in list(pesos):
+                pesos[chave] *= DECAIMENTO
+                if pesos[chave] < PESO_MINIMO and chave not in novos[tipo]:
+                    del pesos[chave]
+            for chave in novos[tipo]:
+                pesos[chave] = pesos.get(chave, 0.0) + 1.0
+
+        dados['peso_total'] = dados['peso_total'] * DECAIMENTO + 1.0
+        dados['documentos'] += 1
+        self._modelos.pop(pasta, None)
+        self._alteradas.add(pasta)
+
+    def salvar(self):
+        """Grava os modelos das pastas alteradas (arquivo temporário + rename)"""
+        if not self._alteradas:
+            return
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        for pasta in sorted(self._alteradas):
+            arquivo = self._arquivo(pasta)
+            arquivo_temp = arquivo.with_suffix('.json.tmp')
+            with open(arquivo_temp, 'w', encoding='utf-8') as f:
+                json.dump(self._pastas[pasta], f, ensure_ascii=False, indent=1)
+            os.replace(arquivo_temp, arquivo)
+        self._alteradas.clear()
+
+
+def _paginas_json(caminho: Path) -> List[Dict]:
+    with open(caminho, 'r', encoding='utf-8') as f:
+        return json.load(f).get('paginas', [])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Modelos de cabeçalhos e rodapés repetidos (boilerplate)')
+    parser.add_argument('--dados', default='json_data', help='Diretório dos JSON (padrão: json_data)')
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+
+    aprender = subcomandos.add_parser('aprender', help='Recria os modelos das pastas a partir dos JSON existentes')
+    aprender.add_argument('--pastas', nargs='+', default=['dje', 'doe', 'iomat'])
+
+    mostrar = subcomandos.add_parser('mostrar', help='Lista o modelo de uma pasta')
+    mostrar.add_argument('pasta')
+
+    testar = subcomandos.add_parser('testar', help='Mostra o que seria removido de um JSON (sem alterá-lo)')
+    testar.add_argument('arquivo')
+    testar.add_argument('--paginas', type=int, default=3, help='Páginas exibidas (padrão: 3)')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    modelos = ModelosBoilerplate(args.dados)
+
+    if args.comando == 'aprender':
+        for pasta in args.pastas:
+            modelos._pastas.pop(pasta, None)
+            modelos._arquivo(pasta).unlink(missing_ok=True)
+            arquivos = sorted((Path(args.dados) / pasta).glob('*.json'))
+            for arquivo in arquivos:
+                analise = AnaliseDocumento()
+                for pagina in _paginas_json(arquivo):
+                    analise.adicionar_pagina(texto_original(pagina))
+                modelos.registrar(pasta, analise)
+            modelo = modelos.modelo(pasta)
+            logger.info(f"{pasta}: {len(arquivos)} documento(s), "
+                        + ', '.join(f"{len(modelo[tipo])} {tipo}" for tipo in TIPOS_MODELO))
+        modelos.salvar()
+
+    elif args.comando == 'mostrar':
+        dados = modelos._dados_pasta(args.pasta)
+        modelo = modelos.modelo(args.pasta)
+        print(f"{args.pasta}: {dados['documentos']} documento(s)")
+        for tipo in TIPOS_MODELO:
+            print(f"\n{tipo} ({len(modelo[tipo])}):")
+            for chave in sorted(modelo[tipo], key=lambda c: -dados[tipo][c]):
+                print(f"  {dados[tipo][chave]:5.2f}  {chave}")
+
+    else:
+        arquivo = Path(args.arquivo)
+        paginas = [dict(pagina, texto=texto_original(pagina)) for pagina in _paginas_json(arquivo)]
+        analise = AnaliseDocumento()
+        for pagina in paginas:
+            analise.adicionar_pagina(pagina['texto'])
+        modelo = analise.modelo(modelos.modelo(arquivo.parent.name))
+
+        total = sum(len(pagina['texto']) for pagina in paginas)
+        removidos = sum(limpar_pagina(pagina, modelo) for pagina in paginas)
+        print(f"{arquivo}: {removidos:,} de {total:,} caracteres removidos "
+              f"({removidos / total if total else 0:.1%}), "
+              f"{sum('boilerplate' in pagina for pagina in paginas)}/{len(paginas)} página(s)")
+        for pagina in paginas[:args.paginas]:
+            print(f"\n--- Página {pagina['numero_pagina']}")
+            for trecho in pagina.get('boilerplate', ()):
+                print(f"  [{trecho['posicao']}] {trecho['texto']!r}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+"""
+Cache HTTP persistente para o crawler
+Guarda respostas por URL (corpo comprimido + ETag/Last-Modified), faz
+requisições condicionais e permite reexecutar coletas sem acesso à rede
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+
+class ErroCacheOffline(LookupError):
+    """URL pedida no modo offline que não está no cache"""
+
+
+class CacheHTTP:
+    """
+    Cache de respostas HTTP em disco, indexado por URL, com despejo LRU
+
+    Cada corpo é gravado comprimido com zlib em <diretorio>/<hash[:2]>/<hash>.zz;
+    o arquivo indice.json guarda, na ordem LRU, os cabeçalhos de validação,
+    o tamanho e o horário de gravação de cada entrada.
+    """
+
+    def __init__(self, diretorio: str = "cache_http", tamanho_maximo_bytes: int = 512 * 1024 * 1024,
+                 offline: bool = False, timeout: int = 30):
+        """
+        Inicializa o cache
+
+        Args:
+            diretorio: Diretório do cache
+            tamanho_maximo_bytes: Tamanho máximo (comprimido) antes do despejo LRU
+            offline: Se True, nunca acessa a rede; URLs fora do cache geram ErroCacheOffline
+            timeout: Tempo máximo de cada requisição (segundos)
+        """
+        self.diretorio = Path(diretorio)
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        self.tamanho_maximo_bytes = tamanho_maximo_bytes
+        self.offline = offline
+        self.timeout = timeout
+
+        self.estatisticas = {'acertos': 0, 'revalidados': 0, 'faltas': 0, 'despejos': 0, 'erros': 0}
+        self._lock = threading.RLock()
+        self._alteracoes_pendentes = 0
+        self._carregar_indice()
+
+    # ------------------------------------------------------------------
+    # Armazenamento
+    # ------------------------------------------------------------------
+
+    def _carregar_indice(self):
+        arquivo = self.diretorio / 'indice.json'
+        self.entradas: 'OrderedDict[str, Dict]' = OrderedDict()
+
+        if arquivo.exists():
+            try:
+                with open(arquivo, 'r', encoding='utf-8') as f:
+                    self.entradas = OrderedDict(json.load(f))
+            except Exception as e:
+                logger.warning(f"Índice do cache inválido, o cache será recriado: {e}")
+
+        self.tamanho_total = sum(entrada['tamanho'] for entrada in self.entradas.values())
+
+    def salvar(self):
+        """Grava o índice do cache"""
+        with self._lock:
+            arquivo = self.diretorio / 'indice.json'
+            arquivo_temp = arquivo.with_suffix('.tmp')
+            with open(arquivo_temp, 'w', encoding='utf-8') as f:
+                json.dump(self.entradas, f, ensure_ascii=False)
+            os.replace(arquivo_temp, arquivo)
+            self._alteracoes_pendentes = 0
+
+    def _contar(self, evento: str):
+        with self._lock:
+            self.estatisticas[evento] += 1
+
+    @staticmethod
+    def _chave(url: str) -> str:
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _caminho(self, chave: str) -> Path:
+        return self.diretorio / chave[:2] / f"{chave}.zz"
+
+    def _ler_corpo(self, chave: str) -> Optional[bytes]:
+        try:
+            with open(self._caminho(chave), 'rb') as f:
+                return zlib.decompress(f.read())
+        except (OSError, zlib.error) as e:
+            logger.warning(f"Entrada do cache ilegível, descartada: {e}")
+            self._remover(chave)
+            return None
+
+    def _remover(self, chave: str):
+        entrada = self.entradas.pop(chave, None)
+        if entrada:
+            self.tamanho_total -= entrada['tamanho']
+            try:
+                self._caminho(chave).unlink()
+            except FileNotFoundError:
+                pass
+
+    def _despejar(self):
+        """Remove as entradas menos usadas até o cache caber no limite"""
+        while self.tamanho_total > self.tamanho_maximo_bytes and len(self.entradas) > 1:
+            chave = next(iter(self.entradas))
+            self._remover(chave)
+            self.estatisticas['despejos'] += 1
+
+    def armazenar(self, url: str, corpo: bytes, etag: Optional[str] = None,
+                  last_modified: Optional[str] = None, content_type: Optional[str] = None):
+        """
+        Grava uma resposta no cache (também usado para HTML renderizado pelo navegador)
+
+        Args:
+            url: URL da resposta
+            corpo: Corpo já descomprimido
+            etag: Cabeçalho ETag recebido
+            last_modified: Cabeçalho Last-Modified recebido
+            content_type: Cabeçalho Content-Type recebido
+        """
+        chave = self._chave(url)
+        comprimido = zlib.compress(corpo, 6)
+        caminho = self._caminho(chave)
+        caminho.parent.mkdir(exist_ok=True)
+
+        with self._lock:
+            self._remover(chave)
+            with open(caminho, 'wb') as f:
+                f.write(comprimido)
+
+            self.entradas[chave] = {
+                'url': url,
+                'etag': etag,
+                'last_modified': last_modified,
+                'content_type': content_type,
+                'tamanho': len(comprimido),
+                'gravado_em': time.time()
+            }
+            self.tamanho_total += len(comprimido)
+            self._despejar()
+
+            self._alteracoes_pendentes += 1
+            if self._alteracoes_pendentes >= 50:
+                self.salvar()
+
+    def consultar(self, url: str) -> Optional[bytes]:
+        """Retorna o corpo em cache de uma URL, sem acessar a rede (None se ausente)"""
+        chave = self._chave(url)
+        with self._lock:
+            corpo = None
+            if chave in self.entradas:
+                self.entradas.move_to_end(chave)
+                corpo = self._ler_corpo(chave)
+
+        self._contar('acertos' if corpo is not None else 'faltas')
+        return corpo
+
+    # ------------------------------------------------------------------
+    # Requisições
+    # ------------------------------------------------------------------
+
+    def _esta_fresca(self, entrada: Optional[Dict], max_idade: Optional[float]) -> bool:
+        if not entrada:
+            return False
+        if self.offline:
+            return True
+        return max_idade is not None and time.time() - entrada['gravado_em'] < max_idade
+
+    def fresca(self, url: str, max_idade: Optional[float] = None) -> bool:
+        """Indica se obter(url, max_idade) seria atendido sem acessar a rede"""
+        with self._lock:
+            return self._esta_fresca(self.entradas.get(self._chave(url)), max_idade)
+
+    def obter(self, url: str, max_idade: Optional[float] = None) -> bytes:
+        """
+        Obtém o corpo de uma URL, usando o cache sempre que possível
+
+        Args:
+            url: URL desejada
+            max_idade: Se informado, entradas gravadas há menos de max_idade
+                segundos são usadas sem nenhuma requisição; caso contrário a
+                entrada é revalidada com If-None-Match/If-Modified-Since
+
+        Returns:
+            bytes: Corpo da resposta (descomprimido)
+
+        Raises:
+            ErroCacheOffline: No modo offline, se a URL não estiver no cache
+            urllib.error.URLError: Em erros de rede ou HTTP
+        """
+        chave = self._chave(url)
+
+        with self._lock:
+            entrada = self.entradas.get(chave)
+            if entrada:
+                self.entradas.move_to_end(chave)
+            corpo = self._ler_corpo(chave) if self._esta_fresca(entrada, max_idade) else None
+
+        if corpo is not None:
+            self._contar('acertos')
+            return corpo
+
+        if self.offline:
+            self._contar('faltas')
+            raise ErroCacheOffline(url)
+
+        cabecalhos = {'User-Agent': USER_AGENT, 'Accept-Encoding': 'gzip'}
+        if entrada and entrada.get('etag'):
+            cabecalhos['If-None-Match'] = entrada['etag']
+        if entrada and entrada.get('last_modified'):
+            cabecalhos['If-Modified-Since'] = entrada['last_modified']
+
+        try:
+            requisicao = urllib.request.Request(url, headers=cabecalhos)
+            with urllib.request.urlopen(requisicao, timeout=self.timeout) as resposta:
+                corpo = resposta.read()
+                if resposta.headers.get('Content-Encoding') == 'gzip':
+                    corpo = gzip.decompress(corpo)
+                self.armazenar(url, corpo,
+                               etag=resposta.headers.get('ETag'),
+                               last_modified=resposta.headers.get('Last-Modified'),
+                               content_type=resposta.headers.get('Content-Type'))
+                self._contar('faltas')
+                return corpo
+
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and entrada:
+                with self._lock:
+                    entrada['gravado_em'] = time.time()
+                    corpo = self._ler_corpo(chave)
+                if corpo is not None:
+                    self._contar('revalidados')
+                    return corpo
+            self._contar('erros')
+            raise
+        except urllib.error.URLError:
+            self._contar('erros')
+            raise
+
+    def obter_texto(self, url: str, max_idade: Optional[float] = None) -> str:
+        """Como obter(), decodificando o corpo com o charset registrado (UTF-8 por padrão)"""
+        corpo = self.obter(url, max_idade)
+        entrada = self.entradas.get(self._chave(url)) or {}
+        charset = 'utf-8'
+        for parte in (entrada.get('content_type') or '').split(';'):
+            if parte.strip().lower().startswith('charset='):
+                charset = parte.split('=', 1)[1].strip()
+        return corpo.decode(charset, errors='replace')
+
+    def registrar_estatisticas(self):
+        """Registra no log os acertos e faltas da execução"""
+        e = self.estatisticas
+        logger.info(
+            f"Cache HTTP: {e['acertos']} acerto(s), {e['revalidados']} revalidado(s) (304), "
+            f"{e['faltas']} falta(s), {e['erros']} erro(s), {e['despejos']} despejo(s); "
+            f"{len(self.entradas)} entradas, {self.tamanho_total / 1024 / 1024:.1f} MB"
+        )
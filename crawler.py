@@ -10,15 +10,30 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from bs4 import BeautifulSoup
+from bs4.element import CData, NavigableString, Tag
+import asyncio
+import gzip
+import heapq
+import http.client
 import json
+import argparse
+import os
 import time
 import pandas as pd
 from datetime import datetime
 import re
 import logging
-from typing import List, Dict, Optional
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass, asdict
 from pathlib import Path
+from urllib.parse import urljoin, urlparse
+
+from cache_http import CacheHTTP, ErroCacheOffline, USER_AGENT
+from indice_busca import idf_bm25, montar_trechos, pontuacao_bm25, tokenizar
 
 
 # Configuração de logging
@@ -54,7 +69,6 @@ class ConteudoEdicao:
     data_publicacao: str
     ano: str
     tipo_documento: str
-    orgao: str = "Ministério Público do Estado de Mato Grosso"
 
     # Conteúdo estruturado
     sumario: List[str]
@@ -67,6 +81,7 @@ class ConteudoEdicao:
 
     # Metadados
     numero_paginas: int
+    orgao: str = "Ministério Público do Estado de Mato Grosso"
     tamanho_arquivo: Optional[str] = None
     link_download_pdf: Optional[str] = None
     texto_completo: str = ""
@@ -83,43 +98,808 @@ class ConteudoEdicao:
             self.data_extracao = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
 
+# Seletores que indicam que a listagem de edições foi renderizada
+SELETORES_LISTAGEM = [
+    'a[href*="doe"]',
+    'a[href*="diario"]',
+    'a[href*="edicao"]',
+    'a[href*="publicacao"]',
+    'a[href*="/wp-content/uploads"]',  # Links para PDFs
+    'a.edicao',
+    'a.publicacao',
+    '.lista-diarios a',
+    '.diario-item a',
+    'article a',
+]
+
+# Padrões pré-compilados usados na classificação dos links da listagem
+PADRAO_NUMERO_EDICAO = re.compile(r'(?:N[°º]|Edição|Ed\.?)\s*(\d+)', re.I)
+PADRAO_DATA_TITULO = re.compile(r'(\d{2})[/\-.](\d{2})[/\-.](\d{4})')
+PADRAO_ANO = re.compile(r'\b(20\d{2})\b')
+PADRAO_TEXTO_EDICAO = re.compile(r'(diário|edição|doe|\d{4})', re.I)
+PADRAO_URL_EXCLUIDA = re.compile(r'javascript:|mailto:|#|facebook\.com|twitter\.com|instagram\.com', re.I)
+
+TIPOS_DOCUMENTO = [(tipo, tipo.lower()) for tipo in
+                   ['Diário Oficial', 'DOE', 'Edição Especial', 'Suplemento', 'Extra']]
+
+# Equivalentes de SELETORES_LISTAGEM usados pelo classificador de passada única;
+# a posição de cada critério na lista completa é a prioridade do link
+TRECHOS_HREF_LISTAGEM = ['doe', 'diario', 'edicao', 'publicacao', '/wp-content/uploads']
+CLASSES_LINK_LISTAGEM = ['edicao', 'publicacao']
+CLASSES_CONTEINER_LISTAGEM = ['lista-diarios', 'diario-item']
+PRIORIDADE_TEXTO = len(SELETORES_LISTAGEM)
+
+
+def extrair_metadados_do_titulo(titulo: str) -> Dict[str, Optional[str]]:
+    """
+    Extrai metadados do título da edição
+
+    Args:
+        titulo: Título da edição
+
+    Returns:
+        Dict com numero_edicao, data_publicacao, ano, tipo_documento
+    """
+    metadados = {
+        'numero_edicao': None,
+        'data_publicacao': None,
+        'ano': None,
+        'tipo_documento': 'Diário Oficial'
+    }
+
+    # Extrai número da edição
+    match_numero = PADRAO_NUMERO_EDICAO.search(titulo)
+    if match_numero:
+        metadados['numero_edicao'] = match_numero.group(1)
+
+    # Extrai data (formatos: dd/mm/yyyy, dd-mm-yyyy, dd.mm.yyyy)
+    match_data = PADRAO_DATA_TITULO.search(titulo)
+    if match_data:
+        metadados['data_publicacao'] = f"{match_data.group(1)}/{match_data.group(2)}/{match_data.group(3)}"
+        metadados['ano'] = match_data.group(3)
+    else:
+        # Extrai ano se não encontrou na data
+        match_ano = PADRAO_ANO.search(titulo)
+        if match_ano:
+            metadados['ano'] = match_ano.group(1)
+
+    # Identifica tipo de documento
+    titulo_minusculo = titulo.lower()
+    for tipo, tipo_minusculo in TIPOS_DOCUMENTO:
+        if tipo_minusculo in titulo_minusculo:
+            metadados['tipo_documento'] = tipo
+            break
+
+    return metadados
+
+
+def _montar_url(href: str, base_url: str) -> str:
+    """Monta a URL absoluta de um link da listagem"""
+    if href.startswith('http'):
+        return href
+    if href.startswith('/'):
+        return f"{base_url}{href}"
+    return f"{base_url}/{href}"
+
+
+def _criar_edicao(texto: str, url: str, data_coleta: str) -> EdicaoInfo:
+    """Cria o EdicaoInfo de um link aceito, com os metadados do título"""
+    metadados = extrair_metadados_do_titulo(texto)
+    return EdicaoInfo(
+        titulo=texto,
+        url=url,
+        data_coleta=data_coleta,
+        numero_edicao=metadados['numero_edicao'],
+        data_publicacao=metadados['data_publicacao'],
+        ano=metadados['ano'],
+        tipo_documento=metadados['tipo_documento']
+    )
+
+
+def _prioridade_link(link, href: str) -> Optional[int]:
+    """
+    Retorna o índice do primeiro critério de SELETORES_LISTAGEM (ou da busca
+    por texto) atendido pelo link, ou None se nenhum for atendido
+    """
+    for i, trecho in enumerate(TRECHOS_HREF_LISTAGEM):
+        if trecho in href:
+            return i
+
+    prioridade = len(TRECHOS_HREF_LISTAGEM)
+    classes = link.get('class') or ()
+    for i, classe in enumerate(CLASSES_LINK_LISTAGEM):
+        if classe in classes:
+            return prioridade + i
+
+    # Contêineres (.lista-diarios a, .diario-item a, article a): uma subida pelos ancestrais
+    prioridade += len(CLASSES_LINK_LISTAGEM)
+    encontrados = set()
+    for pai in link.parents:
+        classes_pai = pai.get('class') or ()
+        for i, classe in enumerate(CLASSES_CONTEINER_LISTAGEM):
+            if classe in classes_pai:
+                encontrados.add(i)
+        if pai.name == 'article':
+            encontrados.add(len(CLASSES_CONTEINER_LISTAGEM))
+    if encontrados:
+        return prioridade + min(encontrados)
+
+    texto = link.string
+    if texto is not None and PADRAO_TEXTO_EDICAO.search(texto):
+        return PRIORIDADE_TEXTO
+    return None
+
+
+def classificar_links(soup: BeautifulSoup, base_url: str) -> List[EdicaoInfo]:
+    """
+    Classifica os links da listagem de edições em uma única passada
+
+    Produz o mesmo resultado que aplicar cada seletor de SELETORES_LISTAGEM e
+    depois a busca por texto, nessa ordem: cada link recebe a prioridade do
+    primeiro critério que atende e, entre links com a mesma URL, vence o de
+    menor prioridade (e, no empate, o que aparece antes na página).
+
+    Args:
+        soup: Página da listagem já parseada
+        base_url: URL base para links relativos
+
+    Returns:
+        Lista de objetos EdicaoInfo
+    """
+    candidatos = []
+    for posicao, link in enumerate(soup.find_all('a', href=True)):
+        href = link['href']
+        if not href:
+            continue
+
+        prioridade = _prioridade_link(link, href)
+        if prioridade is None:
+            continue
+
+        texto = link.get_text(strip=True)
+        if len(texto) < 3:
+            continue
+
+        url = _montar_url(href, base_url)
+        if PADRAO_URL_EXCLUIDA.search(url):
+            continue
+
+        candidatos.append((prioridade, posicao, texto, url))
+
+    candidatos.sort()
+
+    data_coleta = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    edicoes = []
+    links_encontrados = set()
+    for _, _, texto, url in candidatos:
+        if url in links_encontrados:
+            continue
+        links_encontrados.add(url)
+        edicoes.append(_criar_edicao(texto, url, data_coleta))
+        logger.debug(f"Edição encontrada: {texto[:50]}")
+
+    return edicoes
+
+
+# Seletores que indicam que o conteúdo de uma edição foi renderizado
+SELETORES_CONTEUDO_EDICAO = ['article', 'main', '.entry-content', '.conteudo', '.titulo', 'h1']
+
+# Recursos não carregados pelas sessões do navegador (imagens e fontes)
+URLS_BLOQUEADAS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+]
+
+
+def criar_driver(headless: bool = True, timeout: int = 30, bloquear_recursos: bool = False,
+                 estrategia_carregamento: str = 'normal') -> webdriver.Chrome:
+    """
+    Cria uma sessão do Chrome configurada para o crawler
+
+    Args:
+        headless: Se True, executa sem abrir o navegador
+        timeout: Tempo máximo de carregamento de página (segundos)
+        bloquear_recursos: Se True, não carrega imagens nem fontes
+        estrategia_carregamento: page_load_strategy do Selenium ('normal' ou 'eager')
+
+    Returns:
+        webdriver.Chrome: Sessão iniciada
+    """
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument('--headless=new')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+    chrome_options.add_argument('--window-size=1920,1080')
+    chrome_options.add_argument(f'user-agent={USER_AGENT}')
+
+    # Configurações adicionais para performance
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.page_load_strategy = estrategia_carregamento
+
+    if bloquear_recursos:
+        chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+        chrome_options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2
+        })
+
+    driver = webdriver.Chrome(options=chrome_options)
+    driver.set_page_load_timeout(timeout)
+
+    if bloquear_recursos:
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': URLS_BLOQUEADAS})
+        except WebDriverException as e:
+            logger.warning(f"Não foi possível bloquear fontes via CDP: {e}")
+
+    return driver
+
+
+def aguardar_pagina_pronta(driver, timeout: float, seletores: Optional[List[str]] = None,
+                           ociosidade: float = 0.5) -> bool:
+    """
+    Aguarda a página ficar pronta, sem pausas fixas
+
+    Espera document.readyState == 'complete' e, em seguida, que algum dos
+    seletores esteja presente ou que a rede fique ociosa (nenhum recurso novo
+    carregado durante `ociosidade` segundos).
+
+    Args:
+        driver: Sessão do WebDriver
+        timeout: Tempo máximo de espera (segundos)
+        seletores: Seletores CSS que indicam que o conteúdo foi renderizado
+        ociosidade: Intervalo sem novos recursos que caracteriza a rede ociosa
+
+    Returns:
+        bool: True se um seletor apareceu, False se a espera terminou pela rede ociosa
+    """
+    espera = WebDriverWait(driver, timeout, poll_frequency=0.1)
+    espera.until(lambda d: d.execute_script('return document.readyState') == 'complete')
+
+    seletor_css = ', '.join(seletores) if seletores else None
+    estado = {'recursos': -1, 'desde': time.monotonic()}
+
+    def pronta(d):
+        if seletor_css and d.find_elements(By.CSS_SELECTOR, seletor_css):
+            return 'seletor'
+
+        recursos = d.execute_script("return performance.getEntriesByType('resource').length")
+        agora = time.monotonic()
+        if recursos != estado['recursos']:
+            estado['recursos'], estado['desde'] = recursos, agora
+            return False
+        return 'rede' if agora - estado['desde'] >= ociosidade else False
+
+    return espera.until(pronta) == 'seletor'
+
+
+def _detectar_parser_html() -> str:
+    """Usa o parser em C (lxml) quando instalado; senão o html.parser da biblioteca padrão"""
+    try:
+        import lxml  # noqa: F401
+        return 'lxml'
+    except ImportError:
+        return 'html.parser'
+
+
+# Parser usado pelo BeautifulSoup quando nenhum é informado
+PARSER_HTML = _detectar_parser_html()
+
+# Elementos cujo texto forma as seções de uma edição
+TAGS_BLOCO_TEXTO = frozenset(['p', 'div', 'article', 'section'])
+
+# Mesmos tipos de texto considerados por get_text() (sem comentários, scripts etc.)
+TIPOS_TEXTO = (NavigableString, CData)
+
+
+def criar_soup(html: str, parser: Optional[str] = None) -> BeautifulSoup:
+    """
+    Parseia o HTML com o parser informado ou com PARSER_HTML
+
+    Args:
+        html: HTML da página
+        parser: 'lxml', 'html.parser', 'html5lib'... (None = PARSER_HTML)
+
+    Returns:
+        BeautifulSoup da página
+    """
+    return BeautifulSoup(html, parser or PARSER_HTML)
+
+
+def extrair_blocos_texto(raiz, tamanho_minimo: int = 30) -> Tuple[List[str], List[Dict[str, str]]]:
+    """
+    Extrai o texto dos blocos p/div/article/section visitando cada nó uma vez
+
+    O texto de cada bloco (igual ao de get_text(strip=True)) é a junção do
+    intervalo de trechos entre a abertura e o fechamento do bloco, sem
+    percorrer de novo os blocos aninhados. Nas seções, cada trecho pertence
+    só ao bloco mais interno que o contém, então nenhum texto se repete.
+    Textos curtos (títulos de atos, datas, assinaturas) não são descartados:
+    juntam-se, separados por quebra de linha, ao texto dos blocos seguintes
+    até a seção passar do tamanho mínimo; os que sobram no fim de um bloco
+    vão para a última seção aberta dentro dele.
+
+    Args:
+        raiz: BeautifulSoup ou Tag a percorrer
+        tamanho_minimo: Textos e seções com até este número de caracteres
+            são ignorados (textos) ou juntados aos seguintes (seções)
+
+    Returns:
+        Tuple (textos, secoes): textos de todos os blocos, aninhados inclusive,
+        na ordem do documento; e seções sem repetição, na ordem de leitura
+    """
+    trechos = []
+    blocos = []  # [inicio, fim] do intervalo de trechos de cada bloco
+    abertos = []  # (nome, trechos próprios ainda não emitidos, seções antes do bloco) dos blocos abertos
+    secoes = []
+    pendentes = []  # (nome, texto próprio) de blocos ainda curtos demais para uma seção
+
+    def emitir_secao():
+        nome, proprios, _ = abertos[-1]
+        if not proprios:
+            return
+        pendentes.append((nome, ''.join(proprios)))
+        proprios.clear()
+        texto = '\n'.join(texto for _, texto in pendentes)
+        if len(texto) > tamanho_minimo:
+            # A seção leva o tipo do bloco em que começou
+            secoes.append({'tipo': pendentes[0][0], 'texto': texto})
+            pendentes.clear()
+
+    pilha = [(None, iter(raiz.contents))]
+    while pilha:
+        bloco, filhos = pilha[-1]
+        filho = next(filhos, None)
+
+        if filho is None:
+            pilha.pop()
+            if bloco is not None:
+                blocos[bloco][1] = len(trechos)
+                emitir_secao()
+                _, _, secoes_antes = abertos.pop()
+                if pendentes and len(secoes) > secoes_antes:
+                    secoes[-1]['texto'] += '\n' + '\n'.join(texto for _, texto in pendentes)
+                    pendentes.clear()
+
+        elif isinstance(filho, Tag):
+            if filho.name in TAGS_BLOCO_TEXTO:
+                if abertos:
+                    emitir_secao()
+                blocos.append([len(trechos), None])
+                abertos.append((filho.name, [], len(secoes)))
+                pilha.append((len(blocos) - 1, iter(filho.contents)))
+            else:
+                pilha.append((None, iter(filho.contents)))
+
+        elif type(filho) in TIPOS_TEXTO:
+            trecho = filho.strip()
+            if trecho:
+                trechos.append(trecho)
+                if abertos:
+                    abertos[-1][1].append(trecho)
+
+    # O que sobrou curto no fim vai para a última seção
+    if pendentes:
+        restante = '\n'.join(texto for _, texto in pendentes)
+        if secoes:
+            secoes[-1]['texto'] += '\n' + restante
+        else:
+            secoes.append({'tipo': pendentes[0][0], 'texto': restante})
+
+    textos = []
+    for inicio, fim in blocos:
+        texto = ''.join(trechos[inicio:fim])
+        if len(texto) > tamanho_minimo:
+            textos.append(texto)
+
+    return textos, secoes
+
+
+def parsear_conteudo_edicao(html: str, url: str, parser: Optional[str] = None) -> Dict:
+    """
+    Extrai o conteúdo de uma edição a partir do HTML da página
+
+    Usado tanto pelo caminho Selenium quanto pela coleta HTTP assíncrona.
+
+    Args:
+        html: HTML da página da edição
+        url: URL da edição
+        parser: Parser do BeautifulSoup (None = PARSER_HTML)
+
+    Returns:
+        Dict com url, titulo, data_publicacao, numero_edicao, texto_completo,
+        secoes e link_download_pdf
+    """
+    soup = criar_soup(html, parser)
+
+    conteudo = {
+        'url': url,
+        'titulo': '',
+        'data_publicacao': '',
+        'numero_edicao': '',
+        'texto_completo': '',
+        'secoes': [],
+        'link_download_pdf': None
+    }
+
+    # Link do PDF da edição
+    for link in soup.find_all('a', href=True):
+        if '.pdf' in link['href'].lower():
+            conteudo['link_download_pdf'] = urljoin(url, link['href'])
+            break
+
+    # Extrai título
+    for tag in ['h1', 'h2', '.titulo', '.title']:
+        titulo = soup.select_one(tag)
+        if titulo:
+            conteudo['titulo'] = titulo.get_text(strip=True)
+            break
+
+    # Extrai data
+    data_patterns = [
+        soup.find(text=re.compile(r'\d{2}/\d{2}/\d{4}')),
+        soup.find(class_=re.compile(r'data|date', re.I))
+    ]
+
+    for pattern in data_patterns:
+        if pattern:
+            texto = pattern if isinstance(pattern, str) else pattern.get_text()
+            match = re.search(r'\d{2}/\d{2}/\d{4}', texto)
+            if match:
+                conteudo['data_publicacao'] = match.group()
+                break
+
+    # Extrai número da edição
+    numero_match = re.search(r'(?:N[°º]|Edição)\s*(\d+)', html, re.I)
+    if numero_match:
+        conteudo['numero_edicao'] = numero_match.group(1)
+
+    # Remove scripts e estilos
+    for elemento in soup(['script', 'style', 'nav', 'header', 'footer']):
+        elemento.decompose()
+
+    # Extrai texto dos elementos principais (ignora textos muito curtos)
+    textos, conteudo['secoes'] = extrair_blocos_texto(soup)
+
+    conteudo['texto_completo'] = '\n\n'.join(textos)
+
+    return conteudo
+
+
+def baixar_arquivo(url: str, destino: Path, cache: Optional[CacheHTTP] = None, timeout: int = 30) -> bool:
+    """
+    Baixa um arquivo (PDF das edições) e o grava de forma atômica
+
+    Args:
+        url: URL do arquivo
+        destino: Caminho onde gravar o arquivo
+        cache: Cache HTTP a usar (GET condicional); None = download direto
+        timeout: Tempo máximo da requisição (segundos)
+
+    Returns:
+        bool: True se o arquivo foi gravado
+    """
+    try:
+        if cache:
+            corpo = cache.obter(url)
+        else:
+            requisicao = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+            with urllib.request.urlopen(requisicao, timeout=timeout) as resposta:
+                corpo = resposta.read()
+    except (urllib.error.URLError, ErroCacheOffline, OSError) as e:
+        logger.error(f"Erro ao baixar {url}: {e}")
+        return False
+
+    destino = Path(destino)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    arquivo_temp = destino.with_suffix(destino.suffix + '.part')
+    with open(arquivo_temp, 'wb') as f:
+        f.write(corpo)
+    os.replace(arquivo_temp, destino)
+    logger.info(f"Arquivo salvo em: {destino}")
+    return True
+
+
+class LimitadorTaxaPorHost:
+    """
+    Limitador de taxa: garante um intervalo mínimo entre o início de
+    requisições ao mesmo host, substituindo pausas fixas. Pode ser usado
+    tanto por corrotinas quanto por threads.
+    """
+
+    def __init__(self, requisicoes_por_segundo: float):
+        """
+        Args:
+            requisicoes_por_segundo: Taxa máxima de requisições por host
+        """
+        self.intervalo = 1.0 / requisicoes_por_segundo if requisicoes_por_segundo > 0 else 0.0
+        self._proximo_horario: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _reservar(self, host: str) -> float:
+        """Reserva o próximo horário livre do host e retorna quanto falta para ele"""
+        with self._lock:
+            agora = time.monotonic()
+            horario = max(agora, self._proximo_horario.get(host, agora))
+            self._proximo_horario[host] = horario + self.intervalo
+        return horario - agora
+
+    async def aguardar(self, host: str):
+        """Aguarda até que uma nova requisição ao host seja permitida"""
+        espera = self._reservar(host)
+        if espera > 0:
+            await asyncio.sleep(espera)
+
+    def aguardar_sincrono(self, host: str):
+        """Versão bloqueante de aguardar, para uso em threads"""
+        espera = self._reservar(host)
+        if espera > 0:
+            time.sleep(espera)
+
+
+class ColetorHTTPAssincrono:
+    """
+    Coleta páginas de edição por HTTP simples (sem JavaScript), com número
+    limitado de requisições simultâneas e limite de taxa por host
+    """
+
+    def __init__(self, max_concorrencia: int = 8, requisicoes_por_segundo: float = 4.0,
+                 timeout: int = 30, tentativas: int = 2, cache: Optional[CacheHTTP] = None,
+                 max_idade_cache: Optional[float] = None, parser_html: Optional[str] = None):
+        """
+        Args:
+            max_concorrencia: Máximo de requisições em andamento ao mesmo tempo
+            requisicoes_por_segundo: Taxa máxima de requisições por host
+            timeout: Tempo máximo de cada requisição (segundos)
+            tentativas: Número de tentativas por URL em caso de erro de rede ou 5xx
+            cache: Cache HTTP persistente (opcional)
+            max_idade_cache: Idade (segundos) até a qual uma página em cache é
+                usada sem revalidação; None = sempre revalida com GET condicional
+            parser_html: Parser do BeautifulSoup (None = PARSER_HTML)
+        """
+        self.max_concorrencia = max_concorrencia
+        self.limitador = LimitadorTaxaPorHost(requisicoes_por_segundo)
+        self.timeout = timeout
+        self.tentativas = max(1, tentativas)
+        self.cache = cache
+        self.max_idade_cache = max_idade_cache
+        self.parser_html = parser_html
+
+    def _baixar(self, url: str) -> str:
+        """Requisição HTTP bloqueante (executada em thread pelo loop assíncrono)"""
+        if self.cache:
+            return self.cache.obter_texto(url, self.max_idade_cache)
+
+        requisicao = urllib.request.Request(url, headers={
+            'User-Agent': USER_AGENT,
+            'Accept-Encoding': 'gzip'
+        })
+        with urllib.request.urlopen(requisicao, timeout=self.timeout) as resposta:
+            corpo = resposta.read()
+            if resposta.headers.get('Content-Encoding') == 'gzip':
+                corpo = gzip.decompress(corpo)
+            charset = resposta.headers.get_content_charset() or 'utf-8'
+        return corpo.decode(charset, errors='replace')
+
+    async def _coletar_url(self, url: str, semaforo: asyncio.Semaphore) -> Optional[Dict]:
+        """
+        Baixa e interpreta uma página de edição
+
+        Erros de rede e respostas 5xx são repetidos até o número de tentativas;
+        qualquer outra falha (4xx, charset desconhecido, HTML que o parser não
+        aceita...) é registrada no log e a URL fica como None, sem interromper
+        as demais.
+        """
+        try:
+            return await self._coletar_url_com_tentativas(url, semaforo)
+        except ErroCacheOffline:
+            logger.error(f"Fora do cache (modo offline): {url}")
+        except urllib.error.HTTPError as e:
+            logger.error(f"HTTP {e.code} ao acessar {url}")
+        except Exception as e:
+            logger.error(f"Erro ao coletar {url}: {type(e).__name__}: {e}")
+        return None
+
+    async def _coletar_url_com_tentativas(self, url: str, semaforo: asyncio.Semaphore) -> Optional[Dict]:
+        """Corpo de _coletar_url; exceções que não valem nova tentativa sobem"""
+        host = urlparse(url).netloc
+
+        # Páginas servidas pelo cache não passam pelo limitador de taxa
+        if self.cache and self.cache.fresca(url, self.max_idade_cache):
+            html = await asyncio.to_thread(self._baixar, url)
+            return parsear_conteudo_edicao(html, url, self.parser_html)
+
+        for tentativa in range(1, self.tentativas + 1):
+            async with semaforo:
+                await self.limitador.aguardar(host)
+                try:
+                    html = await asyncio.to_thread(self._baixar, url)
+                except urllib.error.HTTPError as e:
+                    if e.code < 500:
+                        raise
+                    erro = e
+                except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
+                    erro = e
+                else:
+                    return parsear_conteudo_edicao(html, url, self.parser_html)
+
+            logger.warning(f"Falha ao acessar {url} (tentativa {tentativa}/{self.tentativas}): {erro}")
+
+        logger.error(f"Desistindo de {url} após {self.tentativas} tentativas")
+        return None
+
+    async def coletar_async(self, urls: List[str]) -> List[Optional[Dict]]:
+        """
+        Coleta várias páginas de edição em paralelo
+
+        Returns:
+            Lista de conteúdos na mesma ordem das URLs (None para falhas)
+        """
+        semaforo = asyncio.Semaphore(self.max_concorrencia)
+        return await asyncio.gather(*(self._coletar_url(url, semaforo) for url in urls))
+
+    def coletar(self, urls: List[str]) -> List[Optional[Dict]]:
+        """Versão síncrona de coletar_async"""
+        return asyncio.run(self.coletar_async(urls))
+
+
+class PoolSessoesNavegador:
+    """
+    Conjunto de sessões WebDriver reutilizáveis que dividem entre si as URLs
+    de edição. As sessões não carregam imagens nem fontes e esperam a página
+    ficar pronta em vez de pausas fixas.
+    """
+
+    def __init__(self, sessoes: int = 4, headless: bool = True, timeout: int = 30,
+                 requisicoes_por_segundo: float = 4.0, cache: Optional[CacheHTTP] = None,
+                 parser_html: Optional[str] = None):
+        """
+        Args:
+            sessoes: Número de navegadores abertos em paralelo
+            headless: Se True, executa sem abrir o navegador
+            timeout: Tempo máximo de espera para carregamento (segundos)
+            requisicoes_por_segundo: Taxa máxima por host, somando todas as sessões
+            cache: Cache HTTP onde gravar o HTML renderizado (opcional)
+            parser_html: Parser do BeautifulSoup (None = PARSER_HTML)
+        """
+        self.timeout = timeout
+        self.limitador = LimitadorTaxaPorHost(requisicoes_por_segundo)
+        self.cache = cache
+        self.parser_html = parser_html
+        self.drivers = []
+
+        logger.info(f"Iniciando {sessoes} sessões do navegador...")
+        with ThreadPoolExecutor(max_workers=sessoes) as executor:
+            futures = [
+                executor.submit(criar_driver, headless, timeout, True, 'eager')
+                for _ in range(sessoes)
+            ]
+            erros = []
+            for future in futures:
+                try:
+                    self.drivers.append(future.result())
+                except WebDriverException as e:
+                    erros.append(e)
+
+        if erros:
+            logger.error(f"Erro ao iniciar Chrome: {erros[0]}")
+            self.fechar()
+            raise erros[0]
+
+    def _extrair(self, driver, url: str) -> Optional[Dict]:
+        """Carrega uma edição numa sessão e interpreta o HTML"""
+        self.limitador.aguardar_sincrono(urlparse(url).netloc)
+        try:
+            driver.get(url)
+            aguardar_pagina_pronta(driver, self.timeout, SELETORES_CONTEUDO_EDICAO)
+            html = driver.page_source
+            if self.cache:
+                self.cache.armazenar(url, html.encode('utf-8'), content_type='text/html; charset=utf-8')
+            return parsear_conteudo_edicao(html, url, self.parser_html)
+        except Exception as e:
+            logger.error(f"Erro ao extrair {url}: {e}")
+            return None
+
+    def extrair_conteudos(self, urls: List[str]) -> List[Optional[Dict]]:
+        """
+        Extrai as edições distribuindo as URLs entre as sessões
+
+        Returns:
+            Lista de conteúdos na mesma ordem das URLs (None para falhas)
+        """
+        resultados: List[Optional[Dict]] = [None] * len(urls)
+        pendentes = list(enumerate(urls))
+        lock = threading.Lock()
+
+        def trabalhar(driver):
+            while True:
+                with lock:
+                    if not pendentes:
+                        return
+                    indice, url = pendentes.pop(0)
+                resultados[indice] = self._extrair(driver, url)
+
+        with ThreadPoolExecutor(max_workers=len(self.drivers)) as executor:
+            list(executor.map(trabalhar, self.drivers))
+
+        return resultados
+
+    def fechar(self):
+        """Fecha todas as sessões"""
+        for driver in self.drivers:
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+        self.drivers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
 class CrawlerDiarioMPMT:
-    def __init__(self, headless=True, timeout=30):
+    def __init__(self, headless=True, timeout=30, bloquear_recursos=True,
+                 cache: Optional[CacheHTTP] = None, max_idade_cache: Optional[float] = None,
+                 parser_html: Optional[str] = None):
         """
         Inicializa o crawler com Selenium
 
         Args:
             headless: Se True, executa sem abrir o navegador
             timeout: Tempo máximo de espera para carregamento (segundos)
+            bloquear_recursos: Se True, o navegador não carrega imagens nem fontes
+            cache: Cache HTTP persistente. Edições e PDFs já presentes no cache
+                não são baixados de novo; com cache.offline=True o navegador nem
+                é iniciado e tudo é lido do disco
+            max_idade_cache: No modo 'http', idade até a qual uma edição em
+                cache é usada sem GET condicional (None = sempre revalida)
+            parser_html: Parser do BeautifulSoup (None = PARSER_HTML)
         """
         logger.info("Inicializando crawler...")
 
-        chrome_options = Options()
-        if headless:
-            chrome_options.add_argument('--headless=new')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-
-        # Configurações adicionais para performance
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.page_load_strategy = 'normal'
+        self.cache = cache
+        self.max_idade_cache = max_idade_cache
+        self.parser_html = parser_html
+        self.driver = None
+        self._html_atual = None
 
-        try:
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.set_page_load_timeout(timeout)
-            logger.info("Driver Chrome iniciado com sucesso")
-        except WebDriverException as e:
-            logger.error(f"Erro ao iniciar Chrome: {e}")
-            raise
+        if cache and cache.offline:
+            logger.info("Modo offline: páginas lidas apenas do cache, sem navegador")
+        else:
+            try:
+                self.driver = criar_driver(headless, timeout, bloquear_recursos)
+                logger.info("Driver Chrome iniciado com sucesso")
+            except WebDriverException as e:
+                logger.error(f"Erro ao iniciar Chrome: {e}")
+                raise
 
         self.base_url = "https://www.mpmt.mp.br"
-        self.wait = WebDriverWait(self.driver, timeout)
+        self.wait = WebDriverWait(self.driver, timeout) if self.driver else None
         self.timeout = timeout
+        self.headless = headless
+
+    def _em_cache(self, url: str) -> bool:
+        """Indica se a página já está no cache (edições publicadas não mudam)"""
+        return bool(self.cache) and self.cache.fresca(url, float('inf'))
+
+    def _html_pagina(self) -> str:
+        """HTML da página atual (do navegador ou, no modo offline, do cache)"""
+        if self._html_atual is not None:
+            return self._html_atual
+        return self.driver.page_source
+
+    def _salvar_html_debug(self):
+        """Salva o HTML da página atual para análise"""
+        with open('debug_pagina.html', 'w', encoding='utf-8') as f:
+            f.write(self._html_pagina())
+        logger.info("HTML salvo em 'debug_pagina.html'")
         
     def acessar_pagina_principal(self) -> bool:
         """
@@ -131,14 +911,29 @@ class CrawlerDiarioMPMT:
         url = f"{self.base_url}/diario-oficial/"
         logger.info(f"Acessando: {url}")
 
+        if self.driver is None:
+            html = self.cache.consultar(url)
+            if html is None:
+                logger.error("Página principal fora do cache (modo offline)")
+                return False
+            self._html_atual = html.decode('utf-8', errors='replace')
+            logger.info("Página carregada do cache")
+            return True
+
         try:
             self.driver.get(url)
 
             # Aguarda o body carregar
             self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
 
-            # Aguarda JavaScript renderizar (timeout menor)
-            time.sleep(3)
+            # Aguarda a listagem ser renderizada (ou a rede ficar ociosa)
+            aguardar_pagina_pronta(self.driver, self.timeout, SELETORES_LISTAGEM)
+
+            # Guarda a listagem renderizada para reexecuções offline
+            self._html_atual = None
+            if self.cache:
+                self.cache.armazenar(url, self.driver.page_source.encode('utf-8'),
+                                     content_type='text/html; charset=utf-8')
 
             logger.info("Página carregada com sucesso")
             return True
@@ -151,50 +946,8 @@ class CrawlerDiarioMPMT:
             return False
         
     def _extrair_metadados_do_titulo(self, titulo: str) -> Dict[str, Optional[str]]:
-        """
-        Extrai metadados do título da edição
-
-        Args:
-            titulo: Título da edição
-
-        Returns:
-            Dict com numero_edicao, data_publicacao, ano, tipo_documento
-        """
-        metadados = {
-            'numero_edicao': None,
-            'data_publicacao': None,
-            'ano': None,
-            'tipo_documento': None
-        }
-
-        # Extrai número da edição
-        match_numero = re.search(r'(?:N[°º]|Edição|Ed\.?)\s*(\d+)', titulo, re.I)
-        if match_numero:
-            metadados['numero_edicao'] = match_numero.group(1)
-
-        # Extrai data (formatos: dd/mm/yyyy, dd-mm-yyyy, dd.mm.yyyy)
-        match_data = re.search(r'(\d{2})[/\-.](\d{2})[/\-.](\d{4})', titulo)
-        if match_data:
-            metadados['data_publicacao'] = f"{match_data.group(1)}/{match_data.group(2)}/{match_data.group(3)}"
-            metadados['ano'] = match_data.group(3)
-
-        # Extrai ano se não encontrou na data
-        if not metadados['ano']:
-            match_ano = re.search(r'\b(20\d{2})\b', titulo)
-            if match_ano:
-                metadados['ano'] = match_ano.group(1)
-
-        # Identifica tipo de documento
-        tipos = ['Diário Oficial', 'DOE', 'Edição Especial', 'Suplemento', 'Extra']
-        for tipo in tipos:
-            if tipo.lower() in titulo.lower():
-                metadados['tipo_documento'] = tipo
-                break
-
-        if not metadados['tipo_documento']:
-            metadados['tipo_documento'] = 'Diário Oficial'
-
-        return metadados
+        """Extrai metadados do título da edição (ver extrair_metadados_do_titulo)"""
+        return extrair_metadados_do_titulo(titulo)
 
     def extrair_links_edicoes(self) -> List[EdicaoInfo]:
         """
@@ -205,35 +958,12 @@ class CrawlerDiarioMPMT:
         """
         logger.info("Extraindo links das edições...")
 
-        html = self.driver.page_source
-        soup = BeautifulSoup(html, 'html.parser')
+        html = self._html_pagina()
+        soup = criar_soup(html, self.parser_html)
 
-        edicoes = []
-        links_encontrados = set()
-
-        # Estratégia 1: Links com palavras-chave no href
-        seletores_css = [
-            'a[href*="doe"]',
-            'a[href*="diario"]',
-            'a[href*="edicao"]',
-            'a[href*="publicacao"]',
-            'a[href*="/wp-content/uploads"]',  # Links para PDFs
-            'a.edicao',
-            'a.publicacao',
-            '.lista-diarios a',
-            '.diario-item a',
-            'article a',
-        ]
-
-        for seletor in seletores_css:
-            elementos = soup.select(seletor)
-            for elemento in elementos:
-                self._processar_elemento_edicao(elemento, links_encontrados, edicoes)
-
-        # Estratégia 2: Busca por padrões no texto
-        links_com_padrao = soup.find_all('a', string=re.compile(r'(diário|edição|doe|\d{4})', re.I))
-        for link in links_com_padrao:
-            self._processar_elemento_edicao(link, links_encontrados, edicoes)
+        # Estratégias 1 e 2 (palavras-chave no href/classes e padrões no texto)
+        # aplicadas em uma única passada pelos links
+        edicoes = classificar_links(soup, self.base_url)
 
         logger.info(f"Encontradas {len(edicoes)} edições")
 
@@ -266,36 +996,19 @@ class CrawlerDiarioMPMT:
                 return
 
             # Monta URL completa
-            if href.startswith('http'):
-                url_completa = href
-            elif href.startswith('/'):
-                url_completa = f"{self.base_url}{href}"
-            else:
-                url_completa = f"{self.base_url}/{href}"
+            url_completa = _montar_url(href, self.base_url)
 
             # Evita duplicatas
             if url_completa in links_encontrados:
                 return
 
             # Filtra URLs irrelevantes
-            urls_excluir = ['javascript:', 'mailto:', '#', 'facebook.com', 'twitter.com', 'instagram.com']
-            if any(excl in url_completa.lower() for excl in urls_excluir):
+            if PADRAO_URL_EXCLUIDA.search(url_completa):
                 return
 
             links_encontrados.add(url_completa)
 
-            # Extrai metadados do título
-            metadados = self._extrair_metadados_do_titulo(texto)
-
-            edicao = EdicaoInfo(
-                titulo=texto,
-                url=url_completa,
-                data_coleta=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                numero_edicao=metadados['numero_edicao'],
-                data_publicacao=metadados['data_publicacao'],
-                ano=metadados['ano'],
-                tipo_documento=metadados['tipo_documento']
-            )
+            edicao = _criar_edicao(texto, url_completa, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
 
             edicoes.append(edicao)
             logger.debug(f"Edição encontrada: {texto[:50]}")
@@ -306,6 +1019,8 @@ class CrawlerDiarioMPMT:
     def _extrair_links_alternativos(self):
         """Método alternativo para extrair links"""
         edicoes = []
+        if self.driver is None:
+            return edicoes
         
         try:
             # Tenta encontrar elementos por diferentes seletores
@@ -318,16 +1033,17 @@ class CrawlerDiarioMPMT:
                     url = elem.get_attribute('href')
                     
                     if url and texto:
-                        edicoes.append({
-                            'titulo': texto,
-                            'url': url,
-                            'data_coleta': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        })
+                        edicoes.append(EdicaoInfo(
+                            titulo=texto,
+                            url=url,
+                            data_coleta=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                        ))
                 except:
                     continue
                     
             # Remove duplicatas
-            edicoes = [dict(t) for t in {tuple(d.items()) for d in edicoes}]
+            vistas = set()
+            edicoes = [e for e in edicoes if not (e.url in vistas or vistas.add(e.url))]
             
         except Exception as e:
             print(f"Erro ao extrair links alternativos: {e}")
@@ -338,104 +1054,125 @@ class CrawlerDiarioMPMT:
         """Extrai o conteúdo completo de uma edição"""
         print(f"\nAcessando: {url}")
         
+        if self.cache:
+            html = self.cache.consultar(url)
+            if html is not None:
+                return parsear_conteudo_edicao(html.decode('utf-8', errors='replace'), url, self.parser_html)
+            if self.driver is None:
+                print(f"Fora do cache (modo offline): {url}")
+                return None
+        
         try:
             self.driver.get(url)
-            time.sleep(3)  # Aguarda carregamento
+            aguardar_pagina_pronta(self.driver, self.timeout, SELETORES_CONTEUDO_EDICAO)
             
             html = self.driver.page_source
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            conteudo = {
-                'url': url,
-                'titulo': '',
-                'data_publicacao': '',
-                'numero_edicao': '',
-                'texto_completo': '',
-                'secoes': []
-            }
-            
-            # Extrai título
-            for tag in ['h1', 'h2', '.titulo', '.title']:
-                titulo = soup.select_one(tag)
-                if titulo:
-                    conteudo['titulo'] = titulo.get_text(strip=True)
-                    break
-            
-            # Extrai data
-            data_patterns = [
-                soup.find(text=re.compile(r'\d{2}/\d{2}/\d{4}')),
-                soup.find(class_=re.compile(r'data|date', re.I))
-            ]
-            
-            for pattern in data_patterns:
-                if pattern:
-                    texto = pattern if isinstance(pattern, str) else pattern.get_text()
-                    match = re.search(r'\d{2}/\d{2}/\d{4}', texto)
-                    if match:
-                        conteudo['data_publicacao'] = match.group()
-                        break
-            
-            # Extrai número da edição
-            numero_match = re.search(r'(?:N[°º]|Edição)\s*(\d+)', html, re.I)
-            if numero_match:
-                conteudo['numero_edicao'] = numero_match.group(1)
-            
-            # Remove scripts e estilos
-            for elemento in soup(['script', 'style', 'nav', 'header', 'footer']):
-                elemento.decompose()
-            
-            # Extrai texto dos elementos principais
-            elementos_texto = soup.find_all(['p', 'div', 'article', 'section'])
-            
-            textos = []
-            for elem in elementos_texto:
-                texto = elem.get_text(strip=True)
-                if len(texto) > 30:  # Ignora textos muito curtos
-                    textos.append(texto)
-                    conteudo['secoes'].append({
-                        'tipo': elem.name,
-                        'texto': texto
-                    })
-            
-            conteudo['texto_completo'] = '\n\n'.join(textos)
-            
-            return conteudo
+            if self.cache:
+                self.cache.armazenar(url, html.encode('utf-8'), content_type='text/html; charset=utf-8')
+            return parsear_conteudo_edicao(html, url, self.parser_html)
             
         except Exception as e:
             print(f"Erro ao extrair conteúdo: {e}")
             return None
     
-    def extrair_todas_edicoes(self, max_edicoes=10):
-        """Extrai informações de múltiplas edições"""
+    def extrair_todas_edicoes(self, max_edicoes=10, modo='selenium', max_concorrencia=8,
+                              requisicoes_por_segundo=4.0, sessoes=1):
+        """
+        Extrai informações de múltiplas edições
+
+        Args:
+            max_edicoes: Número máximo de edições a extrair
+            modo: 'selenium' (edições abertas no navegador) ou 'http' (páginas
+                de edição baixadas por HTTP assíncrono; o Selenium é usado só na
+                listagem e nas edições que não renderizam conteúdo sem JavaScript)
+            max_concorrencia: Requisições simultâneas no modo 'http'
+            requisicoes_por_segundo: Taxa máxima de requisições por host
+            sessoes: No modo 'selenium', número de navegadores que dividem as
+                edições entre si (1 = usa apenas o navegador do crawler)
+        """
         self.acessar_pagina_principal()
         edicoes = self.extrair_links_edicoes()
         
         if not edicoes:
             print("\n⚠️  Nenhuma edição encontrada!")
             print("Salvando HTML da página para debug...")
-            with open('debug_pagina.html', 'w', encoding='utf-8') as f:
-                f.write(self.driver.page_source)
-            print("HTML salvo em 'debug_pagina.html'")
+            self._salvar_html_debug()
             return []
         
+        edicoes = edicoes[:max_edicoes]
+
+        if modo == 'http':
+            return self._extrair_edicoes_http(edicoes, max_concorrencia, requisicoes_por_segundo)
+
+        if sessoes > 1 and self.driver is not None:
+            # Edições já em cache não precisam de navegador
+            em_cache = {edicao.url: self.extrair_conteudo_edicao(edicao.url)
+                        for edicao in edicoes if self._em_cache(edicao.url)}
+            pendentes = [edicao.url for edicao in edicoes if edicao.url not in em_cache]
+
+            if pendentes:
+                with PoolSessoesNavegador(sessoes, self.headless, self.timeout,
+                                          requisicoes_por_segundo, self.cache, self.parser_html) as pool:
+                    em_cache.update(zip(pendentes, pool.extrair_conteudos(pendentes)))
+
+            return [em_cache[edicao.url] for edicao in edicoes if em_cache.get(edicao.url)]
+
         conteudos = []
+        limitador = LimitadorTaxaPorHost(requisicoes_por_segundo)
         
-        for i, edicao in enumerate(edicoes[:max_edicoes]):
-            print(f"\nProcessando {i+1}/{min(len(edicoes), max_edicoes)}: {edicao['titulo'][:50]}...")
+        for i, edicao in enumerate(edicoes):
+            print(f"\nProcessando {i+1}/{len(edicoes)}: {edicao.titulo[:50]}...")
             
-            conteudo = self.extrair_conteudo_edicao(edicao['url'])
+            # Respeita a taxa máxima por host em vez de uma pausa fixa
+            if not self._em_cache(edicao.url):
+                limitador.aguardar_sincrono(urlparse(edicao.url).netloc)
+            conteudo = self.extrair_conteudo_edicao(edicao.url)
             if conteudo:
                 conteudos.append(conteudo)
                 print("✓ Sucesso")
             else:
                 print("✗ Falha")
-            
-            time.sleep(2)  # Pausa entre requisições
         
         return conteudos
+
+    def _extrair_edicoes_http(self, edicoes: List[EdicaoInfo], max_concorrencia: int,
+                              requisicoes_por_segundo: float) -> List[Dict]:
+        """
+        Extrai as edições por HTTP assíncrono, recorrendo ao Selenium apenas
+        para as páginas sem conteúdo no HTML estático
+        """
+        coletor = ColetorHTTPAssincrono(max_concorrencia=max_concorrencia,
+                                        requisicoes_por_segundo=requisicoes_por_segundo,
+                                        timeout=self.timeout, cache=self.cache,
+                                        max_idade_cache=self.max_idade_cache,
+                                        parser_html=self.parser_html)
+        inicio = time.perf_counter()
+        resultados = coletor.coletar([edicao.url for edicao in edicoes])
+        logger.info(f"{len(edicoes)} edições coletadas por HTTP em {time.perf_counter() - inicio:.2f}s")
+
+        conteudos = []
+        for edicao, conteudo in zip(edicoes, resultados):
+            if (not conteudo or not conteudo['texto_completo']) and self.driver is not None:
+                logger.info(f"Sem conteúdo estático, usando o navegador: {edicao.url}")
+                conteudo = self.extrair_conteudo_edicao(edicao.url)
+
+            if conteudo:
+                conteudos.append(conteudo)
+            else:
+                logger.error(f"Falha ao extrair {edicao.url}")
+
+        return conteudos
     
-    def buscar_termo(self, conteudos, termo):
-        """Busca um termo nos conteúdos extraídos"""
+    def buscar_termo(self, conteudos, termo, ranquear=False, max_trechos=3):
+        """
+        Busca um termo nos conteúdos extraídos
+
+        Por padrão procura o termo como substring, sem diferenciar maiúsculas,
+        na ordem dos conteúdos. Com ranquear=True, usa buscar_termo_ranqueado.
+        """
+        if ranquear:
+            return self.buscar_termo_ranqueado(conteudos, termo, max_trechos)
+
         resultados = []
         
         for item in conteudos:
@@ -455,6 +1192,62 @@ class CrawlerDiarioMPMT:
                 })
         
         return resultados
+
+    def buscar_termo_ranqueado(self, conteudos, termo, max_trechos=3, limite=20):
+        """
+        Busca os termos da consulta (palavras inteiras, qualquer um deles) nos
+        conteúdos extraídos
+
+        As edições são ordenadas por relevância (BM25); as `limite` melhores
+        são escolhidas com um heap (None = todas) e só elas têm os trechos
+        montados, até max_trechos por resultado
+        """
+        termos = list(dict.fromkeys(t for t, _ in tokenizar(termo)))
+        if not termos:
+            return []
+
+        ocorrencias = []
+        for item in conteudos:
+            por_termo = {t: [] for t in termos}
+            tokens = list(tokenizar(item['texto_completo']))
+            for t, offset in tokens:
+                if t in por_termo:
+                    por_termo[t].append(offset)
+            ocorrencias.append((item, len(tokens), por_termo))
+
+        comprimento_medio = sum(comprimento for _, comprimento, _ in ocorrencias) / max(1, len(ocorrencias))
+        idfs = {t: idf_bm25(sum(1 for _, _, por_termo in ocorrencias if por_termo[t]), len(ocorrencias))
+                for t in termos}
+
+        pontuacoes = []
+        for item, comprimento, por_termo in ocorrencias:
+            pontuacao = sum(pontuacao_bm25(len(offsets), comprimento, comprimento_medio, idfs[t])
+                            for t, offsets in por_termo.items() if offsets)
+            if pontuacao:
+                pontuacoes.append((pontuacao, item, por_termo))
+
+        if limite is None:
+            melhores = sorted(pontuacoes, key=lambda candidato: candidato[0], reverse=True)
+        else:
+            melhores = heapq.nlargest(limite, pontuacoes, key=lambda candidato: candidato[0])
+
+        resultados = []
+        for pontuacao, item, por_termo in melhores:
+            trechos = montar_trechos(
+                item['texto_completo'],
+                [(offset, offset + len(t)) for t, offsets in por_termo.items() for offset in offsets],
+                maximo=max_trechos, tamanho_contexto=150
+            )
+            resultados.append({
+                'titulo': item['titulo'],
+                'url': item['url'],
+                'data': item['data_publicacao'],
+                'pontuacao': round(pontuacao, 4),
+                'contexto': trechos[0],
+                'trechos': trechos
+            })
+
+        return resultados
     
     def salvar_json(self, conteudos, arquivo='diarios_mpmt.json'):
         """Salva em JSON"""
@@ -478,9 +1271,26 @@ class CrawlerDiarioMPMT:
         df.to_csv(arquivo, index=False, encoding='utf-8-sig')
         print(f"✓ Dados salvos em {arquivo}")
     
+    def baixar_pdf(self, url: str, destino: Path) -> bool:
+        """
+        Baixa um PDF, usando o cache HTTP (GET condicional) quando configurado
+
+        Args:
+            url: URL do PDF
+            destino: Caminho onde gravar o arquivo
+
+        Returns:
+            bool: True se o arquivo foi gravado
+        """
+        return baixar_arquivo(url, destino, self.cache, self.timeout)
+
     def fechar(self):
-        """Fecha o navegador"""
-        self.driver.quit()
+        """Fecha o navegador e grava o índice do cache"""
+        if self.driver:
+            self.driver.quit()
+        if self.cache:
+            self.cache.salvar()
+            self.cache.registrar_estatisticas()
 
 
 # =========================
@@ -492,14 +1302,34 @@ if __name__ == "__main__":
     print("CRAWLER DIÁRIO OFICIAL MP-MT")
     print("="*60)
     
+    parser = argparse.ArgumentParser(description='Crawler do Diário Oficial do MP-MT')
+    parser.add_argument('--max-edicoes', type=int, default=5,
+                        help='Número máximo de edições a extrair')
+    parser.add_argument('--modo', choices=['selenium', 'http'], default='selenium',
+                        help='Como baixar as páginas das edições')
+    parser.add_argument('--sessoes', type=int, default=1,
+                        help='Navegadores em paralelo no modo selenium')
+    parser.add_argument('--cache', default='cache_http',
+                        help='Diretório do cache HTTP')
+    parser.add_argument('--sem-cache', action='store_true',
+                        help='Não usa o cache HTTP')
+    parser.add_argument('--offline', action='store_true',
+                        help='Usa apenas páginas em cache, sem acessar a rede')
+    parser.add_argument('--parser', default=PARSER_HTML,
+                        help=f'Parser HTML do BeautifulSoup (padrão: {PARSER_HTML})')
+    args = parser.parse_args()
+    
     crawler = None
     
     try:
+        cache = None if args.sem_cache else CacheHTTP(args.cache, offline=args.offline)
+        
         # Inicializa o crawler
-        crawler = CrawlerDiarioMPMT(headless=True)
+        crawler = CrawlerDiarioMPMT(headless=True, cache=cache, parser_html=args.parser)
         
         # Extrai as edições
-        conteudos = crawler.extrair_todas_edicoes(max_edicoes=5)
+        conteudos = crawler.extrair_todas_edicoes(max_edicoes=args.max_edicoes, modo=args.modo,
+                                                  sessoes=args.sessoes)
         
         if conteudos:
             print(f"\n{'='*60}")
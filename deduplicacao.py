@@ -0,0 +1,447 @@
+# -*- coding: utf-8 -*-
+"""
+Detecção de atos e páginas republicados entre edições (MinHash + LSH)
+Calcula assinaturas MinHash dos shingles de palavras de cada página (ou ato)
+e encontra os quase duplicados do corpus com LSH, sem comparar todos os pares.
+As assinaturas ficam em disco, então só documentos novos ou alterados são
+processados a cada atualização.
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+import zlib
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from exportacao_colunar import inferir_data
+from indice_busca import listar_json, tokenizar
+from segmentacao_atos import texto_ato
+
+logger = logging.getLogger(__name__)
+
+# Palavras por shingle
+TAMANHO_SHINGLE = 5
+# Unidades com menos palavras (cabeçalhos, páginas em branco) são ignoradas
+MIN_PALAVRAS = 30
+# Permutações da assinatura = BANDAS x LINHAS_POR_BANDA; com 16 bandas de 8
+# linhas, pares com similaridade de Jaccard 0,8 viram candidatos com ~97% de
+# probabilidade e pares com 0,5, com ~6%
+BANDAS = 16
+LINHAS_POR_BANDA = 8
+NUMERO_PERMUTACOES = BANDAS * LINHAS_POR_BANDA
+LIMIAR_SIMILARIDADE = 0.8
+
+# Hashes universais (a * x + b) mod P, com P primo de Mersenne 2^61 - 1
+PRIMO = np.uint64((1 << 61) - 1)
+_gerador = np.random.RandomState(20251014)
+COEFICIENTES_A = _gerador.randint(1, 1 << 31, NUMERO_PERMUTACOES).astype(np.uint64)
+COEFICIENTES_B = _gerador.randint(0, 1 << 31, NUMERO_PERMUTACOES).astype(np.uint64)
+
+
+def shingles(texto: str, tamanho: int = TAMANHO_SHINGLE) -> np.ndarray:
+    """
+    Hashes (CRC-32) dos shingles de palavras normalizadas de um texto
+
+    Args:
+        texto: Texto original
+        tamanho: Palavras por shingle
+
+    Returns:
+        np.ndarray: Hashes distintos (uint64); vazio se o texto tiver menos
+            de MIN_PALAVRAS palavras
+    """
+    palavras = [termo for termo, _ in tokenizar(texto)]
+    if len(palavras) < MIN_PALAVRAS:
+        return np.empty(0, dtype=np.uint64)
+    hashes = {zlib.crc32(' '.join(palavras[i:i + tamanho]).encode('utf-8'))
+              for i in range(len(palavras) - tamanho + 1)}
+    return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+
+def assinatura_minhash(hashes: np.ndarray) -> np.ndarray:
+    """
+    Assinatura MinHash de um conjunto de shingles
+
+    Args:
+        hashes: Hashes dos shingles (não vazio)
+
+    Returns:
+        np.ndarray: NUMERO_PERMUTACOES mínimos (uint32)
+    """
+    # a < 2^31 e x < 2^32: o produto cabe em 64 bits sem estouro
+    permutados = (np.outer(hashes, COEFICIENTES_A) + COEFICIENTES_B) % PRIMO
+    return permutados.min(axis=0).astype(np.uint32)
+
+
+def similaridade_estimada(assinatura_a: np.ndarray, assinatura_b: np.ndarray) -> float:
+    """Similaridade de Jaccard estimada pela fração de posições iguais das assinaturas"""
+    return float(np.count_nonzero(assinatura_a == assinatura_b)) / len(assinatura_a)
+
+
+class DetectorDuplicatas:
+    """
+    Detector incremental de quase duplicados sobre os JSON do PDFExtractor
+
+    Unidades comparadas: páginas, ou atos quando o JSON traz o bloco 'atos'
+    (extract_data.py --segmentar-atos) e unidade='atos'. Unidades do mesmo
+    documento não são comparadas entre si. A unidade canônica de uma
+    republicação é a mais antiga entre as diretamente similares a ela (sem
+    fecho transitivo: A~B e B~C não tornam A e C duplicados).
+
+    Arquivos em <diretorio_dados>/_duplicatas: assinaturas.npy (uma linha por
+    unidade), unidades.json (documentos e unidades, na ordem das linhas) e
+    grupos.json (pares similares e grupos).
+    """
+
+    NOME_DIRETORIO = '_duplicatas'
+    VERSAO = 1
+
+    def __init__(self, diretorio_dados: str = "json_data", unidade: str = 'paginas',
+                 limiar: float = LIMIAR_SIMILARIDADE):
+        """
+        Inicializa o detector, carregando as assinaturas já calculadas
+
+        Args:
+            diretorio_dados: Diretório com as subpastas de JSON do PDFExtractor
+            unidade: 'paginas' ou 'atos' (atos só em JSON com o bloco 'atos';
+                nos demais, páginas)
+            limiar: Similaridade de Jaccard estimada mínima para considerar duplicados
+        """
+        if unidade not in ('paginas', 'atos'):
+            raise ValueError(f"Unidade inválida: {unidade} (use 'paginas' ou 'atos')")
+
+        self.diretorio_dados = Path(diretorio_dados)
+        self.diretorio = self.diretorio_dados / self.NOME_DIRETORIO
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        self.unidade = unidade
+        self.limiar = limiar
+        self._carregar()
+
+    # ------------------------------------------------------------------
+    # Armazenamento
+    # ------------------------------------------------------------------
+
+    def _parametros(self) -> Dict:
+        return {'versao': self.VERSAO, 'unidade': self.unidade, 'shingle': TAMANHO_SHINGLE,
+                'bandas': BANDAS, 'linhas_por_banda': LINHAS_POR_BANDA}
+
+    def _carregar(self):
+        """Carrega assinaturas, unidades e pares (descartando-os se os parâmetros mudaram)"""
+        self.documentos: Dict[str, Dict] = {}
+        self.unidades: List[Dict] = []
+        self.assinaturas = np.empty((0, NUMERO_PERMUTACOES), dtype=np.uint32)
+        self.pares: Dict[Tuple[str, str], float] = {}
+        self._recomparar = False
+
+        arquivo_unidades = self.diretorio / 'unidades.json'
+        if not arquivo_unidades.exists():
+            return
+
+        with open(arquivo_unidades, 'r', encoding='utf-8') as f:
+            tabela = json.load(f)
+        if tabela.get('parametros') != self._parametros():
+            logger.warning("Parâmetros das assinaturas mudaram, as duplicatas serão recalculadas")
+            return
+
+        self.documentos = tabela['documentos']
+        self.unidades = tabela['unidades']
+        self.assinaturas = np.load(self.diretorio / 'assinaturas.npy')
+
+        arquivo_grupos = self.diretorio / 'grupos.json'
+        if arquivo_grupos.exists():
+            with open(arquivo_grupos, 'r', encoding='utf-8') as f:
+                grupos = json.load(f)
+            if grupos.get('limiar') == self.limiar:
+                self.pares = {(a, b): similaridade for a, b, similaridade in grupos['pares']}
+            else:
+                # As assinaturas continuam válidas; só os pares são refeitos
+                self._recomparar = True
+
+    def salvar(self):
+        """Grava assinaturas, unidades e grupos"""
+        arquivo = self.diretorio / 'assinaturas.npy'
+        arquivo_temp = self.diretorio / 'assinaturas.tmp.npy'
+        np.save(arquivo_temp, self.assinaturas)
+        os.replace(arquivo_temp, arquivo)
+
+        for nome, conteudo in (
+            ('unidades.json', {'parametros': self._parametros(), 'documentos': self.documentos,
+                               'unidades': self.unidades}),
+            ('grupos.json', {'limiar': self.limiar, 'grupos': self.grupos(),
+                             'pares': [[a, b, similaridade] for (a, b), similaridade in sorted(self.pares.items())]}),
+        ):
+            arquivo = self.diretorio / nome
+            arquivo_temp = arquivo.with_suffix('.tmp')
+            with open(arquivo_temp, 'w', encoding='utf-8') as f:
+                json.dump(conteudo, f, ensure_ascii=False)
+            os.replace(arquivo_temp, arquivo)
+
+    # ------------------------------------------------------------------
+    # Unidades e assinaturas
+    # ------------------------------------------------------------------
+
+    def _unidades_documento(self, caminho_relativo: str, dados: Dict) -> List[Tuple[Dict, str]]:
+        """Unidades (descrição, texto) de um documento"""
+        paginas = dados.get('paginas', [])
+        if self.unidade == 'atos' and dados.get('atos'):
+            return [({'id': f"{caminho_relativo}#a{i}", 'documento': caminho_relativo,
+                      'pagina_inicio': ato['pagina_inicio'], 'pagina_fim': ato['pagina_fim'],
+                      'titulo': ato.get('titulo', '')[:120]},
+                     ato['texto'] if 'texto' in ato else texto_ato(paginas, ato))
+                    for i, ato in enumerate(dados['atos'], 1)]
+
+        return [({'id': f"{caminho_relativo}#p{pagina['numero_pagina']}", 'documento': caminho_relativo,
+                  'pagina_inicio': pagina['numero_pagina'], 'pagina_fim': pagina['numero_pagina']},
+                 pagina.get('texto', ''))
+                for pagina in paginas]
+
+    def _assinar_documento(self, caminho_json: Path) -> Tuple[List[Dict], List[np.ndarray], Optional[str]]:
+        """Calcula as assinaturas das unidades de um documento"""
+        caminho_relativo = caminho_json.relative_to(self.diretorio_dados).as_posix()
+        with open(caminho_json, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+
+        data = inferir_data(dados.get('arquivo', {}).get('nome', caminho_json.name), dados.get('metadados'))
+        unidades, assinaturas = [], []
+        for descricao, texto in self._unidades_documento(caminho_relativo, dados):
+            hashes = shingles(texto)
+            if len(hashes):
+                unidades.append(descricao)
+                assinaturas.append(assinatura_minhash(hashes))
+        return unidades, assinaturas, data.isoformat() if data else None
+
+    # ------------------------------------------------------------------
+    # LSH
+    # ------------------------------------------------------------------
+
+    def _baldes(self) -> List[Dict[bytes, List[int]]]:
+        """Tabelas LSH: para cada banda, {trecho da assinatura: linhas}"""
+        baldes = [defaultdict(list) for _ in range(BANDAS)]
+        for linha, assinatura in enumerate(self.assinaturas):
+            for banda in range(BANDAS):
+                trecho = assinatura[banda * LINHAS_POR_BANDA:(banda + 1) * LINHAS_POR_BANDA].tobytes()
+                baldes[banda][trecho].append(linha)
+        return baldes
+
+    def _comparar_novas(self, novas: range):
+        """Compara as linhas novas com todas as demais que caem no mesmo balde de alguma banda"""
+        baldes = self._baldes()
+        comparacoes = 0
+        for linha in novas:
+            assinatura = self.assinaturas[linha]
+            documento = self.unidades[linha]['documento']
+            candidatas = set()
+            for banda in range(BANDAS):
+                trecho = assinatura[banda * LINHAS_POR_BANDA:(banda + 1) * LINHAS_POR_BANDA].tobytes()
+                candidatas.update(baldes[banda][trecho])
+
+            for outra in candidatas:
+                # Pares entre duas linhas novas são avaliados uma só vez
+                if outra == linha or (outra in novas and outra < linha):
+                    continue
+                if self.unidades[outra]['documento'] == documento:
+                    continue
+                comparacoes += 1
+                similaridade = similaridade_estimada(assinatura, self.assinaturas[outra])
+                if similaridade >= self.limiar:
+                    par = tuple(sorted((self.unidades[linha]['id'], self.unidades[outra]['id'])))
+                    self.pares[par] = round(similaridade, 3)
+        return comparacoes
+
+    # ------------------------------------------------------------------
+    # Atualização e consulta
+    # ------------------------------------------------------------------
+
+    def atualizar(self) -> Dict[str, int]:
+        """
+        Sincroniza as assinaturas com o diretório de dados e procura duplicatas
+        das unidades de documentos novos ou alterados
+
+        Returns:
+            Dict: Contagem de documentos processados e removidos, unidades,
+                comparações feitas e pares duplicados
+        """
+        inicio = time.perf_counter()
+        existentes = {caminho.relative_to(self.diretorio_dados).as_posix(): caminho
+                      for caminho in listar_json(self.diretorio_dados)}
+
+        alterados = []
+        for caminho_relativo, caminho_json in existentes.items():
+            registro = self.documentos.get(caminho_relativo)
+            stat = caminho_json.stat()
+            if not registro or registro['tamanho_bytes'] != stat.st_size or registro['mtime_ns'] != stat.st_mtime_ns:
+                alterados.append(caminho_relativo)
+
+        # Remove as unidades de documentos alterados ou apagados
+        descartados = set(alterados) | (set(self.documentos) - set(existentes))
+        if descartados:
+            manter = [i for i, unidade in enumerate(self.unidades) if unidade['documento'] not in descartados]
+            ids_descartados = {unidade['id'] for unidade in self.unidades if unidade['documento'] in descartados}
+            self.unidades = [self.unidades[i] for i in manter]
+            self.assinaturas = self.assinaturas[manter]
+            self.pares = {par: s for par, s in self.pares.items()
+                          if par[0] not in ids_descartados and par[1] not in ids_descartados}
+            for caminho_relativo in descartados:
+                self.documentos.pop(caminho_relativo, None)
+
+        primeira_nova = len(self.unidades)
+        novas_assinaturas = []
+        for caminho_relativo in alterados:
+            caminho_json = existentes[caminho_relativo]
+            try:
+                unidades, assinaturas, data = self._assinar_documento(caminho_json)
+            except Exception as e:
+                logger.error(f"Erro ao ler {caminho_json}: {e}")
+                continue
+            stat = caminho_json.stat()
+            self.documentos[caminho_relativo] = {'tamanho_bytes': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                                                 'data': data, 'unidades': len(unidades)}
+            self.unidades.extend(unidades)
+            novas_assinaturas.extend(assinaturas)
+
+        if novas_assinaturas:
+            self.assinaturas = np.vstack([self.assinaturas, np.array(novas_assinaturas, dtype=np.uint32)])
+
+        if self._recomparar:
+            primeira_nova, self._recomparar = 0, False
+        comparacoes = self._comparar_novas(range(primeira_nova, len(self.unidades)))
+        self.salvar()
+
+        contagem = {
+            'documentos_processados': len(alterados),
+            'documentos_removidos': len(descartados) - len(alterados),
+            'unidades': len(self.unidades),
+            'unidades_novas': len(self.unidades) - primeira_nova,
+            'comparacoes': comparacoes,
+            'pares_duplicados': len(self.pares),
+        }
+        logger.info(f"Duplicatas atualizadas em {time.perf_counter() - inicio:.2f}s: {contagem}")
+        return contagem
+
+    def _chave_ordem(self, id_unidade: str) -> Tuple:
+        """Ordem de publicação: data da edição, caminho e posição no documento"""
+        documento, _, posicao = id_unidade.partition('#')
+        data = self.documentos.get(documento, {}).get('data') or '9999-99-99'
+        return data, documento, int(posicao[1:])
+
+    def canonicas(self) -> Dict[str, str]:
+        """
+        Mapeia cada unidade republicada para a unidade mais antiga, de outro
+        documento, com que forma um par duplicado
+
+        Returns:
+            Dict: {id da republicação: id da unidade canônica}; unidades sem
+                par mais antigo que elas não aparecem
+        """
+        parceiros = defaultdict(list)
+        for a, b in self.pares:
+            parceiros[a].append(b)
+            parceiros[b].append(a)
+
+        canonicas = {}
+        for id_unidade, outras in parceiros.items():
+            mais_antiga = min(outras, key=self._chave_ordem)
+            if self._chave_ordem(mais_antiga) < self._chave_ordem(id_unidade):
+                canonicas[id_unidade] = mais_antiga
+        return canonicas
+
+    def grupos(self) -> List[Dict]:
+        """
+        Agrupa as republicações pela unidade canônica (ver canonicas)
+
+        Returns:
+            List[Dict]: Grupos com a unidade 'canonica' e as 'republicacoes'
+                diretamente similares a ela, do maior grupo para o menor
+        """
+        membros = defaultdict(list)
+        for id_unidade, canonica in self.canonicas().items():
+            membros[canonica].append(id_unidade)
+
+        grupos = []
+        for canonica, itens in membros.items():
+            itens.sort(key=self._chave_ordem)
+            grupos.append({'canonica': canonica, 'republicacoes': itens})
+        grupos.sort(key=lambda grupo: (-len(grupo['republicacoes']), self._chave_ordem(grupo['canonica'])))
+        return grupos
+
+    def mapa_canonico(self) -> Dict[Tuple[str, int], Tuple[str, int]]:
+        """
+        Mapeia cada página republicada para a página em que o conteúdo saiu primeiro
+
+        Returns:
+            Dict: {(documento, página): (documento canônico, página inicial canônica)}
+        """
+        por_id = {unidade['id']: unidade for unidade in self.unidades}
+        mapa = {}
+        for id_unidade, id_canonica in self.canonicas().items():
+            unidade, canonica = por_id.get(id_unidade), por_id.get(id_canonica)
+            if unidade is None or canonica is None:
+                continue
+            destino = (canonica['documento'], canonica['pagina_inicio'])
+            for pagina in range(unidade['pagina_inicio'], unidade['pagina_fim'] + 1):
+                mapa[(unidade['documento'], pagina)] = destino
+        return mapa
+
+    def colapsar(self, resultados: List[Dict]) -> List[Dict]:
+        """
+        Remove dos resultados de IndiceInvertido.buscar as páginas republicadas
+        cuja publicação original já está entre os resultados
+
+        Cada resultado mantido ganha 'republicacoes' com as páginas colapsadas
+        nele. Uma página só é colapsada na página canônica com que forma par,
+        que é sempre de outro documento.
+
+        Args:
+            resultados: Resultados com 'documento' e 'pagina'
+
+        Returns:
+            List[Dict]: Resultados sem as republicações
+        """
+        mapa = self.mapa_canonico()
+        por_local = {}
+        for resultado in resultados:
+            por_local.setdefault((resultado['documento'], resultado['pagina']), resultado)
+
+        saida = []
+        for resultado in resultados:
+            local = (resultado['documento'], resultado['pagina'])
+            canonica = por_local.get(mapa.get(local))
+            if canonica is not None and canonica is not resultado:
+                canonica.setdefault('republicacoes', []).append({'documento': local[0], 'pagina': local[1]})
+                continue
+            saida.append(resultado)
+        return saida
+
+
+def main():
+    """Função principal"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Detecção de republicações (MinHash + LSH)')
+    parser.add_argument('--dados', default='json_data', help='Diretório de saída do PDFExtractor')
+    parser.add_argument('--unidade', choices=['paginas', 'atos'], default='paginas',
+                        help='Compara páginas ou atos (JSON com --segmentar-atos)')
+    parser.add_argument('--limiar', type=float, default=LIMIAR_SIMILARIDADE,
+                        help=f'Similaridade mínima (padrão: {LIMIAR_SIMILARIDADE})')
+    parser.add_argument('--listar', type=int, default=10, help='Grupos listados (padrão: 10)')
+    args = parser.parse_args()
+
+    detector = DetectorDuplicatas(args.dados, unidade=args.unidade, limiar=args.limiar)
+    detector.atualizar()
+
+    grupos = detector.grupos()
+    print(f"\n{len(grupos)} grupo(s) de conteúdo republicado")
+    for grupo in grupos[:args.listar]:
+        print(f"\n{grupo['canonica']} ({len(grupo['republicacoes'])} republicação(ões))")
+        for id_unidade in grupo['republicacoes']:
+            print(f"   = {id_unidade}")
+
+
+if __name__ == "__main__":
+    main()
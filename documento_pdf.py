@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+Acesso sob demanda às páginas de PDFs grandes
+Mapeia o PDF em memória (mmap), lê a tabela xref uma única vez e extrai só
+as páginas pedidas, guardando as páginas já extraídas num cache LRU limitado
+por tamanho
+"""
+
+import argparse
+import json
+import logging
+import mmap
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from exportacao_colunar import inferir_data
+from extract_data import PDFExtractor
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentoPDF:
+    """
+    Documento PDF aberto de forma preguiçosa
+
+    Abrir o documento custa apenas a leitura do trailer e da tabela xref; o
+    conteúdo de cada página só é lido e decodificado quando a página é pedida.
+    As páginas extraídas têm o mesmo formato das páginas dos JSONs gerados
+    pelo PDFExtractor.
+
+    Uso:
+        with DocumentoPDF('iomat/diario.pdf', extrator) as documento:
+            pagina = documento.pagina(143)
+    """
+
+    def __init__(self, caminho_pdf, extrator: PDFExtractor,
+                 tamanho_cache_bytes: int = 32 * 1024 * 1024):
+        """
+        Abre o documento
+
+        Args:
+            caminho_pdf: Caminho para o arquivo PDF
+            extrator: Extrator usado para extrair o texto de cada página
+            tamanho_cache_bytes: Tamanho máximo (aproximado) dos textos mantidos
+                no cache de páginas extraídas
+        """
+        self.caminho_pdf = Path(caminho_pdf)
+        self.extrator = extrator
+        self.tamanho_cache_bytes = tamanho_cache_bytes
+
+        self._cache: 'OrderedDict[int, Dict]' = OrderedDict()
+        self._tamanho_cache = 0
+        self._metadados: Optional[Dict] = None
+        self._lock = threading.Lock()
+        self.estatisticas = {'acertos': 0, 'extraidas': 0, 'despejos': 0}
+
+        self._arquivo = open(self.caminho_pdf, 'rb')
+        try:
+            self._mapa = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+            self._documento = extrator.backend.abrir(self._mapa, str(self.caminho_pdf))
+            self.num_paginas = self._documento.num_paginas
+        except Exception:
+            self.fechar()
+            raise
+
+    def __enter__(self) -> 'DocumentoPDF':
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def __len__(self) -> int:
+        return self.num_paginas
+
+    def fechar(self):
+        """Libera o documento, o mapeamento e o arquivo"""
+        if getattr(self, '_documento', None) is not None:
+            self._documento.fechar()
+            self._documento = None
+        self._cache.clear()
+        self._tamanho_cache = 0
+        if getattr(self, '_mapa', None) is not None:
+            self._mapa.close()
+            self._mapa = None
+        self._arquivo.close()
+
+    @property
+    def metadados(self) -> Dict:
+        """Metadados do PDF (lidos na primeira consulta)"""
+        with self._lock:
+            if self._metadados is None:
+                self._metadados = self.extrator.extrair_metadados_pdf(self._documento)
+            return self._metadados
+
+    @staticmethod
+    def _tamanho(pagina: Dict) -> int:
+        return sys.getsizeof(pagina['texto']) + 200
+
+    def _liberar_conteudo(self, indice: int):
+        """
+        Descarta do backend o conteúdo já decodificado da página, para que a
+        memória fique limitada ao cache de textos
+        """
+        try:
+            self._documento.liberar_pagina(indice)
+        except Exception as e:
+            logger.debug(f"Conteúdo da página {indice + 1} mantido em memória: {e}")
+
+    def pagina(self, numero: int) -> Dict:
+        """
+        Extrai uma página (ou a devolve do cache)
+
+        Args:
+            numero: Número da página (base 1)
+
+        Returns:
+            Dict: Página com 'numero_pagina', 'texto', 'numero_caracteres' e
+                'numero_palavras' (e 'erro', se a extração falhou)
+
+        Raises:
+            IndexError: Se a página não existir no documento
+        """
+        if not 1 <= numero <= self.num_paginas:
+            raise IndexError(f"{self.caminho_pdf.name} tem {self.num_paginas} páginas (pedida: {numero})")
+
+        with self._lock:
+            pagina = self._cache.get(numero)
+            if pagina is not None:
+                self._cache.move_to_end(numero)
+                self.estatisticas['acertos'] += 1
+                return pagina
+
+            pagina = next(self.extrator._iterar_paginas(self._documento, numero - 1, numero))
+            self._liberar_conteudo(numero - 1)
+            self.estatisticas['extraidas'] += 1
+
+            self._cache[numero] = pagina
+            self._tamanho_cache += self._tamanho(pagina)
+            while self._tamanho_cache > self.tamanho_cache_bytes and len(self._cache) > 1:
+                _, despejada = self._cache.popitem(last=False)
+                self._tamanho_cache -= self._tamanho(despejada)
+                self.estatisticas['despejos'] += 1
+
+            return pagina
+
+    def paginas(self, inicio: int = 1, fim: Optional[int] = None) -> List[Dict]:
+        """
+        Extrai um intervalo de páginas
+
+        Args:
+            inicio: Primeira página (base 1)
+            fim: Última página, inclusive (padrão: última do documento)
+
+        Returns:
+            Lista de páginas na ordem do documento
+        """
+        fim = self.num_paginas if fim is None else fim
+        return [self.pagina(numero) for numero in range(inicio, fim + 1)]
+
+    def selecionar(self, numeros: Iterable[int]) -> List[Dict]:
+        """Extrai páginas avulsas (por exemplo, as encontradas numa busca), sem repetições"""
+        return [self.pagina(numero) for numero in sorted(set(numeros))]
+
+
+def localizar_pdf(pasta: str, data: date) -> Optional[Path]:
+    """
+    Encontra o PDF de uma pasta de origem pela data da edição no nome do arquivo
+
+    Args:
+        pasta: Pasta de PDFs (dje, doe, iomat...)
+        data: Data da edição
+
+    Returns:
+        Path do PDF ou None se não houver edição na data
+    """
+    for caminho in sorted(Path(pasta).glob('*.pdf')):
+        if inferir_data(caminho.name) == data:
+            return caminho
+    return None
+
+
+def _intervalos(especificacoes: List[str]) -> List[int]:
+    """Converte especificações como ['1', '140-145'] em números de página"""
+    numeros = []
+    for especificacao in especificacoes:
+        inicio, _, fim = especificacao.partition('-')
+        numeros.extend(range(int(inicio), int(fim or inicio) + 1))
+    return numeros
+
+
+def main():
+    """Função principal"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Extrai páginas avulsas de um PDF sem processá-lo inteiro')
+    parser.add_argument('pdf', nargs='?', help='Caminho do PDF')
+    parser.add_argument('--pasta', help='Pasta de origem, para localizar o PDF com --data')
+    parser.add_argument('--data', type=date.fromisoformat, help='Data da edição (AAAA-MM-DD)')
+    parser.add_argument('--paginas', nargs='+', default=['1'],
+                        help='Páginas ou intervalos, ex.: 1 140-145 (padrão: 1)')
+    parser.add_argument('--json', action='store_true', help='Imprime as páginas em JSON')
+    parser.add_argument('--backend', default='pypdf2', help='Backend de extração de texto (ver backends_pdf.py)')
+    args = parser.parse_args()
+
+    caminho = Path(args.pdf) if args.pdf else None
+    if caminho is None:
+        if not (args.pasta and args.data):
+            parser.error('informe o PDF ou --pasta e --data')
+        caminho = localizar_pdf(args.pasta, args.data)
+        if caminho is None:
+            parser.error(f'nenhuma edição de {args.data:%d/%m/%Y} em {args.pasta}')
+
+    extrator = PDFExtractor(backend=args.backend)
+
+    inicio = time.perf_counter()
+    with DocumentoPDF(caminho, extrator) as documento:
+        abertura = time.perf_counter() - inicio
+        paginas = documento.selecionar(_intervalos(args.paginas))
+        duracao = time.perf_counter() - inicio
+
+        if args.json:
+            print(json.dumps(paginas, ensure_ascii=False, indent=2))
+        else:
+            for pagina in paginas:
+                print(f"--- {caminho.name}, página {pagina['numero_pagina']}/{documento.num_paginas} ---")
+                print(pagina['texto'])
+
+    logger.info(f"{len(paginas)} página(s) de {caminho.name} em {duracao * 1000:.1f} ms "
+                f"(abertura: {abertura * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+"""
+Exportação colunar (Parquet) das páginas extraídas
+Converte os JSONs de json_data em um dataset Parquet particionado por pasta
+de origem, ano e mês, permitindo consultas filtradas sem carregar tudo
+"""
+
+import argparse
+import json
+import logging
+import re
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # dependência opcional
+    pa = None
+
+from indice_busca import listar_json
+
+logger = logging.getLogger(__name__)
+
+# Campos de metadados do PDF copiados para cada página
+CAMPOS_METADADOS = ['titulo', 'autor', 'assunto', 'criador', 'produtor', 'data_criacao', 'data_modificacao']
+
+# Padrões de data nos nomes dos arquivos (DOE_MPMT_DIARIO_03_10_2025, diario_oficial_2025-10-10_completo)
+PADRAO_DATA_DMA = re.compile(r'(?<!\d)(\d{2})[_\-.](\d{2})[_\-.](\d{4})(?!\d)')
+PADRAO_DATA_AMD = re.compile(r'(?<!\d)(\d{4})[_\-.](\d{2})[_\-.](\d{2})(?!\d)')
+# Data de criação do PDF (D:20251010135710-04'00')
+PADRAO_DATA_PDF = re.compile(r'^D:(\d{4})(\d{2})(\d{2})')
+
+
+def _criar_data(ano: str, mes: str, dia: str) -> Optional[date]:
+    try:
+        return date(int(ano), int(mes), int(dia))
+    except ValueError:
+        return None
+
+
+def inferir_data(nome_arquivo: str, metadados: Optional[Dict] = None) -> Optional[date]:
+    """
+    Infere a data da edição pelo nome do arquivo ou, se não houver data no
+    nome, pela data de criação do PDF
+
+    Args:
+        nome_arquivo: Nome do PDF ou do JSON
+        metadados: Metadados do PDF (opcional)
+
+    Returns:
+        date ou None se não for possível inferir
+    """
+    match = PADRAO_DATA_AMD.search(nome_arquivo)
+    if match:
+        data = _criar_data(match.group(1), match.group(2), match.group(3))
+        if data:
+            return data
+
+    match = PADRAO_DATA_DMA.search(nome_arquivo)
+    if match:
+        data = _criar_data(match.group(3), match.group(2), match.group(1))
+        if data:
+            return data
+
+    match = PADRAO_DATA_PDF.match((metadados or {}).get('data_criacao') or '')
+    if match:
+        return _criar_data(match.group(1), match.group(2), match.group(3))
+
+    return None
+
+
+def _schema():
+    """Schema das páginas exportadas (pasta_origem, ano e mês vão nos diretórios)"""
+    campos = [
+        ('arquivo', pa.string()),
+        ('data', pa.date32()),
+        ('numero_pagina', pa.int32()),
+        ('texto', pa.large_string()),
+        ('numero_caracteres', pa.int32()),
+        ('numero_palavras', pa.int32()),
+        ('erro', pa.string()),
+    ]
+    campos += [(campo, pa.string()) for campo in CAMPOS_METADADOS]
+    return pa.schema(campos)
+
+
+def _particionamento():
+    return ds.partitioning(
+        pa.schema([('pasta_origem', pa.string()), ('ano', pa.int16()), ('mes', pa.int8())]),
+        flavor='hive'
+    )
+
+
+class ExportadorColunar:
+    """Gera e consulta o dataset Parquet das páginas extraídas"""
+
+    NOME_DIRETORIO = '_colunar'
+
+    def __init__(self, diretorio_dados: str = "json_data", diretorio_saida: Optional[str] = None,
+                 compressao: str = 'zstd', linhas_por_grupo: int = 2048):
+        """
+        Inicializa o exportador
+
+        Args:
+            diretorio_dados: Diretório com os JSONs gerados pelo PDFExtractor
+            diretorio_saida: Diretório do dataset (padrão: <diretorio_dados>/_colunar)
+            compressao: Codec do Parquet ('zstd', 'snappy', 'gzip'...)
+            linhas_por_grupo: Páginas por row group (granularidade das estatísticas
+                usadas para pular dados nas consultas)
+        """
+        if pa is None:
+            raise ImportError("A exportação colunar requer o pacote pyarrow (pip install pyarrow)")
+
+        self.diretorio_dados = Path(diretorio_dados)
+        self.diretorio_saida = Path(diretorio_saida) if diretorio_saida else self.diretorio_dados / self.NOME_DIRETORIO
+        self.compressao = compressao
+        self.linhas_por_grupo = linhas_por_grupo
+
+    def _paginas(self, dados: Dict, data: Optional[date]) -> Iterator[Dict]:
+        """Gera os registros de página de um documento"""
+        metadados = dados.get('metadados', {})
+        for pagina in dados.get('paginas', []):
+            registro = {
+                'arquivo': dados['arquivo']['nome'],
+                'data': data,
+                'numero_pagina': pagina['numero_pagina'],
+                'texto': pagina.get('texto', ''),
+                'numero_caracteres': pagina.get('numero_caracteres', 0),
+                'numero_palavras': pagina.get('numero_palavras', 0),
+                'erro': pagina.get('erro'),
+            }
+            for campo in CAMPOS_METADADOS:
+                registro[campo] = metadados.get(campo) or None
+            yield registro
+
+    def _caminho_parquet(self, pasta_origem: str, data: Optional[date], nome: str) -> Path:
+        """Arquivo Parquet de um documento, dentro das partições hive"""
+        ano = data.year if data else 0
+        mes = data.month if data else 0
+        return self.diretorio_saida / f"pasta_origem={pasta_origem}" / f"ano={ano}" / f"mes={mes}" / f"{nome}.parquet"
+
+    def exportar_documento(self, caminho_json: Path) -> Path:
+        """
+        Exporta as páginas de um JSON para o seu arquivo Parquet
+
+        Args:
+            caminho_json: JSON gerado pelo PDFExtractor
+
+        Returns:
+            Path: Arquivo Parquet gravado
+        """
+        with open(caminho_json, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+
+        pasta_origem = caminho_json.parent.name
+        data = inferir_data(dados['arquivo']['nome'], dados.get('metadados'))
+        if data is None:
+            logger.warning(f"Data não identificada para {caminho_json.name}; partição ano=0/mes=0")
+
+        tabela = pa.Table.from_pylist(list(self._paginas(dados, data)), schema=_schema())
+
+        destino = self._caminho_parquet(pasta_origem, data, caminho_json.stem)
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        # Prefixo '.': ds.dataset ignora o temporário enquanto ele existir
+        arquivo_temp = destino.with_name(f".{destino.name}.tmp")
+        pq.write_table(tabela, arquivo_temp, compression=self.compressao,
+                       row_group_size=self.linhas_por_grupo)
+        arquivo_temp.replace(destino)
+        return destino
+
+    def exportar(self, forcar: bool = False) -> Dict[str, int]:
+        """
+        Exporta todos os JSONs, reaproveitando arquivos Parquet mais novos que o JSON
+
+        Args:
+            forcar: Se True, regrava todos os arquivos
+
+        Returns:
+            Dict com contagens de exportados, inalterados e removidos
+        """
+        # Chave "pasta/nome", a mesma para o JSON e para o Parquet (pasta_origem=<pasta>/...)
+        existentes = {
+            f"{caminho.relative_to(self.diretorio_saida).parts[0].split('=', 1)[1]}/{caminho.stem}": caminho
+            for caminho in self.diretorio_saida.glob('pasta_origem=*/**/*.parquet')
+        }
+        contagem = {'exportados': 0, 'inalterados': 0, 'removidos': 0}
+
+        for caminho_json in listar_json(self.diretorio_dados):
+            atual = existentes.pop(f"{caminho_json.parent.name}/{caminho_json.stem}", None)
+            if atual and not forcar and atual.stat().st_mtime >= caminho_json.stat().st_mtime:
+                contagem['inalterados'] += 1
+                continue
+
+            destino = self.exportar_documento(caminho_json)
+            if atual and atual != destino:
+                atual.unlink()
+            contagem['exportados'] += 1
+            logger.info(f"Exportado: {destino.relative_to(self.diretorio_saida)}")
+
+        # Documentos cujo JSON não existe mais
+        for caminho in existentes.values():
+            caminho.unlink()
+            contagem['removidos'] += 1
+
+        logger.info(
+            f"Exportação colunar: {contagem['exportados']} exportado(s), "
+            f"{contagem['inalterados']} inalterado(s), {contagem['removidos']} removido(s)"
+        )
+        return contagem
+
+    def consultar(self, pastas: Optional[List[str]] = None, data_inicio: Optional[date] = None,
+                  data_fim: Optional[date] = None, colunas: Optional[List[str]] = None):
+        """
+        Consulta o dataset lendo só as partições e row groups necessários
+
+        Os filtros por pasta e por ano/mês descartam diretórios inteiros; o
+        filtro por data usa as estatísticas de cada row group.
+
+        Args:
+            pastas: Pastas de origem desejadas (None = todas)
+            data_inicio: Data mínima (inclusive)
+            data_fim: Data máxima (inclusive)
+            colunas: Colunas a ler (None = todas)
+
+        Returns:
+            pyarrow.Table com as páginas selecionadas
+        """
+        dataset = ds.dataset(self.diretorio_saida, format='parquet', partitioning=_particionamento())
+
+        filtro = None
+
+        def juntar(expressao):
+            return expressao if filtro is None else filtro & expressao
+
+        ano, mes = ds.field('ano'), ds.field('mes')
+        if pastas:
+            filtro = juntar(ds.field('pasta_origem').isin(pastas))
+        if data_inicio:
+            # (ano, mes) >= (ano inicial, mês inicial): poda também os meses do ano inicial
+            particoes = (ano > data_inicio.year) | ((ano == data_inicio.year) & (mes >= data_inicio.month))
+            filtro = juntar(particoes & (ds.field('data') >= data_inicio))
+        if data_fim:
+            particoes = (ano < data_fim.year) | ((ano == data_fim.year) & (mes <= data_fim.month))
+            filtro = juntar(particoes & (ds.field('data') <= data_fim))
+
+        return dataset.to_table(columns=colunas, filter=filtro)
+
+
+def main():
+    """Função principal"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Exportação colunar (Parquet) das páginas extraídas')
+    parser.add_argument('--dados', default='json_data', help='Diretório com os JSONs extraídos')
+    parser.add_argument('--saida', default=None, help='Diretório do dataset (padrão: <dados>/_colunar)')
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+
+    exportar = subcomandos.add_parser('exportar', help='Exporta os JSONs para Parquet')
+    exportar.add_argument('--forcar', action='store_true', help='Regrava todos os arquivos')
+    exportar.add_argument('--compressao', default='zstd', help='Codec do Parquet')
+
+    consultar = subcomandos.add_parser('consultar', help='Consulta o dataset')
+    consultar.add_argument('--pasta', action='append', help='Pasta de origem (pode repetir)')
+    consultar.add_argument('--de', type=date.fromisoformat, help='Data inicial (AAAA-MM-DD)')
+    consultar.add_argument('--ate', type=date.fromisoformat, help='Data final (AAAA-MM-DD)')
+    consultar.add_argument('--colunas', nargs='+', help='Colunas a ler')
+    consultar.add_argument('--csv', help='Grava o resultado em CSV')
+
+    args = parser.parse_args()
+
+    if args.comando == 'exportar':
+        exportador = ExportadorColunar(args.dados, args.saida, compressao=args.compressao)
+        exportador.exportar(forcar=args.forcar)
+        return
+
+    exportador = ExportadorColunar(args.dados, args.saida)
+    colunas = args.colunas or ['pasta_origem', 'arquivo', 'data', 'numero_pagina', 'numero_caracteres']
+    tabela = exportador.consultar(args.pasta, args.de, args.ate, colunas)
+
+    print(f"{tabela.num_rows} página(s)")
+    if args.csv:
+        tabela.to_pandas().to_csv(args.csv, index=False, encoding='utf-8')
+        print(f"Resultado salvo em: {args.csv}")
+    else:
+        print(tabela.slice(0, 20).to_pandas().to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,14 +4,31 @@ Script para extrair dados de PDFs e salvar em formato JSON
 Extrai texto de cada pagina individualmente e organiza os dados
 """
 
-import PyPDF2
+import argparse
+import cProfile
+import ctypes
+import gc
+import hashlib
+import heapq
 import json
 import os
+import pstats
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator, Tuple
 import logging
 
+from backends_pdf import DocumentoBackend, criar_backend
+from boilerplate import AnaliseDocumento, ModelosBoilerplate, limpar_pagina
+from indice_busca import EstatisticasBusca
+from indice_entidades import IndiceEntidades
+from armazenamento_sqlite import ArmazenamentoSQLite
+from observador_pastas import ObservadorPastas
+from segmentacao_atos import SegmentadorAtos, segmentar_paginas
+
 # Configura��o de logging
 logging.basicConfig(
     level=logging.INFO,
@@ -23,27 +40,308 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Versão da lógica de extração: alterá-la invalida o manifesto e força a
+# reextração de todos os PDFs na próxima execução incremental
+VERSAO_EXTRATOR = '1.0'
+ARQUIVO_MANIFESTO = 'manifesto_extracao.json'
+
+
+try:
+    # Devolve ao sistema a memória livre do heap antes de zerar o pico de
+    # memória, que de outro modo partiria do maior documento já extraído
+    _malloc_trim = ctypes.CDLL('libc.so.6').malloc_trim
+except (OSError, AttributeError):  # fora da glibc
+    _malloc_trim = None
+
+# Páginas mais lentas listadas no bloco 'desempenho' de cada documento
+PAGINAS_MAIS_LENTAS = 5
+# Documentos mais lentos listados no resumo da extração
+DOCUMENTOS_MAIS_LENTOS = 10
+
+
+class ArquivoContador:
+    """Envolve um arquivo aberto em modo binário e conta os bytes lidos"""
+
+    def __init__(self, arquivo):
+        self._arquivo = arquivo
+        self.bytes_lidos = 0
+
+    def read(self, tamanho: int = -1) -> bytes:
+        dados = self._arquivo.read(tamanho)
+        self.bytes_lidos += len(dados)
+        return dados
+
+    def readline(self, tamanho: int = -1) -> bytes:
+        dados = self._arquivo.readline(tamanho)
+        self.bytes_lidos += len(dados)
+        return dados
+
+    def __getattr__(self, nome):
+        return getattr(self._arquivo, nome)
+
+
+def _reiniciar_pico_memoria() -> bool:
+    """
+    Zera o pico de memória residente do processo (VmHWM), para que a próxima
+    leitura de _pico_memoria_kb se refira só ao trabalho feito desde então
+
+    Returns:
+        bool: True se o pico foi zerado (Linux); nos demais sistemas o pico
+            não pode ser atribuído a um documento
+    """
+    # Os objetos do PyPDF2 formam ciclos: sem a coleta, a memória do
+    # documento anterior ainda estaria ocupada
+    gc.collect()
+    if _malloc_trim is not None:
+        _malloc_trim(0)
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _pico_memoria_kb(reiniciado: bool) -> Optional[int]:
+    """
+    Pico de memória residente do processo desde _reiniciar_pico_memoria, em KB
+
+    Args:
+        reiniciado: Retorno de _reiniciar_pico_memoria (se False, devolve None)
+    """
+    if not reiniciado:
+        return None
+    try:
+        with open('/proc/self/status', 'r') as f:
+            pico = re.search(r'^VmHWM:\s+(\d+)', f.read(), re.MULTILINE)
+    except OSError:
+        return None
+    return int(pico.group(1)) if pico else None
+
+
+class EscritorJSONIncremental:
+    """
+    Grava o JSON de um documento página a página, sem manter as páginas em memória
+
+    O layout é o mesmo de json.dump(..., indent=2), exceto pela chave
+    'informacoes', que é escrita por último, quando os totais são conhecidos.
+    A escrita é feita num arquivo temporário, renomeado apenas em fechar().
+    """
+
+    def __init__(self, arquivo_json: Path):
+        """
+        Args:
+            arquivo_json: Caminho final do arquivo JSON
+        """
+        self.arquivo_json = arquivo_json
+        self.arquivo_temp = arquivo_json.with_suffix('.json.tmp')
+        self.numero_paginas = 0
+        self.total_caracteres = 0
+        self.total_palavras = 0
+        self._arquivo = None
+
+    @staticmethod
+    def _serializar(valor, nivel: int) -> str:
+        """Serializa um valor com indentação de 2 espaços a partir do nível dado"""
+        texto = json.dumps(valor, ensure_ascii=False, indent=2)
+        return texto.replace('\n', '\n' + '  ' * nivel)
+
+    def abrir(self, arquivo: Dict, metadados: Dict):
+        """Inicia o documento, gravando os blocos 'arquivo' e 'metadados'"""
+        self._arquivo = open(self.arquivo_temp, 'w', encoding='utf-8')
+        self._arquivo.write('{\n')
+        self._arquivo.write(f'  "arquivo": {self._serializar(arquivo, 1)},\n')
+        self._arquivo.write(f'  "metadados": {self._serializar(metadados, 1)},\n')
+        self._arquivo.write('  "paginas": [')
+
+    def escrever_pagina(self, pagina: Dict):
+        """Grava uma página e acumula seus totais"""
+        separador = ',\n    ' if self.numero_paginas else '\n    '
+        self._arquivo.write(separador + self._serializar(pagina, 2))
+        self.numero_paginas += 1
+        self.total_caracteres += pagina['numero_caracteres']
+        self.total_palavras += pagina['numero_palavras']
+
+    def fechar(self, informacoes: Dict, atos: Optional[List[Dict]] = None):
+        """Grava os blocos 'atos' (se informado) e 'informacoes' e publica o arquivo final"""
+        self._arquivo.write('\n  ],\n' if self.numero_paginas else '],\n')
+        if atos is not None:
+            self._arquivo.write(f'  "atos": {self._serializar(atos, 1)},\n')
+        self._arquivo.write(f'  "informacoes": {self._serializar(informacoes, 1)}\n')
+        self._arquivo.write('}')
+        self._arquivo.close()
+        os.replace(self.arquivo_temp, self.arquivo_json)
+
+    def descartar(self):
+        """Interrompe a escrita e remove o arquivo temporário"""
+        if self._arquivo:
+            self._arquivo.close()
+        if self.arquivo_temp.exists():
+            self.arquivo_temp.unlink()
+
 
 class PDFExtractor:
     """Classe para extrair dados de PDFs e salvar em JSON"""
 
-    def __init__(self, output_dir: str = "json_data"):
+    def __init__(self, output_dir: str = "json_data", workers: int = 1,
+                 paginas_por_tarefa: int = 32, incremental: bool = False,
+                 streaming: bool = False, segmentar_atos: bool = False,
+                 perfilar_mais_lentos: int = 0, backend: str = 'pypdf2',
+                 indexar_entidades: bool = False, banco: Optional[str] = None,
+                 remover_boilerplate: bool = False):
         """
         Inicializa o extrator de PDFs
 
         Args:
             output_dir: Diret�rio onde os arquivos JSON ser�o salvos
+            workers: Número de processos usados na extração (1 = serial)
+            paginas_por_tarefa: Tamanho dos blocos de páginas enviados a cada
+                processo; PDFs maiores são divididos em vários blocos
+            incremental: Se True, PDFs inalterados desde a última extração
+                (segundo o manifesto) não são processados novamente
+            streaming: Se True, cada página é gravada no JSON assim que é
+                extraída e os resultados guardam apenas os totais de cada PDF
+            segmentar_atos: Se True, o JSON de cada PDF ganha o bloco 'atos',
+                com cabeçalho, categoria e intervalo (páginas e offsets) de cada ato
+            perfilar_mais_lentos: Se maior que zero, cada PDF é extraído sob o
+                cProfile e os perfis dos N mais lentos são gravados em
+                <output_dir>/_perfis (.prof para snakeviz/flameprof e .txt);
+                disponível apenas na extração serial (workers=1)
+            backend: Backend de extração de texto ('pypdf2', 'pypdf', 'pymupdf',
+                'pypdfium2' ou 'auto' para o mais rápido instalado); ver backends_pdf.py
+            indexar_entidades: Se True, mantém o índice de entidades (processos,
+                CNPJ, CPF, OAB...) em <output_dir>/_entidades; ver indice_entidades.py
+            banco: Se informado, cada documento salvo também é gravado nesse
+                banco SQLite (FTS5), além do JSON; ver armazenamento_sqlite.py
+            remover_boilerplate: Se True, cabeçalhos, rodapés e outros trechos
+                repetidos entre páginas e edições da mesma pasta saem do 'texto'
+                (e das contagens) e ficam no campo 'boilerplate' de cada página;
+                os modelos de cada pasta ficam em <output_dir>/_boilerplate
+                (ver boilerplate.py)
         """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self.workers = max(1, workers)
+        self.paginas_por_tarefa = max(1, paginas_por_tarefa)
+        self.incremental = incremental
+        self.streaming = streaming
+        self.segmentar_atos = segmentar_atos
+        self.perfilar_mais_lentos = max(0, perfilar_mais_lentos)
+        self.backend = criar_backend(backend)
+        self.indexar_entidades = indexar_entidades
+        self.banco = banco
+        self._armazenamento: Optional[ArmazenamentoSQLite] = None
+        self.remover_boilerplate = remover_boilerplate
+        self._modelos_boilerplate: Optional[ModelosBoilerplate] = None
+        self.diretorio_perfis = self.output_dir / '_perfis'
+        self._perfis: List[Tuple[float, str, Path]] = []
+        self._desempenho_execucao: List[Tuple[str, Dict]] = []
+        self._pdfs_encontrados: Dict[str, set] = {}
+        self.manifesto = self._carregar_manifesto()
         logger.info(f"Diret�rio de sa�da: {self.output_dir}")
 
+    def __getstate__(self) -> Dict:
+        # O manifesto não é necessário nos processos do pool
+        estado = self.__dict__.copy()
+        estado.pop('manifesto', None)
+        estado['_armazenamento'] = None
+        estado['_modelos_boilerplate'] = None
+        return estado
+
+    def _carregar_manifesto(self) -> Dict:
+        """Carrega o manifesto de extração do diretório de saída"""
+        arquivo_manifesto = self.output_dir / ARQUIVO_MANIFESTO
+
+        if arquivo_manifesto.exists():
+            try:
+                with open(arquivo_manifesto, 'r', encoding='utf-8') as f:
+                    manifesto = json.load(f)
+                if isinstance(manifesto.get('arquivos'), dict):
+                    return manifesto
+            except Exception as e:
+                logger.warning(f"Manifesto inválido, será recriado: {e}")
+
+        return {'versao_extrator': VERSAO_EXTRATOR, 'arquivos': {}}
+
+    def _salvar_manifesto(self):
+        """Grava o manifesto de forma atômica (arquivo temporário + rename)"""
+        self.manifesto['versao_extrator'] = VERSAO_EXTRATOR
+        arquivo_manifesto = self.output_dir / ARQUIVO_MANIFESTO
+        arquivo_temp = arquivo_manifesto.with_suffix('.json.tmp')
+
+        with open(arquivo_temp, 'w', encoding='utf-8') as f:
+            json.dump(self.manifesto, f, ensure_ascii=False, indent=2)
+        os.replace(arquivo_temp, arquivo_manifesto)
+
+    @staticmethod
+    def _calcular_hash(caminho: Path) -> str:
+        """Calcula o SHA-256 do conteúdo de um arquivo, em blocos de 1 MB"""
+        sha256 = hashlib.sha256()
+        with open(caminho, 'rb') as arquivo:
+            for bloco in iter(lambda: arquivo.read(1024 * 1024), b''):
+                sha256.update(bloco)
+        return sha256.hexdigest()
+
+    def _entrada_inalterada(self, pdf_path: Path, chave: str, arquivo_json: Path) -> Optional[Dict]:
+        """
+        Verifica no manifesto se um PDF já foi extraído e não mudou desde então
+
+        Tamanho e mtime iguais bastam; se apenas o mtime mudou, o hash do
+        conteúdo decide (e o mtime registrado é atualizado).
+
+        Args:
+            pdf_path: Caminho do PDF
+            chave: Chave do PDF no manifesto ("pasta/arquivo.pdf")
+            arquivo_json: JSON de saída correspondente
+
+        Returns:
+            Dict: Entrada do manifesto, ou None se o PDF precisa ser extraído
+        """
+        entrada = self.manifesto['arquivos'].get(chave)
+        if not entrada or entrada.get('versao_extrator') != VERSAO_EXTRATOR:
+            return None
+        if entrada.get('segmentar_atos', False) != self.segmentar_atos:
+            return None
+        if entrada.get('remover_boilerplate', False) != self.remover_boilerplate:
+            return None
+        if entrada.get('backend', 'pypdf2') != self.backend.nome:
+            return None
+        if not arquivo_json.exists():
+            return None
+
+        stat = pdf_path.stat()
+        if stat.st_size != entrada['tamanho_bytes']:
+            return None
+        if stat.st_mtime_ns == entrada['mtime_ns']:
+            return entrada
+
+        if self._calcular_hash(pdf_path) != entrada['sha256']:
+            return None
+
+        entrada['mtime_ns'] = stat.st_mtime_ns
+        return entrada
+
+    def _registrar_no_manifesto(self, pdf_path: Path, chave: str, dados: Dict):
+        """Registra no manifesto um PDF recém-extraído"""
+        stat = pdf_path.stat()
+        self.manifesto['arquivos'][chave] = {
+            'tamanho_bytes': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': self._calcular_hash(pdf_path),
+            'versao_extrator': VERSAO_EXTRATOR,
+            'segmentar_atos': self.segmentar_atos,
+            'remover_boilerplate': self.remover_boilerplate,
+            'backend': self.backend.nome,
+            'arquivo': dados['arquivo'],
+            'informacoes': dados['informacoes']
+        }
+
     def extrair_texto_pagina(self, page) -> str:
         """
         Extrai o texto de uma p�gina do PDF
 
         Args:
-            page: Objeto de p�gina do PyPDF2
+            page: Objeto de página do backend (com extract_text())
 
         Returns:
             str: Texto extra�do da p�gina
@@ -55,12 +353,12 @@ class PDFExtractor:
             logger.error(f"Erro ao extrair texto da p�gina: {e}")
             return ""
 
-    def extrair_metadados_pdf(self, pdf_reader) -> Dict:
+    def extrair_metadados_pdf(self, documento: DocumentoBackend) -> Dict:
         """
         Extrai metadados do PDF
 
         Args:
-            pdf_reader: Objeto PdfReader
+            documento: Documento aberto pelo backend de extração
 
         Returns:
             Dict: Dicion�rio com metadados
@@ -68,98 +366,415 @@ class PDFExtractor:
         metadados = {}
 
         try:
-            if pdf_reader.metadata:
+            info = documento.metadados
+            if info:
                 metadados = {
-                    'titulo': pdf_reader.metadata.get('/Title', ''),
-                    'autor': pdf_reader.metadata.get('/Author', ''),
-                    'assunto': pdf_reader.metadata.get('/Subject', ''),
-                    'criador': pdf_reader.metadata.get('/Creator', ''),
-                    'produtor': pdf_reader.metadata.get('/Producer', ''),
-                    'data_criacao': str(pdf_reader.metadata.get('/CreationDate', '')),
-                    'data_modificacao': str(pdf_reader.metadata.get('/ModDate', ''))
+                    'titulo': info.get('/Title', ''),
+                    'autor': info.get('/Author', ''),
+                    'assunto': info.get('/Subject', ''),
+                    'criador': info.get('/Creator', ''),
+                    'produtor': info.get('/Producer', ''),
+                    'data_criacao': str(info.get('/CreationDate', '')),
+                    'data_modificacao': str(info.get('/ModDate', ''))
                 }
         except Exception as e:
             logger.warning(f"Erro ao extrair metadados: {e}")
 
         return metadados
 
+    def _iterar_paginas(self, documento: DocumentoBackend, inicio: int, fim: int,
+                        medicoes: Optional[List[Tuple[int, float, int]]] = None,
+                        contador: Optional[ArquivoContador] = None) -> Iterator[Dict]:
+        """
+        Extrai, em ordem, as páginas do intervalo [inicio, fim) de um PDF
+
+        Args:
+            documento: Documento aberto pelo backend de extração
+            inicio: Índice (base 0) da primeira página
+            fim: Índice (base 0) seguinte à última página
+            medicoes: Se informada, recebe (página, segundos, bytes lidos) de cada página
+            contador: Arquivo do PDF envolvido por ArquivoContador (para os bytes lidos)
+
+        Yields:
+            Dict: Dados de cada página extraída
+        """
+        for num_pagina in range(inicio, fim):
+            instante = time.perf_counter()
+            bytes_antes = contador.bytes_lidos if contador else 0
+            try:
+                pagina = documento.pagina(num_pagina)
+                texto = self.extrair_texto_pagina(pagina)
+
+                dados_pagina = {
+                    'numero_pagina': num_pagina + 1,
+                    'texto': texto,
+                    'numero_caracteres': len(texto),
+                    'numero_palavras': len(texto.split()) if texto else 0
+                }
+
+                logger.debug(f"  - Página {num_pagina + 1}: {len(texto)} caracteres")
+
+            except Exception as e:
+                logger.error(f"Erro ao processar página {num_pagina + 1}: {e}")
+                dados_pagina = {
+                    'numero_pagina': num_pagina + 1,
+                    'texto': '',
+                    'erro': str(e),
+                    'numero_caracteres': 0,
+                    'numero_palavras': 0
+                }
+
+            if medicoes is not None:
+                duracao = time.perf_counter() - instante
+                bytes_lidos = (contador.bytes_lidos - bytes_antes) if contador else 0
+                medicoes.append((num_pagina + 1, duracao, bytes_lidos))
+                logger.debug(f"  - Página {num_pagina + 1}: {duracao * 1000:.1f} ms, {bytes_lidos} bytes lidos")
+
+            yield dados_pagina
+
+    def _dados_arquivo(self, caminho_pdf: Path) -> Dict:
+        """Monta o bloco 'arquivo' de um PDF"""
+        return {
+            'nome': caminho_pdf.name,
+            'caminho_original': str(caminho_pdf),
+            'pasta_origem': caminho_pdf.parent.name,
+            'tamanho_bytes': caminho_pdf.stat().st_size
+        }
+
+    def _montar_informacoes(self, num_paginas: int, total_caracteres: int,
+                            total_palavras: int, desempenho: Optional[Dict] = None) -> Dict:
+        """Monta o bloco 'informacoes' de um PDF"""
+        informacoes = {
+            'numero_total_paginas': num_paginas,
+            'data_extracao': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'total_caracteres': total_caracteres,
+            'total_palavras': total_palavras
+        }
+        if desempenho is not None:
+            informacoes['desempenho'] = desempenho
+        return informacoes
+
+    def _montar_desempenho(self, medicoes: List[Tuple[int, float, int]], tempo_total: float,
+                           bytes_lidos: int, pico_memoria_kb: Optional[int]) -> Dict:
+        """
+        Monta o bloco 'desempenho' de um PDF
+
+        Args:
+            medicoes: (página, segundos, bytes lidos) de cada página
+            tempo_total: Tempo de extração do documento (segundos)
+            bytes_lidos: Total de bytes lidos do PDF (inclui a estrutura do arquivo)
+            pico_memoria_kb: Pico de memória residente do processo durante a
+                extração do documento (inclui o que o processo já mantinha,
+                como os resultados anteriores fora do modo streaming), em KB;
+                None se não medido
+
+        Returns:
+            Dict: Tempos, bytes lidos, pico de memória e páginas mais lentas
+        """
+        mais_lentas = heapq.nlargest(PAGINAS_MAIS_LENTAS, medicoes, key=lambda medicao: medicao[1])
+        return {
+            'tempo_extracao_s': round(tempo_total, 3),
+            'tempo_medio_pagina_ms': round(sum(m[1] for m in medicoes) * 1000 / len(medicoes), 2) if medicoes else 0,
+            'bytes_lidos': bytes_lidos,
+            'pico_memoria_kb': pico_memoria_kb,
+            'paginas_mais_lentas': [
+                {'numero_pagina': pagina, 'tempo_ms': round(duracao * 1000, 2), 'bytes_lidos': lidos}
+                for pagina, duracao, lidos in mais_lentas
+            ]
+        }
+
+    def _montar_dados(self, caminho_pdf: Path, metadados: Dict, num_paginas: int,
+                      paginas: List[Dict], desempenho: Optional[Dict] = None) -> Dict:
+        """Monta a estrutura final de dados de um PDF já extraído"""
+        if self.remover_boilerplate:
+            self._remover_boilerplate(caminho_pdf, paginas)
+        dados = {
+            'arquivo': self._dados_arquivo(caminho_pdf),
+            'metadados': metadados,
+            'informacoes': self._montar_informacoes(
+                num_paginas,
+                sum(p['numero_caracteres'] for p in paginas),
+                sum(p['numero_palavras'] for p in paginas),
+                desempenho
+            ),
+            'paginas': paginas
+        }
+        if self.segmentar_atos:
+            dados['atos'] = segmentar_paginas(paginas, incluir_texto=False)
+        return dados
+
+    def _modelos(self) -> ModelosBoilerplate:
+        """Modelos de boilerplate das pastas de origem, carregados no primeiro uso"""
+        if self._modelos_boilerplate is None:
+            self._modelos_boilerplate = ModelosBoilerplate(str(self.output_dir))
+        return self._modelos_boilerplate
+
+    def _remover_boilerplate(self, caminho_pdf: Path, paginas: List[Dict]):
+        """
+        Remove o boilerplate das páginas de um documento inteiro, no lugar
+
+        O modelo usado é o aprendido no próprio documento somado ao da pasta
+        de origem, que em seguida passa a considerar este documento.
+
+        Args:
+            caminho_pdf: Caminho do PDF (a pasta define o modelo)
+            paginas: Páginas extraídas, com o texto original
+        """
+        pasta = caminho_pdf.parent.name
+        analise = AnaliseDocumento()
+        for pagina in paginas:
+            analise.adicionar_pagina(pagina['texto'])
+
+        modelo = analise.modelo(self._modelos().modelo(pasta))
+        removidos = sum(limpar_pagina(pagina, modelo) for pagina in paginas)
+        self._modelos().registrar(pasta, analise)
+        logger.info(f"  - Boilerplate: {removidos} caracteres removidos de "
+                    f"{sum('boilerplate' in pagina for pagina in paginas)} página(s)")
+
+    def _iniciar_boilerplate(self, caminho_pdf: Path) -> Optional[Tuple[AnaliseDocumento, Dict]]:
+        """
+        Análise e modelo usados no modo streaming, em que as páginas são
+        gravadas antes do fim do documento: só o modelo da pasta é aplicado,
+        e a análise atualiza o modelo ao final (None se a remoção estiver desligada)
+        """
+        if not self.remover_boilerplate:
+            return None
+        return AnaliseDocumento(), self._modelos().modelo(caminho_pdf.parent.name)
+
+    def _criar_segmentador(self) -> Optional[SegmentadorAtos]:
+        """Segmentador usado no modo streaming (None se a segmentação estiver desligada)"""
+        return SegmentadorAtos(incluir_texto=False) if self.segmentar_atos else None
+
+    def abrir_documento(self, caminho_pdf: Path, tamanho_cache_bytes: int = 32 * 1024 * 1024):
+        """
+        Abre um PDF para extração sob demanda de páginas avulsas (sem processá-lo inteiro)
+
+        Args:
+            caminho_pdf: Caminho para o arquivo PDF
+            tamanho_cache_bytes: Limite do cache de páginas já extraídas
+
+        Returns:
+            DocumentoPDF: Documento mapeado em memória (use com "with")
+        """
+        from documento_pdf import DocumentoPDF
+        return DocumentoPDF(caminho_pdf, self, tamanho_cache_bytes)
+
     def processar_pdf(self, caminho_pdf: Path) -> Optional[Dict]:
         """
-        Processa um arquivo PDF e extrai todo o conte�do por p�gina
+        Processa um arquivo PDF e extrai todo o conteúdo por página
 
         Args:
             caminho_pdf: Caminho para o arquivo PDF
 
         Returns:
-            Dict: Dicion�rio com dados extra�dos ou None em caso de erro
+            Dict: Dicionário com dados extraídos ou None em caso de erro
         """
         logger.info(f"Processando: {caminho_pdf.name}")
+        inicio = time.perf_counter()
+        memoria_reiniciada = _reiniciar_pico_memoria()
 
         try:
             with open(caminho_pdf, 'rb') as arquivo:
-                pdf_reader = PyPDF2.PdfReader(arquivo)
-
-                # Informa��es b�sicas do documento
-                num_paginas = len(pdf_reader.pages)
-                logger.info(f"  - N�mero de p�ginas: {num_paginas}")
-
-                # Extrai metadados
-                metadados = self.extrair_metadados_pdf(pdf_reader)
-
-                # Extrai texto de cada p�gina
-                paginas = []
-                for num_pagina in range(num_paginas):
-                    try:
-                        pagina = pdf_reader.pages[num_pagina]
-                        texto = self.extrair_texto_pagina(pagina)
-
-                        paginas.append({
-                            'numero_pagina': num_pagina + 1,
-                            'texto': texto,
-                            'numero_caracteres': len(texto),
-                            'numero_palavras': len(texto.split()) if texto else 0
-                        })
-
-                        logger.debug(f"  - P�gina {num_pagina + 1}: {len(texto)} caracteres")
-
-                    except Exception as e:
-                        logger.error(f"Erro ao processar p�gina {num_pagina + 1}: {e}")
-                        paginas.append({
-                            'numero_pagina': num_pagina + 1,
-                            'texto': '',
-                            'erro': str(e),
-                            'numero_caracteres': 0,
-                            'numero_palavras': 0
-                        })
+                contador = ArquivoContador(arquivo)
+                with self.backend.abrir(contador) as documento:
+                    # Informações básicas do documento
+                    num_paginas = documento.num_paginas
+                    logger.info(f"  - Número de páginas: {num_paginas}")
+
+                    # Extrai metadados
+                    metadados = self.extrair_metadados_pdf(documento)
+
+                    # Extrai texto de cada página, medindo tempo e bytes lidos
+                    medicoes = []
+                    paginas = list(self._iterar_paginas(documento, 0, num_paginas, medicoes, contador))
 
                 # Monta estrutura de dados
-                dados = {
-                    'arquivo': {
-                        'nome': caminho_pdf.name,
-                        'caminho_original': str(caminho_pdf),
-                        'pasta_origem': caminho_pdf.parent.name,
-                        'tamanho_bytes': caminho_pdf.stat().st_size
-                    },
-                    'metadados': metadados,
-                    'informacoes': {
-                        'numero_total_paginas': num_paginas,
-                        'data_extracao': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                        'total_caracteres': sum(p['numero_caracteres'] for p in paginas),
-                        'total_palavras': sum(p['numero_palavras'] for p in paginas)
-                    },
-                    'paginas': paginas
-                }
+                desempenho = self._montar_desempenho(medicoes, time.perf_counter() - inicio,
+                                                     contador.bytes_lidos, _pico_memoria_kb(memoria_reiniciada))
+                dados = self._montar_dados(caminho_pdf, metadados, num_paginas, paginas, desempenho)
 
-                logger.info(f"   Extra��o conclu�da: {num_paginas} p�ginas")
+                logger.info(f"   Extração concluída: {num_paginas} páginas")
                 return dados
 
         except FileNotFoundError:
-            logger.error(f"Arquivo n�o encontrado: {caminho_pdf}")
+            logger.error(f"Arquivo não encontrado: {caminho_pdf}")
+            return None
+        except Exception as e:
+            logger.error(f"Erro ao processar PDF {caminho_pdf.name}: {e}")
+            return None
+
+    def processar_pdf_streaming(self, caminho_pdf: Path, arquivo_json: Path) -> Optional[Dict]:
+        """
+        Processa um PDF gravando cada página no JSON assim que é extraída
+
+        Args:
+            caminho_pdf: Caminho para o arquivo PDF
+            arquivo_json: Caminho do JSON de saída
+
+        Returns:
+            Dict: Blocos 'arquivo' e 'informacoes' do documento ou None em caso de erro
+        """
+        logger.info(f"Processando: {caminho_pdf.name}")
+        inicio = time.perf_counter()
+        escritor = EscritorJSONIncremental(arquivo_json)
+        segmentador = self._criar_segmentador()
+        atos = [] if segmentador else None
+        boilerplate = self._iniciar_boilerplate(caminho_pdf)
+        medicoes = []
+        memoria_reiniciada = _reiniciar_pico_memoria()
+
+        try:
+            with open(caminho_pdf, 'rb') as arquivo:
+                contador = ArquivoContador(arquivo)
+                with self.backend.abrir(contador) as documento:
+                    num_paginas = documento.num_paginas
+                    logger.info(f"  - Número de páginas: {num_paginas}")
+
+                    dados_arquivo = self._dados_arquivo(caminho_pdf)
+                    escritor.abrir(dados_arquivo, self.extrair_metadados_pdf(documento))
+
+                    for pagina in self._iterar_paginas(documento, 0, num_paginas, medicoes, contador):
+                        if boilerplate:
+                            boilerplate[0].adicionar_pagina(pagina['texto'])
+                            limpar_pagina(pagina, boilerplate[1])
+                        escritor.escrever_pagina(pagina)
+                        if segmentador:
+                            atos.extend(segmentador.adicionar_pagina(pagina['numero_pagina'], pagina['texto']))
+
+                if segmentador:
+                    atos.extend(segmentador.finalizar())
+
+                desempenho = self._montar_desempenho(medicoes, time.perf_counter() - inicio,
+                                                     contador.bytes_lidos, _pico_memoria_kb(memoria_reiniciada))
+                informacoes = self._montar_informacoes(
+                    num_paginas, escritor.total_caracteres, escritor.total_palavras, desempenho)
+                escritor.fechar(informacoes, atos)
+                if boilerplate:
+                    self._modelos().registrar(caminho_pdf.parent.name, boilerplate[0])
+
+            logger.info(f"   Extração concluída: {num_paginas} páginas")
+            return {'arquivo': dados_arquivo, 'informacoes': informacoes}
+
+        except FileNotFoundError:
+            escritor.descartar()
+            logger.error(f"Arquivo não encontrado: {caminho_pdf}")
+            return None
+        except Exception as e:
+            escritor.descartar()
+            logger.error(f"Erro ao processar PDF {caminho_pdf.name}: {e}")
+            return None
+
+    def _agendar_pdf(self, executor: ProcessPoolExecutor, caminho_pdf: Path) -> Optional[Tuple]:
+        """
+        Lê a estrutura do PDF e distribui seus blocos de páginas no pool
+
+        Args:
+            executor: Pool de processos em uso
+            caminho_pdf: Caminho para o arquivo PDF
+
+        Returns:
+            Tuple: (metadados, número de páginas, futures dos blocos) ou None em caso de erro
+        """
+        logger.info(f"Agendando: {caminho_pdf.name}")
+
+        try:
+            with open(caminho_pdf, 'rb') as arquivo, self.backend.abrir(arquivo) as documento:
+                num_paginas = documento.num_paginas
+                metadados = self.extrair_metadados_pdf(documento)
+        except FileNotFoundError:
+            logger.error(f"Arquivo não encontrado: {caminho_pdf}")
+            return None
+        except Exception as e:
+            logger.error(f"Erro ao processar PDF {caminho_pdf.name}: {e}")
+            return None
+
+        futures = [
+            executor.submit(_extrair_intervalo_paginas, self, str(caminho_pdf), inicio,
+                            min(inicio + self.paginas_por_tarefa, num_paginas))
+            for inicio in range(0, num_paginas, self.paginas_por_tarefa)
+        ]
+        return metadados, num_paginas, futures
+
+    def _coletar_pdf(self, caminho_pdf: Path, agendamento: Optional[Tuple],
+                     arquivo_json: Optional[Path] = None) -> Optional[Dict]:
+        """
+        Aguarda os blocos de um PDF agendado e monta seus dados na ordem das páginas
+
+        Args:
+            caminho_pdf: Caminho para o arquivo PDF
+            agendamento: Retorno de _agendar_pdf
+            arquivo_json: Se informado, cada bloco é gravado neste JSON assim
+                que fica pronto (modo streaming)
+
+        Returns:
+            Dict: Dicionário com dados extraídos (no modo streaming, apenas os
+                blocos 'arquivo' e 'informacoes') ou None em caso de erro
+        """
+        if agendamento is None:
             return None
+
+        metadados, num_paginas, futures = agendamento
+        escritor = EscritorJSONIncremental(arquivo_json) if arquivo_json else None
+        segmentador = self._criar_segmentador() if escritor else None
+        atos = [] if segmentador else None
+        boilerplate = self._iniciar_boilerplate(caminho_pdf) if escritor else None
+        paginas = []
+        inicios, fins = [], []
+        medicoes, bytes_lidos, picos_memoria = [], 0, []
+
+        try:
+            if escritor:
+                escritor.abrir(self._dados_arquivo(caminho_pdf), metadados)
+
+            for future in futures:
+                paginas_bloco, inicio, fim, medicoes_bloco, bytes_bloco, pico_bloco = future.result()
+                medicoes.extend(medicoes_bloco)
+                bytes_lidos += bytes_bloco
+                if pico_bloco is not None:
+                    picos_memoria.append(pico_bloco)
+                if escritor:
+                    for pagina in paginas_bloco:
+                        if boilerplate:
+                            boilerplate[0].adicionar_pagina(pagina['texto'])
+                            limpar_pagina(pagina, boilerplate[1])
+                        escritor.escrever_pagina(pagina)
+                        if segmentador:
+                            atos.extend(segmentador.adicionar_pagina(pagina['numero_pagina'], pagina['texto']))
+                else:
+                    paginas.extend(paginas_bloco)
+                inicios.append(inicio)
+                fins.append(fim)
         except Exception as e:
+            if escritor:
+                escritor.descartar()
             logger.error(f"Erro ao processar PDF {caminho_pdf.name}: {e}")
             return None
 
+        logger.info(f"  - Número de páginas: {num_paginas}")
+        if futures:
+            logger.info(f"  - Tempo de extração: {max(fins) - min(inicios):.2f}s de parede, "
+                        f"{sum(f - i for i, f in zip(inicios, fins)):.2f}s somados em {len(futures)} bloco(s)")
+
+        # Pico de memória: o maior entre os blocos, cada um medido no processo que o extraiu
+        desempenho = self._montar_desempenho(
+            medicoes, max(fins) - min(inicios) if futures else 0.0, bytes_lidos,
+            max(picos_memoria) if picos_memoria else None)
+
+        if escritor:
+            if segmentador:
+                atos.extend(segmentador.finalizar())
+            informacoes = self._montar_informacoes(
+                num_paginas, escritor.total_caracteres, escritor.total_palavras, desempenho)
+            escritor.fechar(informacoes, atos)
+            if boilerplate:
+                self._modelos().registrar(caminho_pdf.parent.name, boilerplate[0])
+            dados = {'arquivo': self._dados_arquivo(caminho_pdf), 'informacoes': informacoes}
+        else:
+            dados = self._montar_dados(caminho_pdf, metadados, num_paginas, paginas, desempenho)
+
+        logger.info(f"   Extração concluída: {num_paginas} páginas")
+        return dados
+
     def salvar_json(self, dados: Dict, nome_arquivo: str) -> bool:
         """
         Salva os dados extra�dos em arquivo JSON
@@ -193,7 +808,9 @@ class PDFExtractor:
             pasta: Nome da pasta a processar
 
         Returns:
-            List[Dict]: Lista com dados de todos os PDFs processados
+            List[Dict]: Lista com dados de todos os PDFs processados. No modo
+                streaming, e para os PDFs inalterados no modo incremental, cada
+                item traz apenas as chaves 'arquivo' e 'informacoes'
         """
         pasta_path = Path(pasta)
 
@@ -205,8 +822,9 @@ class PDFExtractor:
         logger.info(f"Processando pasta: {pasta}")
         logger.info(f"{'='*60}")
 
-        # Encontra todos os PDFs na pasta
+        # Encontra todos os PDFs na pasta (a contagem do resumo reaproveita esta listagem)
         pdfs = list(pasta_path.glob("*.pdf"))
+        self._pdfs_encontrados[pasta] = {pdf_path.name for pdf_path in pdfs}
 
         if not pdfs:
             logger.warning(f"Nenhum PDF encontrado em {pasta}")
@@ -218,33 +836,195 @@ class PDFExtractor:
         subpasta_output = self.output_dir / pasta_path.name
         subpasta_output.mkdir(exist_ok=True)
 
-        resultados = []
-
-        for i, pdf_path in enumerate(pdfs, 1):
-            logger.info(f"\n[{i}/{len(pdfs)}] {pdf_path.name}")
+        inicio_pasta = time.perf_counter()
 
-            # Processa o PDF
-            dados = self.processar_pdf(pdf_path)
+        # Separa os PDFs inalterados desde a última extração
+        chaves = {pdf_path: f"{pasta_path.name}/{pdf_path.name}" for pdf_path in pdfs}
+        resultados_por_pdf = {}
+        pendentes = []
 
-            if dados:
-                # Salva JSON (sem extens�o .pdf no nome)
-                nome_arquivo = pdf_path.stem
-                arquivo_json = subpasta_output / f"{nome_arquivo}.json"
+        for pdf_path in pdfs:
+            arquivo_json = subpasta_output / f"{pdf_path.stem}.json"
+            entrada = self._entrada_inalterada(pdf_path, chaves[pdf_path], arquivo_json) \
+                if self.incremental else None
 
-                with open(arquivo_json, 'w', encoding='utf-8') as f:
-                    json.dump(dados, f, ensure_ascii=False, indent=2)
-
-                logger.info(f"   Salvo em: {arquivo_json}")
-                resultados.append(dados)
+            if entrada:
+                resultados_por_pdf[pdf_path] = {
+                    'arquivo': entrada['arquivo'],
+                    'informacoes': entrada['informacoes']
+                }
             else:
-                logger.error(f"   Falha ao processar {pdf_path.name}")
+                pendentes.append(pdf_path)
+
+        if self.incremental:
+            logger.info(f"{len(pdfs) - len(pendentes)} PDF(s) inalterado(s), "
+                        f"{len(pendentes)} a extrair")
+
+        if self.workers > 1 and pendentes:
+            if self.perfilar_mais_lentos:
+                logger.warning("Perfis de execução disponíveis apenas com workers=1; ignorando")
+            logger.info(f"Extração paralela com {self.workers} processos "
+                        f"(blocos de até {self.paginas_por_tarefa} páginas)")
+
+            # Fora do modo streaming, agenda todos os PDFs de uma vez para ocupar
+            # todos os processos; no streaming, limita os PDFs em andamento para
+            # que os blocos prontos não se acumulem na memória
+            janela = 2 * self.workers if self.streaming else len(pendentes)
+
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                agendamentos = {}
+                proximo = 0
+
+                for i, pdf_path in enumerate(pendentes):
+                    while proximo < len(pendentes) and proximo - i < janela:
+                        agendamentos[proximo] = self._agendar_pdf(executor, pendentes[proximo])
+                        proximo += 1
+
+                    logger.info(f"\n[{i + 1}/{len(pendentes)}] {pdf_path.name}")
+                    arquivo_json = subpasta_output / f"{pdf_path.stem}.json" if self.streaming else None
+                    dados = self._coletar_pdf(pdf_path, agendamentos.pop(i), arquivo_json)
+                    if self._salvar_resultado(pdf_path, dados, subpasta_output, chaves[pdf_path]):
+                        resultados_por_pdf[pdf_path] = dados
+        else:
+            for i, pdf_path in enumerate(pendentes, 1):
+                logger.info(f"\n[{i}/{len(pendentes)}] {pdf_path.name}")
+                dados = self._extrair_e_salvar(pdf_path, subpasta_output, chaves[pdf_path])
+                if dados:
+                    resultados_por_pdf[pdf_path] = dados
+
+        # Desempenho dos PDFs extraídos nesta execução (para o resumo)
+        for pdf_path in pendentes:
+            if pdf_path in resultados_por_pdf:
+                self._desempenho_execucao.append(
+                    (chaves[pdf_path], resultados_por_pdf[pdf_path]['informacoes']))
+
+        # Remove do manifesto os PDFs que não existem mais nesta pasta
+        prefixo = f"{pasta_path.name}/"
+        existentes = set(chaves.values())
+        for chave in [c for c in self.manifesto['arquivos'] if c.startswith(prefixo)]:
+            if chave not in existentes:
+                del self.manifesto['arquivos'][chave]
+        self._salvar_manifesto()
+        if self._modelos_boilerplate:
+            self._modelos_boilerplate.salvar()
+
+        # Mantém a ordem original dos arquivos, intercalando extraídos e reaproveitados
+        resultados = [resultados_por_pdf[pdf_path] for pdf_path in pdfs if pdf_path in resultados_por_pdf]
 
         logger.info(f"\n{'='*60}")
         logger.info(f"Pasta {pasta}: {len(resultados)}/{len(pdfs)} PDFs processados com sucesso")
+        logger.info(f"Tempo total da pasta: {time.perf_counter() - inicio_pasta:.2f}s")
         logger.info(f"{'='*60}")
 
         return resultados
 
+    def _extrair_e_salvar(self, pdf_path: Path, subpasta_output: Path, chave: str) -> Optional[Dict]:
+        """
+        Extrai um PDF no processo atual (sob o cProfile, se habilitado) e salva o resultado
+
+        Args:
+            pdf_path: Caminho do PDF
+            subpasta_output: Subpasta de saída da pasta de origem
+            chave: Chave do PDF no manifesto
+
+        Returns:
+            Dict: Dados extraídos, ou None se a extração ou a gravação falhou
+        """
+        perfil = cProfile.Profile() if self.perfilar_mais_lentos else None
+        inicio_arquivo = time.perf_counter()
+        if perfil:
+            perfil.enable()
+        if self.streaming:
+            dados = self.processar_pdf_streaming(pdf_path, subpasta_output / f"{pdf_path.stem}.json")
+        else:
+            dados = self.processar_pdf(pdf_path)
+        duracao = time.perf_counter() - inicio_arquivo
+        if perfil:
+            perfil.disable()
+            self._registrar_perfil(chave, duracao, perfil)
+        logger.info(f"  - Tempo de extração: {duracao:.2f}s")
+
+        return dados if self._salvar_resultado(pdf_path, dados, subpasta_output, chave) else None
+
+    def _registrar_perfil(self, chave: str, duracao: float, perfil: cProfile.Profile):
+        """
+        Mantém em disco apenas os perfis dos N PDFs mais lentos da execução
+
+        Cada perfil é gravado em <output_dir>/_perfis como .prof (formato do
+        pstats, aberto por snakeviz, flameprof ou gprof2dot) e como .txt com
+        as funções ordenadas pelo tempo acumulado.
+
+        Args:
+            chave: Chave do PDF no manifesto ("pasta/arquivo.pdf")
+            duracao: Tempo de extração do PDF (segundos)
+            perfil: Perfil coletado durante a extração
+        """
+        if len(self._perfis) >= self.perfilar_mais_lentos and duracao <= self._perfis[0][0]:
+            return
+
+        self.diretorio_perfis.mkdir(parents=True, exist_ok=True)
+        base = self.diretorio_perfis / Path(chave).with_suffix('').as_posix().replace('/', '__')
+        perfil.dump_stats(base.with_suffix('.prof'))
+        with open(base.with_suffix('.txt'), 'w', encoding='utf-8') as f:
+            f.write(f"{chave}: {duracao:.3f}s\n\n")
+            pstats.Stats(perfil, stream=f).sort_stats('cumulative').print_stats(40)
+
+        # Heap de mínimo: o topo é o mais rápido entre os perfis mantidos
+        if len(self._perfis) < self.perfilar_mais_lentos:
+            heapq.heappush(self._perfis, (duracao, chave, base))
+        else:
+            _, _, descartado = heapq.heapreplace(self._perfis, (duracao, chave, base))
+            for sufixo in ('.prof', '.txt'):
+                descartado.with_suffix(sufixo).unlink(missing_ok=True)
+
+    def _salvar_resultado(self, pdf_path: Path, dados: Optional[Dict], subpasta_output: Path,
+                          chave: str) -> bool:
+        """
+        Salva o JSON de um PDF processado e o registra no manifesto
+
+        Args:
+            pdf_path: Caminho do PDF de origem
+            dados: Dados extraídos (None se a extração falhou)
+            subpasta_output: Subpasta de saída da pasta de origem
+            chave: Chave do PDF no manifesto
+
+        Returns:
+            bool: True se o resultado foi salvo
+        """
+        if dados:
+            # Salva JSON (sem extensão .pdf no nome); no modo streaming o
+            # arquivo já foi gravado durante a extração
+            nome_arquivo = pdf_path.stem
+            arquivo_json = subpasta_output / f"{nome_arquivo}.json"
+
+            if not self.streaming:
+                with open(arquivo_json, 'w', encoding='utf-8') as f:
+                    json.dump(dados, f, ensure_ascii=False, indent=2)
+
+            logger.info(f"   Salvo em: {arquivo_json}")
+            if self.banco:
+                self._gravar_no_banco(arquivo_json, None if self.streaming else dados)
+            self._registrar_no_manifesto(pdf_path, chave, dados)
+            return True
+
+        logger.error(f"   Falha ao processar {pdf_path.name}")
+        return False
+
+    def _banco_sqlite(self) -> ArmazenamentoSQLite:
+        """Banco SQLite de saída, aberto na primeira gravação"""
+        if self._armazenamento is None:
+            self._armazenamento = ArmazenamentoSQLite(self.banco)
+        return self._armazenamento
+
+    def _gravar_no_banco(self, arquivo_json: Path, dados: Optional[Dict] = None):
+        """Grava no banco SQLite o documento salvo (relido do JSON no modo streaming)"""
+        if dados is None:
+            with open(arquivo_json, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        stat = arquivo_json.stat()
+        self._banco_sqlite().salvar_documento(arquivo_json.relative_to(self.output_dir).as_posix(), dados,
+                                             stat.st_size, stat.st_mtime_ns)
+
     def processar_todas_pastas(self, pastas: List[str]) -> Dict[str, List[Dict]]:
         """
         Processa PDFs de m�ltiplas pastas
@@ -265,17 +1045,112 @@ class PDFExtractor:
         total_processados = 0
         total_sucesso = 0
 
+        # Perfis e medições valem só para esta execução
+        self._desempenho_execucao = []
+        self._perfis = []
+        if self.perfilar_mais_lentos and self.diretorio_perfis.exists():
+            for arquivo in self.diretorio_perfis.iterdir():
+                arquivo.unlink()
+
         for pasta in pastas:
             dados = self.processar_pasta(pasta)
             resultados[pasta] = dados
-            total_processados += len(list(Path(pasta).glob("*.pdf"))) if Path(pasta).exists() else 0
+            total_processados += len(self._pdfs_encontrados.get(pasta, ()))
             total_sucesso += len(dados)
 
-        # Salva resumo geral
+        # Salva resumo geral e, ao lado dele, as estatísticas da busca ranqueada
         self._salvar_resumo(resultados, total_processados, total_sucesso)
+        EstatisticasBusca(str(self.output_dir)).atualizar()
+        if self.indexar_entidades:
+            IndiceEntidades(str(self.output_dir)).atualizar()
 
         return resultados
 
+    def observar_pastas(self, pastas: List[str], espera: float = 2.0, parar=None):
+        """
+        Modo de observação: processa as pastas uma vez e, a partir daí, extrai
+        cada PDF novo ou regravado assim que ele termina de ser gravado
+
+        Os eventos vêm do inotify (ver observador_pastas.py), sem novas
+        varreduras das pastas. A cada PDF, o manifesto, o resumo e as
+        estatísticas de busca são atualizados no lugar.
+
+        Args:
+            pastas: Pastas de PDFs observadas
+            espera: Segundos sem escrita até um PDF ser considerado gravado
+            parar: Função sem argumentos que encerra a observação ao retornar True
+        """
+        pastas_por_caminho = {Path(pasta): pasta for pasta in pastas}
+
+        # A observação começa antes da primeira passada para não perder os
+        # PDFs que chegarem durante ela
+        with ObservadorPastas(pastas, espera=espera) as observador:
+            self.processar_todas_pastas(pastas)
+            estatisticas = EstatisticasBusca(str(self.output_dir))
+            entidades = IndiceEntidades(str(self.output_dir)) if self.indexar_entidades else None
+            logger.info(f"Aguardando novos PDFs em {', '.join(pastas)} (Ctrl+C para encerrar)")
+
+            try:
+                for evento, pdf_path in observador.eventos(parar):
+                    pasta = pastas_por_caminho.get(pdf_path.parent)
+                    if pasta is None:
+                        continue
+                    chave = f"{pdf_path.parent.name}/{pdf_path.name}"
+                    encontrados = self._pdfs_encontrados.setdefault(pasta, set())
+
+                    if evento == 'removido':
+                        encontrados.discard(pdf_path.name)
+                        if self.manifesto['arquivos'].pop(chave, None) is None:
+                            continue
+                        logger.info(f"PDF removido: {chave}")
+                        if self.banco:
+                            self._banco_sqlite().remover_documento(f"{pdf_path.parent.name}/{pdf_path.stem}.json")
+                        if estatisticas.remover_documento(f"{pdf_path.parent.name}/{pdf_path.stem}.json"):
+                            estatisticas.salvar()
+                        if entidades and entidades.remover_documento(f"{pdf_path.parent.name}/{pdf_path.stem}.json"):
+                            entidades.salvar()
+                    else:
+                        encontrados.add(pdf_path.name)
+                        subpasta_output = self.output_dir / pdf_path.parent.name
+                        subpasta_output.mkdir(exist_ok=True)
+                        arquivo_json = subpasta_output / f"{pdf_path.stem}.json"
+                        if self.incremental and self._entrada_inalterada(pdf_path, chave, arquivo_json):
+                            logger.info(f"PDF inalterado: {chave}")
+                            continue
+
+                        logger.info(f"\nNovo PDF: {chave}")
+                        dados = self._extrair_e_salvar(pdf_path, subpasta_output, chave)
+                        # Uma falha também atualiza o resumo (o PDF passa a contar como erro)
+                        if dados:
+                            self._desempenho_execucao.append((chave, dados['informacoes']))
+                            estatisticas.adicionar_documento(arquivo_json, None if self.streaming else dados)
+                            estatisticas.salvar()
+                            if entidades:
+                                entidades.indexar_documento(arquivo_json, None if self.streaming else dados)
+                                entidades.salvar()
+
+                    self._salvar_manifesto()
+                    if self._modelos_boilerplate:
+                        self._modelos_boilerplate.salvar()
+                    self._atualizar_resumo(pastas)
+            except KeyboardInterrupt:
+                logger.info("Observação encerrada")
+
+    def _atualizar_resumo(self, pastas: List[str]):
+        """Regrava o resumo a partir do manifesto (sem reler os JSONs nem varrer as pastas)"""
+        resultados = {}
+        for pasta in pastas:
+            encontrados = self._pdfs_encontrados.get(pasta, set())
+            prefixo = f"{Path(pasta).name}/"
+            resultados[pasta] = [
+                {'arquivo': entrada['arquivo'], 'informacoes': entrada['informacoes']}
+                for chave, entrada in sorted(self.manifesto['arquivos'].items())
+                if chave.startswith(prefixo) and chave[len(prefixo):] in encontrados
+            ]
+
+        total_processados = sum(len(self._pdfs_encontrados.get(pasta, ())) for pasta in pastas)
+        self._salvar_resumo(resultados, total_processados, sum(len(dados) for dados in resultados.values()))
+
     def _salvar_resumo(self, resultados: Dict, total_processados: int, total_sucesso: int):
         """Salva um arquivo de resumo da extra��o"""
         resumo = {
@@ -297,6 +1172,8 @@ class PDFExtractor:
                 'arquivos': [d['arquivo']['nome'] for d in dados]
             }
 
+        resumo['desempenho'] = self._resumir_desempenho()
+
         # Salva resumo
         arquivo_resumo = self.output_dir / "resumo_extracao.json"
         with open(arquivo_resumo, 'w', encoding='utf-8') as f:
@@ -308,18 +1185,133 @@ class PDFExtractor:
         logger.info(f"Total de arquivos processados: {total_processados}")
         logger.info(f"Total de arquivos com sucesso: {total_sucesso}")
         logger.info(f"Total de arquivos com erro: {total_processados - total_sucesso}")
+        desempenho = resumo['desempenho']
+        if desempenho['documentos_extraidos']:
+            logger.info(f"Tempo de extração: {desempenho['tempo_extracao_s']:.2f}s em "
+                        f"{desempenho['paginas_extraidas']} página(s) "
+                        f"({desempenho['tempo_medio_pagina_ms']:.1f} ms/página), "
+                        f"{desempenho['bytes_lidos'] / 1024 / 1024:.1f} MB lidos")
         logger.info(f"Resumo salvo em: {arquivo_resumo}")
         logger.info(f"{'#'*60}\n")
 
+    def _resumir_desempenho(self) -> Dict:
+        """
+        Resume o desempenho dos PDFs extraídos nesta execução
+
+        Returns:
+            Dict: Totais, médias, documentos e páginas mais lentos e perfis gravados
+        """
+        documentos = [(chave, informacoes['numero_total_paginas'], informacoes['desempenho'])
+                      for chave, informacoes in self._desempenho_execucao]
+        tempo_total = sum(d['tempo_extracao_s'] for _, _, d in documentos)
+        total_paginas = sum(paginas for _, paginas, _ in documentos)
+        picos = [d['pico_memoria_kb'] for _, _, d in documentos if d['pico_memoria_kb'] is not None]
+
+        mais_lentos = heapq.nlargest(DOCUMENTOS_MAIS_LENTOS, documentos, key=lambda doc: doc[2]['tempo_extracao_s'])
+        paginas_lentas = heapq.nlargest(
+            DOCUMENTOS_MAIS_LENTOS,
+            ((chave, pagina) for chave, _, d in documentos for pagina in d['paginas_mais_lentas']),
+            key=lambda item: item[1]['tempo_ms']
+        )
+
+        return {
+            'documentos_extraidos': len(documentos),
+            'paginas_extraidas': total_paginas,
+            'tempo_extracao_s': round(tempo_total, 3),
+            'tempo_medio_pagina_ms': round(tempo_total * 1000 / total_paginas, 2) if total_paginas else 0,
+            'bytes_lidos': sum(d['bytes_lidos'] for _, _, d in documentos),
+            'pico_memoria_kb': max(picos) if picos else None,
+            'documentos_mais_lentos': [
+                {'arquivo': chave, 'numero_paginas': paginas, 'tempo_extracao_s': d['tempo_extracao_s'],
+                 'bytes_lidos': d['bytes_lidos']}
+                for chave, paginas, d in mais_lentos
+            ],
+            'paginas_mais_lentas': [{'arquivo': chave, **pagina} for chave, pagina in paginas_lentas],
+            'perfis': [
+                {'arquivo': chave, 'tempo_extracao_s': round(duracao, 3),
+                 'perfil': str(base.with_suffix('.prof'))}
+                for duracao, chave, base in sorted(self._perfis, reverse=True)
+            ]
+        }
+
+
+def _extrair_intervalo_paginas(extrator: PDFExtractor, caminho_pdf: str, inicio: int,
+                               fim: int) -> Tuple[List[Dict], float, float, List[Tuple[int, float, int]],
+                                                  int, Optional[int]]:
+    """
+    Extrai um bloco de páginas de um PDF (executado nos processos do pool)
+
+    Args:
+        extrator: Extrator configurado no processo principal
+        caminho_pdf: Caminho para o arquivo PDF
+        inicio: Índice (base 0) da primeira página do bloco
+        fim: Índice (base 0) seguinte à última página do bloco
+
+    Returns:
+        Tuple: (páginas extraídas, instante de início, instante de término,
+            medições por página, bytes lidos, pico de memória do bloco em KB)
+    """
+    instante_inicio = time.time()
+    medicoes = []
+    memoria_reiniciada = _reiniciar_pico_memoria()
+    with open(caminho_pdf, 'rb') as arquivo:
+        contador = ArquivoContador(arquivo)
+        with extrator.backend.abrir(contador) as documento:
+            paginas = list(extrator._iterar_paginas(documento, inicio, fim, medicoes, contador))
+    return (paginas, instante_inicio, time.time(), medicoes, contador.bytes_lidos,
+            _pico_memoria_kb(memoria_reiniciada))
+
 
 def main():
     """Fun��o principal"""
 
+    parser = argparse.ArgumentParser(description='Extrai o texto dos PDFs para JSON')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Processos de extração (0 = um por núcleo de CPU; padrão: 1, serial)')
+    parser.add_argument('--paginas-por-tarefa', type=int, default=32,
+                        help='Páginas por bloco enviado a cada processo (padrão: 32)')
+    parser.add_argument('--forcar', action='store_true',
+                        help='Reextrai todos os PDFs, ignorando o manifesto de extração')
+    parser.add_argument('--streaming', action='store_true',
+                        help='Grava cada página assim que é extraída, com memória constante')
+    parser.add_argument('--pastas', nargs='+', default=['dje', 'doe', 'iomat'],
+                        help='Pastas de PDFs a processar (padrão: dje doe iomat)')
+    parser.add_argument('--segmentar-atos', action='store_true',
+                        help='Inclui no JSON os atos (portarias, editais...) de cada documento')
+    parser.add_argument('--backend', default='pypdf2',
+                        choices=['auto', 'pypdf2', 'pypdf', 'pymupdf', 'pypdfium2'],
+                        help='Backend de extração de texto (padrão: pypdf2; auto = o mais rápido instalado)')
+    parser.add_argument('--perfilar', type=int, default=0, metavar='N',
+                        help='Grava em json_data/_perfis o perfil (cProfile) dos N PDFs mais lentos')
+    parser.add_argument('--observar', action='store_true',
+                        help='Depois da primeira passada, continua extraindo os PDFs novos (inotify)')
+    parser.add_argument('--espera', type=float, default=2.0,
+                        help='Segundos sem escrita até um PDF ser considerado gravado, com --observar')
+    parser.add_argument('--banco', action='store_true',
+                        help='Grava também os documentos no banco SQLite json_data/diarios.db (FTS5)')
+    parser.add_argument('--entidades', action='store_true',
+                        help='Mantém o índice de entidades (processos, CNPJ, CPF, OAB...) em json_data/_entidades')
+    parser.add_argument('--remover-boilerplate', action='store_true',
+                        help='Remove do texto os cabeçalhos, rodapés e trechos repetidos (mantidos à parte no JSON)')
+    args = parser.parse_args()
+
     # Define as pastas a processar
-    pastas_processar = ['dje', 'doe', 'iomat']
+    pastas_processar = args.pastas
 
     # Cria o extrator
-    extrator = PDFExtractor(output_dir='json_data')
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    extrator = PDFExtractor(output_dir='json_data', workers=workers,
+                            paginas_por_tarefa=args.paginas_por_tarefa,
+                            incremental=not args.forcar, streaming=args.streaming,
+                            segmentar_atos=args.segmentar_atos,
+                            perfilar_mais_lentos=args.perfilar, backend=args.backend,
+                            indexar_entidades=args.entidades,
+                            banco='json_data/diarios.db' if args.banco else None,
+                            remover_boilerplate=args.remover_boilerplate)
+
+    if args.observar:
+        extrator.observar_pastas(pastas_processar, espera=args.espera)
+        return
 
     # Processa todas as pastas
     resultados = extrator.processar_todas_pastas(pastas_processar)
@@ -0,0 +1,991 @@
+# -*- coding: utf-8 -*-
+"""
+Índice invertido de texto completo sobre os JSON gerados pelo PDFExtractor
+Permite buscas por termo, frase e expressões AND/OR com trechos de contexto
+e buscas ranqueadas por relevância (BM25) sobre páginas ou atos
+"""
+
+import argparse
+import bisect
+import gzip
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import time
+import unicodedata
+import zlib
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+from typing import List, Dict, Optional, Iterator, Tuple
+
+from segmentacao_atos import texto_ato
+
+logger = logging.getLogger(__name__)
+
+
+def _montar_tabela_normalizacao() -> Dict[int, str]:
+    """
+    Monta a tabela de str.translate que remove acentos e converte para minúsculas
+
+    Cada caractere é trocado por exatamente um caractere, de modo que os
+    offsets do texto normalizado continuam valendo no texto original.
+    """
+    tabela = {}
+    for codigo in range(0x250):
+        caractere = chr(codigo)
+        decomposto = unicodedata.normalize('NFKD', caractere)
+        base = ''.join(c for c in decomposto if not unicodedata.combining(c)).lower()
+        if len(base) == 1 and base != caractere:
+            tabela[codigo] = base
+    return tabela
+
+
+TABELA_NORMALIZACAO = _montar_tabela_normalizacao()
+PADRAO_TOKEN = re.compile(r'\w+')
+OPERADORES_E = {'AND', 'E'}
+OPERADORES_OU = {'OR', 'OU'}
+
+# Parâmetros do BM25 (valores usuais: k1 controla a saturação da frequência
+# do termo e b o peso da normalização pelo comprimento da unidade)
+BM25_K1 = 1.2
+BM25_B = 0.75
+UNIDADES_BUSCA = ('paginas', 'atos')
+
+
+def normalizar(texto: str) -> str:
+    """Remove acentos e converte para minúsculas, preservando o comprimento do texto"""
+    return texto.translate(TABELA_NORMALIZACAO)
+
+
+def tokenizar(texto: str) -> Iterator[Tuple[str, int]]:
+    """
+    Divide um texto em termos normalizados
+
+    Args:
+        texto: Texto original
+
+    Yields:
+        Tuple: (termo normalizado, offset do termo no texto original)
+    """
+    for match in PADRAO_TOKEN.finditer(normalizar(texto)):
+        yield match.group().lower(), match.start()
+
+
+def listar_json(diretorio_dados: Path) -> List[Path]:
+    """Lista os JSON de documentos (ignora subpastas auxiliares iniciadas por '_')"""
+    return sorted(
+        caminho for caminho in Path(diretorio_dados).glob('*/*.json')
+        if not caminho.parent.name.startswith('_')
+    )
+
+
+def idf_bm25(frequencia: int, total_unidades: int) -> float:
+    """IDF do BM25 (sempre positivo) de um termo presente em `frequencia` de `total_unidades` unidades"""
+    return math.log(1 + (total_unidades - frequencia + 0.5) / (frequencia + 0.5))
+
+
+def pontuacao_bm25(frequencia_termo: int, comprimento: int, comprimento_medio: float, idf: float) -> float:
+    """
+    Contribuição de um termo para a pontuação BM25 de uma unidade
+
+    Args:
+        frequencia_termo: Ocorrências do termo na unidade
+        comprimento: Número de termos da unidade
+        comprimento_medio: Número médio de termos das unidades do corpus
+        idf: IDF do termo (idf_bm25)
+    """
+    normalizacao = 1 - BM25_B + BM25_B * comprimento / comprimento_medio if comprimento_medio else 1
+    return idf * frequencia_termo * (BM25_K1 + 1) / (frequencia_termo + BM25_K1 * normalizacao)
+
+
+def montar_trechos(texto: str, ocorrencias: List[Tuple[int, int]], maximo: int = 3,
+                   tamanho_contexto: int = 80, marcador: str = '**') -> List[str]:
+    """
+    Monta trechos de contexto com as ocorrências destacadas
+
+    Ocorrências próximas são agrupadas no mesmo trecho; quando há mais grupos
+    que `maximo`, ficam os que reúnem mais termos distintos e mais ocorrências.
+
+    Args:
+        texto: Texto original
+        ocorrencias: Intervalos (inicio, fim) das ocorrências no texto
+        maximo: Número máximo de trechos
+        tamanho_contexto: Caracteres de contexto antes e depois de cada grupo
+        marcador: Texto colocado antes e depois de cada ocorrência
+
+    Returns:
+        List[str]: Trechos na ordem do texto
+    """
+    grupos = []
+    for inicio, fim in sorted(set(ocorrencias)):
+        if grupos and inicio - grupos[-1][1] <= tamanho_contexto and fim - grupos[-1][0] <= 2 * tamanho_contexto:
+            grupos[-1][1] = max(grupos[-1][1], fim)
+            grupos[-1][2].append((inicio, fim))
+        else:
+            grupos.append([inicio, fim, [(inicio, fim)]])
+
+    escolhidos = heapq.nlargest(
+        maximo, grupos,
+        key=lambda grupo: (len({normalizar(texto[i:f]).lower() for i, f in grupo[2]}), len(grupo[2]), -grupo[0])
+    )
+
+    trechos = []
+    for inicio, fim, intervalos in sorted(escolhidos):
+        cursor = max(0, inicio - tamanho_contexto)
+        partes = []
+        for i, f in intervalos:
+            if i >= cursor:
+                partes.append(f"{texto[cursor:i]}{marcador}{texto[i:f]}{marcador}")
+                cursor = f
+        partes.append(texto[cursor:min(len(texto), fim + tamanho_contexto)])
+        trechos.append(f"...{''.join(partes)}...")
+    return trechos
+
+
+class EstatisticasBusca:
+    """
+    Estatísticas do corpus usadas no ranqueamento BM25
+
+    Guarda o comprimento (em termos) de cada página e de cada ato e a
+    frequência de documentos de cada termo, isto é, em quantas páginas e em
+    quantos atos ele aparece. São gravadas em <diretorio_dados>/estatisticas_busca.json,
+    ao lado do resumo_extracao.json, pelo PDFExtractor ao fim de cada extração
+    e pelo pipeline a cada documento indexado.
+
+    O registro de cada documento guarda também a sua contribuição para as
+    frequências ({termo: unidades do documento com o termo}), de modo que um
+    documento alterado ou removido é descontado sem reler o corpus.
+    """
+
+    NOME_ARQUIVO = 'estatisticas_busca.json'
+    VERSAO = 2
+
+    def __init__(self, diretorio_dados: str = "json_data"):
+        """
+        Carrega as estatísticas gravadas (se existirem)
+
+        Args:
+            diretorio_dados: Diretório com as subpastas de JSON do PDFExtractor
+        """
+        self.diretorio_dados = Path(diretorio_dados)
+        self.arquivo = self.diretorio_dados / self.NOME_ARQUIVO
+        self.documentos: Dict[str, Dict] = {}
+        self.frequencias: Dict[str, Dict[str, int]] = {unidade: {} for unidade in UNIDADES_BUSCA}
+        self._alterado = False
+
+        if self.arquivo.exists():
+            with open(self.arquivo, 'r', encoding='utf-8') as f:
+                tabela = json.load(f)
+            if tabela.get('versao') == self.VERSAO:
+                self.documentos = tabela['documentos']
+                self.frequencias = tabela['frequencias']
+            else:
+                logger.warning("Versão das estatísticas de busca incompatível, elas serão recalculadas")
+        self._calcular_totais()
+
+    def _calcular_totais(self):
+        """Número de unidades e soma dos comprimentos, por tipo de unidade"""
+        self._totais = {unidade: [0, 0] for unidade in UNIDADES_BUSCA}
+        for registro in self.documentos.values():
+            self._somar_totais(registro)
+
+    def _somar_totais(self, registro: Dict, sinal: int = 1):
+        comprimentos = {
+            'paginas': list(registro['paginas'].values()),
+            'atos': [comprimento for _, _, comprimento in registro.get('atos', [])],
+        }
+        for unidade, valores in comprimentos.items():
+            self._totais[unidade][0] += sinal * len(valores)
+            self._totais[unidade][1] += sinal * sum(valores)
+
+    def totais(self, unidade: str) -> Tuple[int, float]:
+        """
+        Returns:
+            Tuple: (número de unidades, comprimento médio) do tipo de unidade
+        """
+        quantidade, soma = self._totais[unidade]
+        return quantidade, soma / quantidade if quantidade else 0.0
+
+    def frequencia(self, unidade: str, termo: str) -> int:
+        """Em quantas unidades (páginas ou atos) o termo aparece"""
+        return self.frequencias[unidade].get(termo, 0)
+
+    def _contabilizar(self, dados: Dict) -> Dict:
+        """
+        Soma às frequências os termos de um documento
+
+        Returns:
+            Dict: Registro do documento com os comprimentos das páginas
+                ({numero_pagina: termos}), dos atos ([pagina_inicio, offset_inicio, termos])
+                e a contribuição para as frequências ({unidade: {termo: unidades}})
+        """
+        paginas = dados.get('paginas', [])
+        registro = {'paginas': {}, 'termos': {'paginas': defaultdict(int)}}
+
+        for pagina in paginas:
+            termos = [termo for termo, _ in tokenizar(pagina.get('texto', ''))]
+            registro['paginas'][str(pagina['numero_pagina'])] = len(termos)
+            for termo in set(termos):
+                registro['termos']['paginas'][termo] += 1
+
+        if dados.get('atos'):
+            registro['atos'] = []
+            registro['termos']['atos'] = defaultdict(int)
+            for ato in dados['atos']:
+                texto = ato['texto'] if 'texto' in ato else texto_ato(paginas, ato)
+                termos = [termo for termo, _ in tokenizar(texto)]
+                registro['atos'].append([ato['pagina_inicio'], ato['offset_inicio'], len(termos)])
+                for termo in set(termos):
+                    registro['termos']['atos'][termo] += 1
+
+        registro['termos'] = {unidade: dict(contagem) for unidade, contagem in registro['termos'].items()}
+        self._somar_frequencias(registro)
+        return registro
+
+    def _somar_frequencias(self, registro: Dict, sinal: int = 1):
+        """Soma (ou, com sinal=-1, desconta) a contribuição de um documento às frequências"""
+        for unidade, contagem in registro['termos'].items():
+            frequencias = self.frequencias[unidade]
+            for termo, unidades in contagem.items():
+                total = frequencias.get(termo, 0) + sinal * unidades
+                if total > 0:
+                    frequencias[termo] = total
+                else:
+                    frequencias.pop(termo, None)
+
+    def remover_documento(self, caminho_relativo: str) -> bool:
+        """
+        Desconta um documento das estatísticas
+
+        Args:
+            caminho_relativo: Caminho do JSON relativo ao diretório de dados (ex.: 'dje/dje_0.json')
+
+        Returns:
+            bool: True se o documento estava contabilizado
+        """
+        registro = self.documentos.pop(caminho_relativo, None)
+        if registro is None:
+            return False
+        self._somar_frequencias(registro, -1)
+        self._somar_totais(registro, -1)
+        self._alterado = True
+        return True
+
+    def adicionar_documento(self, caminho_json: Path, dados: Optional[Dict] = None) -> bool:
+        """
+        Contabiliza um JSON novo ou alterado
+
+        Um documento já contabilizado é descontado antes de ser contado de novo.
+
+        Args:
+            caminho_json: Caminho do JSON
+            dados: Conteúdo já carregado do JSON (opcional)
+
+        Returns:
+            bool: True se as estatísticas mudaram
+        """
+        caminho_json = Path(caminho_json)
+        caminho_relativo = caminho_json.relative_to(self.diretorio_dados).as_posix()
+        stat = caminho_json.stat()
+        registro = self.documentos.get(caminho_relativo)
+        if registro is not None and stat.st_size == registro['tamanho_bytes'] \
+                and stat.st_mtime_ns == registro['mtime_ns']:
+            return False
+
+        try:
+            if dados is None:
+                with open(caminho_json, 'r', encoding='utf-8') as f:
+                    dados = json.load(f)
+        except Exception as e:
+            logger.error(f"Erro ao ler {caminho_json}: {e}")
+            return False
+
+        self.remover_documento(caminho_relativo)
+        registro = {'tamanho_bytes': stat.st_size, 'mtime_ns': stat.st_mtime_ns, **self._contabilizar(dados)}
+        self.documentos[caminho_relativo] = registro
+        self._somar_totais(registro)
+        self._alterado = True
+        return True
+
+    def recalcular(self):
+        """Recalcula as estatísticas de todos os JSON do diretório de dados"""
+        self.documentos = {}
+        self.frequencias = {unidade: {} for unidade in UNIDADES_BUSCA}
+        self._calcular_totais()
+        for caminho_json in listar_json(self.diretorio_dados):
+            self.adicionar_documento(caminho_json)
+        self._alterado = True
+
+    def atualizar(self) -> Dict[str, int]:
+        """
+        Sincroniza as estatísticas com o diretório de dados e grava o arquivo
+
+        Returns:
+            Dict: Contagem de documentos adicionados, alterados e removidos
+        """
+        inicio = time.perf_counter()
+        caminhos = {caminho.relative_to(self.diretorio_dados).as_posix(): caminho
+                    for caminho in listar_json(self.diretorio_dados)}
+        contagem = {'adicionados': 0, 'alterados': 0, 'removidos': 0}
+
+        for caminho_relativo in set(self.documentos) - set(caminhos):
+            contagem['removidos'] += self.remover_documento(caminho_relativo)
+
+        for caminho_relativo, caminho in caminhos.items():
+            tipo = 'alterados' if caminho_relativo in self.documentos else 'adicionados'
+            contagem[tipo] += self.adicionar_documento(caminho)
+
+        if self._alterado:
+            self.salvar()
+            logger.info(f"Estatísticas de busca atualizadas em {time.perf_counter() - inicio:.2f}s: {contagem}")
+        return contagem
+
+    def salvar(self):
+        """Grava as estatísticas"""
+        self.arquivo.parent.mkdir(parents=True, exist_ok=True)
+        arquivo_temp = self.arquivo.with_suffix('.tmp')
+        with open(arquivo_temp, 'w', encoding='utf-8') as f:
+            json.dump({'versao': self.VERSAO, 'documentos': self.documentos, 'frequencias': self.frequencias},
+                      f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(arquivo_temp, self.arquivo)
+        self._alterado = False
+
+
+class IndiceInvertido:
+    """
+    Índice invertido em disco sobre os JSON de um diretório de saída do PDFExtractor
+
+    As postings ficam em fragmentos (arquivos .json.gz escolhidos pelo hash do
+    termo) no formato {termo: {id_documento: {pagina: [posicao, offset, ...]}}},
+    de modo que uma consulta só carrega os fragmentos dos termos pesquisados.
+    """
+
+    NOME_DIRETORIO = '_indice'
+    NUMERO_FRAGMENTOS = 64
+    VERSAO = 1
+
+    def __init__(self, diretorio_dados: str = "json_data", diretorio_indice: Optional[str] = None,
+                 documentos_em_cache: int = 8):
+        """
+        Inicializa o índice
+
+        Args:
+            diretorio_dados: Diretório com as subpastas de JSON do PDFExtractor
+            diretorio_indice: Onde gravar o índice (padrão: <diretorio_dados>/_indice)
+            documentos_em_cache: Quantos documentos JSON manter em memória para montar trechos
+        """
+        self.diretorio_dados = Path(diretorio_dados)
+        self.diretorio_indice = Path(diretorio_indice) if diretorio_indice \
+            else self.diretorio_dados / self.NOME_DIRETORIO
+        self.diretorio_indice.mkdir(parents=True, exist_ok=True)
+
+        self.documentos_em_cache = documentos_em_cache
+        self._estatisticas: Optional[EstatisticasBusca] = None
+        self._inicios_atos: Dict[str, List[Tuple[int, int]]] = {}
+        self._fragmentos: Dict[int, Dict] = {}
+        self._fragmentos_alterados = set()
+        self._cache_documentos = OrderedDict()
+        self._carregar_documentos()
+
+    # ------------------------------------------------------------------
+    # Armazenamento
+    # ------------------------------------------------------------------
+
+    def _carregar_documentos(self):
+        """Carrega a tabela de documentos indexados"""
+        arquivo = self.diretorio_indice / 'documentos.json'
+        self.proximo_id = 1
+        self.documentos: Dict[str, Dict] = {}
+
+        if arquivo.exists():
+            with open(arquivo, 'r', encoding='utf-8') as f:
+                tabela = json.load(f)
+            if tabela.get('versao') == self.VERSAO:
+                self.proximo_id = tabela['proximo_id']
+                self.documentos = tabela['documentos']
+            else:
+                logger.warning("Versão do índice incompatível, o índice será reconstruído")
+                for arquivo_fragmento in self.diretorio_indice.glob('fragmento_*.json.gz'):
+                    arquivo_fragmento.unlink()
+
+        self._ids_por_caminho = {doc['caminho']: id_doc for id_doc, doc in self.documentos.items()}
+
+    def _numero_fragmento(self, termo: str) -> int:
+        return zlib.crc32(termo.encode('utf-8')) % self.NUMERO_FRAGMENTOS
+
+    def _fragmento(self, numero: int) -> Dict:
+        """Retorna um fragmento de postings, carregando-o do disco na primeira vez"""
+        if numero not in self._fragmentos:
+            arquivo = self.diretorio_indice / f'fragmento_{numero:02d}.json.gz'
+            if arquivo.exists():
+                with gzip.open(arquivo, 'rt', encoding='utf-8') as f:
+                    self._fragmentos[numero] = json.load(f)
+            else:
+                self._fragmentos[numero] = {}
+        return self._fragmentos[numero]
+
+    def salvar(self):
+        """Grava os fragmentos alterados e a tabela de documentos"""
+        for numero in sorted(self._fragmentos_alterados):
+            arquivo = self.diretorio_indice / f'fragmento_{numero:02d}.json.gz'
+            arquivo_temp = arquivo.with_suffix('.tmp')
+            with gzip.open(arquivo_temp, 'wt', encoding='utf-8', compresslevel=5) as f:
+                json.dump(self._fragmentos[numero], f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(arquivo_temp, arquivo)
+        self._fragmentos_alterados.clear()
+
+        arquivo = self.diretorio_indice / 'documentos.json'
+        arquivo_temp = arquivo.with_suffix('.tmp')
+        with open(arquivo_temp, 'w', encoding='utf-8') as f:
+            json.dump({'versao': self.VERSAO, 'proximo_id': self.proximo_id,
+                       'documentos': self.documentos}, f, ensure_ascii=False, indent=2)
+        os.replace(arquivo_temp, arquivo)
+
+    # ------------------------------------------------------------------
+    # Indexação
+    # ------------------------------------------------------------------
+
+    def _termos_da_pagina(self, texto: str) -> Iterator[Tuple[str, int, int]]:
+        """
+        Termos indexados de uma página
+
+        Yields:
+            Tuple: (termo, posição do termo na página, offset no texto)
+        """
+        for posicao, (termo, offset) in enumerate(tokenizar(texto)):
+            yield termo, posicao, offset
+
+    def _listar_json(self) -> List[Path]:
+        """Lista os JSON de documentos (ignora subpastas auxiliares iniciadas por '_')"""
+        return listar_json(self.diretorio_dados)
+
+    def indexar_documento(self, caminho_json: Path, dados: Optional[Dict] = None) -> bool:
+        """
+        Indexa (ou reindexa) um JSON gerado pelo PDFExtractor
+
+        Args:
+            caminho_json: Caminho do JSON
+            dados: Conteúdo já carregado do JSON (opcional)
+
+        Returns:
+            bool: True se o documento foi indexado
+        """
+        caminho_json = Path(caminho_json)
+        caminho_relativo = caminho_json.relative_to(self.diretorio_dados).as_posix()
+
+        try:
+            if dados is None:
+                with open(caminho_json, 'r', encoding='utf-8') as f:
+                    dados = json.load(f)
+        except Exception as e:
+            logger.error(f"Erro ao ler {caminho_json}: {e}")
+            return False
+
+        if caminho_relativo in self._ids_por_caminho:
+            self.remover_documento(caminho_relativo)
+
+        id_doc = str(self.proximo_id)
+        self.proximo_id += 1
+
+        # Agrupa as postings por fragmento antes de mesclá-las
+        novas_postings: Dict[int, Dict[str, Dict[str, List[int]]]] = {}
+        for pagina in dados.get('paginas', []):
+            chave_pagina = str(pagina['numero_pagina'])
+            for termo, posicao, offset in self._termos_da_pagina(pagina.get('texto', '')):
+                fragmento = novas_postings.setdefault(self._numero_fragmento(termo), {})
+                fragmento.setdefault(termo, {}).setdefault(chave_pagina, []).extend((posicao, offset))
+
+        for numero, postings in novas_postings.items():
+            fragmento = self._fragmento(numero)
+            for termo, por_pagina in postings.items():
+                fragmento.setdefault(termo, {})[id_doc] = por_pagina
+            self._fragmentos_alterados.add(numero)
+
+        stat = caminho_json.stat()
+        self.documentos[id_doc] = {
+            'caminho': caminho_relativo,
+            'tamanho_bytes': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'pasta_origem': dados.get('arquivo', {}).get('pasta_origem', caminho_json.parent.name),
+            'nome': dados.get('arquivo', {}).get('nome', caminho_json.name),
+            'numero_paginas': len(dados.get('paginas', [])),
+            'fragmentos': sorted(novas_postings)
+        }
+        self._ids_por_caminho[caminho_relativo] = id_doc
+        self._cache_documentos.pop(id_doc, None)
+        return True
+
+    def remover_documento(self, caminho_relativo: str) -> bool:
+        """
+        Remove do índice um documento (caminho relativo ao diretório de dados)
+
+        Só são carregados os fragmentos com termos do documento, registrados
+        na indexação (índices antigos, sem esse registro, percorrem todos)
+
+        Returns:
+            bool: True se o documento estava indexado
+        """
+        id_doc = self._ids_por_caminho.pop(caminho_relativo, None)
+        if id_doc is None:
+            return False
+
+        for numero in self.documentos[id_doc].get('fragmentos', range(self.NUMERO_FRAGMENTOS)):
+            fragmento = self._fragmento(numero)
+            vazios = []
+            for termo, por_documento in fragmento.items():
+                if por_documento.pop(id_doc, None) is not None:
+                    self._fragmentos_alterados.add(numero)
+                    if not por_documento:
+                        vazios.append(termo)
+            for termo in vazios:
+                del fragmento[termo]
+
+        del self.documentos[id_doc]
+        self._cache_documentos.pop(id_doc, None)
+        return True
+
+    def atualizar(self) -> Dict[str, int]:
+        """
+        Sincroniza o índice com o diretório de dados, indexando apenas JSON
+        novos ou alterados e removendo os que não existem mais
+
+        Returns:
+            Dict: Contagem de documentos adicionados, atualizados e removidos
+        """
+        inicio = time.perf_counter()
+        contagem = {'adicionados': 0, 'atualizados': 0, 'removidos': 0}
+        encontrados = set()
+
+        for caminho_json in self._listar_json():
+            caminho_relativo = caminho_json.relative_to(self.diretorio_dados).as_posix()
+            encontrados.add(caminho_relativo)
+
+            id_doc = self._ids_por_caminho.get(caminho_relativo)
+            if id_doc is not None:
+                registro = self.documentos[id_doc]
+                stat = caminho_json.stat()
+                if stat.st_size == registro['tamanho_bytes'] and stat.st_mtime_ns == registro['mtime_ns']:
+                    continue
+
+            if self.indexar_documento(caminho_json):
+                contagem['atualizados' if id_doc is not None else 'adicionados'] += 1
+                logger.info(f"Indexado: {caminho_relativo}")
+
+        for caminho_relativo in list(self._ids_por_caminho):
+            if caminho_relativo not in encontrados:
+                self.remover_documento(caminho_relativo)
+                contagem['removidos'] += 1
+                logger.info(f"Removido do índice: {caminho_relativo}")
+
+        self.salvar()
+        logger.info(f"Índice atualizado em {time.perf_counter() - inicio:.2f}s: {contagem}")
+        return contagem
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+
+    def postings(self, termo: str) -> Dict[str, Dict[str, List[int]]]:
+        """Postings de um termo já normalizado: {id_documento: {pagina: [posicao, offset, ...]}}"""
+        return self._fragmento(self._numero_fragmento(termo)).get(termo, {})
+
+    def _analisar_consulta(self, consulta: str) -> List[List[List[str]]]:
+        """
+        Converte a consulta em forma normal disjuntiva
+
+        Termos soltos são combinados com AND; OR tem precedência menor.
+        Trechos entre aspas são tratados como frases.
+
+        Returns:
+            List: Lista de conjunções; cada conjunção é uma lista de frases
+                (listas de termos normalizados)
+        """
+        conjuncoes = [[]]
+        for match in re.finditer(r'"([^"]*)"|(\S+)', consulta):
+            frase, palavra = match.groups()
+            if palavra in OPERADORES_OU:
+                conjuncoes.append([])
+                continue
+            if palavra in OPERADORES_E:
+                continue
+
+            termos = [termo for termo, _ in tokenizar(frase if frase is not None else palavra)]
+            if termos:
+                conjuncoes[-1].append(termos)
+
+        return [conjuncao for conjuncao in conjuncoes if conjuncao]
+
+    def _ocorrencias_frase(self, termos: List[str]) -> Dict[Tuple[str, str], List[Tuple[int, int]]]:
+        """
+        Localiza uma frase (termos consecutivos)
+
+        Returns:
+            Dict: {(id_documento, pagina): [(offset inicial, offset final), ...]}
+        """
+        listas = [self.postings(termo) for termo in termos]
+        if not all(listas):
+            return {}
+
+        ocorrencias = {}
+        primeira, ultima = listas[0], listas[-1]
+        for id_doc, por_pagina in primeira.items():
+            if not all(id_doc in lista for lista in listas[1:]):
+                continue
+
+            for pagina, valores in por_pagina.items():
+                if not all(pagina in lista[id_doc] for lista in listas[1:]):
+                    continue
+
+                posicoes_seguintes = [set(lista[id_doc][pagina][0::2]) for lista in listas[1:]]
+                offsets_ultimo = dict(zip(ultima[id_doc][pagina][0::2], ultima[id_doc][pagina][1::2]))
+                encontrados = []
+
+                for posicao, offset in zip(valores[0::2], valores[1::2]):
+                    if all(posicao + i in posicoes for i, posicoes in enumerate(posicoes_seguintes, 1)):
+                        posicao_final = posicao + len(termos) - 1
+                        encontrados.append((offset, offsets_ultimo[posicao_final] + len(termos[-1])))
+
+                if encontrados:
+                    ocorrencias[(id_doc, pagina)] = encontrados
+
+        return ocorrencias
+
+    def _avaliar(self, conjuncoes: List[List[List[str]]]) -> Dict[Tuple[str, str], List[Tuple[int, int]]]:
+        """Avalia a consulta em forma normal disjuntiva no nível de página"""
+        resultado: Dict[Tuple[str, str], List[Tuple[int, int]]] = {}
+
+        for conjuncao in conjuncoes:
+            # Avalia primeiro as frases mais raras para reduzir as interseções
+            frases = sorted(conjuncao, key=lambda termos: min(len(self.postings(t)) for t in termos))
+            parcial = self._ocorrencias_frase(frases[0])
+            for termos in frases[1:]:
+                if not parcial:
+                    break
+                outras = self._ocorrencias_frase(termos)
+                parcial = {chave: parcial[chave] + outras[chave] for chave in parcial if chave in outras}
+
+            for chave, trechos in parcial.items():
+                resultado.setdefault(chave, []).extend(trechos)
+
+        return resultado
+
+    def _carregar_documento(self, id_doc: str) -> Dict:
+        """Carrega o JSON de um documento, mantendo os mais recentes em cache (LRU)"""
+        if id_doc in self._cache_documentos:
+            self._cache_documentos.move_to_end(id_doc)
+            return self._cache_documentos[id_doc]
+
+        with open(self.diretorio_dados / self.documentos[id_doc]['caminho'], 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+
+        self._cache_documentos[id_doc] = dados
+        if len(self._cache_documentos) > self.documentos_em_cache:
+            self._cache_documentos.popitem(last=False)
+        return dados
+
+    def _texto_pagina(self, id_doc: str, pagina: int) -> str:
+        """Texto de uma página de um documento indexado"""
+        paginas = self._carregar_documento(id_doc).get('paginas', [])
+        if 0 < pagina <= len(paginas) and paginas[pagina - 1]['numero_pagina'] == pagina:
+            return paginas[pagina - 1]['texto']
+        return next((p['texto'] for p in paginas if p['numero_pagina'] == pagina), '')
+
+    def _resultado_booleano(self, chave: Tuple[str, str], trechos: List[Tuple[int, int]],
+                            tamanho_contexto: int) -> Dict:
+        """Monta um resultado de buscar() com o contexto da primeira ocorrência da página"""
+        id_doc, pagina = chave
+        documento = self.documentos[id_doc]
+        trechos = sorted(trechos)
+        texto = self._texto_pagina(id_doc, int(pagina))
+        inicio_ocorrencia, fim_ocorrencia = trechos[0]
+        inicio = max(0, inicio_ocorrencia - tamanho_contexto)
+        fim = min(len(texto), fim_ocorrencia + tamanho_contexto)
+
+        return {
+            'documento': documento['caminho'],
+            'arquivo': documento['nome'],
+            'pasta_origem': documento['pasta_origem'],
+            'pagina': int(pagina),
+            'ocorrencias': len(trechos),
+            'offset': inicio_ocorrencia,
+            'contexto': f"...{texto[inicio:fim]}..."
+        }
+
+    def buscar(self, consulta: str, limite: Optional[int] = 20, tamanho_contexto: int = 150) -> List[Dict]:
+        """
+        Executa uma consulta no índice
+
+        Exemplos: 'portaria', '"ministério público"', 'edital AND licitação',
+        'exoneração OR nomeação', '"processo seletivo" cuiabá'
+
+        Args:
+            consulta: Termos, frases entre aspas e operadores AND/OR (E/OU)
+            limite: Número máximo de páginas retornadas (None = todas)
+            tamanho_contexto: Caracteres de contexto antes e depois da ocorrência
+
+        Returns:
+            List[Dict]: Páginas encontradas, na ordem do corpus, com trecho de contexto
+        """
+        ocorrencias = self._avaliar(self._analisar_consulta(consulta))
+        chaves = sorted(ocorrencias, key=lambda chave: (int(chave[0]), int(chave[1])))
+        if limite is not None:
+            chaves = chaves[:limite]
+
+        return [self._resultado_booleano(chave, ocorrencias[chave], tamanho_contexto) for chave in chaves]
+
+    def estatisticas_busca(self) -> EstatisticasBusca:
+        """Estatísticas do BM25, sincronizadas com o diretório de dados na primeira consulta"""
+        if self._estatisticas is None:
+            self._estatisticas = EstatisticasBusca(str(self.diretorio_dados))
+            self._estatisticas.atualizar()
+            self._inicios_atos.clear()
+        return self._estatisticas
+
+    def _localizar_ato(self, caminho: str, registro: Dict, pagina: int, offset: int) -> Optional[int]:
+        """Índice (base 0) do ato que contém a posição, ou None se ela vem antes do primeiro ato"""
+        inicios = self._inicios_atos.get(caminho)
+        if inicios is None:
+            inicios = self._inicios_atos[caminho] = [(p, o) for p, o, _ in registro.get('atos', [])]
+        indice = bisect.bisect_right(inicios, (pagina, offset)) - 1
+        return indice if indice >= 0 else None
+
+    def _ocorrencias_unidades(self, termo: str, unidade: str) -> Iterator[Tuple[Tuple[str, int], int, int]]:
+        """
+        Ocorrências de um termo agrupadas por unidade
+
+        Yields:
+            Tuple: ((id_documento, índice da unidade), página, offset) para cada
+                ocorrência; a unidade é o número da página ou o índice do ato
+        """
+        documentos = self.estatisticas_busca().documentos
+        for id_doc, por_pagina in self.postings(termo).items():
+            caminho = self.documentos[id_doc]['caminho']
+            registro = documentos.get(caminho)
+            if registro is None:
+                continue
+            for pagina, valores in por_pagina.items():
+                numero = int(pagina)
+                for offset in valores[1::2]:
+                    if unidade == 'paginas':
+                        yield (id_doc, numero), numero, offset
+                    else:
+                        indice = self._localizar_ato(caminho, registro, numero, offset)
+                        if indice is not None:
+                            yield (id_doc, indice), numero, offset
+
+    def _comprimento(self, chave: Tuple[str, int], unidade: str) -> int:
+        """Número de termos de uma unidade (páginas ausentes das estatísticas valem a média)"""
+        id_doc, indice = chave
+        estatisticas = self.estatisticas_busca()
+        registro = estatisticas.documentos[self.documentos[id_doc]['caminho']]
+        if unidade == 'paginas':
+            return registro['paginas'].get(str(indice), round(estatisticas.totais(unidade)[1]))
+        return registro['atos'][indice][2]
+
+    def _pontuar(self, consulta: str, unidade: str) -> Tuple[Dict[Tuple[str, int], float],
+                                                             Dict[Tuple[str, int], List[Tuple[int, int, int]]]]:
+        """
+        Pontua com BM25 as unidades que contêm algum termo da consulta
+
+        Returns:
+            Tuple: ({(id_documento, unidade): pontuação},
+                {(id_documento, unidade): [(pagina, inicio, fim), ...]})
+        """
+        if unidade not in UNIDADES_BUSCA:
+            raise ValueError(f"Unidade inválida: {unidade} (use 'paginas' ou 'atos')")
+
+        estatisticas = self.estatisticas_busca()
+        total_unidades, comprimento_medio = estatisticas.totais(unidade)
+        termos = list(dict.fromkeys(
+            termo for conjuncao in self._analisar_consulta(consulta) for frase in conjuncao for termo in frase
+        ))
+
+        pontuacoes: Dict[Tuple[str, int], float] = defaultdict(float)
+        ocorrencias: Dict[Tuple[str, int], List[Tuple[int, int, int]]] = defaultdict(list)
+        for termo in termos:
+            frequencias: Dict[Tuple[str, int], int] = defaultdict(int)
+            for chave, pagina, offset in self._ocorrencias_unidades(termo, unidade):
+                frequencias[chave] += 1
+                ocorrencias[chave].append((pagina, offset, offset + len(termo)))
+
+            idf = idf_bm25(estatisticas.frequencia(unidade, termo) or len(frequencias), total_unidades)
+            for chave, frequencia in frequencias.items():
+                pontuacoes[chave] += pontuacao_bm25(frequencia, self._comprimento(chave, unidade),
+                                                    comprimento_medio, idf)
+
+        return pontuacoes, ocorrencias
+
+    def _resultado_ranqueado(self, chave: Tuple[str, int], pontuacao: float,
+                             ocorrencias: List[Tuple[int, int, int]], unidade: str,
+                             trechos_por_resultado: int, tamanho_contexto: int, marcador: str) -> Dict:
+        """Monta um resultado de buscar_ranqueado() com os trechos destacados"""
+        id_doc, indice = chave
+        documento = self.documentos[id_doc]
+        por_pagina: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+        for pagina, inicio, fim in ocorrencias:
+            por_pagina[pagina].append((inicio, fim))
+
+        trechos = []
+        for pagina in sorted(por_pagina):
+            if len(trechos) >= trechos_por_resultado:
+                break
+            trechos.extend(montar_trechos(self._texto_pagina(id_doc, pagina), por_pagina[pagina],
+                                          trechos_por_resultado - len(trechos), tamanho_contexto, marcador))
+
+        resultado = {
+            'documento': documento['caminho'],
+            'arquivo': documento['nome'],
+            'pasta_origem': documento['pasta_origem'],
+            'pagina': min(por_pagina),
+            'pontuacao': round(pontuacao, 4),
+            'ocorrencias': len(ocorrencias),
+            'trechos': trechos
+        }
+        if unidade == 'atos':
+            ato = self._carregar_documento(id_doc)['atos'][indice]
+            resultado.update({
+                'ato': indice + 1,
+                'tipo': ato['tipo'],
+                'titulo': ato['titulo'],
+                'numero': ato['numero'],
+                'pagina': ato['pagina_inicio'],
+                'pagina_fim': ato['pagina_fim'],
+            })
+        return resultado
+
+    def buscar_ranqueado(self, consulta: str, limite: Optional[int] = 20, unidade: str = 'paginas',
+                         trechos_por_resultado: int = 3, tamanho_contexto: int = 80,
+                         marcador: str = '**') -> List[Dict]:
+        """
+        Busca por relevância (BM25): as unidades com qualquer um dos termos da
+        consulta são pontuadas e as `limite` melhores são escolhidas com um heap
+
+        Frases entre aspas e operadores são tratados como termos soltos.
+
+        Args:
+            consulta: Termos da busca
+            limite: Número máximo de resultados (None = todos)
+            unidade: 'paginas' ou 'atos' (atos só nos JSON com o bloco 'atos')
+            trechos_por_resultado: Número máximo de trechos de cada resultado
+            tamanho_contexto: Caracteres de contexto antes e depois dos trechos
+            marcador: Texto colocado antes e depois de cada ocorrência nos trechos
+
+        Returns:
+            List[Dict]: Resultados em ordem decrescente de pontuação, com os
+                trechos destacados
+        """
+        pontuacoes, ocorrencias = self._pontuar(consulta, unidade)
+        if limite is None:
+            melhores = sorted(pontuacoes.items(), key=lambda item: item[1], reverse=True)
+        else:
+            melhores = heapq.nlargest(limite, pontuacoes.items(), key=lambda item: item[1])
+
+        return [self._resultado_ranqueado(chave, pontuacao, ocorrencias[chave], unidade,
+                                          trechos_por_resultado, tamanho_contexto, marcador)
+                for chave, pontuacao in melhores]
+
+    def pesquisar(self, consulta: str, pagina: int = 1, por_pagina: int = 20, ranquear: bool = False,
+                  unidade: str = 'paginas', trechos_por_resultado: int = 3) -> Dict:
+        """
+        Busca paginada, como buscar() (ordem do corpus) ou buscar_ranqueado()
+
+        Só os resultados da página pedida têm trechos montados; os anteriores
+        são apenas contados.
+
+        Args:
+            consulta: Consulta (ver buscar e buscar_ranqueado)
+            pagina: Página de resultados (base 1)
+            por_pagina: Resultados por página
+            ranquear: Se True, ordena por relevância (BM25)
+            unidade: Unidade ranqueada ('paginas' ou 'atos')
+            trechos_por_resultado: Trechos por resultado na busca ranqueada
+
+        Returns:
+            Dict: 'total' de resultados e os 'resultados' da página
+        """
+        inicio = (pagina - 1) * por_pagina
+        if ranquear:
+            pontuacoes, ocorrencias = self._pontuar(consulta, unidade)
+            melhores = heapq.nlargest(inicio + por_pagina, pontuacoes.items(), key=lambda item: item[1])
+            return {
+                'total': len(pontuacoes),
+                'resultados': [self._resultado_ranqueado(chave, pontuacao, ocorrencias[chave], unidade,
+                                                         trechos_por_resultado, 80, '**')
+                               for chave, pontuacao in melhores[inicio:]]
+            }
+
+        ocorrencias = self._avaliar(self._analisar_consulta(consulta))
+        chaves = heapq.nsmallest(inicio + por_pagina, ocorrencias,
+                                 key=lambda chave: (int(chave[0]), int(chave[1])))
+        return {
+            'total': len(ocorrencias),
+            'resultados': [self._resultado_booleano(chave, ocorrencias[chave], 150) for chave in chaves[inicio:]]
+        }
+
+
+def main():
+    """Função principal"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Índice invertido sobre os JSON extraídos')
+    parser.add_argument('--dados', default='json_data', help='Diretório de saída do PDFExtractor')
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+    subcomandos.add_parser('atualizar', help='Indexa JSON novos ou alterados')
+    parser_busca = subcomandos.add_parser('buscar', help='Executa uma consulta')
+    parser_busca.add_argument('consulta')
+    parser_busca.add_argument('--limite', type=int, default=20)
+    parser_busca.add_argument('--sem-republicacoes', action='store_true',
+                              help='Colapsa as páginas republicadas (ver deduplicacao.py)')
+    parser_busca.add_argument('--ranquear', action='store_true',
+                              help='Ordena os resultados por relevância (BM25)')
+    parser_busca.add_argument('--unidade', choices=UNIDADES_BUSCA, default='paginas',
+                              help='Unidade ranqueada com --ranquear (padrão: paginas)')
+    parser_busca.add_argument('--trechos', type=int, default=3,
+                              help='Trechos por resultado com --ranquear (padrão: 3)')
+    args = parser.parse_args()
+
+    indice = IndiceInvertido(args.dados)
+
+    if args.comando == 'atualizar':
+        indice.atualizar()
+        return
+
+    if args.sem_republicacoes and args.ranquear and args.unidade == 'atos':
+        parser.error('--sem-republicacoes colapsa páginas, não atos')
+
+    def buscar(limite: Optional[int]) -> List[Dict]:
+        if args.ranquear:
+            return indice.buscar_ranqueado(args.consulta, limite=limite, unidade=args.unidade,
+                                           trechos_por_resultado=args.trechos)
+        return indice.buscar(args.consulta, limite=limite)
+
+    inicio = time.perf_counter()
+    if args.sem_republicacoes:
+        from deduplicacao import DetectorDuplicatas
+        resultados = DetectorDuplicatas(args.dados).colapsar(buscar(None))[:args.limite]
+    else:
+        resultados = buscar(args.limite)
+    duracao = (time.perf_counter() - inicio) * 1000
+
+    print(f"\n{len(resultados)} resultado(s) para '{args.consulta}' em {duracao:.1f} ms:\n")
+    for i, res in enumerate(resultados, 1):
+        if 'ato' in res:
+            print(f"{i}. {res['documento']} - {res['titulo']} (páginas {res['pagina']}-{res['pagina_fim']}, "
+                  f"pontuação {res['pontuacao']:.2f})")
+        elif 'pontuacao' in res:
+            print(f"{i}. {res['documento']} - página {res['pagina']} "
+                  f"({res['ocorrencias']} ocorrência(s), pontuação {res['pontuacao']:.2f})")
+        else:
+            print(f"{i}. {res['documento']} - página {res['pagina']} ({res['ocorrencias']} ocorrência(s))")
+        for republicacao in res.get('republicacoes', []):
+            print(f"   = republicada em {republicacao['documento']} - página {republicacao['pagina']}")
+        for trecho in res.get('trechos', [res.get('contexto')]):
+            print(f"   {trecho}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
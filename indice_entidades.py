@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+Índice de entidades estruturadas dos JSON gerados pelo PDFExtractor
+Extrai números de processo (CNJ), CNPJ, CPF, inscrições na OAB, números de
+edição e nomes rotulados ("Nome: ...") das páginas, normaliza cada um numa
+chave canônica e mantém um índice chave -> (documento, página, offset)
+"""
+
+import argparse
+import logging
+import re
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from indice_busca import IndiceInvertido, normalizar
+
+logger = logging.getLogger(__name__)
+
+TIPOS_ENTIDADES = ('processo', 'cnpj', 'cpf', 'oab', 'edicao', 'nome')
+
+UFS = {'AC', 'AL', 'AP', 'AM', 'BA', 'CE', 'DF', 'ES', 'GO', 'MA', 'MT', 'MS', 'MG', 'PA',
+       'PB', 'PR', 'PE', 'PI', 'RJ', 'RN', 'RS', 'RO', 'RR', 'SC', 'SP', 'SE', 'TO'}
+
+# O texto extraído dos PDFs costuma trazer espaços em volta da pontuação
+# e quebras de linha no meio dos números ("0067994 -\n91.2025 .8.11.0000"),
+# então os separadores aceitam alguns caracteres em branco
+_S = r'\s{0,3}'
+
+# Número único de processo (CNJ): NNNNNNN-DD.AAAA.J.TR.OOOO, formatado ou só com dígitos
+PADRAO_PROCESSO = re.compile(
+    rf'(?<!\d)(\d{{7}}){_S}-{_S}(\d{{2}}){_S}\.{_S}(\d{{4}}){_S}\.{_S}(\d){_S}\.?{_S}(\d{{2}}){_S}\.{_S}(\d{{4}})(?!\d)'
+    r'|(?<![\d.])(\d{7})(\d{2})(\d{4})(\d)(\d{2})(\d{4})(?![\d.])'
+)
+PADRAO_CNPJ = re.compile(
+    rf'(?<![\d.])(\d{{2}}){_S}\.{_S}(\d{{3}}){_S}\.{_S}(\d{{3}}){_S}/{_S}(\d{{4}}){_S}-{_S}(\d{{2}})(?!\d)'
+    r'|CNPJ[^\d\n]{0,12}(?<!\d)(\d{14})(?!\d)'
+)
+# CPFs mascarados (***.123.456-**) não são indexados
+PADRAO_CPF = re.compile(
+    rf'(?<![\d.*])(\d{{3}}){_S}\.{_S}(\d{{3}}){_S}\.{_S}(\d{{3}}){_S}-{_S}(\d{{2}})(?![\d*])'
+    r'|CPF[^\d\n]{0,12}(?<!\d)(\d{11})(?!\d)'
+)
+# "OAB/MT 13.034", "OAB /MT 16113", "OAB MT35616/O", "OAB nº 1234/MT"
+PADRAO_OAB = re.compile(
+    rf'OAB{_S}[/\-]?{_S}([A-Z]{{2}}){_S}(?:n[º°o.]*{_S})?(\d{{1,3}}(?:\.\d{{3}})+|\d+)(?:{_S}[/\-]{_S}[A-Z]\b)?'
+    rf'|OAB{_S}(?:n[º°o.]*{_S})?(\d{{1,3}}(?:\.\d{{3}})+|\d+){_S}[/\-]{_S}([A-Z]{{2}})\b'
+)
+# "Edição nº 1529", "edição n.º 1526", "edição nº 24.676"
+PADRAO_EDICAO = re.compile(
+    rf'(?i:edi[çc][ãa]o){_S}(?i:n){_S}\.?{_S}[º°o]?{_S}\.?{_S}(\d{{1,3}}(?:\.\d{{3}})+|\d+)(?![\d/])'
+)
+# Nomes em maiúsculas rotulados: "Nome : JOSE DA SILVA ,", "Nome: (225810/1) NIBSA BRUNA SOUZA"
+PADRAO_NOME = re.compile(
+    rf"Nome{_S}:{_S}(?:\([\d/ ]+\){_S})?([A-ZÀ-Ý][A-ZÀ-Ý'’]*(?: [A-ZÀ-Ý][A-ZÀ-Ý'’]*)+)"
+)
+
+
+def _digitos_verificadores_validos(digitos: str, pesos_primeiro: List[int]) -> bool:
+    """Confere os dois dígitos verificadores (módulo 11) de CPF e CNPJ"""
+    if len(set(digitos)) == 1:
+        return False
+    for posicao, pesos in ((len(digitos) - 2, pesos_primeiro), (len(digitos) - 1, [pesos_primeiro[0] + 1] + pesos_primeiro)):
+        soma = sum(int(d) * p for d, p in zip(digitos[:posicao], pesos))
+        resto = soma % 11
+        if int(digitos[posicao]) != (0 if resto < 2 else 11 - resto):
+            return False
+    return True
+
+
+def cnpj_valido(digitos: str) -> bool:
+    return len(digitos) == 14 and _digitos_verificadores_validos(digitos, [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2])
+
+
+def cpf_valido(digitos: str) -> bool:
+    return len(digitos) == 11 and _digitos_verificadores_validos(digitos, list(range(10, 1, -1)))
+
+
+def processo_valido(partes: Tuple[str, ...]) -> bool:
+    """Confere o dígito verificador (módulo 97) de um número CNJ (N, DD, AAAA, J, TR, OOOO)"""
+    numero, digito, ano, segmento, tribunal, origem = partes
+    return int(f"{numero}{ano}{segmento}{tribunal}{origem}{digito}") % 97 == 1
+
+
+def _grupos(match: re.Match, inicio: int, quantidade: int) -> Tuple[str, ...]:
+    return tuple(match.group(i) for i in range(inicio, inicio + quantidade))
+
+
+def extrair_entidades(texto: str) -> Iterator[Tuple[str, int, int]]:
+    """
+    Extrai as entidades de um texto
+
+    Números só com dígitos (sem a formatação usual) precisam ter dígitos
+    verificadores válidos; CPF e CNPJ sem formatação só são aceitos logo
+    depois do rótulo ("CPF", "CNPJ").
+
+    Args:
+        texto: Texto de uma página
+
+    Yields:
+        Tuple: (chave canônica, início, fim) de cada entidade, em ordem de tipo
+            e, dentro de cada tipo, de posição
+    """
+    for match in PADRAO_PROCESSO.finditer(texto):
+        formatado = match.group(1) is not None
+        partes = _grupos(match, 1 if formatado else 7, 6)
+        if formatado or processo_valido(partes):
+            numero, digito, ano, segmento, tribunal, origem = partes
+            yield f"processo:{numero}-{digito}.{ano}.{segmento}.{tribunal}.{origem}", match.start(), match.end()
+
+    for match in PADRAO_CNPJ.finditer(texto):
+        digitos = ''.join(_grupos(match, 1, 5)) if match.group(1) else match.group(6)
+        if cnpj_valido(digitos):
+            inicio = match.start() if match.group(1) else match.start(6)
+            yield f"cnpj:{digitos}", inicio, match.end()
+
+    for match in PADRAO_CPF.finditer(texto):
+        digitos = ''.join(_grupos(match, 1, 4)) if match.group(1) else match.group(5)
+        if cpf_valido(digitos):
+            inicio = match.start() if match.group(1) else match.start(5)
+            yield f"cpf:{digitos}", inicio, match.end()
+
+    for match in PADRAO_OAB.finditer(texto):
+        uf, numero = (match.group(1), match.group(2)) if match.group(1) else (match.group(4), match.group(3))
+        if uf in UFS:
+            yield f"oab:{uf}{int(numero.replace('.', ''))}", match.start(), match.end()
+
+    for match in PADRAO_EDICAO.finditer(texto):
+        yield f"edicao:{int(match.group(1).replace('.', ''))}", match.start(), match.end()
+
+    for match in PADRAO_NOME.finditer(texto):
+        yield f"nome:{normalizar(match.group(1)).lower()}", match.start(1), match.end(1)
+
+
+def _processo_cnj(digitos: str) -> str:
+    """Formata os 20 dígitos de um número de processo no padrão CNJ"""
+    return f"{digitos[:7]}-{digitos[7:9]}.{digitos[9:13]}.{digitos[13]}.{digitos[14:16]}.{digitos[16:]}"
+
+
+def _valor_canonico(tipo: str, valor: str) -> str:
+    """
+    Normaliza o valor de uma consulta com prefixo de tipo ("cnpj:58.240.555/0001-90")
+    do mesmo jeito que extrair_entidades normaliza o texto das páginas
+    """
+    valor = ' '.join(valor.split())
+    if tipo == 'nome':
+        return normalizar(valor).lower()
+
+    digitos = re.sub(r'\D', '', valor)
+    if not digitos:
+        return valor
+    if tipo in ('cnpj', 'cpf'):
+        return digitos
+    if tipo == 'edicao':
+        return str(int(digitos))
+    if tipo == 'processo':
+        return _processo_cnj(digitos) if len(digitos) == 20 else valor
+    # oab: "MT14810", "MT 14.810", "14.810/MT"
+    uf = re.search(r'(?<![A-Z])([A-Z]{2})(?![A-Z])', valor.upper())
+    return f"{uf.group(1)}{int(digitos)}" if uf else valor
+
+
+def chave_entidade(consulta: str) -> Optional[str]:
+    """
+    Converte uma consulta na chave canônica da entidade
+
+    Aceita a chave canônica, com o valor em qualquer formatação
+    ("cnpj:58.240.555/0001-90", "oab:MT 14.810"), a entidade sem prefixo
+    ("58.240.555/0001-90", "OAB/MT 14.810"), números só com dígitos
+    (20 = processo, 14 = CNPJ, 11 = CPF) ou um nome.
+
+    Returns:
+        str: Chave canônica, ou None se a consulta estiver vazia
+    """
+    consulta = consulta.strip()
+    tipo, separador, valor = consulta.partition(':')
+    tipo = tipo.strip().lower()
+    if separador and tipo in TIPOS_ENTIDADES:
+        return f"{tipo}:{_valor_canonico(tipo, valor)}"
+
+    digitos = re.sub(r'\D', '', consulta)
+    if digitos and len(digitos) >= len(consulta.replace(' ', '')) - 4:
+        if len(digitos) == 20:
+            return f"processo:{_processo_cnj(digitos)}"
+        if len(digitos) == 14:
+            return f"cnpj:{digitos}"
+        if len(digitos) == 11:
+            return f"cpf:{digitos}"
+
+    for chave, _, _ in extrair_entidades(consulta):
+        if not chave.startswith('nome:'):
+            return chave
+
+    nome = ' '.join(normalizar(consulta).lower().split())
+    return f"nome:{nome}" if nome else None
+
+
+class IndiceEntidades(IndiceInvertido):
+    """
+    Índice persistente chave canônica -> ocorrências (documento, página, offset)
+
+    Usa o mesmo armazenamento em fragmentos e a mesma atualização incremental
+    do IndiceInvertido, com as entidades no lugar das palavras: a consulta de
+    uma entidade carrega um único fragmento e faz uma busca em dicionário.
+    """
+
+    NOME_DIRETORIO = '_entidades'
+
+    def _termos_da_pagina(self, texto: str) -> Iterator[Tuple[str, int, int]]:
+        for posicao, (chave, inicio, _) in enumerate(extrair_entidades(texto)):
+            yield chave, posicao, inicio
+
+    def localizar(self, entidade: str, tamanho_contexto: int = 0) -> List[Dict]:
+        """
+        Localiza todas as menções de uma entidade
+
+        Args:
+            entidade: Entidade em qualquer formatação ou chave canônica (ver chave_entidade)
+            tamanho_contexto: Caracteres de contexto em volta de cada menção
+                (0 = sem contexto, sem abrir os JSON)
+
+        Returns:
+            List[Dict]: Menções na ordem do corpus, com documento, página e offset
+        """
+        chave = chave_entidade(entidade)
+        if chave is None:
+            return []
+
+        mencoes = []
+        for id_doc, por_pagina in sorted(self.postings(chave).items(), key=lambda item: int(item[0])):
+            documento = self.documentos[id_doc]
+            for pagina in sorted(por_pagina, key=int):
+                for offset in por_pagina[pagina][1::2]:
+                    mencao = {
+                        'entidade': chave,
+                        'documento': documento['caminho'],
+                        'arquivo': documento['nome'],
+                        'pasta_origem': documento['pasta_origem'],
+                        'pagina': int(pagina),
+                        'offset': offset,
+                    }
+                    if tamanho_contexto:
+                        texto = self._texto_pagina(id_doc, int(pagina))
+                        inicio = max(0, offset - tamanho_contexto)
+                        mencao['contexto'] = f"...{' '.join(texto[inicio:offset + tamanho_contexto].split())}..."
+                    mencoes.append(mencao)
+        return mencoes
+
+    def contar(self, entidade: str) -> int:
+        """Número de menções de uma entidade"""
+        chave = chave_entidade(entidade)
+        if chave is None:
+            return 0
+        return sum(len(valores) // 2 for por_pagina in self.postings(chave).values()
+                   for valores in por_pagina.values())
+
+
+def main():
+    """Função principal"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Índice de entidades (processos, CNPJ, CPF, OAB, edições, nomes)')
+    parser.add_argument('--dados', default='json_data', help='Diretório de saída do PDFExtractor')
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+    subcomandos.add_parser('atualizar', help='Indexa JSON novos ou alterados')
+    parser_busca = subcomandos.add_parser('buscar', help='Lista as menções de uma entidade')
+    parser_busca.add_argument('entidade', help='Ex.: "1025970-25.2025.8.11.0002", "58.240.555/0001-90", "OAB/MT 14810"')
+    parser_busca.add_argument('--limite', type=int, default=20)
+    parser_busca.add_argument('--contexto', type=int, default=80, help='Caracteres de contexto (0 = nenhum)')
+    args = parser.parse_args()
+
+    indice = IndiceEntidades(args.dados)
+
+    if args.comando == 'atualizar':
+        indice.atualizar()
+        return
+
+    inicio = time.perf_counter()
+    mencoes = indice.localizar(args.entidade, args.contexto)
+    duracao = (time.perf_counter() - inicio) * 1000
+
+    print(f"\n{len(mencoes)} menção(ões) de {chave_entidade(args.entidade)} em {duracao:.1f} ms:\n")
+    for mencao in mencoes[:args.limite]:
+        print(f"- {mencao['documento']} - página {mencao['pagina']}, offset {mencao['offset']}")
+        if 'contexto' in mencao:
+            print(f"  {mencao['contexto']}")
+
+
+if __name__ == "__main__":
+    main()
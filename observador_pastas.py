@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Observação de pastas de PDFs por eventos do sistema de arquivos (inotify)
+Entrega cada PDF novo assim que ele termina de ser gravado, sem varrer as
+pastas periodicamente
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Constantes de <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_CLOEXEC = 0o2000000
+
+MASCARA_EVENTOS = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+                   IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+CABECALHO_EVENTO = struct.Struct('iIII')
+
+# Um PDF completo termina com o marcador %%EOF (seguido, às vezes, de espaços)
+MARCADOR_FIM_PDF = b'%%EOF'
+BYTES_FIM_PDF = 1024
+
+
+def pdf_completo(caminho: Path) -> bool:
+    """Indica se o arquivo já tem o marcador de fim de um PDF"""
+    try:
+        with open(caminho, 'rb') as arquivo:
+            tamanho = arquivo.seek(0, os.SEEK_END)
+            if tamanho == 0:
+                return False
+            arquivo.seek(max(0, tamanho - BYTES_FIM_PDF))
+            return MARCADOR_FIM_PDF in arquivo.read()
+    except OSError:
+        return False
+
+
+class ObservadorPastas:
+    """
+    Observa pastas com inotify e entrega os PDFs concluídos
+
+    Cada evento de escrita de um PDF adia o seu processamento por `espera`
+    segundos (debounce); quando o arquivo fica quieto e já tem o marcador
+    %%EOF, ele é entregue como concluído. Arquivos que continuam sem o
+    marcador são reavaliados até `espera_maxima` e então entregues mesmo
+    assim (o extrator registra a falha, se o PDF estiver de fato truncado).
+
+    Uso:
+        with ObservadorPastas(['dje', 'doe']) as observador:
+            for evento, caminho in observador.eventos():
+                ...
+    """
+
+    def __init__(self, pastas: List[str], espera: float = 2.0, espera_maxima: float = 300.0,
+                 extensao: str = '.pdf'):
+        """
+        Inicia a observação
+
+        Args:
+            pastas: Pastas observadas (não recursivo)
+            espera: Segundos sem novos eventos até um arquivo ser considerado gravado
+            espera_maxima: Segundos máximos de espera por um arquivo sem %%EOF
+            extensao: Extensão dos arquivos de interesse
+
+        Raises:
+            OSError: Se o inotify não estiver disponível (fora do Linux) ou se
+                uma pasta não puder ser observada
+        """
+        self.espera = espera
+        self.espera_maxima = espera_maxima
+        self.extensao = extensao.lower()
+        self._pastas: Dict[int, Path] = {}
+        self._pendentes: Dict[Path, Tuple[float, float]] = {}
+
+        nome_libc = ctypes.util.find_library('c')
+        try:
+            self._libc = ctypes.CDLL(nome_libc or 'libc.so.6', use_errno=True)
+            self._libc.inotify_init1
+        except (OSError, AttributeError):
+            raise OSError("inotify não disponível neste sistema (o modo de observação requer Linux)")
+
+        self._fd = self._libc.inotify_init1(IN_CLOEXEC)
+        if self._fd < 0:
+            erro = ctypes.get_errno()
+            raise OSError(erro, f"inotify_init1: {os.strerror(erro)}")
+
+        try:
+            for pasta in pastas:
+                self.adicionar_pasta(pasta)
+        except OSError:
+            self.fechar()
+            raise
+
+    def __enter__(self) -> 'ObservadorPastas':
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def fechar(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def adicionar_pasta(self, pasta: str):
+        """Passa a observar mais uma pasta (criando-a, se não existir)"""
+        caminho = Path(pasta)
+        caminho.mkdir(parents=True, exist_ok=True)
+        descritor = self._libc.inotify_add_watch(self._fd, os.fsencode(caminho), MASCARA_EVENTOS)
+        if descritor < 0:
+            erro = ctypes.get_errno()
+            raise OSError(erro, f"inotify_add_watch({caminho}): {os.strerror(erro)}")
+        self._pastas[descritor] = caminho
+        logger.info(f"Observando {caminho}")
+
+    @property
+    def pendentes(self) -> int:
+        """Arquivos aguardando o fim da gravação"""
+        return len(self._pendentes)
+
+    def _ler_eventos(self, timeout: Optional[float]) -> Iterator[Tuple[int, Path]]:
+        """Lê os eventos disponíveis (espera até timeout segundos pelo primeiro)"""
+        prontos, _, _ = select.select([self._fd], [], [], timeout)
+        if not prontos:
+            return
+
+        dados = os.read(self._fd, 64 * 1024)
+        posicao = 0
+        while posicao + CABECALHO_EVENTO.size <= len(dados):
+            descritor, mascara, _, tamanho = CABECALHO_EVENTO.unpack_from(dados, posicao)
+            posicao += CABECALHO_EVENTO.size
+            nome = dados[posicao:posicao + tamanho].rstrip(b'\0')
+            posicao += tamanho
+
+            if mascara & IN_Q_OVERFLOW:
+                logger.warning("Fila de eventos do inotify cheia: eventos perdidos")
+                continue
+            pasta = self._pastas.get(descritor)
+            if pasta is None:
+                continue
+            if mascara & (IN_DELETE_SELF | IN_IGNORED):
+                logger.warning(f"Pasta observada removida: {pasta}")
+                del self._pastas[descritor]
+                continue
+            yield mascara, pasta / os.fsdecode(nome)
+
+    def eventos(self, parar=None) -> Iterator[Tuple[str, Path]]:
+        """
+        Gera os eventos de interesse até parar() retornar True (ou para sempre)
+
+        Args:
+            parar: Função sem argumentos consultada a cada segundo
+
+        Yields:
+            Tuple: ('concluido', caminho) para PDFs novos ou regravados e
+                ('removido', caminho) para PDFs apagados ou movidos para fora
+        """
+        while parar is None or not parar():
+            agora = time.monotonic()
+            timeout = min([1.0] + [prazo - agora for prazo, _ in self._pendentes.values()])
+
+            for mascara, caminho in self._ler_eventos(max(0.0, timeout)):
+                if caminho.suffix.lower() != self.extensao:
+                    continue
+                if mascara & (IN_DELETE | IN_MOVED_FROM):
+                    self._pendentes.pop(caminho, None)
+                    yield 'removido', caminho
+                    continue
+                # Escrita em andamento: adia o processamento (debounce)
+                _, primeiro_evento = self._pendentes.get(caminho, (0.0, time.monotonic()))
+                self._pendentes[caminho] = (time.monotonic() + self.espera, primeiro_evento)
+
+            agora = time.monotonic()
+            for caminho, (prazo, primeiro_evento) in list(self._pendentes.items()):
+                if prazo > agora:
+                    continue
+                if not caminho.exists():
+                    del self._pendentes[caminho]
+                elif pdf_completo(caminho) or agora - primeiro_evento >= self.espera_maxima:
+                    del self._pendentes[caminho]
+                    yield 'concluido', caminho
+                else:
+                    logger.debug(f"{caminho.name} ainda sem %%EOF, aguardando")
+                    self._pendentes[caminho] = (agora + self.espera, primeiro_evento)
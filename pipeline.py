@@ -0,0 +1,526 @@
+# -*- coding: utf-8 -*-
+"""
+Pipeline contínuo de coleta, download, extração, segmentação e indexação
+Cada etapa roda em suas próprias threads e se comunica com a seguinte por
+uma fila limitada: quando uma etapa atrasa, as anteriores esperam
+"""
+
+import argparse
+import copy
+import logging
+import multiprocessing
+import queue
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from alertas import MonitorAlertas
+from cache_http import CacheHTTP
+from crawler import CrawlerDiarioMPMT, baixar_arquivo
+from extract_data import PDFExtractor
+from indice_busca import EstatisticasBusca, IndiceInvertido
+from indice_entidades import IndiceEntidades
+from segmentacao_atos import segmentar_paginas
+
+logger = logging.getLogger(__name__)
+
+# Sinaliza às threads de uma etapa que não haverá mais itens
+FIM = object()
+
+
+@dataclass
+class TarefaPDF:
+    """Um PDF em trânsito pelo pipeline"""
+    pasta: str
+    nome: str
+    url: Optional[str] = None
+    caminho_pdf: Optional[Path] = None
+    caminho_json: Optional[Path] = None
+    dados: Optional[Dict] = None
+    inicio: float = field(default_factory=time.monotonic)
+
+
+class Etapa:
+    """
+    Etapa do pipeline: um grupo de threads que consome uma fila limitada
+
+    A função da etapa recebe um item e retorna (ou gera) os itens, zero ou
+    mais, a entregar à etapa seguinte. A entrega bloqueia enquanto a fila
+    seguinte estiver cheia, o que propaga a contrapressão até a coleta.
+    """
+
+    def __init__(self, nome: str, funcao: Callable[[object], Optional[Iterable]],
+                 trabalhadores: int = 1, capacidade: int = 8,
+                 ao_falhar: Optional[Callable[[object], None]] = None):
+        """
+        Args:
+            nome: Nome da etapa (usado no log)
+            funcao: Função aplicada a cada item
+            trabalhadores: Número de threads da etapa
+            capacidade: Tamanho máximo da fila de entrada
+            ao_falhar: Chamada com o item quando a função levanta uma exceção
+        """
+        self.nome = nome
+        self.funcao = funcao
+        self.ao_falhar = ao_falhar
+        self.trabalhadores = max(1, trabalhadores)
+        self.capacidade = max(1, capacidade)
+        self.entrada: queue.Queue = queue.Queue(self.capacidade)
+        self.proxima: Optional['Etapa'] = None
+
+        self.processados = 0
+        self.erros = 0
+        self.em_andamento = 0
+        self.tempo_ocupado = 0.0
+        self._ativas = 0
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._inicio = None
+
+    def conectar(self, proxima: 'Etapa') -> 'Etapa':
+        """Define a etapa seguinte e a retorna (permite encadear)"""
+        self.proxima = proxima
+        return proxima
+
+    def iniciar(self):
+        """Inicia as threads da etapa"""
+        self._inicio = time.monotonic()
+        self._ativas = self.trabalhadores
+        for i in range(self.trabalhadores):
+            thread = threading.Thread(target=self._trabalhar, name=f"{self.nome}-{i + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def enviar(self, item):
+        """Coloca um item na fila, esperando se ela estiver cheia"""
+        self.entrada.put(item)
+
+    def oferecer(self, item) -> bool:
+        """Coloca um item na fila apenas se houver espaço"""
+        try:
+            self.entrada.put_nowait(item)
+            return True
+        except queue.Full:
+            return False
+
+    def encerrar(self):
+        """Pede o encerramento das threads depois dos itens já enfileirados"""
+        for _ in range(self.trabalhadores):
+            self.entrada.put(FIM)
+
+    def aguardar(self, timeout: Optional[float] = None):
+        """Aguarda o término das threads da etapa"""
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _trabalhar(self):
+        while True:
+            item = self.entrada.get()
+            if item is FIM:
+                break
+
+            with self._lock:
+                self.em_andamento += 1
+            inicio = time.perf_counter()
+            try:
+                # Cada saída é entregue assim que gerada (a coleta é um gerador)
+                for saida in self.funcao(item) or ():
+                    if self.proxima:
+                        self.proxima.enviar(saida)
+                sucesso = True
+            except Exception as e:
+                logger.exception(f"[{self.nome}] Erro ao processar item: {e}")
+                sucesso = False
+                if self.ao_falhar:
+                    self.ao_falhar(item)
+
+            with self._lock:
+                self.em_andamento -= 1
+                self.tempo_ocupado += time.perf_counter() - inicio
+                if sucesso:
+                    self.processados += 1
+                else:
+                    self.erros += 1
+
+        # A última thread a sair encerra a etapa seguinte
+        with self._lock:
+            self._ativas -= 1
+            ultima = self._ativas == 0
+        if ultima and self.proxima:
+            self.proxima.encerrar()
+
+    def estatisticas(self) -> Dict:
+        """Vazão, profundidade da fila e ocupação da etapa"""
+        decorrido = max(time.monotonic() - (self._inicio or time.monotonic()), 1e-9)
+        with self._lock:
+            return {
+                'etapa': self.nome,
+                'fila': self.entrada.qsize(),
+                'capacidade': self.capacidade,
+                'em_andamento': self.em_andamento,
+                'processados': self.processados,
+                'erros': self.erros,
+                'por_minuto': self.processados * 60 / decorrido,
+                'ocupacao': self.tempo_ocupado / (decorrido * self.trabalhadores)
+            }
+
+
+class PipelineDiarios:
+    """
+    Pipeline contínuo: coleta -> download -> extração -> segmentação -> indexação
+
+    A coleta roda a cada intervalo_coleta segundos: varre as pastas locais
+    (PDFs novos ou alterados) e, se habilitado, a listagem do MP-MT (PDFs
+    ainda não baixados). A extração usa PDFExtractor.processar_pdf num pool
+    de processos e respeita o manifesto de extração, então PDFs inalterados
+    não são reprocessados.
+    """
+
+    def __init__(self, output_dir: str = "json_data", pastas: Optional[List[str]] = None,
+                 coletar_mpmt: bool = True, pasta_mpmt: str = 'doe', max_edicoes: int = 20,
+                 intervalo_coleta: float = 600.0, trabalhadores_download: int = 4,
+                 processos_extracao: int = 2, capacidade_filas: int = 8,
+                 segmentar: bool = True, indexar: bool = True,
+                 cache: Optional[CacheHTTP] = None, intervalo_monitor: float = 30.0,
+                 backend: str = 'pypdf2', arquivo_assinaturas: Optional[str] = None,
+                 banco: Optional[str] = None, remover_boilerplate: bool = False,
+                 indexar_entidades: bool = False):
+        """
+        Inicializa o pipeline
+
+        Args:
+            output_dir: Diretório dos JSON (o mesmo do extract_data.py)
+            pastas: Pastas de PDFs locais monitoradas (padrão: dje, doe, iomat)
+            coletar_mpmt: Se True, busca novas edições no site do MP-MT
+            pasta_mpmt: Pasta onde os PDFs do MP-MT são gravados
+            max_edicoes: Edições mais recentes do MP-MT verificadas a cada coleta
+            intervalo_coleta: Segundos entre duas coletas
+            trabalhadores_download: Downloads simultâneos
+            processos_extracao: Processos (e PDFs simultâneos) da extração
+            capacidade_filas: Tamanho máximo de cada fila entre etapas
+            segmentar: Se True, inclui os atos no JSON de cada documento
+            indexar: Se True, indexa cada documento no índice de busca
+            cache: Cache HTTP usado pelo crawler e pelos downloads
+            intervalo_monitor: Segundos entre dois registros de estatísticas
+            backend: Backend de extração de texto do PDFExtractor (ver backends_pdf.py)
+            arquivo_assinaturas: Se informado, cada documento gravado é conferido
+                contra as listas de observação desse arquivo (ver alertas.py)
+            banco: Se informado, cada documento também é gravado nesse banco
+                SQLite (ver armazenamento_sqlite.py)
+            remover_boilerplate: Se True, remove cabeçalhos, rodapés e trechos
+                repetidos do texto de cada documento (ver boilerplate.py)
+            indexar_entidades: Se True (e indexar), mantém também o índice de
+                entidades (processos, CNPJ, CPF, OAB...); ver indice_entidades.py
+        """
+        self.output_dir = Path(output_dir)
+        self.pastas = pastas if pastas is not None else ['dje', 'doe', 'iomat']
+        self.coletar_mpmt = coletar_mpmt
+        self.pasta_mpmt = pasta_mpmt
+        self.max_edicoes = max_edicoes
+        self.intervalo_coleta = intervalo_coleta
+        self.processos_extracao = max(1, processos_extracao)
+        self.segmentar = segmentar
+        self.cache = cache
+        self.intervalo_monitor = intervalo_monitor
+
+        self.extrator = PDFExtractor(output_dir=str(self.output_dir), incremental=True,
+                                     segmentar_atos=segmentar, backend=backend, banco=banco,
+                                     remover_boilerplate=remover_boilerplate)
+        # Cópia enviada aos processos: a remoção do boilerplate (que aprende os
+        # modelos de cada pasta), a segmentação e a gravação são feitas nas etapas próprias
+        self._extrator_processos = copy.copy(self.extrator)
+        self._extrator_processos.segmentar_atos = False
+        self._extrator_processos.banco = None
+        self._extrator_processos.remover_boilerplate = False
+        self._lock_manifesto = threading.Lock()
+
+        self.indice = IndiceInvertido(str(self.output_dir)) if indexar else None
+        self.estatisticas_busca = EstatisticasBusca(str(self.output_dir)) if indexar else None
+        self.indice_entidades = IndiceEntidades(str(self.output_dir)) if indexar and indexar_entidades else None
+        self.alertas = MonitorAlertas(str(self.output_dir), arquivo_assinaturas) if arquivo_assinaturas else None
+        self.crawler: Optional[CrawlerDiarioMPMT] = None
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+        self._arquivos_vistos: Dict[Path, tuple] = {}
+        self._urls_vistas = set()
+        self._pdf_por_edicao: Dict[str, Optional[str]] = {}
+        self._parar = threading.Event()
+
+        self.etapas = [
+            Etapa('coleta', self._coletar, 1, 1),
+            Etapa('download', self._baixar, trabalhadores_download, capacidade_filas, self._esquecer),
+            Etapa('extracao', self._extrair, self.processos_extracao, capacidade_filas, self._esquecer),
+            Etapa('segmentacao', self._segmentar_e_gravar, 1, capacidade_filas, self._esquecer),
+        ]
+        if self.indice:
+            self.etapas.append(Etapa('indexacao', self._indexar, 1, capacidade_filas))
+        for anterior, seguinte in zip(self.etapas, self.etapas[1:]):
+            anterior.conectar(seguinte)
+
+    # ------------------------------------------------------------------
+    # Etapas
+    # ------------------------------------------------------------------
+
+    def _coletar(self, _sinal) -> Iterable[TarefaPDF]:
+        """Gera as tarefas de PDFs novos ou alterados"""
+        for pasta in self.pastas:
+            for caminho in sorted(Path(pasta).glob('*.pdf')):
+                stat = caminho.stat()
+                assinatura = (stat.st_size, stat.st_mtime_ns)
+                if self._arquivos_vistos.get(caminho) == assinatura:
+                    continue
+                self._arquivos_vistos[caminho] = assinatura
+                yield TarefaPDF(pasta=Path(pasta).name, nome=caminho.name, caminho_pdf=caminho)
+
+        if self.coletar_mpmt:
+            yield from self._coletar_mpmt()
+
+    def _coletar_mpmt(self) -> Iterable[TarefaPDF]:
+        """Busca na listagem do MP-MT os PDFs das edições ainda não baixados"""
+        if self.crawler is None:
+            self.crawler = CrawlerDiarioMPMT(headless=True, cache=self.cache)
+
+        if not self.crawler.acessar_pagina_principal():
+            return
+
+        for edicao in self.crawler.extrair_links_edicoes()[:self.max_edicoes]:
+            if '.pdf' in edicao.url.lower():
+                url_pdf = edicao.url
+            else:
+                if edicao.url not in self._pdf_por_edicao:
+                    conteudo = self.crawler.extrair_conteudo_edicao(edicao.url)
+                    if not conteudo:
+                        # Página indisponível agora: tenta de novo na próxima coleta
+                        continue
+                    self._pdf_por_edicao[edicao.url] = conteudo.get('link_download_pdf')
+                url_pdf = self._pdf_por_edicao[edicao.url]
+
+            if not url_pdf or url_pdf in self._urls_vistas:
+                continue
+            self._urls_vistas.add(url_pdf)
+
+            nome = Path(url_pdf.split('?', 1)[0]).name
+            yield TarefaPDF(pasta=self.pasta_mpmt, nome=nome, url=url_pdf)
+
+    def _esquecer(self, tarefa: TarefaPDF):
+        """
+        Desfaz o registro da coleta de uma tarefa que falhou no download, na
+        extração ou na gravação, para que a próxima coleta a gere de novo
+
+        A coleta marca o arquivo (ou a URL) como visto ao gerar a tarefa, o
+        que evita tarefas duplicadas enquanto ela ainda está no pipeline.
+        """
+        if tarefa.url:
+            self._urls_vistas.discard(tarefa.url)
+        elif tarefa.caminho_pdf is not None:
+            self._arquivos_vistos.pop(tarefa.caminho_pdf, None)
+
+    def _baixar(self, tarefa: TarefaPDF) -> Iterable[TarefaPDF]:
+        """Baixa o PDF da tarefa (tarefas de arquivos locais passam direto)"""
+        if tarefa.caminho_pdf is None:
+            destino = Path(tarefa.pasta) / tarefa.nome
+            if not destino.exists() and not baixar_arquivo(tarefa.url, destino, self.cache):
+                raise RuntimeError(f"Falha no download de {tarefa.url}")
+            tarefa.caminho_pdf = destino
+        return [tarefa]
+
+    def _extrair(self, tarefa: TarefaPDF) -> Iterable[TarefaPDF]:
+        """Extrai as páginas do PDF num processo do pool"""
+        chave = f"{tarefa.pasta}/{tarefa.nome}"
+        tarefa.caminho_json = self.output_dir / tarefa.pasta / f"{tarefa.caminho_pdf.stem}.json"
+
+        with self._lock_manifesto:
+            inalterado = self.extrator._entrada_inalterada(tarefa.caminho_pdf, chave, tarefa.caminho_json)
+        if inalterado:
+            logger.debug(f"[extracao] Inalterado: {chave}")
+            return []
+
+        dados = self.executor.submit(self._extrator_processos.processar_pdf, tarefa.caminho_pdf).result()
+        if not dados:
+            raise RuntimeError(f"Falha na extração de {chave}")
+
+        tarefa.dados = dados
+        return [tarefa]
+
+    def _segmentar_e_gravar(self, tarefa: TarefaPDF) -> Iterable[TarefaPDF]:
+        """Remove o boilerplate, segmenta o documento em atos, grava o JSON e atualiza o manifesto"""
+        if self.extrator.remover_boilerplate:
+            paginas = tarefa.dados['paginas']
+            self.extrator._remover_boilerplate(tarefa.caminho_pdf, paginas)
+            tarefa.dados['informacoes']['total_caracteres'] = sum(p['numero_caracteres'] for p in paginas)
+            tarefa.dados['informacoes']['total_palavras'] = sum(p['numero_palavras'] for p in paginas)
+        if self.segmentar:
+            tarefa.dados['atos'] = segmentar_paginas(tarefa.dados['paginas'], incluir_texto=False)
+
+        subpasta_output = tarefa.caminho_json.parent
+        subpasta_output.mkdir(parents=True, exist_ok=True)
+        with self._lock_manifesto:
+            if not self.extrator._salvar_resultado(tarefa.caminho_pdf, tarefa.dados, subpasta_output,
+                                                   f"{tarefa.pasta}/{tarefa.nome}"):
+                raise RuntimeError(f"Falha ao gravar {tarefa.caminho_json}")
+            self.extrator._salvar_manifesto()
+            if self.extrator.remover_boilerplate:
+                self.extrator._modelos().salvar()
+
+        if self.alertas:
+            self.alertas.recarregar_assinaturas()
+            self.alertas.conferir_documento(tarefa.caminho_json, tarefa.dados)
+            self.alertas.salvar()
+
+        if not self.indice:
+            logger.info(f"Disponível: {tarefa.caminho_json} ({time.monotonic() - tarefa.inicio:.1f}s)")
+        return [tarefa]
+
+    def _indexar(self, tarefa: TarefaPDF) -> Iterable[TarefaPDF]:
+        """Indexa o documento; o índice é gravado quando a fila esvazia"""
+        self.indice.indexar_documento(tarefa.caminho_json, tarefa.dados)
+        self.estatisticas_busca.adicionar_documento(tarefa.caminho_json, tarefa.dados)
+        if self.indice_entidades:
+            self.indice_entidades.indexar_documento(tarefa.caminho_json, tarefa.dados)
+        tarefa.dados = None
+
+        if self.etapas[-1].entrada.empty():
+            self.indice.salvar()
+            self.estatisticas_busca.salvar()
+            if self.indice_entidades:
+                self.indice_entidades.salvar()
+        logger.info(f"Pesquisável: {tarefa.caminho_json.name} "
+                    f"({time.monotonic() - tarefa.inicio:.1f}s desde a coleta)")
+        return []
+
+    # ------------------------------------------------------------------
+    # Execução
+    # ------------------------------------------------------------------
+
+    def estatisticas(self) -> List[Dict]:
+        """Estatísticas de todas as etapas"""
+        return [etapa.estatisticas() for etapa in self.etapas]
+
+    def registrar_estatisticas(self):
+        """Registra no log a vazão e a fila de cada etapa"""
+        for e in self.estatisticas():
+            logger.info(
+                f"[{e['etapa']:>11}] fila {e['fila']}/{e['capacidade']}, "
+                f"{e['em_andamento']} em andamento, {e['processados']} ok, {e['erros']} erro(s), "
+                f"{e['por_minuto']:.1f}/min, ocupação {e['ocupacao']:.0%}"
+            )
+
+    def _monitorar(self):
+        while not self._parar.wait(self.intervalo_monitor):
+            self.registrar_estatisticas()
+
+    def parar(self):
+        """Pede o encerramento (os itens em andamento são concluídos)"""
+        self._parar.set()
+
+    def executar(self, uma_vez: bool = False):
+        """
+        Executa o pipeline até parar() ou Ctrl+C
+
+        Args:
+            uma_vez: Se True, faz uma única coleta e encerra quando todas as
+                etapas esvaziarem
+        """
+        logger.info(f"Iniciando pipeline: {' -> '.join(etapa.nome for etapa in self.etapas)}")
+        # Os processos só são criados no primeiro envio, com as threads das
+        # etapas já rodando: um fork herdaria travas (como a do logging)
+        # presas por outras threads, então eles partem de um forkserver
+        metodo = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        self.executor = ProcessPoolExecutor(max_workers=self.processos_extracao,
+                                            mp_context=multiprocessing.get_context(metodo))
+        for etapa in self.etapas:
+            etapa.iniciar()
+        threading.Thread(target=self._monitorar, name='monitor', daemon=True).start()
+
+        try:
+            while not self._parar.is_set():
+                # Se a coleta anterior ainda estiver na fila, não agenda outra
+                self.etapas[0].oferecer(time.time())
+                if uma_vez:
+                    break
+                self._parar.wait(self.intervalo_coleta)
+        except KeyboardInterrupt:
+            logger.info("Interrompido, concluindo os itens em andamento...")
+        finally:
+            self.etapas[0].encerrar()
+            for etapa in self.etapas:
+                etapa.aguardar()
+            self._parar.set()
+            self._finalizar()
+
+    def _finalizar(self):
+        self.executor.shutdown()
+        if self.indice:
+            self.indice.salvar()
+            self.estatisticas_busca.salvar()
+        if self.indice_entidades:
+            self.indice_entidades.salvar()
+        with self._lock_manifesto:
+            self.extrator._salvar_manifesto()
+        if self.crawler:
+            self.crawler.fechar()
+        elif self.cache:
+            self.cache.salvar()
+        self.registrar_estatisticas()
+        logger.info("Pipeline encerrado")
+
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description='Pipeline contínuo: coleta, download, extração e indexação')
+    parser.add_argument('--pastas', nargs='+', default=['dje', 'doe', 'iomat'],
+                        help='Pastas de PDFs monitoradas (padrão: dje doe iomat)')
+    parser.add_argument('--sem-mpmt', action='store_true', help='Não busca edições no site do MP-MT')
+    parser.add_argument('--max-edicoes', type=int, default=20, help='Edições do MP-MT verificadas por coleta')
+    parser.add_argument('--intervalo', type=float, default=600, help='Segundos entre coletas (padrão: 600)')
+    parser.add_argument('--downloads', type=int, default=4, help='Downloads simultâneos')
+    parser.add_argument('--processos', type=int, default=2, help='Processos de extração')
+    parser.add_argument('--backend', default='pypdf2',
+                        choices=['auto', 'pypdf2', 'pypdf', 'pymupdf', 'pypdfium2'],
+                        help='Backend de extração de texto (padrão: pypdf2)')
+    parser.add_argument('--capacidade', type=int, default=8, help='Tamanho de cada fila entre etapas')
+    parser.add_argument('--sem-segmentacao', action='store_true', help='Não segmenta os documentos em atos')
+    parser.add_argument('--sem-indice', action='store_true', help='Não atualiza o índice de busca')
+    parser.add_argument('--entidades', action='store_true',
+                        help='Mantém também o índice de entidades (processos, CNPJ, CPF, OAB...) '
+                             'em json_data/_entidades')
+    parser.add_argument('--alertas', metavar='ARQUIVO',
+                        help='Confere cada documento novo contra as listas de observação do arquivo (ver alertas.py)')
+    parser.add_argument('--banco', action='store_true',
+                        help='Grava também os documentos no banco SQLite json_data/diarios.db (FTS5)')
+    parser.add_argument('--remover-boilerplate', action='store_true',
+                        help='Remove do texto os cabeçalhos, rodapés e trechos repetidos (ver boilerplate.py)')
+    parser.add_argument('--offline', action='store_true', help='Usa apenas o cache HTTP, sem acessar a rede')
+    parser.add_argument('--monitor', type=float, default=30, help='Segundos entre registros de estatísticas')
+    parser.add_argument('--uma-vez', action='store_true', help='Faz uma coleta e encerra')
+    args = parser.parse_args()
+
+    pipeline = PipelineDiarios(
+        pastas=args.pastas,
+        coletar_mpmt=not args.sem_mpmt,
+        max_edicoes=args.max_edicoes,
+        intervalo_coleta=args.intervalo,
+        trabalhadores_download=args.downloads,
+        processos_extracao=args.processos,
+        capacidade_filas=args.capacidade,
+        segmentar=not args.sem_segmentacao,
+        indexar=not args.sem_indice,
+        cache=CacheHTTP(offline=args.offline),
+        intervalo_monitor=args.monitor,
+        backend=args.backend,
+        arquivo_assinaturas=args.alertas,
+        banco='json_data/diarios.db' if args.banco else None,
+        remover_boilerplate=args.remover_boilerplate,
+        indexar_entidades=args.entidades
+    )
+
+    signal.signal(signal.SIGTERM, lambda *_: pipeline.parar())
+    pipeline.executar(uma_vez=args.uma_vez)
+
+
+if __name__ == "__main__":
+    main()
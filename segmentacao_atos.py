@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+Segmentação das páginas extraídas em atos (portarias, despachos, editais...)
+Detecta os cabeçalhos dos atos numa única passada pelo texto das páginas,
+inclusive atos que continuam na página seguinte
+"""
+
+import argparse
+import json
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Cabeçalho de ato: palavra-chave em maiúsculas no início da linha, sem plural
+# ("PORTARIAS DA DIRETORIA-GERAL" é título de seção, não um ato)
+PADRAO_CABECALHO_ATO = re.compile(
+    r'^[ \t]*(?P<tipo>PORTARIA|DESPACHO|EDITAL|RESOLU[ÇC][ÃA]O|AVISO|EXTRATO|DECRETO|PROVIMENTO|'
+    r'INSTRU[ÇC][ÃA]O NORMATIVA|ATO|TERMO|DECIS[ÃA]O|RECOMENDA[ÇC][ÃA]O|LEI COMPLEMENTAR|LEI|ERRATA)'
+    r'(?![A-Za-zÀ-ÿ_])(?P<resto>[^\n]*)',
+    re.M
+)
+
+# Número do ato no cabeçalho: "Nº 1034/2025", "N.º 12", "N . 1.579", "N ° 321/2025"
+PADRAO_NUMERO_ATO = re.compile(r'\bN\s*[.º°o]?\s*[.º°]?\s*(\d[\d.]*(?:\s*/\s*\d{2,4})?)')
+
+# Forma canônica (com acentos) dos tipos, indexada pela grafia sem acentos
+TIPOS_CANONICOS = {
+    'RESOLUCAO': 'RESOLUÇÃO',
+    'INSTRUCAO NORMATIVA': 'INSTRUÇÃO NORMATIVA',
+    'DECISAO': 'DECISÃO',
+    'RECOMENDACAO': 'RECOMENDAÇÃO',
+}
+
+# Campo de ConteudoEdicao (crawler.py) onde cada tipo de ato é agrupado
+CATEGORIAS_ATOS = {
+    'PORTARIA': 'portarias',
+    'DESPACHO': 'despachos',
+    'EDITAL': 'editais',
+    'RESOLUÇÃO': 'resolucoes',
+    'AVISO': 'avisos',
+}
+CATEGORIA_OUTROS = 'outros_atos'
+CATEGORIAS = list(CATEGORIAS_ATOS.values()) + [CATEGORIA_OUTROS]
+
+
+def _tipo_canonico(tipo: str) -> str:
+    return TIPOS_CANONICOS.get(tipo.replace('Ç', 'C').replace('Ã', 'A'), tipo)
+
+
+def _inicia_ato(texto: str, posicao: int) -> bool:
+    """
+    Indica se o cabeçalho encontrado em posicao inicia um ato, e não é só a
+    continuação de uma frase quebrada em linhas ("... nos termos da\\nLEI Nº ...")
+    """
+    anterior = posicao - 1
+    while anterior >= 0 and texto[anterior].isspace():
+        anterior -= 1
+    if anterior < 0:
+        return True
+    caractere = texto[anterior]
+    return not (caractere.islower() or caractere in ',;-(')
+
+
+class SegmentadorAtos:
+    """
+    Segmenta incrementalmente o texto das páginas de um documento em atos
+
+    As páginas são passadas em ordem com adicionar_pagina(), que retorna os
+    atos concluídos até ali; finalizar() retorna o último ato. Cada ato guarda
+    o intervalo que ocupa: (pagina_inicio, offset_inicio) até
+    (pagina_fim, offset_fim), com offsets relativos ao texto de cada página e
+    offset_fim exclusivo.
+    """
+
+    def __init__(self, incluir_texto: bool = True):
+        """
+        Args:
+            incluir_texto: Se False, os atos trazem só cabeçalho e intervalo
+                (o texto pode ser recuperado das páginas com texto_ato)
+        """
+        self.incluir_texto = incluir_texto
+        self._atual: Optional[Dict] = None
+        self._trechos: List[str] = []
+        self._fim = None
+
+    def _abrir(self, numero_pagina: int, match: re.Match):
+        tipo = _tipo_canonico(match.group('tipo'))
+        resto = match.group('resto')
+        match_numero = PADRAO_NUMERO_ATO.search(resto)
+
+        self._atual = {
+            'tipo': tipo,
+            'categoria': CATEGORIAS_ATOS.get(tipo, CATEGORIA_OUTROS),
+            'titulo': f"{match.group('tipo')}{resto}".strip(),
+            'numero': re.sub(r'\s+', '', match_numero.group(1)).rstrip('.') if match_numero else None,
+            'pagina_inicio': numero_pagina,
+            'offset_inicio': match.start('tipo'),
+        }
+        self._trechos = []
+        self._fim = None
+
+    def _acumular(self, numero_pagina: int, texto: str, inicio: int, fim: int):
+        """Acrescenta ao ato aberto o trecho [inicio, fim) da página, sem espaços finais"""
+        trecho = texto[inicio:fim].rstrip()
+        if trecho:
+            if self.incluir_texto:
+                self._trechos.append(trecho)
+            self._fim = (numero_pagina, inicio + len(trecho))
+
+    def _fechar(self) -> Dict:
+        ato = self._atual
+        ato['pagina_fim'], ato['offset_fim'] = self._fim
+        if self.incluir_texto:
+            ato['texto'] = '\n'.join(self._trechos)
+        self._atual = None
+        self._trechos = []
+        return ato
+
+    def adicionar_pagina(self, numero_pagina: int, texto: str) -> List[Dict]:
+        """
+        Processa o texto de uma página
+
+        Args:
+            numero_pagina: Número da página (base 1)
+            texto: Texto da página
+
+        Returns:
+            Lista dos atos concluídos nesta página
+        """
+        concluidos = []
+        inicio = 0
+
+        for match in PADRAO_CABECALHO_ATO.finditer(texto):
+            posicao = match.start('tipo')
+            if not _inicia_ato(texto, posicao):
+                continue
+
+            if self._atual is not None:
+                self._acumular(numero_pagina, texto, inicio, posicao)
+                concluidos.append(self._fechar())
+
+            self._abrir(numero_pagina, match)
+            inicio = posicao
+
+        if self._atual is not None:
+            self._acumular(numero_pagina, texto, inicio, len(texto))
+
+        return concluidos
+
+    def finalizar(self) -> List[Dict]:
+        """Conclui o documento, retornando o último ato (se houver)"""
+        return [self._fechar()] if self._atual is not None else []
+
+
+def segmentar_paginas(paginas: Iterable[Dict], incluir_texto: bool = True) -> List[Dict]:
+    """
+    Segmenta as páginas de um documento (formato dos JSONs de json_data)
+
+    Args:
+        paginas: Páginas com 'numero_pagina' e 'texto'
+        incluir_texto: Se False, os atos trazem só cabeçalho e intervalo
+
+    Returns:
+        Lista de atos na ordem do documento
+    """
+    segmentador = SegmentadorAtos(incluir_texto)
+    atos = []
+    for pagina in paginas:
+        atos.extend(segmentador.adicionar_pagina(pagina['numero_pagina'], pagina.get('texto', '')))
+    atos.extend(segmentador.finalizar())
+    return atos
+
+
+def texto_ato(paginas: List[Dict], ato: Dict) -> str:
+    """
+    Recupera o texto de um ato a partir do seu intervalo nas páginas
+
+    Args:
+        paginas: Páginas do documento
+        ato: Ato gerado pelo SegmentadorAtos
+
+    Returns:
+        str: Texto do ato (igual ao de incluir_texto=True)
+    """
+    por_numero = {pagina['numero_pagina']: pagina.get('texto', '') for pagina in paginas}
+    trechos = []
+    for numero in range(ato['pagina_inicio'], ato['pagina_fim'] + 1):
+        texto = por_numero.get(numero, '')
+        inicio = ato['offset_inicio'] if numero == ato['pagina_inicio'] else 0
+        fim = ato['offset_fim'] if numero == ato['pagina_fim'] else len(texto)
+        trecho = texto[inicio:fim].rstrip()
+        if trecho:
+            trechos.append(trecho)
+    return '\n'.join(trechos)
+
+
+def agrupar_por_categoria(atos: Iterable[Dict]) -> Dict[str, List[Dict]]:
+    """
+    Agrupa os atos nos campos de ConteudoEdicao (portarias, despachos, editais,
+    resolucoes, avisos e outros_atos)
+
+    Args:
+        atos: Atos gerados pelo SegmentadorAtos
+
+    Returns:
+        Dict com uma lista (possivelmente vazia) para cada categoria
+    """
+    grupos = {categoria: [] for categoria in CATEGORIAS}
+    for ato in atos:
+        grupos[ato['categoria']].append(ato)
+    return grupos
+
+
+def main():
+    """Função principal"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description='Segmenta os JSONs extraídos em atos')
+    parser.add_argument('arquivos', nargs='+', help='JSONs gerados pelo extract_data.py')
+    parser.add_argument('--listar', action='store_true', help='Lista o cabeçalho de cada ato')
+    args = parser.parse_args()
+
+    for arquivo in args.arquivos:
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+
+        inicio = time.perf_counter()
+        atos = segmentar_paginas(dados.get('paginas', []))
+        duracao = time.perf_counter() - inicio
+
+        grupos = agrupar_por_categoria(atos)
+        contagem = ', '.join(f"{categoria}: {len(lista)}" for categoria, lista in grupos.items())
+        print(f"{Path(arquivo).name}: {len(atos)} atos em {len(dados.get('paginas', []))} "
+              f"páginas ({duracao * 1000:.1f} ms) - {contagem}")
+
+        if args.listar:
+            for ato in atos:
+                print(f"  p.{ato['pagina_inicio']}-{ato['pagina_fim']} [{ato['categoria']}] {ato['titulo'][:90]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Testes de ida e volta do formato binário (.dpz)
+
+Uso:
+    python -m pytest tests
+    python -m unittest discover tests
+"""
+
+import struct
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from armazenamento_binario import (ASSINATURA, CABECALHO, LeitorBinario, carregar_binario,  # noqa: E402
+                                   criar_dicionario, salvar_binario)
+
+
+def _pagina(numero: int, texto: str) -> dict:
+    return {'numero_pagina': numero, 'texto': texto, 'numero_caracteres': len(texto),
+            'numero_palavras': len(texto.split()) if texto else 0}
+
+
+def documento_sintetico() -> dict:
+    """Documento no formato dos JSONs de json_data, com os casos especiais do formato"""
+    cabecalho = 'DIÁRIO OFICIAL ELETRÔNICO - Cuiabá, sexta-feira, 10 de outubro de 2025\n'
+    return {
+        'arquivo': {'nome': 'diario_2025-10-10.pdf', 'caminho': 'iomat/diario_2025-10-10.pdf'},
+        'metadados': {'/Title': 'Diário Oficial', '/Producer': 'gerador'},
+        'paginas': [
+            _pagina(1, cabecalho + 'PORTARIA Nº 1.234/2025 - Nomeia JOÃO DA SILVA, Procurador-Geral de Justiça.'),
+            _pagina(2, ''),
+            {'numero_pagina': 3, 'texto': '', 'erro': 'EOF marker not found', 'numero_caracteres': 0,
+             'numero_palavras': 0},
+            _pagina(4, cabecalho + 'Ação civil pública — § 2º, “aspas”, ½, ç, ü, 日本語 e emoji 📄.'),
+        ],
+        'informacoes': {'numero_total_paginas': 4, 'total_caracteres': 250, 'total_palavras': 40},
+        'atos': [{'tipo': 'PORTARIA', 'pagina_inicio': 1, 'offset_inicio': 73}],
+    }
+
+
+class TesteArmazenamentoBinario(unittest.TestCase):
+
+    def setUp(self):
+        self._temporario = tempfile.TemporaryDirectory()
+        self.diretorio = Path(self._temporario.name)
+
+    def tearDown(self):
+        self._temporario.cleanup()
+
+    def test_ida_e_volta_do_documento(self):
+        dados = documento_sintetico()
+        caminho = salvar_binario(dados, self.diretorio / 'doc.dpz')
+
+        carregado = carregar_binario(caminho)
+        self.assertEqual(carregado, dados)
+        self.assertEqual(list(carregado), list(dados))
+        self.assertEqual(list(carregado['paginas'][2]), list(dados['paginas'][2]))
+
+    def test_pagina_avulsa(self):
+        dados = documento_sintetico()
+        caminho = salvar_binario(dados, self.diretorio / 'doc.dpz')
+
+        with LeitorBinario(caminho) as leitor:
+            self.assertEqual(len(leitor), 4)
+            for pagina in reversed(dados['paginas']):
+                self.assertEqual(leitor.pagina(pagina['numero_pagina']), pagina)
+            with self.assertRaises(IndexError):
+                leitor.pagina(5)
+            with self.assertRaises(IndexError):
+                leitor.pagina(0)
+
+    def test_pagina_com_erro_e_pagina_vazia(self):
+        caminho = salvar_binario(documento_sintetico(), self.diretorio / 'doc.dpz')
+
+        with LeitorBinario(caminho) as leitor:
+            self.assertEqual(leitor.pagina(2), _pagina(2, ''))
+            self.assertEqual(leitor.pagina(3)['erro'], 'EOF marker not found')
+            self.assertEqual(leitor.pagina(3)['texto'], '')
+
+    def test_texto_nao_ascii(self):
+        dados = documento_sintetico()
+        caminho = salvar_binario(dados, self.diretorio / 'doc.dpz')
+
+        with LeitorBinario(caminho) as leitor:
+            self.assertEqual(leitor.texto(4), dados['paginas'][3]['texto'])
+            self.assertEqual(leitor.documento['blocos']['metadados']['/Title'], 'Diário Oficial')
+
+    def test_dicionario_vazio(self):
+        dados = documento_sintetico()
+        caminho = salvar_binario(dados, self.diretorio / 'doc.dpz', dicionario=b'')
+
+        with LeitorBinario(caminho) as leitor:
+            self.assertEqual(leitor.dicionario, b'')
+            self.assertEqual(leitor.carregar(), dados)
+        self.assertEqual(criar_dicionario(['sem repetições']), b'')
+
+    def test_documento_sem_paginas(self):
+        for dados in ({}, {'arquivo': {'nome': 'vazio.pdf'}, 'paginas': []}):
+            caminho = salvar_binario(dados, self.diretorio / 'vazio.dpz')
+            with LeitorBinario(caminho) as leitor:
+                self.assertEqual(len(leitor), 0)
+                self.assertEqual(leitor.carregar(), dados)
+
+    def test_cabecalho_truncado(self):
+        caminho = salvar_binario(documento_sintetico(), self.diretorio / 'doc.dpz')
+        caminho.write_bytes(caminho.read_bytes()[:CABECALHO.size - 1])
+
+        with self.assertRaisesRegex(ValueError, 'truncado'):
+            LeitorBinario(caminho)
+
+    def test_assinatura_invalida(self):
+        caminho = salvar_binario(documento_sintetico(), self.diretorio / 'doc.dpz')
+        conteudo = caminho.read_bytes()
+        self.assertEqual(conteudo[:len(ASSINATURA)], ASSINATURA)
+        caminho.write_bytes(b'PK\x03\x04' + conteudo[4:])
+
+        with self.assertRaisesRegex(ValueError, 'não é um arquivo'):
+            LeitorBinario(caminho)
+
+    def test_tabela_de_offsets_incompleta(self):
+        caminho = salvar_binario(documento_sintetico(), self.diretorio / 'doc.dpz')
+        conteudo = caminho.read_bytes()
+        caminho.write_bytes(conteudo[:-struct.calcsize('<Q')])
+
+        with self.assertRaisesRegex(ValueError, 'incompleta'):
+            LeitorBinario(caminho)
+
+    def test_sem_arquivo_temporario(self):
+        salvar_binario(documento_sintetico(), self.diretorio / 'doc.dpz')
+        self.assertEqual([caminho.name for caminho in self.diretorio.iterdir()], ['doc.dpz'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Testes da coleta HTTP assíncrona (crawler.ColetorHTTPAssincrono) contra um
+servidor local
+
+Uso:
+    python -m pytest tests
+"""
+
+import sys
+import threading
+import unittest
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from crawler import ColetorHTTPAssincrono  # noqa: E402
+
+PAGINA = ('<html><body><h1>Edição {numero}</h1>'
+          '<div><p>PORTARIA Nº {numero}/2024 - Designa servidor para exercer a função de fiscal.</p>'
+          '<a href="/diario_{numero}.pdf">PDF</a></div></body></html>')
+
+
+class ServidorEdicoes(BaseHTTPRequestHandler):
+    """
+    /ok/<n>      página válida
+    /instavel/<n> 503 na primeira requisição, depois página válida
+    /fora         sempre 500
+    /ausente      404
+    /charset      Content-Type com charset inexistente
+    /truncada     Content-Length maior que o corpo enviado
+    """
+
+    requisicoes = Counter()
+
+    def log_message(self, *args):
+        pass
+
+    def _responder(self, status: int, corpo: bytes, content_type: str = 'text/html; charset=utf-8',
+                   tamanho: int = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(corpo) if tamanho is None else tamanho))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def do_GET(self):
+        self.requisicoes[self.path] += 1
+        partes = self.path.strip('/').split('/')
+        pagina = PAGINA.format(numero=partes[-1]).encode('utf-8')
+
+        if partes[0] == 'ok':
+            self._responder(200, pagina)
+        elif partes[0] == 'instavel':
+            if self.requisicoes[self.path] == 1:
+                self._responder(503, b'indisponivel')
+            else:
+                self._responder(200, pagina)
+        elif partes[0] == 'fora':
+            self._responder(500, b'erro')
+        elif partes[0] == 'charset':
+            self._responder(200, pagina, content_type='text/html; charset=bogus')
+        elif partes[0] == 'truncada':
+            self._responder(200, pagina[:20], tamanho=len(pagina))
+            self.close_connection = True
+        else:
+            self._responder(404, b'nao encontrada')
+
+
+class TesteColetorHTTPAssincrono(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.servidor = ThreadingHTTPServer(('127.0.0.1', 0), ServidorEdicoes)
+        cls.base = f'http://127.0.0.1:{cls.servidor.server_address[1]}'
+        cls.thread = threading.Thread(target=cls.servidor.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.servidor.shutdown()
+        cls.servidor.server_close()
+
+    def setUp(self):
+        ServidorEdicoes.requisicoes.clear()
+        self.coletor = ColetorHTTPAssincrono(max_concorrencia=4, requisicoes_por_segundo=1000,
+                                             timeout=5, tentativas=2)
+
+    def test_pagina_valida(self):
+        [conteudo] = self.coletor.coletar([f'{self.base}/ok/1'])
+        self.assertEqual(conteudo['titulo'], 'Edição 1')
+        self.assertEqual(conteudo['link_download_pdf'], f'{self.base}/diario_1.pdf')
+
+    def test_5xx_e_repetido(self):
+        [conteudo] = self.coletor.coletar([f'{self.base}/instavel/2'])
+        self.assertEqual(conteudo['titulo'], 'Edição 2')
+        self.assertEqual(ServidorEdicoes.requisicoes['/instavel/2'], 2)
+
+        with self.assertLogs('crawler', 'ERROR'):
+            self.assertEqual(self.coletor.coletar([f'{self.base}/fora']), [None])
+        self.assertEqual(ServidorEdicoes.requisicoes['/fora'], 2)
+
+    def test_4xx_nao_e_repetido(self):
+        with self.assertLogs('crawler', 'ERROR') as logs:
+            self.assertEqual(self.coletor.coletar([f'{self.base}/ausente']), [None])
+        self.assertIn('HTTP 404', logs.output[0])
+        self.assertEqual(ServidorEdicoes.requisicoes['/ausente'], 1)
+
+    def test_pagina_com_defeito_nao_interrompe_as_demais(self):
+        urls = [f'{self.base}/ok/1', f'{self.base}/charset', f'{self.base}/ok/2',
+                f'{self.base}/truncada', f'{self.base}/ausente', f'{self.base}/ok/3']
+
+        with self.assertLogs('crawler', 'ERROR') as logs:
+            resultados = self.coletor.coletar(urls)
+
+        self.assertEqual([r and r['titulo'] for r in resultados],
+                         ['Edição 1', None, 'Edição 2', None, None, 'Edição 3'])
+        self.assertTrue(any('LookupError' in linha for linha in logs.output))
+        self.assertEqual(ServidorEdicoes.requisicoes['/charset'], 1)
+        self.assertEqual(ServidorEdicoes.requisicoes['/truncada'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Testes das seções extraídas das páginas de edição (crawler.extrair_blocos_texto)
+
+Uso:
+    python -m pytest tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+sys.path.insert(0, str(RAIZ / 'benchmarks'))
+
+from benchmark_html import conferir_secoes, gerar_pagina_edicao  # noqa: E402
+from crawler import parsear_conteudo_edicao  # noqa: E402
+
+ATO = ('<div><p><strong>PORTARIA Nº 12/2024</strong></p>'
+       '<p>Designa servidor para exercer a função de fiscal do contrato.</p>'
+       '<div>Cuiabá, 15 de março de 2024.</div></div>')
+
+
+class TesteSecoesEdicao(unittest.TestCase):
+
+    def test_textos_curtos_entram_na_secao(self):
+        secoes = parsear_conteudo_edicao(ATO, 'https://exemplo/edicao')['secoes']
+        self.assertEqual(secoes, [{
+            'tipo': 'p',
+            'texto': 'PORTARIA Nº 12/2024\nDesigna servidor para exercer a função de fiscal do contrato.\n'
+                     'Cuiabá, 15 de março de 2024.'
+        }])
+
+    def test_textos_repetidos_sao_mantidos(self):
+        html = f'<article>{ATO}{ATO}</article>'
+        secoes = parsear_conteudo_edicao(html, 'https://exemplo/edicao')['secoes']
+        self.assertEqual(len(secoes), 2)
+        self.assertEqual(secoes[0]['texto'], secoes[1]['texto'])
+
+    def test_pagina_so_com_textos_curtos(self):
+        secoes = parsear_conteudo_edicao('<div><p>Edição extra</p><p>Sem atos</p></div>', 'u')['secoes']
+        self.assertEqual(secoes, [{'tipo': 'p', 'texto': 'Edição extra\nSem atos'}])
+
+    def test_paridade_com_os_blocos(self):
+        for html in (ATO, f'<section>Abertura do caderno{ATO}Encerramento</section>', gerar_pagina_edicao(50)):
+            for parser in ('html.parser', 'lxml'):
+                with self.subTest(parser=parser, html=html[:40]):
+                    conteudo = parsear_conteudo_edicao(html, 'https://exemplo/edicao', parser)
+                    self.assertTrue(conferir_secoes(html, conteudo['secoes'], parser))
+
+
+if __name__ == '__main__':
+    unittest.main()